@@ -0,0 +1,325 @@
+"""
+app/core/audit.py
+==================
+Audit trail for mutating actions, written to `audit_logs` off the request path.
+
+  @audited("user.login", ...)   names the action an endpoint performs and
+                                which argument / result identifies the actor,
+                                target and (redacted) request body
+  AuditMiddleware               pure ASGI; for POST/PUT/PATCH/DELETE it opens an
+                                event, lets the endpoint fill it, then adds
+                                status, latency, IP and user agent — failed
+                                attempts (401, 403, 409 …) are recorded too
+  AuditPipeline                 samples and shapes events into audit_logs rows
+                                for a WriteBehindQueue (app/core/write_behind.py)
+                                that bulk-inserts them every
+                                AUDIT_FLUSH_INTERVAL_MS and on shutdown, and
+                                isolates rows the database rejects
+
+Only decorated endpoints produce events. Routine actions are sampled at
+AUDIT_SAMPLE_RATE; AUDIT_ALWAYS_ACTIONS and every failed request are always
+kept. Body fields named in AUDIT_REDACT_FIELDS are masked and long strings
+truncated to AUDIT_MAX_FIELD_CHARS; every string column is cut to its
+length. The client IP is the socket peer unless that peer is one of
+AUDIT_TRUSTED_PROXIES, in which case X-Forwarded-For is walked right to left
+past the trusted hops. When the buffer (AUDIT_BUFFER_SIZE) is full the oldest
+events are overwritten (counted as `dropped` in /health).
+
+Latency budget: the middleware + decorator may add at most 0.5 ms at p99 to
+an audited request (benchmarks/bench_audit.py checks this) — the request
+path never touches the database.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import ipaddress
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+import structlog
+
+from app.config import settings
+from app.core.write_behind import WriteBehindQueue
+from app.models.audit_log import AuditLog
+
+logger = structlog.get_logger(__name__)
+
+_MUTATING = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_REDACTED = "[redacted]"
+
+_event: ContextVar[dict | None] = ContextVar("audit_event", default=None)
+
+
+# ── Payload redaction ─────────────────────────────────────────────────────────
+
+def redact(value: Any, fields: frozenset[str] | None = None, limit: int | None = None) -> Any:
+    """Copy of `value` with sensitive keys masked and long strings cut."""
+    fields = frozenset(f.lower() for f in settings.AUDIT_REDACT_FIELDS) if fields is None else fields
+    limit  = settings.AUDIT_MAX_FIELD_CHARS if limit is None else limit
+    if isinstance(value, dict):
+        return {k: _REDACTED if str(k).lower() in fields else redact(v, fields, limit) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v, fields, limit) for v in value]
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + "…"
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# ── Decorator ─────────────────────────────────────────────────────────────────
+
+def audited(
+    action:   str,
+    resource: str | None = None,
+    *,
+    target:   str | Callable[[Any], Any] | None = None,
+    actor:    Callable[[Any], Any] | None = None,
+    body:     str | None = None,
+):
+    """
+    Mark an endpoint as an audited action.
+
+    target  endpoint argument name, or function of the result, giving resource_id
+    actor   function of the result giving the user id when the caller was not
+            authenticated yet (register / login)
+    body    endpoint argument (pydantic model) stored, redacted, in the payload
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            event = _event.get()
+            if event is None:                     # middleware not installed / not mutating
+                return await fn(*args, **kwargs)
+
+            event["action"], event["resource"] = action, resource
+            current = kwargs.get("current")
+            if isinstance(current, dict) and current.get("id"):
+                event["user_id"] = str(current["id"])
+            if isinstance(target, str) and kwargs.get(target) is not None:
+                event["resource_id"] = str(kwargs[target])
+            if body and kwargs.get(body) is not None:
+                event["body"] = kwargs[body].model_dump(mode="json")
+
+            result = await fn(*args, **kwargs)
+            try:
+                if callable(target):
+                    event["resource_id"] = str(target(result))
+                if actor is not None and "user_id" not in event:
+                    event["user_id"] = str(actor(result))
+            except Exception:                     # never fail the request over audit metadata
+                pass
+            return result
+
+        # Routers use postponed annotations; FastAPI would resolve them against
+        # this module's globals, so hand it the evaluated signature instead.
+        wrapper.__signature__ = inspect.signature(fn, eval_str=True)
+        return wrapper
+    return decorate
+
+
+def audit_context(**fields: Any) -> None:
+    """Attach extra fields to the current request's audit event (no-op outside one)."""
+    event = _event.get()
+    if event is not None:
+        event.setdefault("extra", {}).update(fields)
+
+
+# ── Middleware ────────────────────────────────────────────────────────────────
+
+class AuditMiddleware:
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _MUTATING or not settings.AUDIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        event: dict = {}
+        token   = _event.set(event)
+        status  = 500
+        started = time.perf_counter()
+
+        async def send_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            _event.reset(token)
+            if "action" in event:
+                audit_pipeline.record(event, scope, status, (time.perf_counter() - started) * 1000)
+
+
+def _header(scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _bearer_subject(scope) -> str | None:
+    auth = _header(scope, b"authorization")
+    if not auth or not auth.lower().startswith("bearer "):
+        return None
+    try:
+        from app.core.security import decode_token
+        return decode_token(auth[7:]).get("sub")
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _networks(proxies: tuple[str, ...]) -> tuple:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in net for net in _networks(tuple(settings.AUDIT_TRUSTED_PROXIES)))
+
+
+def client_ip(scope) -> str | None:
+    """
+    The socket peer, or — when the peer is a trusted proxy — the right-most
+    X-Forwarded-For entry that is not itself a trusted proxy.
+    """
+    client = scope.get("client")
+    peer   = client[0] if client else None
+    if peer is None or not settings.AUDIT_TRUSTED_PROXIES or not _trusted(peer):
+        return peer
+    forwarded = _header(scope, b"x-forwarded-for") or ""
+    for hop in reversed([h.strip() for h in forwarded.split(",") if h.strip()]):
+        try:
+            ipaddress.ip_address(hop)
+        except ValueError:
+            return peer                           # malformed chain: fall back to the proxy
+        if not _trusted(hop):
+            return hop
+    return peer
+
+
+# Column lengths of audit_logs' string columns; values are cut to fit
+_LIMITS = {c.name: c.type.length for c in AuditLog.__table__.columns if getattr(c.type, "length", None)}
+
+
+def _fit(row: dict) -> dict:
+    for name, limit in _LIMITS.items():
+        value = row.get(name)
+        if value is not None:
+            value     = str(value)
+            row[name] = value[:limit] or None
+    return row
+
+
+# ── Buffer + bulk flush ───────────────────────────────────────────────────────
+
+@dataclass
+class AuditStats:
+    recorded:    int = 0
+    sampled_out: int = 0
+
+
+class AuditPipeline:
+
+    def __init__(self, capacity: int, flush_interval_ms: int) -> None:
+        self.capacity = capacity
+        self.stats    = AuditStats()
+        # Size trigger = capacity: flushes are timed; a full buffer overwrites the oldest event
+        self.queue    = WriteBehindQueue(
+            batch_size=capacity, flush_interval_ms=flush_interval_ms, max_queue=capacity,
+            max_attempts=settings.WRITE_BEHIND_MAX_ATTEMPTS, name="audit-flush",
+        )
+
+    @property
+    def engine(self) -> Any:
+        return self.queue.engine
+
+    @engine.setter
+    def engine(self, engine: Any) -> None:
+        self.queue.engine = engine
+
+    @property
+    def depth(self) -> int:
+        return self.queue.depth
+
+    def events(self) -> list[dict]:
+        """Buffered rows, oldest first."""
+        return [row for _, row, _ in self.queue._buffer]
+
+    def record(self, event: dict, scope: dict, status: int, elapsed_ms: float) -> None:
+        """Queue one finished request's event. Synchronous: no I/O on the request path."""
+        action = event["action"]
+        if (status < 400 and action not in settings.AUDIT_ALWAYS_ACTIONS
+                and random.random() >= settings.AUDIT_SAMPLE_RATE):
+            self.stats.sampled_out += 1
+            return
+
+        payload: dict[str, Any] = {
+            "method": scope["method"], "path": scope["path"],
+            "status": status, "duration_ms": round(elapsed_ms, 2),
+        }
+        if "body" in event:
+            payload["body"] = redact(event["body"])
+        if "extra" in event:
+            payload.update(redact(event["extra"]))
+
+        self.queue.append(AuditLog.__table__, _fit({
+            "id":          uuid.uuid4(),
+            "user_id":     event.get("user_id") or _bearer_subject(scope),
+            "action":      action,
+            "resource":    event.get("resource"),
+            "resource_id": event.get("resource_id"),
+            "ip_address":  client_ip(scope),
+            "user_agent":  _header(scope, b"user-agent"),
+            "payload":     payload,
+            "created_at":  datetime.utcnow(),
+        }))
+        self.stats.recorded += 1
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self, engine: Any = None) -> None:
+        self.queue.start(engine)
+
+    async def stop(self) -> None:
+        await self.queue.stop()
+
+    async def flush(self) -> int:
+        """Bulk-insert everything buffered. Returns rows written."""
+        return await self.queue.flush()
+
+    def snapshot(self) -> dict:
+        queue = self.queue.stats
+        return {
+            "enabled":       settings.AUDIT_ENABLED,
+            "sample_rate":   settings.AUDIT_SAMPLE_RATE,
+            "depth":         self.depth,
+            "capacity":      self.capacity,
+            **asdict(self.stats),
+            "dropped":       queue.dropped,    # overwritten in a full buffer / rejected rows
+            "flushed":       queue.flushed,
+            "flushes":       queue.flushes,
+            "failures":      queue.failures,
+            "last_flush_ms": queue.last_flush_ms,
+        }
+
+
+audit_pipeline = AuditPipeline(
+    capacity=settings.AUDIT_BUFFER_SIZE,
+    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+)
@@ -0,0 +1,104 @@
+"""
+app/core/db_pool.py
+====================
+Connection-pool instrumentation for the async engines in app/database.py.
+
+  InstrumentedPool   AsyncAdaptedQueuePool that times every checkout (the
+                     wait for a free slot plus any connect) and counts
+                     overflow connections opened and checkout timeouts
+  PoolStats          the counters, with p50/p99 over the last 1024 checkouts
+
+`pool_snapshot(engine)` adds the live gauges (size, in use, idle, overflow)
+and is what /health reports under "database_pool". Checkouts that wait
+longer than SLOW_CHECKOUT_MS are logged as `db.pool_slow_checkout` — the
+sign that DATABASE_POOL_SIZE / DATABASE_MAX_OVERFLOW are too small for
+the request concurrency.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import structlog
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = structlog.get_logger(__name__)
+
+SLOW_CHECKOUT_MS = 100.0
+
+
+@dataclass
+class PoolStats:
+    checkouts:       int   = 0
+    timeouts:        int   = 0
+    overflow_opened: int   = 0
+    peak_in_use:     int   = 0
+    wait_total_ms:   float = 0.0
+    wait_max_ms:     float = 0.0
+    _recent: deque = field(default_factory=lambda: deque(maxlen=1024), repr=False)
+
+    def observe(self, wait_ms: float, in_use: int) -> None:
+        self.checkouts     += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms    = max(self.wait_max_ms, wait_ms)
+        self.peak_in_use    = max(self.peak_in_use, in_use)
+        self._recent.append(wait_ms)
+
+    def percentile(self, q: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts":       self.checkouts,
+            "timeouts":        self.timeouts,
+            "overflow_opened": self.overflow_opened,
+            "peak_in_use":     self.peak_in_use,
+            "wait_avg_ms":     round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+            "wait_p50_ms":     round(self.percentile(0.50), 3),
+            "wait_p99_ms":     round(self.percentile(0.99), 3),
+            "wait_max_ms":     round(self.wait_max_ms, 3),
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout latency and overflow/timeout events."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        overflow = self.overflow()
+        started  = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            logger.warning("db.pool_timeout", size=self.size(), in_use=self.checkedout())
+            raise
+        wait_ms = (time.perf_counter() - started) * 1000
+        if self.overflow() > max(overflow, 0):
+            self.stats.overflow_opened += 1
+        self.stats.observe(wait_ms, self.checkedout())
+        if wait_ms > SLOW_CHECKOUT_MS:
+            logger.warning("db.pool_slow_checkout", wait_ms=round(wait_ms, 1), in_use=self.checkedout())
+        return conn
+
+
+def pool_snapshot(engine) -> dict:
+    """Live gauges + counters for one engine's pool (empty for other pool classes)."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedPool):
+        return {}
+    return {
+        "size":     pool.size(),
+        "in_use":   pool.checkedout(),
+        "idle":     pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        **pool.stats.as_dict(),
+    }
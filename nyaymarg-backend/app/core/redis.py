@@ -0,0 +1,69 @@
+"""
+app/core/redis.py — Lazily-created async Redis client shared by the external
+API stack (response cache, request coalescing).
+
+Returns None when shared state is disabled or Redis recently failed, so every
+caller degrades to in-process behaviour instead of erroring.
+
+A redis.asyncio connection pool is bound to the loop that created it, and
+Celery tasks run each task in a fresh asyncio.run loop, so one client is kept
+per running loop (the same pattern as the rate limiter registry).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from typing import Any
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_BACKOFF_SECONDS = 5.0
+
+_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_down_until: float = 0.0
+
+
+def shared_state_enabled() -> bool:
+    """True when shared state is configured and Redis is not backing off."""
+    return settings.EXTERNAL_CACHE_REDIS_ENABLED and time.monotonic() >= _down_until
+
+
+def get_async_redis() -> Any | None:
+    """Return the running loop's redis.asyncio client, or None if disabled / backing off."""
+    if not shared_state_enabled():
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    client = _clients.get(loop)
+    if client is None:
+        import redis.asyncio as aioredis
+        client = _clients[loop] = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+    return client
+
+
+def mark_redis_down(op: str, exc: Exception) -> None:
+    """Stop using Redis for a few seconds after a failure."""
+    global _down_until
+    _down_until = time.monotonic() + _BACKOFF_SECONDS
+    logger.warning("redis.unavailable", op=op, error=str(exc))
+
+
+async def close_async_redis() -> None:
+    """Close the running loop's client (call before the loop shuts down)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
@@ -0,0 +1,264 @@
+"""
+app/core/write_behind.py
+=========================
+Write-behind persistence for append-only records (predictions, chat
+messages; audit events go through their own queue, app/core/audit.py).
+
+DB_DURABILITY_MODE selects how `persist(db, *objs)` stores them:
+
+  sync          db.add + one flush inside the request (rows are visible to
+                the same request and committed with it)
+  write_behind  the rows are copied into an in-memory buffer and the request
+                returns; a background task writes them as multi-row INSERTs
+                per table every WRITE_BEHIND_FLUSH_INTERVAL_MS or as soon as
+                WRITE_BEHIND_BATCH_SIZE rows are waiting
+
+Ids and created_at are assigned at submit time, so ordering and the ids
+returned to clients do not depend on when the batch lands. A full buffer
+(WRITE_BEHIND_MAX_QUEUE) makes the submitting request flush inline instead
+of dropping rows. The lifespan stops the queue with a final flush. Rows still
+buffered when the process is killed are lost — choose `sync` where that
+matters.
+
+Producers that cannot await (the audit middleware) use `append`, which never
+flushes inline: past max_queue the oldest rows are discarded instead.
+
+A failed flush first checks the database answers at all: if not, the whole
+batch waits for the next flush. Otherwise the batch is bisected so the good
+rows land and each bad row is isolated; a row that fails on its own is
+retried up to WRITE_BEHIND_MAX_ATTEMPTS flushes, then logged and dropped.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy import insert, inspect, text
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class WriteBehindStats:
+    enqueued:       int   = 0
+    flushed:        int   = 0    # rows written
+    flushes:        int   = 0
+    failures:       int   = 0
+    dropped:        int   = 0    # rows that kept failing on their own / overwritten by append
+    inline_flushes: int   = 0    # buffer was full; the submitting request flushed
+    last_flush_ms:  float = 0.0
+    max_flush_ms:   float = 0.0
+    total_flush_ms: float = 0.0
+
+
+# (table, column values, failed attempts)
+_Pending = tuple[Any, dict, int]
+
+
+def _row(obj: Any) -> tuple[Any, dict]:
+    """(table, column values) of an ORM instance, with Python-side defaults applied now."""
+    mapper = inspect(obj).mapper
+    row: dict[str, Any] = {}
+    for attr in mapper.column_attrs:
+        column = attr.columns[0]
+        value  = getattr(obj, attr.key)
+        if value is None and column.default is not None:
+            value = column.default.arg(None) if column.default.is_callable else column.default.arg
+            setattr(obj, attr.key, value)
+        row[column.name] = value
+    return mapper.local_table, row
+
+
+class WriteBehindQueue:
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, max_queue: int,
+                 max_attempts: int = 3, name: str = "write-behind") -> None:
+        self.name           = name
+        self.batch_size     = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue      = max_queue
+        self.max_attempts   = max_attempts
+        self.engine: Any    = None
+        self.stats          = WriteBehindStats()
+        self._buffer: list[_Pending] = []
+        self._wake          = asyncio.Event()
+        self._lock          = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        return len(self._buffer)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self, engine: Any = None) -> None:
+        if self.running:
+            return
+        if engine is None:
+            from app.database import engine
+        self.engine = engine
+        self._wake  = asyncio.Event()
+        self._lock  = asyncio.Lock()
+        self._task  = asyncio.create_task(self._run(), name=self.name)
+        logger.info("write_behind.started", queue=self.name, batch_size=self.batch_size,
+                    interval_ms=int(self.flush_interval * 1000))
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._buffer and self.engine is not None:
+            await self.flush()
+        logger.info("write_behind.stopped", queue=self.name, remaining=self.depth, **asdict(self.stats))
+
+    # ── Producer ──────────────────────────────────────────────────────────────
+
+    async def submit(self, *objs: Any) -> None:
+        self._buffer.extend((*_row(o), 0) for o in objs)
+        self.stats.enqueued += len(objs)
+        if self.depth >= self.max_queue:
+            self.stats.inline_flushes += 1
+            await self.flush()
+        elif self.depth >= self.batch_size:
+            self._wake.set()
+
+    def append(self, table: Any, row: dict) -> None:
+        """Buffer a prepared row without awaiting; when full the oldest row is discarded."""
+        self._buffer.append((table, row, 0))
+        self.stats.enqueued += 1
+        overflow = self.depth - self.max_queue
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.stats.dropped += overflow
+        elif self.depth >= self.batch_size:
+            self._wake.set()
+
+    # ── Consumer ──────────────────────────────────────────────────────────────
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._buffer:
+                await self.flush()
+
+    async def flush(self) -> int:
+        """Write the buffered rows, one multi-row INSERT per table. Returns rows written."""
+        async with self._lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                await self._write(batch)
+                written = len(batch)
+            except Exception as exc:
+                self.stats.failures += 1
+                logger.error("write_behind.flush_failed", queue=self.name, rows=len(batch), error=str(exc))
+                if not await self._reachable():
+                    self._buffer[:0] = batch    # outage, not bad rows: retried as-is
+                    return 0
+                written, failed = await self._isolate(batch, exc)
+                self._requeue(failed)
+                if not written:
+                    return 0
+
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stats.flushed        += written
+            self.stats.flushes        += 1
+            self.stats.last_flush_ms   = round(elapsed, 2)
+            self.stats.max_flush_ms    = round(max(self.stats.max_flush_ms, elapsed), 2)
+            self.stats.total_flush_ms += elapsed
+            return written
+
+    async def _write(self, batch: list[_Pending]) -> None:
+        by_table: dict[Any, list[dict]] = {}
+        for table, row, _ in batch:
+            by_table.setdefault(table, []).append(row)
+        async with self.engine.begin() as conn:
+            for table, rows in by_table.items():
+                await conn.execute(insert(table), rows)
+
+    async def _isolate(
+        self, batch: list[_Pending], exc: Exception | None = None,
+    ) -> tuple[int, list[tuple[_Pending, Exception]]]:
+        """
+        Bisect a failing batch (`exc`: already known to fail with it). Returns
+        rows written and each row that fails on its own, with its error.
+        """
+        if exc is None:
+            try:
+                await self._write(batch)
+                return len(batch), []
+            except Exception as error:
+                exc = error
+        if len(batch) == 1:
+            return 0, [(batch[0], exc)]
+        mid = len(batch) // 2
+        left, right = await self._isolate(batch[:mid]), await self._isolate(batch[mid:])
+        return left[0] + right[0], left[1] + right[1]
+
+    def _requeue(self, failed: list[tuple[_Pending, Exception]]) -> None:
+        keep: list[_Pending] = []
+        for (table, row, attempts), exc in failed:
+            if attempts + 1 < self.max_attempts:
+                keep.append((table, row, attempts + 1))
+                continue
+            self.stats.dropped += 1
+            logger.error("write_behind.row_dropped", queue=self.name, table=table.name, id=str(row.get("id")),
+                         attempts=attempts + 1, error=str(exc)[:500])
+        self._buffer[:0] = keep
+
+    async def _reachable(self) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
+
+    def snapshot(self) -> dict:
+        stats = asdict(self.stats)
+        total = stats.pop("total_flush_ms")
+        return {
+            "mode":         settings.DB_DURABILITY_MODE,
+            "running":      self.running,
+            "depth":        self.depth,
+            "avg_flush_ms": round(total / self.stats.flushes, 2) if self.stats.flushes else 0.0,
+            **stats,
+        }
+
+
+write_behind = WriteBehindQueue(
+    batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+    flush_interval_ms=settings.WRITE_BEHIND_FLUSH_INTERVAL_MS,
+    max_queue=settings.WRITE_BEHIND_MAX_QUEUE,
+    max_attempts=settings.WRITE_BEHIND_MAX_ATTEMPTS,
+)
+
+
+async def persist(db: Any, *objs: Any) -> None:
+    """Store ORM rows per DB_DURABILITY_MODE (see module docstring)."""
+    if settings.DB_DURABILITY_MODE == "write_behind" and write_behind.running:
+        await write_behind.submit(*objs)
+        return
+    db.add_all(objs)
+    await db.flush()
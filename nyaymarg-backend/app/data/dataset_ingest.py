@@ -0,0 +1,348 @@
+"""
+app/data/dataset_ingest.py
+===========================
+Streaming ingestion of uploaded datasets (CSV, JSON array / NDJSON) for
+tasks.process_dataset. Memory stays at one chunk of DATASET_INGEST_CHUNK_ROWS
+rows whatever the file size:
+
+  read      CSV via pandas' chunked reader (every cell read as text);
+            JSON via an incremental parser that decodes one array element
+            (or NDJSON line) at a time
+  infer     column kinds (integer / number / boolean / date / string) from
+            the first DATASET_SAMPLE_ROWS rows; columns of the NyayMarg case
+            schema (df_cases, see CASE_SCHEMA) use that schema's kinds
+  validate  when the required case columns are present, every row is checked
+            (types, ranges, required values) while rows are counted; the
+            report keeps counts and the first MAX_REPORTED_ERRORS problems
+  convert   each typed chunk is appended to <file>.parquet (pyarrow), so
+            training reads a columnar file instead of re-parsing the upload
+
+Values that do not match their column's kind become nulls in the Parquet
+file and are counted per column; a file that cannot be parsed at all fails
+the dataset. Without pyarrow (or with DATASET_PARQUET_ENABLED off) the scan
+and validation still run and `schema_info["parquet"]` is None.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+import pandas as pd
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+MAX_REPORTED_ERRORS = 20
+
+_BOOL = {"true": True, "false": False, "yes": True, "no": False, "y": True, "n": False}
+
+
+@dataclass(frozen=True)
+class _Field:
+    kind:     str
+    required: bool         = False
+    min:      float | None = None
+    max:      float | None = None
+
+
+# df_cases as built by app/data/seed.py (the registry / training format).
+CASE_SCHEMA: dict[str, _Field] = {
+    "case_id":             _Field("string", required=True),
+    "case_title":          _Field("string"),
+    "case_number":         _Field("string"),
+    "court_id":            _Field("string"),
+    "judge_id":            _Field("string"),
+    "case_type":           _Field("string", required=True),
+    "status":              _Field("string", required=True),
+    "filing_date":         _Field("date"),
+    "hearing_count":       _Field("integer", min=0),
+    "complexity_score":    _Field("number", min=0, max=10),
+    "case_value_lakhs":    _Field("number", min=0),
+    "days_pending":        _Field("integer", min=0),
+    "public_interest_tag": _Field("boolean"),
+    "law_id":              _Field("string"),
+    "case_text":           _Field("string", required=True),
+    "outcome":             _Field("integer", min=0, max=1),
+}
+# `cases` table / API naming → df_cases naming
+ALIASES = {"public_interest": "public_interest_tag", "judgment_text": "case_text"}
+
+
+# ── Readers ───────────────────────────────────────────────────────────────────
+
+def csv_chunks(path: str | Path, rows: int) -> Iterator[pd.DataFrame]:
+    yield from pd.read_csv(path, chunksize=rows, dtype=str, skipinitialspace=True)
+
+
+def json_records(path: str | Path, buffer_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time (or each value
+    of an NDJSON / concatenated-JSON file; a lone object is one record).
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8-sig") as fh:
+        buf, pos, eof = "", 0, False
+        in_array = None
+
+        def _fill() -> None:
+            nonlocal buf, pos, eof
+            chunk = fh.read(buffer_size)
+            eof   = not chunk
+            buf   = buf[pos:] + chunk
+            pos   = 0
+
+        def _skip() -> str:
+            """Advance past whitespace (and array commas); next char or '' at EOF."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and (buf[pos].isspace() or (in_array and buf[pos] == ",")):
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return buf[pos] if pos < len(buf) else ""
+                _fill()
+
+        _fill()
+        if _skip() == "[":
+            in_array, pos = True, pos + 1
+        while True:
+            head = _skip()
+            if head == "" or (in_array and head == "]"):
+                return
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                    # A value touching the end of the buffer may be cut short (e.g. a number).
+                    if end < len(buf) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                _fill()
+            pos = end
+            yield value
+
+
+def json_chunks(path: str | Path, rows: int) -> Iterator[pd.DataFrame]:
+    batch: list[dict] = []
+    for record in json_records(path):
+        batch.append(record if isinstance(record, dict) else {"value": record})
+        if len(batch) >= rows:
+            yield pd.DataFrame.from_records(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame.from_records(batch)
+
+
+# ── Typing ────────────────────────────────────────────────────────────────────
+
+def _present(series: pd.Series) -> pd.Series:
+    return series.notna() & (series != "")
+
+
+def _parse_dates(series: pd.Series) -> pd.Series:
+    values = pd.to_datetime(series, errors="coerce", format="ISO8601")
+    retry  = values.isna() & series.notna()
+    if retry.any():                                   # e.g. 15/01/2020 — slower per-value parse
+        values[retry] = pd.to_datetime(series[retry], errors="coerce", format="mixed", dayfirst=True)
+    return values
+
+
+def convert(series: pd.Series, kind: str) -> tuple[pd.Series, pd.Series]:
+    """(typed values, mask of present values that did not fit `kind`)."""
+    present = _present(series)
+    if kind in ("integer", "number"):
+        values = pd.to_numeric(series.where(present), errors="coerce")
+        bad    = present & values.isna()
+        if kind == "integer":
+            fractional = values.notna() & (values % 1 != 0)
+            bad       |= fractional
+            return values.where(~fractional).round().astype("Int64"), bad
+        return values.astype("float64"), bad
+    if kind == "boolean":
+        values = series.where(present).map(
+            lambda v: v if isinstance(v, bool) else _BOOL.get(str(v).strip().lower()) if pd.notna(v) else None
+        )
+        numeric = pd.to_numeric(series.where(present & values.isna()), errors="coerce")   # 1 / 0
+        values  = values.where(values.notna(), numeric.map({1: True, 0: False}))
+        values  = values.astype("boolean")
+        return values, present & values.isna()
+    if kind == "date":
+        values = _parse_dates(series.where(present))
+        return values, present & values.isna()
+    values = series.where(present)
+    if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):   # JSON scalars / objects
+        values = values.map(
+            lambda v: None if v is None or (not isinstance(v, (dict, list)) and pd.isna(v))
+            else json.dumps(v) if isinstance(v, (dict, list)) else str(v)
+        )
+    return values.astype("string"), pd.Series(False, index=series.index)
+
+
+def infer_kind(series: pd.Series) -> str:
+    """Narrowest kind every non-empty sample value fits (string if none do)."""
+    sample = series[_present(series)]
+    if sample.empty:
+        return "string"
+    for kind in ("integer", "number", "boolean", "date"):
+        if kind == "boolean" and not sample.map(lambda v: isinstance(v, bool) or str(v).strip().lower() in _BOOL).all():
+            continue
+        if not convert(sample, kind)[1].any():
+            return kind
+    return "string"
+
+
+# ── Ingestion ─────────────────────────────────────────────────────────────────
+
+@dataclass
+class _Report:
+    row_count:    int = 0
+    invalid_rows: int = 0
+    type_errors:  dict[str, int] = field(default_factory=dict)
+    errors:       list[dict]     = field(default_factory=list)
+
+    def flag(self, mask: pd.Series, column: str, raw: pd.Series, error: str, offset: int) -> None:
+        if len(self.errors) >= MAX_REPORTED_ERRORS or not mask.any():
+            return
+        for i in mask[mask].index[: MAX_REPORTED_ERRORS - len(self.errors)]:
+            value = raw.loc[i] if i in raw.index else None
+            self.errors.append({
+                "row":    offset + int(mask.index.get_loc(i)) + 1,
+                "column": column,
+                "value":  None if value is None or (not isinstance(value, (dict, list)) and pd.isna(value)) else str(value)[:100],
+                "error":  error,
+            })
+
+
+def _range_error(spec: _Field) -> str:
+    if spec.max is None:
+        return f"must be >= {spec.min:g}"
+    if spec.min is None:
+        return f"must be <= {spec.max:g}"
+    return f"must be between {spec.min:g} and {spec.max:g}"
+
+
+class _ParquetSink:
+    """Appends typed chunks to a temp Parquet file, renamed into place on close."""
+
+    def __init__(self, dest: Path) -> None:
+        import pyarrow as pa           # type: ignore
+        import pyarrow.parquet as pq   # type: ignore
+
+        self._pa, self._pq = pa, pq
+        self.dest   = dest
+        self.tmp    = dest.with_name(f".{dest.name}.tmp")
+        self.writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.writer is None:
+            table       = self._pa.Table.from_pandas(df, preserve_index=False)
+            self.writer = self._pq.ParquetWriter(str(self.tmp), table.schema, compression="zstd")
+        else:
+            table = self._pa.Table.from_pandas(df, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self) -> Path | None:
+        if self.writer is None:
+            return None
+        self.writer.close()
+        os.replace(self.tmp, self.dest)
+        return self.dest
+
+    def abort(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def _parquet_sink(path: Path) -> _ParquetSink | None:
+    if not settings.DATASET_PARQUET_ENABLED:
+        return None
+    try:
+        return _ParquetSink(path.with_suffix(".parquet"))
+    except ImportError:
+        logger.info("dataset_ingest.parquet_unavailable", reason="pyarrow not installed")
+        return None
+
+
+def ingest(path: str | Path) -> tuple[int, dict]:
+    """Scan, validate and convert one uploaded file. Returns (row_count, schema_info)."""
+    path    = Path(path)
+    suffix  = path.suffix.lower()
+    rows    = settings.DATASET_INGEST_CHUNK_ROWS
+    started = time.perf_counter()
+    if suffix == ".csv":
+        chunks = csv_chunks(path, rows)
+    elif suffix == ".json":
+        chunks = json_chunks(path, rows)
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix}")
+
+    report = _Report()
+    kinds: dict[str, str] | None = None
+    case_schema: dict[str, Any] = {}
+    sink = _parquet_sink(path)
+    try:
+        for raw in chunks:
+            raw = raw.rename(columns=lambda c: str(c).strip())
+            raw = raw.rename(columns={a: c for a, c in ALIASES.items() if a in raw.columns and c not in raw.columns})
+            if kinds is None:
+                sample  = raw.head(settings.DATASET_SAMPLE_ROWS)
+                kinds   = {c: CASE_SCHEMA[c].kind if c in CASE_SCHEMA else infer_kind(sample[c]) for c in raw.columns}
+                missing = [c for c, f in CASE_SCHEMA.items() if f.required and c not in kinds]
+                case_schema = {"matches": not missing, "missing": missing}
+            for column in kinds:                       # later chunks may lack a column (JSON)
+                if column not in raw.columns:
+                    raw[column] = None
+            raw = raw[list(kinds)]
+
+            typed   = pd.DataFrame(index=raw.index)
+            invalid = pd.Series(False, index=raw.index)
+            for column, kind in kinds.items():
+                typed[column], bad = convert(raw[column], kind)
+                if bad.any():
+                    report.type_errors[column] = report.type_errors.get(column, 0) + int(bad.sum())
+                if not case_schema["matches"] or column not in CASE_SCHEMA:
+                    continue
+                spec = CASE_SCHEMA[column]
+                report.flag(bad, column, raw[column], f"expected {kind}", report.row_count)
+                invalid |= bad
+                if spec.required:
+                    absent = typed[column].isna() & ~bad
+                    report.flag(absent, column, raw[column], "required", report.row_count)
+                    invalid |= absent
+                if spec.min is not None or spec.max is not None:
+                    values = typed[column].astype("float64")
+                    out    = (values < spec.min if spec.min is not None else False) | \
+                             (values > spec.max if spec.max is not None else False)
+                    out    = out.fillna(False).astype(bool)
+                    report.flag(out, column, raw[column], _range_error(spec), report.row_count)
+                    invalid |= out
+
+            report.invalid_rows += int(invalid.sum())
+            report.row_count    += len(raw)
+            if sink is not None:
+                sink.write(typed.reset_index(drop=True))
+        parquet = sink.close() if sink is not None else None
+    except BaseException:
+        if sink is not None:
+            sink.abort()
+        raise
+
+    if case_schema.get("matches"):
+        case_schema.update(invalid_rows=report.invalid_rows, errors=report.errors)
+    schema_info = {
+        "format":      "csv" if suffix == ".csv" else "json",
+        "columns":     list(kinds or {}),
+        "kinds":       kinds or {},
+        "type_errors": report.type_errors,
+        "case_schema": case_schema,
+        "parquet":     str(parquet) if parquet else None,
+        "elapsed_s":   round(time.perf_counter() - started, 2),
+    }
+    return report.row_count, schema_info
@@ -0,0 +1,239 @@
+"""
+app/data/gov_sync.py
+=====================
+Periodic mirror of the data.gov.in judiciary resources into `gov_records`.
+
+The sync job (Celery `tasks.sync_data_gov`, weekly via beat):
+  1. reads page 0 of each resource for its `total`, then fetches the remaining
+     offset/limit pages concurrently (DATA_GOV_SYNC_CONCURRENCY; the shared
+     client's rate limiter still applies)
+  2. upserts every record keyed by (resource, md5 of its fields) and deletes
+     rows the upstream no longer returns; a resource whose fetch fails keeps
+     its previous rows and is reported in the summary
+  3. tags rows with a normalised state + year, indexed for per-state queries
+
+The API answers /gov/* from the table and keeps one DataFrame per resource on
+the registry (load_gov_frames), joinable with df_courts on `state_key`.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+import structlog
+from sqlalchemy import delete, func, select
+
+from app.config import settings
+from app.data.seed import get_registry
+from app.models.gov_record import GovRecord
+
+logger = structlog.get_logger(__name__)
+
+_UPSERT_BATCH = 500
+
+
+# ── Record normalisation ──────────────────────────────────────────────────────
+
+def _record_key(record: dict) -> str:
+    return hashlib.md5(json.dumps(record, sort_keys=True, default=str).encode()).hexdigest()  # noqa: S324
+
+
+def _state_of(record: dict) -> str | None:
+    """OGD field names vary per resource: state, state_ut, name_of_state, …"""
+    for key, value in record.items():
+        if "state" in key.lower() and isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _year_of(record: dict) -> int | None:
+    for key, value in record.items():
+        if "year" in key.lower():
+            try:
+                return int(str(value)[:4])
+            except ValueError:
+                return None
+    return None
+
+
+def state_key(state: str | None) -> str | None:
+    return state.strip().lower() if state else None
+
+
+def _row(resource: str, record: dict, synced_at: datetime) -> dict:
+    state = _state_of(record)
+    return {
+        "resource":   resource,
+        "record_key": _record_key(record),
+        "state":      state,
+        "state_key":  state_key(state),
+        "year":       _year_of(record),
+        "data":       record,
+        "synced_at":  synced_at,
+    }
+
+
+# ── Fetch ─────────────────────────────────────────────────────────────────────
+
+async def fetch_resource(client, resource_id: str) -> tuple[list[dict], int]:
+    """All records of a resource and the number of pages read. Raises on API errors."""
+    size  = settings.DATA_GOV_PAGE_SIZE
+    first = await client.get_page(resource_id, offset=0, limit=size)
+    if "error" in first:
+        raise RuntimeError(f"data.gov {resource_id}: {first['error']}")
+    records = list(first.get("records", []))
+    total   = int(first.get("total") or len(records))
+    sem     = asyncio.Semaphore(settings.DATA_GOV_SYNC_CONCURRENCY)
+
+    async def page(offset: int) -> list[dict]:
+        async with sem:
+            result = await client.get_page(resource_id, offset=offset, limit=size)
+        if "error" in result:
+            raise RuntimeError(f"data.gov {resource_id} offset {offset}: {result['error']}")
+        return result.get("records", [])
+
+    offsets = range(size, total, size)
+    for chunk in await asyncio.gather(*(page(o) for o in offsets)):
+        records.extend(chunk)
+    return records, 1 + len(offsets)
+
+
+# ── Upsert ────────────────────────────────────────────────────────────────────
+
+def _insert(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+async def upsert_records(db, resource: str, records: list[dict]) -> dict:
+    """Mirror `records` into gov_records: insert new, touch unchanged, drop vanished."""
+    synced_at = datetime.utcnow()
+    rows      = list({r["record_key"]: r for r in (_row(resource, rec, synced_at) for rec in records)}.values())
+    insert    = _insert(db.bind.dialect.name)
+    for i in range(0, len(rows), _UPSERT_BATCH):
+        stmt = insert(GovRecord).values(rows[i:i + _UPSERT_BATCH])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["resource", "record_key"],
+            set_={"synced_at": stmt.excluded.synced_at, "state": stmt.excluded.state,
+                  "state_key": stmt.excluded.state_key, "year": stmt.excluded.year},
+        )
+        await db.execute(stmt)
+    removed = await db.execute(
+        delete(GovRecord).where(GovRecord.resource == resource, GovRecord.synced_at < synced_at)
+    )
+    return {"records": len(rows), "removed": removed.rowcount or 0}
+
+
+async def run_sync(resources: list[str] | None = None, session_factory: Any = None) -> dict:
+    """
+    Fetch every resource concurrently, then upsert the ones that came back in
+    one transaction. A resource whose fetch fails keeps its previous rows and
+    is reported as {"error": ...} (listed under "failed"); the sync only raises
+    when nothing could be fetched. Unknown resource names raise ValueError
+    before anything is fetched.
+    """
+    from app.external.data_gov.client import RESOURCES, DataGovClient
+
+    if session_factory is None:
+        from app.database import AsyncSessionLocal as session_factory
+
+    names   = resources or list(RESOURCES)
+    unknown = [n for n in names if n not in RESOURCES]
+    if unknown:
+        raise ValueError(f"Unknown data.gov resources {unknown}; expected any of {sorted(RESOURCES)}")
+
+    client  = DataGovClient()
+    started = time.monotonic()
+    fetched = await asyncio.gather(
+        *(fetch_resource(client, RESOURCES[n]) for n in names), return_exceptions=True
+    )
+
+    summary: dict[str, Any] = {}
+    failed:  list[str] = []
+    async with session_factory() as db:
+        for name, result in zip(names, fetched):
+            if isinstance(result, BaseException):
+                logger.warning("gov_sync.resource_failed", resource=name, error=str(result))
+                summary[name] = {"error": str(result)}
+                failed.append(name)
+                continue
+            records, pages = result
+            summary[name] = {"pages": pages, **await upsert_records(db, name, records)}
+        await db.commit()
+    if len(failed) == len(names):
+        raise RuntimeError(f"data.gov sync failed for every resource: {summary}")
+    summary["failed"]    = failed
+    summary["elapsed_s"] = round(time.monotonic() - started, 2)
+    logger.info("gov_sync.complete", **summary)
+    return summary
+
+
+# ── Local reads ───────────────────────────────────────────────────────────────
+
+async def query_records(
+    resource:        str,
+    state:           str | None = None,
+    year:            int | None = None,
+    session_factory: Any = None,
+) -> dict | None:
+    """Synced records for a resource (filtered), or None if it was never synced."""
+    if session_factory is None:
+        from app.database import AsyncSessionLocal as session_factory
+
+    async with session_factory() as db:
+        synced_at = (await db.execute(
+            select(func.max(GovRecord.synced_at)).where(GovRecord.resource == resource)
+        )).scalar()
+        if synced_at is None:
+            return None
+        stmt = select(GovRecord.data).where(GovRecord.resource == resource)
+        if state:
+            stmt = stmt.where(GovRecord.state_key == state_key(state))
+        if year:
+            stmt = stmt.where(GovRecord.year == year)
+        records = (await db.execute(stmt.order_by(GovRecord.id))).scalars().all()
+    return {"source": "local", "synced_at": synced_at.isoformat(), "total": len(records), "records": records}
+
+
+async def load_gov_frames(session_factory: Any = None) -> dict[str, int]:
+    """Build one DataFrame per synced resource on the registry. Returns row counts."""
+    if session_factory is None:
+        from app.database import AsyncSessionLocal as session_factory
+
+    async with session_factory() as db:
+        rows = (await db.execute(
+            select(GovRecord.resource, GovRecord.state, GovRecord.state_key, GovRecord.year, GovRecord.data)
+        )).all()
+
+    by_resource: dict[str, list[dict]] = {}
+    for resource, state, key, year, data in rows:
+        by_resource.setdefault(resource, []).append(
+            {**data, "state": state, "state_key": key, "year": year}
+        )
+    registry = get_registry()
+    registry.df_gov = {name: pd.DataFrame(recs) for name, recs in by_resource.items()}
+    return {name: len(df) for name, df in registry.df_gov.items()}
+
+
+def courts_with_gov(resource: str = "infrastructure", year: int | None = None) -> pd.DataFrame:
+    """
+    df_courts left-joined with a synced resource on the normalised state
+    (one resource row per state: the given year, else the first row).
+    """
+    registry = get_registry()
+    courts   = registry.df_courts.assign(state_key=registry.df_courts["state"].str.lower())
+    gov      = registry.df_gov.get(resource)
+    if gov is None or gov.empty:
+        return courts
+    if year is not None:
+        gov = gov[gov["year"] == year]
+    gov = gov.drop(columns=["state"]).drop_duplicates("state_key")
+    return courts.merge(gov, on="state_key", how="left", suffixes=("", f"_{resource}"))
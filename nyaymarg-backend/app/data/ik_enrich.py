@@ -0,0 +1,219 @@
+"""
+app/data/ik_enrich.py
+======================
+Batch enrichment of synthetic cases with their closest real Indian Kanoon
+judgment.
+
+The synthetic corpus is template-generated, so thousands of cases share the
+same `clean_text[:100]` search query. The batch job:
+  1. selects cases by court_id / state / case_type that are not enriched yet
+  2. collapses them to unique queries and answers previously seen queries from
+     IK_IMPORT_DIR/enrichments.jsonl without any API call
+  3. runs the remaining IK searches + metadata lookups concurrently (the shared
+     client's rate limiter and circuit breaker still apply)
+  4. appends each query's result to the JSONL file and writes ik_* columns onto
+     the matching df_cases rows
+
+The API process re-applies the file on startup and when a batch job finishes
+(load_enrichments), so repeat enrichments are free.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import structlog
+
+from app.config import settings
+from app.data.seed import get_registry
+from app.utils.fs import append_jsonl, read_jsonl
+
+logger = structlog.get_logger(__name__)
+
+ENRICH_FILE = Path(settings.IK_IMPORT_DIR) / "enrichments.jsonl"
+
+ENRICH_COLUMNS = ["ik_doc_id", "ik_title", "ik_court", "ik_date", "ik_citation", "ik_enriched_at"]
+
+ProgressFn = Callable[[dict], None]
+
+
+def query_for(clean_text: str) -> str:
+    return (clean_text or "")[:100]
+
+
+def _key(query: str) -> str:
+    return hashlib.md5(query.encode()).hexdigest()  # noqa: S324
+
+
+_results: dict[str, dict] | None = None     # query key → record, mirrors ENRICH_FILE
+
+
+def _load_results(reload: bool = False) -> dict[str, dict]:
+    """query key → record; later lines win. Re-read when another process may have written."""
+    global _results
+    if _results is None or reload:
+        _results = {}
+        if ENRICH_FILE.exists():
+            _results = {rec["key"]: rec for rec in read_jsonl(ENRICH_FILE, "key")}
+    return _results
+
+
+def _append_results(records: list[dict]) -> None:
+    ENRICH_FILE.parent.mkdir(parents=True, exist_ok=True)
+    append_jsonl(ENRICH_FILE, records)
+    _load_results().update({rec["key"]: rec for rec in records})
+
+
+def _record(query: str, result: dict) -> dict:
+    return {"key": _key(query), "query": query, "result": result,
+            "at": datetime.now(timezone.utc).isoformat()}
+
+
+def stored_result(query: str) -> dict | None:
+    rec = _load_results().get(_key(query))
+    return rec["result"] if rec is not None else None
+
+
+def record_result(query: str, result: dict) -> None:
+    """Persist one query's result and apply it to every case sharing the query."""
+    rec = _record(query, result)
+    _append_results([rec])
+    df = get_registry().df_cases
+    _ensure_columns(df)
+    _apply(df, df["clean_text"].fillna("").map(query_for) == query, rec)
+
+
+async def enrich_query(query: str) -> dict:
+    """IK search + metadata for one query. {"enriched": False, ...} if no match."""
+    from app.external.indian_kanoon.client import IndianKanoonClient
+    from app.services.external_service import ExternalService
+
+    results = await IndianKanoonClient().search(query, page=0)
+    if "error" in results:
+        raise RuntimeError(results["error"])
+    docs = results.get("docs", [])
+    if not docs:
+        return {"enriched": False, "reason": "no IK match"}
+    top  = docs[0]
+    meta = await ExternalService().ik_metadata(top["tid"])
+    if "error" in meta:
+        raise RuntimeError(meta["error"])
+    return {"enriched": True, "ik_doc_id": top["tid"], **meta}
+
+
+def _apply(df: pd.DataFrame, mask: pd.Series, rec: dict) -> None:
+    result = rec["result"]
+    if not result.get("enriched"):
+        df.loc[mask, "ik_enriched_at"] = rec["at"]      # tried, no match: don't retry
+        return
+    df.loc[mask, "ik_doc_id"]      = result["ik_doc_id"]
+    df.loc[mask, "ik_title"]       = result.get("title")
+    df.loc[mask, "ik_court"]       = result.get("court")
+    df.loc[mask, "ik_date"]        = result.get("date")
+    df.loc[mask, "ik_citation"]    = result.get("citation")
+    df.loc[mask, "ik_enriched_at"] = rec["at"]
+
+
+def _ensure_columns(df: pd.DataFrame) -> None:
+    for col in ENRICH_COLUMNS:
+        if col not in df.columns:
+            df[col] = None
+
+
+async def run_enrichment(
+    court_id:  str | None = None,
+    state:     str | None = None,
+    case_type: str | None = None,
+    limit:     int | None = None,
+    progress:  ProgressFn | None = None,
+) -> dict:
+    """Enrich every matching, not-yet-enriched case. Returns a summary."""
+    registry = get_registry()
+    df = registry.df_cases
+    _ensure_columns(df)
+
+    mask = ~df["case_id"].astype(str).str.startswith("IK_") & df["ik_enriched_at"].isna()
+    if court_id:
+        mask &= df["court_id"] == court_id
+    if state:
+        mask &= df["state"].str.lower() == state.lower()
+    if case_type:
+        mask &= df["case_type"].str.lower() == case_type.lower()
+    selected = df[mask]
+    if limit:
+        selected = selected.head(limit)
+
+    queries = selected["clean_text"].fillna("").map(query_for)
+    unique  = [q for q in queries.unique() if q]
+    known   = _load_results(reload=True)
+    todo    = [q for q in unique if _key(q) not in known]
+    started = time.monotonic()
+    done    = 0
+    failed  = 0
+    sem     = asyncio.Semaphore(settings.IK_IMPORT_CONCURRENCY)
+
+    async def one(query: str) -> dict | None:
+        nonlocal done, failed
+        async with sem:
+            try:
+                result = await enrich_query(query)
+            except Exception as exc:
+                failed += 1
+                logger.warning("enrich.query_failed", query=query[:40], error=str(exc))
+                return None
+        done += 1
+        if progress is not None and done % 10 == 0:
+            progress({"step": "searching", "queries_done": done, "queries_total": len(todo),
+                      "progress": int(100 * done / len(todo))})
+        return _record(query, result)
+
+    fresh = [r for r in await asyncio.gather(*(one(q) for q in todo)) if r is not None]
+    _append_results(fresh)
+
+    enriched = 0
+    for query in unique:
+        rec = known.get(_key(query))
+        if rec is None:
+            continue
+        rows = selected.index[queries == query]
+        _apply(df, df.index.isin(rows), rec)
+        enriched += len(rows) if rec["result"].get("enriched") else 0
+
+    summary = {
+        "status":         "complete",
+        "cases_selected": len(selected),
+        "unique_queries": len(unique),
+        "cached_queries": len(unique) - len(todo),
+        "api_queries":    len(todo),
+        "failed_queries": failed,
+        "cases_enriched": enriched,
+        "elapsed_s":      round(time.monotonic() - started, 2),
+    }
+    if progress is not None:
+        progress({"step": "done", "progress": 100, **summary})
+    logger.info("enrich.batch_complete", **summary)
+    return summary
+
+
+def load_enrichments() -> int:
+    """Apply stored enrichment results to df_cases rows that don't have them yet."""
+    registry = get_registry()
+    df = registry.df_cases
+    if df is None or not ENRICH_FILE.exists():
+        return 0
+    _ensure_columns(df)
+    known   = _load_results(reload=True)
+    pending = df["ik_enriched_at"].isna() & ~df["case_id"].astype(str).str.startswith("IK_")
+    keys    = df.loc[pending, "clean_text"].fillna("").map(lambda t: _key(query_for(t)))
+    applied = 0
+    for key, rows in keys.groupby(keys).groups.items():
+        rec = known.get(key)
+        if rec is not None:
+            _apply(df, df.index.isin(rows), rec)
+            applied += len(rows)
+    return applied
@@ -0,0 +1,221 @@
+"""
+app/data/ik_import.py
+======================
+Bulk import of real Indian Kanoon judgments into the similarity index.
+
+Pipeline (run by the Celery task `tasks.import_ik_cases`):
+  1. Page through IK search results for the query
+  2. Fetch + clean each new document with bounded parallelism through the
+     shared IK client (rate limiter, cache, circuit breaker) and the local
+     document store, so re-imports never refetch
+  3. Append the mapped case rows to IMPORT_DIR/imported_cases.jsonl after every
+     page, and write a checkpoint (next page, imported doc ids)
+
+An interrupted import re-queued with the same query and count resumes from its
+checkpoint. The API process merges imported rows into registry.df_imported and
+extends the TF-IDF matrix with just the new rows (load_imported_cases) on
+startup and when an import job finishes; the full matrix is never rebuilt.
+
+Imported rows only join the similarity corpus. They have no outcome label and
+no court/judge, so they stay out of df_cases, model training and analytics.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import structlog
+
+from app.config import settings
+from app.data.seed import CASE_TYPES, get_registry
+from app.ml.pipeline import clean_text
+from app.utils.fs import append_jsonl, read_jsonl
+
+logger = structlog.get_logger(__name__)
+
+IMPORT_DIR = Path(settings.IK_IMPORT_DIR)
+CASES_FILE = IMPORT_DIR / "imported_cases.jsonl"
+
+_MAX_TEXT_CHARS = 20_000    # enough for TF-IDF; keeps df_imported small
+
+ProgressFn = Callable[[dict], None]
+
+
+# ── Checkpoints ───────────────────────────────────────────────────────────────
+
+def _checkpoint_path(query: str, max_cases: int) -> Path:
+    key = hashlib.md5(f"{query}|{max_cases}".encode()).hexdigest()[:12]  # noqa: S324
+    return IMPORT_DIR / f"{key}.checkpoint.json"
+
+
+def _load_checkpoint(path: Path) -> dict:
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"page": 0, "imported": [], "done": False}
+
+
+def _save_checkpoint(path: Path, state: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state))
+    tmp.replace(path)
+
+
+def _imported_doc_ids() -> set[str]:
+    if not CASES_FILE.exists():
+        return set()
+    return {row["case_id"] for row in read_jsonl(CASES_FILE, "case_id")}
+
+
+# ── Mapping ───────────────────────────────────────────────────────────────────
+
+def _infer_case_type(text: str) -> str:
+    lower = text[:5000].lower()
+    for case_type in CASE_TYPES:
+        if case_type.lower() in lower:
+            return case_type
+    return "Civil"
+
+
+def ik_case_row(doc_id: int | str, text: str, meta: dict) -> dict:
+    """Map a cleaned IK judgment onto the df_cases schema."""
+    date = pd.to_datetime(meta.get("publishdate"), errors="coerce")
+    body = text[:_MAX_TEXT_CHARS]
+    return {
+        "case_id":             f"IK_{doc_id}",
+        "case_title":          meta.get("title") or f"IK document {doc_id}",
+        "case_number":         meta.get("docsource") or str(doc_id),
+        "court_id":            "",
+        "court_name":          meta.get("docsource") or meta.get("court") or "Unknown Court",
+        "state":               "",
+        "judge_id":            "",
+        "case_type":           _infer_case_type(body),
+        "status":              "Decided",        # published judgments are disposed
+        "filing_date":         date.date().isoformat() if not pd.isna(date) else None,
+        "hearing_count":       0,
+        "complexity_score":    0.0,
+        "case_value_lakhs":    0.0,
+        "days_pending":        0,
+        "public_interest_tag": False,
+        "law_id":              "",
+        "case_text":           body[:2000],
+        "clean_text":          clean_text(body),
+        "outcome":             None,             # no label: kept out of training
+        "source":              "indian_kanoon",
+        "ik_doc_id":           int(doc_id),
+    }
+
+
+# ── Import job ────────────────────────────────────────────────────────────────
+
+async def run_import(query: str, max_cases: int, progress: ProgressFn | None = None) -> dict:
+    """Import up to `max_cases` new IK judgments for `query`, resuming if checkpointed."""
+    from app.external.indian_kanoon.client import IndianKanoonClient
+    from app.services.external_service import ExternalService
+
+    IMPORT_DIR.mkdir(parents=True, exist_ok=True)
+    ckpt_path = _checkpoint_path(query, max_cases)
+    state     = _load_checkpoint(ckpt_path)
+    if state["done"]:
+        return {"status": "complete", "imported": len(state["imported"]), "resumed": True}
+
+    svc      = ExternalService()
+    client   = IndianKanoonClient()
+    existing = _imported_doc_ids()
+    sem      = asyncio.Semaphore(settings.IK_IMPORT_CONCURRENCY)
+    failed   = 0
+    resumed  = state["page"] > 0
+    started  = time.monotonic()
+
+    async def fetch(tid: int) -> dict | None:
+        async with sem:
+            doc = await svc.ik_stored_document(tid)
+        if isinstance(doc, dict) or not doc.text:
+            return None
+        return ik_case_row(tid, doc.text, doc.meta)
+
+    def report(step: str) -> None:
+        if progress is not None:
+            progress({
+                "step":     step,
+                "page":     state["page"],
+                "imported": len(state["imported"]),
+                "failed":   failed,
+                "progress": int(100 * len(state["imported"]) / max_cases),
+            })
+
+    while len(state["imported"]) < max_cases and state["page"] < settings.IK_IMPORT_MAX_PAGES:
+        report("searching")
+        result = await client.search(query, page=state["page"])
+        if "error" in result:
+            raise RuntimeError(f"IK search failed on page {state['page']}: {result['error']}")
+        docs = result.get("docs", [])
+        if not docs:
+            break
+
+        wanted = max_cases - len(state["imported"])
+        tids   = [
+            int(d["tid"]) for d in docs
+            if f"IK_{d['tid']}" not in existing
+        ][:wanted]
+        report("fetching")
+        rows = [r for r in await asyncio.gather(*(fetch(t) for t in tids)) if r is not None]
+        failed += len(tids) - len(rows)
+
+        # Append rows before advancing the checkpoint: a crash in between only
+        # re-imports rows that load_imported_cases() will dedupe by case_id
+        append_jsonl(CASES_FILE, rows)
+        existing.update(r["case_id"] for r in rows)
+        state["imported"].extend(r["ik_doc_id"] for r in rows)
+        state["page"] += 1
+        _save_checkpoint(ckpt_path, state)
+
+    state["done"] = True
+    _save_checkpoint(ckpt_path, state)
+    report("done")
+
+    merged = load_imported_cases()   # no-op in a worker that has no registry loaded
+    logger.info(
+        "ik_import.complete", query=query, imported=len(state["imported"]),
+        failed=failed, pages=state["page"], elapsed_s=round(time.monotonic() - started, 1),
+    )
+    return {
+        "status":   "complete",
+        "imported": len(state["imported"]),
+        "failed":   failed,
+        "pages":    state["page"],
+        "resumed":  resumed,
+        "merged":   merged,
+    }
+
+
+# ── Registry merge ────────────────────────────────────────────────────────────
+
+def load_imported_cases() -> int:
+    """
+    Append imported IK cases that df_imported doesn't have yet and extend the
+    similarity index with just those rows. Returns the number of rows added.
+    """
+    registry = get_registry()
+    if registry.df_cases is None or not CASES_FILE.exists():
+        return 0
+
+    known = set(registry.df_imported["case_id"]) if registry.df_imported is not None else set()
+    rows = {
+        row["case_id"]: row for row in read_jsonl(CASES_FILE, "case_id")
+        if row["case_id"] not in known
+    }
+    if not rows:
+        return 0
+
+    df_new = pd.DataFrame(list(rows.values()))
+    df_new["filing_date"] = pd.to_datetime(df_new["filing_date"], errors="coerce").dt.date
+
+    from app.services.similarity_service import SimilarityService
+    SimilarityService().extend_index(df_new)
+    logger.info("ik_import.merged", rows=len(df_new), total=len(registry.df_imported))
+    return len(df_new)
@@ -0,0 +1,134 @@
+"""
+app/data/partitions.py
+=======================
+Monthly range partitions for the append-only history tables (Postgres only).
+
+`predictions` and `audit_logs` are converted to tables partitioned by
+RANGE (created_at) by migration 0003, one partition per calendar month
+(`<table>_pYYYY_MM`) plus a `<table>_default` catch-all. The beat-scheduled
+task `tasks.maintain_partitions` then keeps them healthy:
+
+  ensure    creates partitions up to HISTORY_PARTITION_MONTHS_AHEAD months
+            ahead, so new rows never land in the default partition
+  retention drops whole partitions older than the table's retention window
+            (PREDICTION_RETENTION_MONTHS / AUDIT_LOG_RETENTION_MONTHS; 0 keeps
+            everything) — a metadata-only DROP TABLE instead of a huge DELETE
+
+On other databases (SQLite in tests/dev) every function is a no-op.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any
+
+import structlog
+from sqlalchemy import text
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+PARTITIONED = ("predictions", "audit_logs")
+
+_NAME_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+# ── Month arithmetic + DDL ────────────────────────────────────────────────────
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def default_partition_sql(table: str) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def retention_months(table: str) -> int:
+    return {
+        "predictions": settings.PREDICTION_RETENTION_MONTHS,
+        "audit_logs":  settings.AUDIT_LOG_RETENTION_MONTHS,
+    }.get(table, 0)
+
+
+# ── Maintenance ───────────────────────────────────────────────────────────────
+
+async def _is_partitioned(conn, table: str) -> bool:
+    kind = (await conn.execute(
+        text("SELECT relkind::text FROM pg_class WHERE relname = :t AND relkind IN ('p', 'r')"), {"t": table},
+    )).scalar()
+    return kind == "p"
+
+
+async def _partitions(conn, table: str) -> list[str]:
+    rows = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :t"
+    ), {"t": table})
+    return [r[0] for r in rows]
+
+
+async def ensure_partitions(conn, table: str, today: date | None = None) -> list[str]:
+    """Create this month's and the next HISTORY_PARTITION_MONTHS_AHEAD partitions."""
+    current  = month_start(today or date.today())
+    existing = set(await _partitions(conn, table))
+    created  = []
+    for n in range(settings.HISTORY_PARTITION_MONTHS_AHEAD + 1):
+        month = add_months(current, n)
+        if partition_name(table, month) not in existing:
+            await conn.execute(text(create_partition_sql(table, month)))
+            created.append(partition_name(table, month))
+    return created
+
+
+async def drop_expired_partitions(conn, table: str, today: date | None = None) -> list[str]:
+    """Drop monthly partitions that end before the retention cutoff."""
+    keep = retention_months(table)
+    if keep <= 0:
+        return []
+    cutoff  = add_months(month_start(today or date.today()), -keep)
+    dropped = []
+    for name in await _partitions(conn, table):
+        m = _NAME_RE.search(name)
+        if m and add_months(date(int(m.group(1)), int(m.group(2)), 1), 1) <= cutoff:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+    return dropped
+
+
+async def maintain_partitions(engine: Any = None, today: date | None = None) -> dict:
+    """Premake upcoming partitions and apply retention for every partitioned table."""
+    if engine is None:
+        from app.database import engine
+    if engine.dialect.name != "postgresql":
+        return {"skipped": f"{engine.dialect.name} has no partitions"}
+
+    summary: dict[str, Any] = {}
+    async with engine.begin() as conn:
+        for table in PARTITIONED:
+            if not await _is_partitioned(conn, table):
+                summary[table] = "not partitioned (run alembic upgrade head)"
+                continue
+            summary[table] = {
+                "created": await ensure_partitions(conn, table, today),
+                "dropped": await drop_expired_partitions(conn, table, today),
+            }
+    logger.info("partitions.maintained", **summary)
+    return summary
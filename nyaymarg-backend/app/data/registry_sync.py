@@ -0,0 +1,216 @@
+"""
+app/data/registry_sync.py
+==========================
+Mirror of the in-memory registry (df_courts, df_judges, df_cases) into the
+`courts`, `judges` and `cases` tables, so relational queries see the same
+rows the API serves from pandas.
+
+Tables are loaded parent-first, REGISTRY_SYNC_CHUNK_SIZE rows at a time:
+
+  Postgres  each chunk is streamed into a temporary staging table with
+            asyncpg `copy_records_to_table` (binary COPY), then one
+            INSERT … SELECT … ON CONFLICT (natural key) DO UPDATE merges it,
+            rewriting only rows whose values changed
+  other     chunked executemany upserts (SQLite in dev/tests)
+
+Rows whose court_id / judge_id are not in the parent table are skipped and
+counted rather than failing the whole load. Cases can also be streamed from
+Parquet partitions in the df_cases schema (`cases_dir`) without building one
+DataFrame; pyarrow is only needed for that.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import pandas as pd
+import structlog
+from sqlalchemy import select, text
+
+from app.config import settings
+from app.data.seed import get_registry
+from app.models.case import Case
+from app.models.court import Court
+from app.models.judge import Judge
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class _Target:
+    model:   Any
+    key:     str
+    rename:  dict[str, str] = field(default_factory=dict)    # DataFrame column → table column
+    parents: dict[str, Any] = field(default_factory=dict)    # FK column → parent key column
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def columns(self) -> list[Any]:
+        """Table columns filled from the DataFrame (the surrogate id/created_at are generated)."""
+        return [c for c in self.model.__table__.columns if c.name not in ("id", "created_at")]
+
+
+COURTS = _Target(Court, "court_id")
+JUDGES = _Target(Judge, "judge_id", parents={"court_id": Court.court_id})
+CASES  = _Target(
+    Case, "case_id",
+    rename={"public_interest_tag": "public_interest", "case_text": "judgment_text"},
+    parents={"court_id": Court.court_id, "judge_id": Judge.judge_id},
+)
+
+
+# ── DataFrame → records ───────────────────────────────────────────────────────
+
+def _coerce(series: pd.Series | None, column: Any, n: int) -> list:
+    """One column as plain Python values of the table's type (asyncpg is strict)."""
+    kind = column.type.python_type
+    if series is None:
+        fill = None if column.nullable else {str: "", int: 0, float: 0.0, bool: False}.get(kind)
+        return [fill] * n
+    if kind is str:
+        values = series.astype(object).where(series.notna(), None)
+        return [v if v is None or isinstance(v, str) else str(v) for v in values.tolist()]
+    if kind is bool:
+        return series.fillna(False).astype(bool).tolist()
+    if kind is date:
+        values = pd.to_datetime(series, errors="coerce")
+        return values.dt.date.astype(object).where(values.notna(), None).tolist()
+    numeric = pd.to_numeric(series, errors="coerce")
+    if not column.nullable:
+        numeric = numeric.fillna(0)
+    if kind is int:
+        return [None if pd.isna(v) else int(v) for v in numeric.tolist()]
+    return numeric.astype(object).where(numeric.notna(), None).tolist()
+
+
+def records(df: pd.DataFrame, target: _Target) -> list[tuple]:
+    """Rows of `df` as tuples in `target.columns` order."""
+    df   = df.rename(columns=target.rename)
+    cols = [_coerce(df[c.name] if c.name in df.columns else None, c, len(df)) for c in target.columns]
+    return list(zip(*cols))
+
+
+def _chunks(df: pd.DataFrame, size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+def parquet_chunks(directory: str | Path, size: int) -> Iterator[pd.DataFrame]:
+    """Stream every *.parquet file under `directory` in record batches."""
+    import pyarrow.parquet as pq  # type: ignore
+
+    for path in sorted(Path(directory).glob("*.parquet")):
+        for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=size):
+            yield batch.to_pandas()
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+
+async def _known_keys(conn, column: Any) -> set[str]:
+    return set((await conn.execute(select(column))).scalars().all())
+
+
+def _orphans(df: pd.DataFrame, parents: dict[str, set[str]]) -> pd.Series:
+    mask = pd.Series(False, index=df.index)
+    for column, keys in parents.items():
+        if column not in df.columns:
+            return pd.Series(True, index=df.index)
+        mask |= ~df[column].astype(str).isin(keys)
+    return mask
+
+
+async def _copy_upsert(conn, target: _Target, chunks: Iterable[list[tuple]]) -> int:
+    """COPY every chunk into a staging table, then merge it. Returns rows changed."""
+    names = [c.name for c in target.columns]
+    cols  = ", ".join(names)
+    stage = f"_stage_{target.table}"
+    await conn.execute(text(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {cols} FROM {target.table} WITH NO DATA"
+    ))
+    driver = (await conn.get_raw_connection()).driver_connection
+    for chunk in chunks:
+        await driver.copy_records_to_table(stage, records=chunk, columns=names)
+
+    generated = {"id": "gen_random_uuid()", "created_at": "now()"}
+    extra     = [c for c in generated if c in target.model.__table__.columns]
+    updates   = [n for n in names if n != target.key]
+    result = await conn.execute(text(
+        f"INSERT INTO {target.table} ({', '.join(extra)}, {cols}) "
+        f"SELECT DISTINCT ON ({target.key}) {', '.join(generated[c] for c in extra)}, {cols} "
+        f"FROM {stage} ORDER BY {target.key} "
+        f"ON CONFLICT ({target.key}) DO UPDATE SET "
+        + ", ".join(f"{n} = EXCLUDED.{n}" for n in updates)
+        + f" WHERE ({', '.join(f'{target.table}.{n}' for n in updates)}) "
+        f"IS DISTINCT FROM ({', '.join(f'EXCLUDED.{n}' for n in updates)})"
+    ))
+    return result.rowcount or 0
+
+
+async def _executemany_upsert(conn, target: _Target, chunks: Iterable[list[tuple]]) -> int:
+    from sqlalchemy.dialects.sqlite import insert
+
+    names = [c.name for c in target.columns]
+    stmt  = insert(target.model.__table__)
+    stmt  = stmt.on_conflict_do_update(
+        index_elements=[target.key],
+        set_={n: stmt.excluded[n] for n in names if n != target.key},
+    )
+    written = 0
+    for chunk in chunks:
+        if chunk:
+            await conn.execute(stmt, [dict(zip(names, row)) for row in chunk])
+            written += len(chunk)
+    return written
+
+
+async def load_table(conn, target: _Target, frames: Iterable[pd.DataFrame]) -> dict:
+    """Upsert DataFrame chunks into one table, skipping rows with unknown parents."""
+    parents = {col: await _known_keys(conn, key) for col, key in target.parents.items()}
+    stats   = {"rows": 0, "skipped": 0}
+
+    def batches() -> Iterator[list[tuple]]:
+        for frame in frames:
+            if parents:
+                orphan = _orphans(frame, parents)
+                stats["skipped"] += int(orphan.sum())
+                frame = frame[~orphan]
+            stats["rows"] += len(frame)
+            yield records(frame, target)
+
+    if conn.dialect.name == "postgresql":
+        stats["changed"] = await _copy_upsert(conn, target, batches())
+    else:
+        await _executemany_upsert(conn, target, batches())
+    return stats
+
+
+async def sync_registry(engine: Any = None, cases_dir: str | None = None) -> dict:
+    """
+    Upsert df_courts → df_judges → df_cases (or the Parquet partitions in
+    `cases_dir`) in one transaction. Returns per-table row counts and timings.
+    """
+    if engine is None:
+        from app.database import engine
+    registry = get_registry()
+    if registry.df_courts is None:
+        raise RuntimeError("Registry is empty; run initialise_seed_data() first")
+
+    size   = settings.REGISTRY_SYNC_CHUNK_SIZE
+    cases  = parquet_chunks(cases_dir, size) if cases_dir else _chunks(registry.df_cases, size)
+    plan   = [(COURTS, _chunks(registry.df_courts, size)),
+              (JUDGES, _chunks(registry.df_judges, size)),
+              (CASES,  cases)]
+    summary: dict[str, Any] = {}
+    async with engine.begin() as conn:
+        for target, frames in plan:
+            started = time.monotonic()
+            summary[target.table] = await load_table(conn, target, frames)
+            summary[target.table]["elapsed_s"] = round(time.monotonic() - started, 2)
+    logger.info("registry_sync.complete", **summary)
+    return summary
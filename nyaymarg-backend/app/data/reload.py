@@ -0,0 +1,193 @@
+"""
+app/data/reload.py
+==================
+Cross-process reload of the data background jobs write for the API.
+
+The Celery worker writes imported IK judgments, enrichment results, the
+citation graph and the data.gov.in mirror; every API process keeps its own
+in-memory copy of them. Following the model hot-reload pattern
+(app/ml/artefact_store.py):
+
+  announce  a finished job publishes {"kind": ...} on DATA_RELOAD_CHANNEL
+  reload    each API process runs a DataReloader thread subscribed to that
+            channel and re-runs the loader for the announced kind
+  catch-up  loaders are idempotent, so after a lost subscription all of them
+            run once on resubscribe, and every DATA_RELOAD_POLL_SECONDS while
+            Redis is unreachable
+
+Job-status endpoints stay read-only: no process depends on being polled.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any, Callable
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+def _ik_import() -> Any:
+    from app.data.ik_import import load_imported_cases
+    return load_imported_cases()
+
+
+def _ik_enrich() -> Any:
+    from app.data.ik_enrich import load_enrichments
+    return load_enrichments()
+
+
+def _citation_graph() -> Any:
+    from app.external.citation_graph import citation_graph
+    return citation_graph.load()
+
+
+async def _gov_records() -> Any:
+    from app.data.gov_sync import load_gov_frames
+    return await load_gov_frames()
+
+
+# kind → loader; coroutine loaders run on the API event loop (they use the DB engine)
+LOADERS: dict[str, Callable[[], Any]] = {
+    "ik_import":      _ik_import,
+    "ik_enrich":      _ik_enrich,
+    "citation_graph": _citation_graph,
+    "gov_records":    _gov_records,
+}
+
+
+def announce(kind: str) -> bool:
+    """Tell API processes that `kind` changed (best effort: they also catch up on resubscribe)."""
+    if not settings.DATA_HOT_RELOAD_ENABLED:
+        return False
+    try:
+        import redis
+        client = redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        try:
+            client.publish(settings.DATA_RELOAD_CHANNEL, json.dumps({"kind": kind}))
+        finally:
+            client.close()
+        return True
+    except Exception as exc:
+        logger.warning("data.announce_failed", kind=kind, error=str(exc))
+        return False
+
+
+class DataReloader:
+    """Background thread that re-runs a loader whenever a job announces its kind."""
+
+    def __init__(self, loaders: dict[str, Callable[[], Any]] | None = None) -> None:
+        self.loaders    = loaders or LOADERS
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop      = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stale     = False          # announcements may have been missed
+        self.subscribed = False
+        self.reloads: dict[str, int] = {}
+        self.last_error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Start following announcements; call after the startup loads (from the API loop)."""
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="data-reloader", daemon=True)
+        self._thread.start()
+        logger.info("data.reloader_started", channel=settings.DATA_RELOAD_CHANNEL)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _connect(self) -> Any:
+        import redis
+        client = redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, health_check_interval=30)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(settings.DATA_RELOAD_CHANNEL)
+        return pubsub
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                pubsub = self._connect()
+            except Exception as exc:
+                self._failed("subscribe", exc)
+                self.sync_all()                             # Redis down: poll instead
+                self._stop.wait(settings.DATA_RELOAD_POLL_SECONDS)
+                continue
+            self.subscribed = True
+            try:
+                if self._stale:
+                    self.sync_all()                         # anything announced while unsubscribed
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle(message["data"])
+            except Exception as exc:
+                self._failed("listen", exc)
+            finally:
+                self.subscribed = False
+                self._stale     = True
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+    def handle(self, data: bytes | str) -> bool:
+        try:
+            kind = json.loads(data).get("kind")
+        except (ValueError, AttributeError):
+            kind = None
+        if kind not in self.loaders:
+            logger.warning("data.unknown_announcement", data=str(data)[:200])
+            return False
+        return self.reload(kind)
+
+    def sync_all(self) -> None:
+        for kind in self.loaders:
+            self.reload(kind)
+        self._stale = False
+
+    def reload(self, kind: str) -> bool:
+        """Run one loader in this process. Returns False if it failed."""
+        try:
+            result = self.loaders[kind]()
+            if asyncio.iscoroutine(result):
+                if self._loop is None or self._loop.is_closed():
+                    result.close()
+                    return False
+                result = asyncio.run_coroutine_threadsafe(result, self._loop).result(timeout=60)
+        except Exception as exc:
+            self._failed(f"load {kind}", exc)
+            return False
+        self.reloads[kind] = self.reloads.get(kind, 0) + 1
+        logger.info("data.reloaded", kind=kind, result=result)
+        return True
+
+    def _failed(self, op: str, exc: Exception) -> None:
+        error = f"{op}: {exc}"
+        if error != self.last_error:                   # once per outage, not once per poll
+            logger.warning("data.reloader_error", op=op, error=str(exc))
+        self.last_error = error
+
+    def snapshot(self) -> dict:
+        return {
+            "running":    self.running,
+            "subscribed": self.subscribed,
+            "reloads":    dict(self.reloads),
+            "last_error": self.last_error,
+        }
+
+
+data_reloader = DataReloader()
@@ -9,7 +9,10 @@ All generation logic is deterministic (np.random.seed = RANDOM_SEED).
 """
 from __future__ import annotations
 
+import dataclasses
 import re
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -97,6 +100,29 @@ _ACTS: list[str] = [
 
 # ── DataRegistry singleton ────────────────────────────────────────────────────
 
+@dataclass(frozen=True)
+class ModelBundle:
+    """
+    One model version plus the similarity matrix built with its vectorizer.
+    Replaced as a whole (never mutated), so a request that reads
+    `registry.models` once uses a consistent set even during a hot reload.
+    """
+    version:        str | None = None
+    rf_model:       Any        = None   # RandomForestClassifier
+    lr_model:       Any        = None   # LogisticRegression
+    vectorizer:     Any        = None   # TfidfVectorizer
+    corpus_vectors: Any        = None   # corpus_frames() under `vectorizer` (similarity_service)
+
+
+def _bundle_field(name: str) -> property:
+    def get(self):
+        return getattr(self.models, name)
+
+    def set(self, value):
+        self.update_models(**{name: value})
+    return property(get, set)
+
+
 class DataRegistry:
     """Single in-memory store for all generated DataFrames and trained ML objects."""
 
@@ -105,18 +131,44 @@ class DataRegistry:
     df_cases:    pd.DataFrame | None = None
     df_laws:     pd.DataFrame | None = None
 
-    rf_model     = None  # RandomForestClassifier
-    lr_model     = None  # LogisticRegression
-    vectorizer   = None  # TfidfVectorizer
+    # Real IK judgments added by ik_import: similarity corpus only, never
+    # training labels or registry analytics
+    df_imported: pd.DataFrame | None = None
+
+    # data.gov.in resources mirrored by gov_sync (resource name → DataFrame)
+    df_gov:      dict = {}
+
+    # Trained models: read `models` once per request; the attributes below
+    # are shortcuts into the current bundle (setting one swaps the bundle).
+    models:       ModelBundle = ModelBundle()
+    models_lock   = threading.RLock()   # writers only (swap / index build)
+    rf_model      = _bundle_field("rf_model")
+    lr_model      = _bundle_field("lr_model")
+    vectorizer    = _bundle_field("vectorizer")
     scaler:       MinMaxScaler | None = None
 
     # populated by similarity_service on startup
-    corpus_vectors = None
+    corpus_vectors = _bundle_field("corpus_vectors")
 
     # model metadata
     model_metrics: dict = {}
     model_trained_at: datetime | None = None
 
+    def update_models(self, **changes: Any) -> None:
+        with self.models_lock:
+            self.models = dataclasses.replace(self.models, **changes)
+
+    def corpus_frames(self) -> list[pd.DataFrame]:
+        """Frames covered by corpus_vectors, in row order: df_cases, then df_imported."""
+        return [df for df in (self.df_cases, self.df_imported) if df is not None]
+
+    def corpus_texts(self, start: int = 0) -> list[str]:
+        """clean_text of every corpus row from `start` on."""
+        texts: list[str] = []
+        for df in self.corpus_frames():
+            texts.extend(df["clean_text"].fillna("").tolist())
+        return texts[start:]
+
 
 _registry = DataRegistry()
 
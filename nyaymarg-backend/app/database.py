@@ -1,29 +1,53 @@
 """
-app/database.py — Async SQLAlchemy engine + session factory.
+app/database.py — Async SQLAlchemy engines + session factories.
+
+  engine / AsyncSessionLocal     primary; get_db commits at the end of the request
+  read_engine / ReadSessionLocal DATABASE_READ_URL replica when set, else the
+                                 primary; get_read_db never commits and refuses
+                                 to flush, so GET endpoints cost one round trip less
 """
 from __future__ import annotations
 
+import time
 from typing import AsyncGenerator
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy import text
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.core.db_pool import InstrumentedPool, pool_snapshot
+
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    echo=settings.DEBUG,
-    future=True,
-    connect_args={
-        "command_timeout": 60,
-        "ssl": "require" if "render.com" in settings.DATABASE_URL else False,
-        "server_settings": {
-            "application_name": "nyaymarg_backend",
+def _make_engine(url: str):
+    connect_args: dict = {}
+    if "postgres" in url:
+        connect_args = {
+            "command_timeout": 60,
+            "ssl": "require" if "render.com" in url else False,
+            # SQLAlchemy's per-connection LRU of asyncpg prepared statements, and
+            # asyncpg's own; both must be 0 behind pgbouncer in transaction mode.
+            "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "statement_cache_size":          settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": "nyaymarg_backend",
+            }
         }
-    } if "postgres" in settings.DATABASE_URL else {}
-)
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        echo=settings.DEBUG,
+        future=True,
+        connect_args=connect_args,
+    )
+
+
+engine      = _make_engine(settings.DATABASE_URL)
+read_engine = _make_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -34,6 +58,25 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+class ReadOnlySession(Session):
+    """Sync session class behind ReadSessionLocal; flushing raises."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _refuse_flush(session, flush_context, instances) -> None:
+    raise RuntimeError("read-only session: use get_db for endpoints that write")
+
+
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False,
+)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency — yields a session per request."""
     async with AsyncSessionLocal() as session:
@@ -45,6 +88,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for read-only endpoints — no commit; closing the session
+    returns the connection with a rollback, which is all a SELECT needs.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
 async def create_tables() -> None:
     """Create all ORM tables. Called on startup (dev/test only — production uses Alembic)."""
     from app.models.base import Base  # noqa: F401 — side-effect imports
@@ -59,16 +111,38 @@ async def create_tables() -> None:
     import app.models.ml_model       # noqa: F401
     import app.models.dataset        # noqa: F401
     import app.models.audit_log      # noqa: F401
+    import app.models.gov_record     # noqa: F401
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+_health: tuple[float, str] = (0.0, "")
+
+
 async def check_db_connection() -> str:
-    """Health-check helper — returns 'ok' or an error message."""
+    """
+    Health-check helper — returns 'ok' or an error message. The result is
+    reused for DATABASE_HEALTH_CACHE_SECONDS so frequent probes don't each
+    check out a connection.
+    """
+    global _health
+    checked, status = _health
+    if status and time.monotonic() - checked < settings.DATABASE_HEALTH_CACHE_SECONDS:
+        return status
     try:
-        async with AsyncSessionLocal() as session:
-            await session.execute(text("SELECT 1"))
-        return "ok"
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        status = "ok"
     except Exception as exc:
-        return f"error: {exc}"
+        status = f"error: {exc}"
+    _health = (time.monotonic(), status)
+    return status
+
+
+def pool_status() -> dict:
+    """Pool gauges and counters for /health — primary, plus replica when configured."""
+    status = {"primary": pool_snapshot(engine)}
+    if read_engine is not engine:
+        status["replica"] = pool_snapshot(read_engine)
+    return status
@@ -3,30 +3,55 @@ app/external/aggregator.py
 ============================
 LegalSearchAggregator — fan-out search across all enabled legal APIs.
 
-Runs all enabled API clients in parallel via asyncio.gather.
+Runs all enabled API clients concurrently, each against its own latency budget.
 Normalises every source's response to UnifiedSearchResult.
-Deduplicates by title similarity.
+Merges near-duplicates across sources (MinHash/LSH, see dedup.py).
 Returns a single ranked list sorted by source-confidence + recency.
+
+  search_all   waits at most EXTERNAL_SEARCH_DEADLINE_SECONDS and ranks
+               whatever arrived in time
+  iter_search  yields one event per source as it completes (used by the
+               NDJSON / SSE streaming endpoint), then a final merged ranking
+
+A source that misses its budget is cancelled from the caller's point of view
+only; the underlying request is shielded by single-flight and still fills the
+response cache for the next search. Repeated errors or missed deadlines open
+the source's circuit breaker and it is skipped until it recovers.
 """
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 import structlog
 
 from app.config import settings
+from app.external.circuit_breaker import circuit_breakers
+from app.external.dedup import merge_duplicates
 from app.external.indian_kanoon.schemas import UnifiedSearchResult
 
 logger = structlog.get_logger(__name__)
 
+SourceFn = Callable[[str], Awaitable[list[UnifiedSearchResult]]]
+
+
+class SourceError(Exception):
+    """A client returned its {"error": ...} dict instead of results."""
+
+
+def _check(raw: Any) -> Any:
+    if isinstance(raw, dict) and "error" in raw:
+        raise SourceError(raw["error"])
+    return raw
+
 
 class LegalSearchAggregator:
     """
     Single entry point for cross-API legal search.
     Each private _search_* method handles one source, normalises the result,
-    and returns List[UnifiedSearchResult].  Individual failures are swallowed
-    with a warning so one bad API doesn't kill the whole search.
+    and returns List[UnifiedSearchResult].  Individual failures and timeouts
+    are reported per source so one bad API doesn't kill the whole search.
     """
 
     async def search_all(
@@ -36,42 +61,131 @@ class LegalSearchAggregator:
         max_results:            int  = 20,
     ) -> list[dict]:
         """
-        Fan out to all *enabled* APIs in parallel.
-        Returns normalised, deduplicated, ranked results.
+        Fan out to all *enabled* APIs concurrently.
+        Returns normalised, deduplicated, ranked results from the sources that
+        answered within their budget.
         """
-        tasks: list[Any] = []
+        async for event in self.iter_search(
+            query, include_international=include_international, max_results=max_results,
+        ):
+            if event["event"] == "done":
+                return event["results"]  # type: ignore[no-any-return]
+        return []
 
-        if settings.IK_ENABLED:
-            tasks.append(self._search_indian_kanoon(query))
-        if settings.KANOON_DEV_ENABLED:
-            tasks.append(self._search_kanoon_dev(query))
-        if settings.ECIAPI_ENABLED:
-            tasks.append(self._search_eciapi(query))
-        if settings.COURTLISTENER_ENABLED and include_international:
-            tasks.append(self._search_courtlistener(query))
-
-        if not tasks:
+    async def iter_search(
+        self,
+        query:                 str,
+        include_international: bool = False,
+        max_results:           int  = 20,
+    ) -> AsyncIterator[dict]:
+        """
+        Yield {"event": "source", ...} as each source completes, times out or
+        is skipped, then {"event": "done", "results": [...], "sources": {...}}.
+        """
+        sources = self._enabled_sources(include_international)
+        if not sources:
             logger.warning("aggregator.no_sources_enabled")
-            return []
-
-        results_lists = await asyncio.gather(*tasks, return_exceptions=True)
+            yield {"event": "done", "results": [], "sources": {}}
+            return
 
+        status:  dict[str, str] = {}
         unified: list[UnifiedSearchResult] = []
-        for i, res in enumerate(results_lists):
-            if isinstance(res, Exception):
-                logger.warning("aggregator.source_failed", index=i, error=str(res))
+
+        start    = time.monotonic()
+        deadline = settings.EXTERNAL_SEARCH_DEADLINE_SECONDS
+        pending:   dict[asyncio.Task, str]   = {}
+        deadlines: dict[asyncio.Task, float] = {}
+        for name, fn in sources.items():
+            # The client claims the half-open probe itself; only peek here
+            if not circuit_breakers.get(name).available():
+                status[name] = "skipped"
+                yield self._source_event(name, "skipped", start, detail="circuit open")
                 continue
-            unified.extend(res)  # type: ignore[arg-type]
+            budget = min(settings.EXTERNAL_SEARCH_SOURCE_BUDGETS.get(name, deadline), deadline)
+            task = asyncio.ensure_future(fn(query))
+            pending[task]   = name
+            deadlines[task] = start + budget
+
+        try:
+            while pending:
+                timeout = max(0.0, min(deadlines[t] for t in pending) - time.monotonic())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    name = pending.pop(task)
+                    exc  = task.exception()
+                    if exc is not None:
+                        logger.warning("aggregator.source_failed", source=name, error=str(exc))
+                        status[name] = "error"
+                        yield self._source_event(name, "error", start, detail=str(exc))
+                        continue
+                    results = task.result()
+                    unified.extend(results)
+                    status[name] = "ok"
+                    yield self._source_event(name, "ok", start, results=results)
+
+                now = time.monotonic()
+                for task in [t for t in pending if deadlines[t] <= now]:
+                    name = pending.pop(task)
+                    task.cancel()
+                    # Upstream errors are recorded by the client; it can't see our deadline
+                    circuit_breakers.get(name).record_failure(
+                        "deadline exceeded", latency=now - start,
+                    )
+                    logger.warning("aggregator.source_timeout", source=name)
+                    status[name] = "timeout"
+                    yield self._source_event(name, "timeout", start)
+        finally:
+            for task in pending:   # client went away mid-stream
+                task.cancel()
 
         ranked = self._deduplicate_and_rank(unified)[:max_results]
-        return [r.model_dump() for r in ranked]
+        yield {
+            "event":      "done",
+            "results":    [r.model_dump() for r in ranked],
+            "sources":    status,
+            "elapsed_ms": round((time.monotonic() - start) * 1000),
+        }
+
+    def _enabled_sources(self, include_international: bool) -> dict[str, SourceFn]:
+        sources: dict[str, SourceFn] = {}
+        if settings.IK_ENABLED:
+            sources["indian_kanoon"] = self._search_indian_kanoon
+        if settings.KANOON_DEV_ENABLED:
+            sources["kanoon_dev"] = self._search_kanoon_dev
+        if settings.ECIAPI_ENABLED:
+            sources["eciapi"] = self._search_eciapi
+        if settings.COURTLISTENER_ENABLED and include_international:
+            sources["courtlistener"] = self._search_courtlistener
+        return sources
+
+    @staticmethod
+    def _source_event(
+        source:  str,
+        status:  str,
+        start:   float,
+        *,
+        results: list[UnifiedSearchResult] | None = None,
+        detail:  str | None = None,
+    ) -> dict:
+        event: dict[str, Any] = {
+            "event":      "source",
+            "source":     source,
+            "status":     status,
+            "elapsed_ms": round((time.monotonic() - start) * 1000),
+            "results":    [r.model_dump() for r in results or []],
+        }
+        if detail:
+            event["detail"] = detail
+        return event
 
     # ── Source adapters ───────────────────────────────────────────────────────
 
     async def _search_indian_kanoon(self, query: str) -> list[UnifiedSearchResult]:
         from app.external.indian_kanoon.client import IndianKanoonClient
         client = IndianKanoonClient()
-        raw    = await client.search(query, page=0)
+        raw    = _check(await client.search(query, page=0))
         return [
             UnifiedSearchResult(
                 source  = "indian_kanoon",
@@ -81,6 +195,7 @@ class LegalSearchAggregator:
                 date    = doc.get("publishdate"),
                 summary = doc.get("headline"),
                 relevance = 0.9,   # IK returns BM25-ranked results
+                metadata  = {"citation": doc["citation"]} if doc.get("citation") else {},
             )
             for doc in raw.get("docs", [])
         ]
@@ -89,7 +204,7 @@ class LegalSearchAggregator:
         from app.external.kanoon_dev.client import KanoonDevClient
         client = KanoonDevClient()
         # kanoon.dev doesn't have a free-text search — list SC cases as demo
-        raw = await client.get_court_cases("sc", limit=5)
+        raw = _check(await client.get_court_cases("sc", limit=5))
         cases = raw.get("cases", raw) if isinstance(raw, dict) else raw
         return [
             UnifiedSearchResult(
@@ -107,7 +222,7 @@ class LegalSearchAggregator:
     async def _search_eciapi(self, query: str) -> list[UnifiedSearchResult]:
         from app.external.ecourts.eciapi_client import ECIAPIClient
         client  = ECIAPIClient()
-        raw     = await client.search_by_party(query)
+        raw     = _check(await client.search_by_party(query))
         results = raw if isinstance(raw, list) else []
         return [
             UnifiedSearchResult(
@@ -125,7 +240,7 @@ class LegalSearchAggregator:
     async def _search_courtlistener(self, query: str) -> list[UnifiedSearchResult]:
         from app.external.courtlistener.client import CourtListenerClient
         client = CourtListenerClient()
-        raw    = await client.search_opinions(query)
+        raw    = _check(await client.search_opinions(query))
         return [
             UnifiedSearchResult(
                 source    = "courtlistener",
@@ -135,6 +250,7 @@ class LegalSearchAggregator:
                 date      = r.get("dateFiled"),
                 summary   = r.get("snippet"),
                 relevance = 0.65,   # US data — lower weight for Indian platform
+                metadata  = {"citation": r["citation"]} if r.get("citation") else {},   # its own parallel cites
             )
             for r in raw.get("results", [])
         ]
@@ -144,13 +260,7 @@ class LegalSearchAggregator:
     def _deduplicate_and_rank(
         self, results: list[UnifiedSearchResult]
     ) -> list[UnifiedSearchResult]:
-        seen:    set[str] = set()
-        deduped: list[UnifiedSearchResult] = []
-        for r in results:
-            key = r.title[:50].lower().strip()
-            if key not in seen:
-                seen.add(key)
-                deduped.append(r)
+        deduped = merge_duplicates(results)
         # Sort by relevance desc, then date desc (None dates go last)
         return sorted(
             deduped,
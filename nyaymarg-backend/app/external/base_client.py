@@ -5,7 +5,13 @@ Shared async HTTP foundation for all external legal API clients.
 
 Features:
   - Exponential-backoff retry (tenacity)
-  - Per-client TTL response cache (cachetools)
+  - Two-tier response cache (in-process LRU + optional Redis) with per-source
+    TTLs, stale-while-revalidate and negative caching of 404s
+  - Single-flight coalescing of identical concurrent requests
+  - Per-source token-bucket rate limit + max-in-flight cap, with 429 /
+    Retry-After aware cooldown (see rate_limit.py)
+  - Circuit breaker per source: fail fast, or serve stale cache, while a
+    provider is down or slow (see circuit_breaker.py)
   - Consistent timeout + error logging
   - NyayMarg User-Agent header (qualifies for IK non-commercial free tier)
 """
@@ -18,25 +24,38 @@ from typing import Any
 
 import httpx
 import structlog
-from cachetools import TTLCache
 from tenacity import (
     AsyncRetrying,
     retry_if_exception_type,
     stop_after_attempt,
+    stop_any,
     wait_exponential,
 )
 
 from app.config import settings
+from app.external.cache import response_cache
+from app.external.circuit_breaker import CircuitState, circuit_breakers
+from app.external.rate_limit import (
+    RateLimitQueueTimeout,
+    UpstreamRateLimited,
+    parse_retry_after,
+    rate_limiters,
+)
+from app.external.singleflight import single_flight
 
 logger = structlog.get_logger(__name__)
 
-# ── Global shared cache ───────────────────────────────────────────────────────
-_RESPONSE_CACHE: TTLCache = TTLCache(
-    maxsize=500,
-    ttl=settings.EXTERNAL_API_CACHE_TTL_SECONDS,
+_RETRYABLE = (
+    httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError, UpstreamRateLimited,
 )
+_exponential = wait_exponential(multiplier=1, min=1, max=10)
+
 
-_RETRYABLE = (httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError)
+def _backoff(retry_state) -> float:
+    # After a 429 the limiter's cooldown already holds the next attempt back
+    if isinstance(retry_state.outcome.exception(), UpstreamRateLimited):
+        return 0.0
+    return _exponential(retry_state)
 
 BASE_HEADERS = {
     "User-Agent": "NyayMarg/2.0 (non-commercial; legal-analytics)",
@@ -50,14 +69,25 @@ class BaseAPIClient:
     All external API clients inherit from this.
     """
 
-    name:     str = "base"
-    base_url: str = ""
-    timeout:  int = settings.EXTERNAL_API_TIMEOUT_SECONDS
+    name:      str = "base"
+    base_url:  str = ""
+    timeout:   int = settings.EXTERNAL_API_TIMEOUT_SECONDS
+    cache_ttl: int = settings.EXTERNAL_API_CACHE_TTL_SECONDS
+    rate_limit_per_min: int = settings.EXTERNAL_API_RATE_LIMIT_PER_MIN
+    max_in_flight:      int = settings.EXTERNAL_API_MAX_IN_FLIGHT
 
     def _cache_key(self, method: str, url: str, **kwargs) -> str:
         raw = json.dumps({"m": method, "u": url, **kwargs}, sort_keys=True)
         return hashlib.md5(raw.encode()).hexdigest()  # noqa: S324
 
+    def _ttl(self) -> int:
+        """Per-source TTL: env override first, then the client's class default."""
+        return settings.EXTERNAL_API_CACHE_TTL_OVERRIDES.get(self.name, self.cache_ttl)
+
+    def _limiter(self):
+        rate = settings.EXTERNAL_API_RATE_LIMIT_OVERRIDES.get(self.name, self.rate_limit_per_min)
+        return rate_limiters.get(self.name, rate, self.max_in_flight)
+
     async def _request(
         self,
         method:   str,
@@ -68,51 +98,63 @@ class BaseAPIClient:
     ) -> dict | list:
         """
         Make an HTTP request with retry, caching, and structured logging.
-        Returns parsed JSON or raises HTTPStatusError.
+        Returns parsed JSON, or an {"error": ...} dict on failure (with the
+        upstream HTTP "status" when the provider answered with an error code).
+
+        Stale cache entries are returned immediately and refreshed in the
+        background, so a TTL expiry never puts a refetch on the caller's path.
+        Cacheable misses are coalesced: concurrent callers with the same cache
+        key await one shared upstream request.
         """
         cache_key = self._cache_key(method, url, **kwargs)
+        if not use_cache:
+            return await self._fetch(method, url, cache_key, use_cache=False, **kwargs)
+
+        def fetch() -> Any:
+            return single_flight.do(
+                self.name, cache_key,
+                lambda: self._fetch(method, url, cache_key, use_cache=True, **kwargs),
+                on_remote=lambda: self._cached_value(cache_key),
+            )
 
-        if use_cache and cache_key in _RESPONSE_CACHE:
-            logger.debug("external.cache_hit", source=self.name, url=url)
-            return _RESPONSE_CACHE[cache_key]  # type: ignore[return-value]
+        entry = await response_cache.get(self.name, cache_key)
+        if entry is not None:
+            logger.debug("external.cache_hit", source=self.name, url=url, fresh=entry.is_fresh())
+            # While the circuit is open a stale entry is the answer; don't refresh
+            if not entry.is_fresh() and circuit_breakers.get(self.name).available():
+                response_cache.schedule_refresh(self.name, cache_key, fetch)
+            return entry.value  # type: ignore[no-any-return]
 
-        start = time.monotonic()
+        # Concurrent identical misses share one upstream call
+        return await fetch()
+
+    async def _cached_value(self, cache_key: str) -> Any:
+        """Read a result another worker just stored in the shared cache."""
+        entry = await response_cache.get(self.name, cache_key)
+        return entry.value if entry is not None else None
+
+    async def _fetch(
+        self,
+        method:    str,
+        url:       str,
+        cache_key: str,
+        *,
+        use_cache: bool,
+        **kwargs:  Any,
+    ) -> dict | list:
+        """Go upstream, store the result in the cache, map failures to error dicts."""
+        if not circuit_breakers.get(self.name).allow():
+            logger.debug("external.circuit_open", source=self.name, url=url)
+            return {
+                "error": f"External API {self.name} temporarily unavailable",
+                "detail": "circuit open after repeated failures or slow responses",
+                "url": url
+            }
         try:
-            async for attempt in AsyncRetrying(
-                stop=stop_after_attempt(settings.EXTERNAL_API_MAX_RETRIES),
-                wait=wait_exponential(multiplier=1, min=1, max=10),
-                retry=retry_if_exception_type(_RETRYABLE),
-                reraise=True,
-            ):
-                with attempt:
-                    # Don't pop from kwargs inside the retry loop as it mutates it for subsequent attempts
-                    headers = {**BASE_HEADERS, **kwargs.get("headers", {})}
-                    req_kwargs = {k: v for k, v in kwargs.items() if k != "headers"}
-
-                    async with httpx.AsyncClient(
-                        timeout=self.timeout,
-                        follow_redirects=True,
-                    ) as client:
-                        resp = await client.request(
-                            method, url,
-                            headers=headers,
-                            **req_kwargs,
-                        )
-                        resp.raise_for_status()
-                        data = resp.json()
-
-                        elapsed = round(time.monotonic() - start, 3)
-                        logger.info(
-                            "external.request_ok",
-                            source=self.name,
-                            url=url,
-                            status=resp.status_code,
-                            elapsed_s=elapsed,
-                        )
-
-                        if use_cache:
-                            _RESPONSE_CACHE[cache_key] = data
-                        return data  # type: ignore[return-value]
+            data = await self._send(method, url, **kwargs)
+            if use_cache:
+                await response_cache.set(self.name, cache_key, data, ttl=self._ttl())
+            return data
 
         except httpx.HTTPStatusError as exc:
             msg = exc.response.text[:200]
@@ -123,11 +165,27 @@ class BaseAPIClient:
                 status=exc.response.status_code,
                 detail=msg,
             )
-            return {
+            error = {
                 "error": f"External API {self.name} returned {exc.response.status_code}",
+                "status": exc.response.status_code,
                 "detail": msg,
                 "url": url
             }
+            if use_cache and exc.response.status_code == 404:
+                await response_cache.set(
+                    self.name, cache_key, error,
+                    ttl=settings.EXTERNAL_API_NEGATIVE_CACHE_TTL_SECONDS,
+                    negative=True,
+                )
+            return error
+        except RateLimitQueueTimeout as exc:
+            logger.warning("external.rate_limit_rejected", source=self.name, url=url)
+            return {
+                "error": f"External API {self.name} rate limited",
+                "detail": str(exc),
+                "url": url,
+                "rate_limited": True,     # never sent upstream: safe to re-queue
+            }
         except json.JSONDecodeError as exc:
             logger.error("external.json_error", source=self.name, url=url, error=str(exc))
             return {
@@ -143,6 +201,74 @@ class BaseAPIClient:
                 "url": url
             }
 
+    async def _send(self, method: str, url: str, **kwargs: Any) -> Any:
+        """
+        One logical upstream call with tenacity retries. Raises on failure.
+        Every attempt waits for a rate-limit slot; a 429 pauses the source for
+        Retry-After seconds and is retried once the cooldown has passed.
+        Each attempt's outcome and latency feed the source's circuit breaker.
+        """
+        start   = time.monotonic()
+        limiter = self._limiter()
+        breaker = circuit_breakers.get(self.name)
+        async for attempt in AsyncRetrying(
+            # Stop retrying as soon as the breaker trips; the rest would fail anyway
+            stop=stop_any(
+                stop_after_attempt(settings.EXTERNAL_API_MAX_RETRIES),
+                lambda _: breaker.state is CircuitState.OPEN,
+            ),
+            wait=_backoff,
+            retry=retry_if_exception_type(_RETRYABLE),
+            reraise=True,
+        ):
+            with attempt:
+                async with limiter.slot():
+                    sent = time.monotonic()
+                    try:
+                        resp = await self._transport(method, url, **kwargs)
+                    except httpx.TransportError as exc:
+                        breaker.record_failure(type(exc).__name__, time.monotonic() - sent)
+                        raise
+                    latency = time.monotonic() - sent
+
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    breaker.record_failure(f"HTTP {resp.status_code}", latency)
+                else:
+                    breaker.record_success(latency)
+
+                if resp.status_code == 429:
+                    retry_after = parse_retry_after(resp)
+                    await limiter.penalize(retry_after)
+                    raise UpstreamRateLimited(resp, retry_after)
+                resp.raise_for_status()
+                data = resp.json()
+
+                elapsed = round(time.monotonic() - start, 3)
+                logger.info(
+                    "external.request_ok",
+                    source=self.name,
+                    url=url,
+                    status=resp.status_code,
+                    elapsed_s=elapsed,
+                )
+                return data
+
+    async def _transport(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """A single HTTP exchange; the body is read before the client closes."""
+        # Don't pop from kwargs: the same dict is reused by every retry attempt
+        headers = {**BASE_HEADERS, **kwargs.get("headers", {})}
+        req_kwargs = {k: v for k, v in kwargs.items() if k != "headers"}
+
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+        ) as client:
+            return await client.request(
+                method, url,
+                headers=headers,
+                **req_kwargs,
+            )
+
     async def get(self, path: str, *, params: dict | None = None, **kw) -> Any:
         return await self._request("GET", f"{self.base_url}{path}", params=params, **kw)
 
@@ -0,0 +1,218 @@
+"""
+app/external/cache.py
+======================
+Two-tier response cache shared by every external legal API client.
+
+  L1  in-process LRU (cachetools)  — per worker, sub-millisecond hits
+  L2  Redis (optional)             — shared by all uvicorn + Celery workers,
+                                     survives restarts
+
+Each entry carries its own TTL so sources can choose their freshness window.
+An entry past its TTL but still inside the stale window is served immediately
+while one background task refreshes it (stale-while-revalidate).
+404 responses are stored as negative entries with a short TTL.
+
+Redis failures never fail a request: the shared client backs off for a few
+seconds (see app/core/redis.py) and the cache keeps serving from L1.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+import structlog
+from cachetools import LRUCache
+
+from app.config import settings
+from app.core.redis import get_async_redis, mark_redis_down
+
+logger = structlog.get_logger(__name__)
+
+_KEY_PREFIX = "nyaymarg:ext"
+
+
+@dataclass
+class CacheEntry:
+    value:     Any
+    stored_at: float
+    ttl:       int
+    negative:  bool = False
+    size:      int  = 0     # serialised bytes
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def is_fresh(self) -> bool:
+        return self.age < self.ttl
+
+    def is_servable(self, stale_window: int) -> bool:
+        return self.age < self.ttl + stale_window
+
+    def dumps(self) -> bytes:
+        return json.dumps(
+            {"v": self.value, "t": self.stored_at, "ttl": self.ttl, "neg": self.negative}
+        ).encode()
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CacheEntry":
+        d = json.loads(raw)
+        return cls(value=d["v"], stored_at=d["t"], ttl=d["ttl"], negative=d["neg"], size=len(raw))
+
+
+@dataclass
+class SourceCacheStats:
+    hits_l1:       int = 0
+    hits_l2:       int = 0
+    stale_hits:    int = 0
+    negative_hits: int = 0
+    misses:        int = 0
+    refreshes:     int = 0
+    bytes_served:  int = 0
+    bytes_stored:  int = 0
+    l2_errors:     int = 0
+
+
+class ResponseCache:
+    """
+    Async two-tier cache keyed by (source, request hash).
+    One module-level instance (`response_cache`) is shared by all clients.
+    """
+
+    def __init__(
+        self,
+        maxsize:      int,
+        stale_window: int,
+        shared:       bool = False,
+    ) -> None:
+        self.stale_window = stale_window
+        self.shared       = shared
+        self._l1: LRUCache = LRUCache(maxsize=maxsize)
+        self._refreshing: set[str] = set()
+        self._tasks:      set[asyncio.Task] = set()
+        self.stats: dict[str, SourceCacheStats] = defaultdict(SourceCacheStats)
+
+    # ── Redis (L2) ────────────────────────────────────────────────────────────
+
+    def _l2(self) -> Any:
+        return get_async_redis() if self.shared else None
+
+    def _l2_failed(self, source: str, op: str, exc: Exception) -> None:
+        self.stats[source].l2_errors += 1
+        mark_redis_down(f"cache.{op}", exc)
+
+    @staticmethod
+    def _redis_key(source: str, key: str) -> str:
+        return f"{_KEY_PREFIX}:{source}:{key}"
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    async def get(self, source: str, key: str) -> CacheEntry | None:
+        """
+        Return a servable entry (fresh or stale-but-within-window) or None.
+        Callers check `entry.is_fresh()` to decide whether to revalidate.
+        """
+        stats = self.stats[source]
+        entry: CacheEntry | None = self._l1.get((source, key))
+        tier  = "l1"
+
+        if entry is None:
+            redis = self._l2()
+            if redis is not None:
+                try:
+                    raw = await redis.get(self._redis_key(source, key))
+                except Exception as exc:
+                    self._l2_failed(source, "get", exc)
+                    raw = None
+                if raw is not None:
+                    entry = CacheEntry.loads(raw)
+                    self._l1[(source, key)] = entry
+                    tier = "l2"
+
+        if entry is None or not entry.is_servable(self.stale_window):
+            stats.misses += 1
+            return None
+
+        if tier == "l1":
+            stats.hits_l1 += 1
+        else:
+            stats.hits_l2 += 1
+        if entry.negative:
+            stats.negative_hits += 1
+        if not entry.is_fresh():
+            stats.stale_hits += 1
+        stats.bytes_served += entry.size
+        return entry
+
+    async def set(
+        self,
+        source:   str,
+        key:      str,
+        value:    Any,
+        ttl:      int,
+        negative: bool = False,
+    ) -> CacheEntry:
+        entry = CacheEntry(value=value, stored_at=time.time(), ttl=ttl, negative=negative)
+        raw   = entry.dumps()
+        entry.size = len(raw)
+        self._l1[(source, key)] = entry
+        self.stats[source].bytes_stored += entry.size
+
+        redis = self._l2()
+        if redis is not None:
+            try:
+                await redis.set(
+                    self._redis_key(source, key),
+                    raw,
+                    ex=ttl + self.stale_window,
+                )
+            except Exception as exc:
+                self._l2_failed(source, "set", exc)
+        return entry
+
+    def schedule_refresh(
+        self,
+        source:  str,
+        key:     str,
+        refresh: Callable[[], Awaitable[Any]],
+    ) -> None:
+        """Run `refresh` in the background unless one is already in flight for key."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self.stats[source].refreshes += 1
+
+        async def _run() -> None:
+            try:
+                await refresh()
+            except Exception as exc:
+                logger.warning("external.cache_refresh_failed", source=source, error=str(exc))
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def clear(self) -> None:
+        """Drop L1 and reset counters (L2 entries expire on their own)."""
+        self._l1.clear()
+        self.stats.clear()
+
+    def snapshot(self) -> dict:
+        return {
+            "l1_entries": len(self._l1),
+            "l2_enabled": self.shared,
+            "sources":    {src: asdict(s) for src, s in self.stats.items()},
+        }
+
+
+response_cache = ResponseCache(
+    maxsize=settings.EXTERNAL_API_CACHE_L1_MAXSIZE,
+    stale_window=settings.EXTERNAL_API_CACHE_STALE_SECONDS,
+    shared=settings.EXTERNAL_CACHE_REDIS_ENABLED,
+)
@@ -0,0 +1,260 @@
+"""
+app/external/causelists.py
+===========================
+Daily cause-list snapshots per court, with a local CNR → hearing index.
+
+Cause lists change at most once a day, yet the provider clients fetch them
+uncached. Instead each (source, court, date[, bench]) list is fetched once and
+kept in a SQLite file (CAUSELIST_STORE_PATH):
+
+  snapshots   zlib-compressed JSON of the provider's list + entry count and
+              fetch time, one row per source / court / date / bench
+  hearings    one row per listed case: CNR, court, date, bench, item number
+              (indexed on CNR + date)
+
+Snapshots are taken for CAUSELIST_TRACKED_COURTS by the beat-scheduled task
+`tasks.snapshot_causelists`, and read-through on the first request for any
+other court/date. Lists for today or later can still change, so their
+snapshots are refetched once older than CAUSELIST_TTL_SECONDS, and an empty
+list for those dates (usually: not published yet) is never stored; past
+lists are final and kept as they are. Questions like "when are my bookmarked
+cases listed this week" are then a single indexed query instead of one
+upstream call per court.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    source     TEXT NOT NULL,
+    court      TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    bench      TEXT NOT NULL DEFAULT '',
+    body       BLOB NOT NULL,
+    entries    INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (source, court, date, bench)
+);
+CREATE TABLE IF NOT EXISTS hearings (
+    cnr     TEXT NOT NULL,
+    source  TEXT NOT NULL,
+    court   TEXT NOT NULL,
+    date    TEXT NOT NULL,
+    bench   TEXT NOT NULL DEFAULT '',
+    item_no TEXT,
+    case_no TEXT,
+    parties TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_hearings_cnr_date ON hearings (cnr, date);
+CREATE INDEX IF NOT EXISTS ix_hearings_list ON hearings (source, court, date, bench);
+"""
+
+_LIST_KEYS = ("entries", "cases", "items", "causelist", "data", "results")
+
+
+def list_entries(payload: Any) -> list[dict]:
+    """The case rows of a provider cause list (bare list or wrapped in a dict)."""
+    if isinstance(payload, list):
+        return [e for e in payload if isinstance(e, dict)]
+    if isinstance(payload, dict):
+        for key in _LIST_KEYS:
+            if isinstance(payload.get(key), list):
+                return list_entries(payload[key])
+    return []
+
+
+def _hearing_row(entry: dict) -> tuple | None:
+    cnr = entry.get("cnr") or entry.get("cnr_number") or entry.get("cino")
+    if not cnr:
+        return None
+    parties = entry.get("parties")
+    if isinstance(parties, (list, dict)):
+        parties = json.dumps(parties)
+    return (
+        str(cnr).strip().upper(),
+        str(entry.get("bench") or ""),
+        str(entry.get("item_no") or entry.get("sr_no") or "") or None,
+        str(entry.get("case_no") or "") or None,
+        parties,
+    )
+
+
+@dataclass
+class CauseListStats:
+    hits:     int = 0
+    fetched:  int = 0
+    failed:   int = 0
+
+
+class CauseListStore:
+
+    def __init__(self, path: str) -> None:
+        self.path  = path
+        self.stats = CauseListStats()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── Sync API (runs in a worker thread) ────────────────────────────────────
+
+    def get_sync(
+        self, source: str, court: str, day: str, bench: str = "", max_age: float | None = None,
+    ) -> Any | None:
+        """Stored list, or None if missing or fetched more than `max_age` seconds ago."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT body, fetched_at FROM snapshots WHERE source=? AND court=? AND date=? AND bench=?",
+                (source, court, day, bench),
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        self.stats.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put_sync(self, source: str, court: str, day: str, payload: Any, bench: str = "") -> int:
+        """Replace the snapshot and its hearing rows. Returns the number of entries."""
+        entries = list_entries(payload)
+        rows    = [r for r in map(_hearing_row, entries) if r is not None]
+        body    = zlib.compress(json.dumps(payload).encode(), 6)
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO snapshots (source, court, date, bench, body, entries, fetched_at) "
+                "VALUES (?,?,?,?,?,?,?)",
+                (source, court, day, bench, body, len(entries), time.time()),
+            )
+            db.execute(
+                "DELETE FROM hearings WHERE source=? AND court=? AND date=? AND bench=?",
+                (source, court, day, bench),
+            )
+            db.executemany(
+                "INSERT INTO hearings (cnr, source, court, date, bench, item_no, case_no, parties) "
+                "VALUES (?,?,?,?,?,?,?,?)",
+                ((cnr, source, court, day, row_bench or bench, item, case_no, parties)
+                 for cnr, row_bench, item, case_no, parties in rows),
+            )
+            db.commit()
+        self.stats.fetched += 1
+        return len(entries)
+
+    def hearings_sync(self, cnrs: list[str], start: str, end: str) -> list[dict]:
+        """Listings of `cnrs` between start and end (ISO dates, inclusive), by date."""
+        if not cnrs:
+            return []
+        marks = ",".join("?" * len(cnrs))
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT cnr, date, source, court, bench, item_no, case_no, parties FROM hearings "
+                f"WHERE cnr IN ({marks}) AND date BETWEEN ? AND ? ORDER BY date, court, item_no",
+                (*cnrs, start, end),
+            ).fetchall()
+        keys = ("cnr", "date", "source", "court", "bench", "item_no", "case_no", "parties")
+        return [dict(zip(keys, r)) for r in rows]
+
+    # ── Async API ─────────────────────────────────────────────────────────────
+
+    async def get(
+        self, source: str, court: str, day: str, bench: str = "", max_age: float | None = None,
+    ) -> Any | None:
+        return await asyncio.to_thread(self.get_sync, source, court, day, bench, max_age)
+
+    async def put(self, source: str, court: str, day: str, payload: Any, bench: str = "") -> int:
+        return await asyncio.to_thread(self.put_sync, source, court, day, payload, bench)
+
+    async def hearings(self, cnrs: list[str], start: str, end: str) -> list[dict]:
+        return await asyncio.to_thread(self.hearings_sync, cnrs, start, end)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lists, hearings = self._db().execute(
+                "SELECT (SELECT COUNT(*) FROM snapshots), (SELECT COUNT(*) FROM hearings)"
+            ).fetchone()
+        return {"snapshots": lists, "hearings": hearings, **asdict(self.stats)}
+
+
+causelist_store = CauseListStore(settings.CAUSELIST_STORE_PATH)
+
+
+# ── Fetching ──────────────────────────────────────────────────────────────────
+
+async def _fetch(source: str, court: str, day: str, bench: str) -> Any:
+    if source == "ecourtsindia":
+        from app.external.ecourts.ecourtsindia_client import ECourtsIndiaClient
+        return await ECourtsIndiaClient().get_causelist(court, day, bench=bench or None)
+    from app.external.ecourts.eciapi_client import ECIAPIClient
+    return await ECIAPIClient().get_causelist(court, day)
+
+
+async def get_causelist(
+    source: str, court: str, day: str, bench: str = "", refresh: bool = False,
+) -> Any:
+    """
+    Stored snapshot of a cause list, fetching it on first use, when refresh=True,
+    or when a list for today or later is older than CAUSELIST_TTL_SECONDS.
+    """
+    current = day >= date.today().isoformat()        # may still change / not published yet
+    if not refresh:
+        stored = await causelist_store.get(
+            source, court, day, bench, max_age=settings.CAUSELIST_TTL_SECONDS if current else None,
+        )
+        if stored is not None:
+            return stored
+    payload = await _fetch(source, court, day, bench)
+    if isinstance(payload, dict) and "error" in payload:
+        causelist_store.stats.failed += 1
+        return payload                      # never snapshot a failure
+    if current and not list_entries(payload):
+        return payload                      # not published yet: ask again next time
+    await causelist_store.put(source, court, day, payload, bench)
+    return payload
+
+
+async def snapshot_tracked(days_ahead: int | None = None) -> dict:
+    """Refresh today's (+ days_ahead) lists for every tracked court."""
+    days_ahead = settings.CAUSELIST_DAYS_AHEAD if days_ahead is None else days_ahead
+    source = settings.CAUSELIST_SOURCE
+    today  = date.today()
+    jobs   = [
+        (court, (today + timedelta(days=d)).isoformat())
+        for court in settings.CAUSELIST_TRACKED_COURTS
+        for d in range(days_ahead + 1)
+    ]
+    results = await asyncio.gather(
+        *(get_causelist(source, court, day, refresh=True) for court, day in jobs)
+    )
+    failed  = [f"{c}/{d}" for (c, d), r in zip(jobs, results) if isinstance(r, dict) and "error" in r]
+    summary = {"source": source, "lists": len(jobs), "failed": len(failed), "failed_lists": failed}
+    logger.info("causelist.snapshot_complete", **summary)
+    return summary
@@ -0,0 +1,208 @@
+"""
+app/external/circuit_breaker.py
+================================
+Per-source circuit breaker and health scoring for external legal APIs.
+
+Every upstream attempt made by a BaseAPIClient subclass is recorded with its
+latency. The breaker trips on whichever signal fires first:
+
+  consecutive   EXTERNAL_CB_FAILURE_THRESHOLD failures in a row (hard down)
+  error rate    >= EXTERNAL_CB_ERROR_RATE over the rolling window, once it
+                holds at least EXTERNAL_CB_MIN_CALLS attempts
+  latency       p95 over the window >= EXTERNAL_CB_SLOW_P95_SECONDS
+
+States:
+
+  closed     calls flow normally
+  open       calls fail fast (or are answered from stale cache) for
+             EXTERNAL_CB_RESET_SECONDS
+  half-open  once the reset window passes, a single probe call is let through;
+             success closes the circuit, failure re-opens it. A probe that
+             never reports back (cancelled caller) expires after another
+             reset window.
+
+Only provider faults count as failures: transport errors, 5xx and 429.
+Other 4xx responses mean the provider is up. Fan-out deadlines missed in the
+aggregator are recorded as failures too.
+
+State is per worker process: a breaker only needs to stop *this* worker from
+waiting on a dead provider.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED    = "closed"
+    OPEN      = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    source:            str
+    failure_threshold: int   = settings.EXTERNAL_CB_FAILURE_THRESHOLD
+    reset_timeout:     float = settings.EXTERNAL_CB_RESET_SECONDS
+    window:            float = settings.EXTERNAL_CB_WINDOW_SECONDS
+    min_calls:         int   = settings.EXTERNAL_CB_MIN_CALLS
+    error_rate_limit:  float = settings.EXTERNAL_CB_ERROR_RATE
+    slow_p95:          float = settings.EXTERNAL_CB_SLOW_P95_SECONDS
+
+    state:         CircuitState = CircuitState.CLOSED
+    failures:      int   = 0        # consecutive
+    opened_at:     float = 0.0
+    probe_started: float | None = None
+    rejected:      int   = 0        # calls refused while open
+    trips:         int   = 0
+    last_error:    str | None = None
+    # (monotonic time, ok, latency seconds)
+    _calls: deque = field(default_factory=deque, repr=False)
+
+    # ── Gate ──────────────────────────────────────────────────────────────────
+
+    def available(self) -> bool:
+        """Non-mutating check: would `allow()` let a call through right now?"""
+        now = time.monotonic()
+        if self.state is CircuitState.OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        if self.state is CircuitState.HALF_OPEN:
+            return self._probe_expired(now)
+        return True
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream; claims the probe slot when half-open."""
+        now = time.monotonic()
+        if self.state is CircuitState.OPEN:
+            if now - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.probe_started = None
+            logger.info("circuit.half_open", source=self.source)
+        if self.state is CircuitState.HALF_OPEN:
+            if not self._probe_expired(now):
+                self.rejected += 1
+                return False
+            self.probe_started = now
+        return True
+
+    def _probe_expired(self, now: float) -> bool:
+        return self.probe_started is None or now - self.probe_started >= self.reset_timeout
+
+    # ── Outcomes ──────────────────────────────────────────────────────────────
+
+    def record_success(self, latency: float = 0.0) -> None:
+        self._push(True, latency)
+        self.failures = 0
+        if self.state is CircuitState.HALF_OPEN:
+            self._close()
+        elif self.state is CircuitState.CLOSED:
+            self._check_latency()
+
+    def record_failure(self, reason: str, latency: float = 0.0) -> None:
+        self._push(False, latency)
+        self.failures  += 1
+        self.last_error = reason
+        if self.state is CircuitState.HALF_OPEN:
+            self._open("probe failed")
+        elif self.state is CircuitState.CLOSED:
+            if self.failures >= self.failure_threshold:
+                self._open(f"{self.failures} consecutive failures")
+            elif self._enough_calls() and self.error_rate() >= self.error_rate_limit:
+                self._open(f"error rate {self.error_rate():.0%}")
+            else:
+                self._check_latency()
+
+    def _check_latency(self) -> None:
+        if self.slow_p95 > 0 and self._enough_calls():
+            p95 = self.p95()
+            if p95 is not None and p95 >= self.slow_p95:
+                self._open(f"p95 latency {p95:.1f}s")
+
+    # ── Rolling window ────────────────────────────────────────────────────────
+
+    def _push(self, ok: bool, latency: float) -> None:
+        now = time.monotonic()
+        self._calls.append((now, ok, latency))
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _enough_calls(self) -> bool:
+        return len(self._calls) >= self.min_calls
+
+    def error_rate(self) -> float:
+        self._trim(time.monotonic())
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok, _ in self._calls if not ok) / len(self._calls)
+
+    def p95(self) -> float | None:
+        self._trim(time.monotonic())
+        if not self._calls:
+            return None
+        latencies = sorted(lat for _, _, lat in self._calls)
+        return latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)]
+
+    # ── Transitions ───────────────────────────────────────────────────────────
+
+    def _open(self, why: str) -> None:
+        logger.warning("circuit.opened", source=self.source, why=why, last_error=self.last_error)
+        self.state         = CircuitState.OPEN
+        self.opened_at     = time.monotonic()
+        self.probe_started = None
+        self.trips        += 1
+
+    def _close(self) -> None:
+        logger.info("circuit.closed", source=self.source)
+        self.state         = CircuitState.CLOSED
+        self.probe_started = None
+        # Judge the recovered provider on fresh calls only
+        self._calls.clear()
+
+    def snapshot(self) -> dict:
+        p95 = self.p95()
+        return {
+            "state":       self.state.value,
+            "calls":       len(self._calls),
+            "error_rate":  round(self.error_rate(), 3),
+            "p95_ms":      round(p95 * 1000) if p95 is not None else None,
+            "failures":    self.failures,
+            "trips":       self.trips,
+            "rejected":    self.rejected,
+            "last_error":  self.last_error,
+        }
+
+
+class CircuitBreakers:
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, source: str) -> CircuitBreaker:
+        breaker = self._breakers.get(source)
+        if breaker is None:
+            breaker = self._breakers[source] = CircuitBreaker(source)
+        return breaker
+
+    def snapshot(self) -> dict:
+        return {src: b.snapshot() for src, b in self._breakers.items()}
+
+    def reset(self) -> None:
+        self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakers()
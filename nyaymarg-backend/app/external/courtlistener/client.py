@@ -18,6 +18,7 @@ from app.external.base_client import BaseAPIClient
 class CourtListenerClient(BaseAPIClient):
     name     = "courtlistener"
     base_url = settings.COURTLISTENER_BASE
+    cache_ttl = 86_400
 
     def _headers(self) -> dict:
         return {"Authorization": f"Token {settings.COURTLISTENER_TOKEN}"}
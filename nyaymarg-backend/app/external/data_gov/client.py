@@ -20,10 +20,18 @@ _RES_COURT_INFRA    = "b031d51c-e7db-4ef6-a47a-08ee97fd9f62"
 _RES_PENDENCY       = "2c9b3831-9f07-4c73-b2b2-5e1d6dcf3f22"
 _RES_DISPOSAL_RATES = "b031d51c-disposal-rates-placeholder"   # update with real ID
 
+# Resources mirrored locally by the sync job (app/data/gov_sync.py)
+RESOURCES = {
+    "infrastructure": _RES_COURT_INFRA,
+    "pendency":       _RES_PENDENCY,
+    "disposal":       _RES_DISPOSAL_RATES,
+}
+
 
 class DataGovClient(BaseAPIClient):
     name     = "data_gov"
     base_url = settings.DATA_GOV_BASE
+    cache_ttl = 21_600   # OGD resources update a few times a year
 
     def _base_params(self, offset: int = 0, limit: int = 100) -> dict:
         return {
@@ -35,17 +43,17 @@ class DataGovClient(BaseAPIClient):
 
     # ── ENDPOINT 1: Court infrastructure by state ─────────────────────────────
     async def get_court_infrastructure(
-        self, offset: int = 0, limit: int = 100
+        self, state: str | None = None, offset: int = 0, limit: int = 100
     ) -> dict:
         """
         GET /resource/{resource_id}?api-key=...
         Returns: court count, judge strength, pending cases by state.
         Source: Ministry of Law and Justice
         """
-        return await self.get(
-            f"/{_RES_COURT_INFRA}",
-            params=self._base_params(offset, limit),
-        )
+        params = self._base_params(offset, limit)
+        if state:
+            params["filters[state]"] = state
+        return await self.get(f"/{_RES_COURT_INFRA}", params=params)
 
     # ── ENDPOINT 2: Pendency statistics ──────────────────────────────────────
     async def get_pendency_stats(self, state: str | None = None) -> dict:
@@ -69,3 +77,11 @@ class DataGovClient(BaseAPIClient):
         if year:
             params["filters[year]"] = str(year)
         return await self.get(f"/{_RES_DISPOSAL_RATES}", params=params)
+
+    # ── Paging (used by the sync job) ─────────────────────────────────────────
+    async def get_page(self, resource_id: str, offset: int = 0, limit: int = 500) -> dict:
+        """
+        GET /resource/{resource_id}?offset=...&limit=...
+        One page of any resource. Response: {"total": int, "count": int, "records": [...]}
+        """
+        return await self.get(f"/{resource_id}", params=self._base_params(offset, limit))
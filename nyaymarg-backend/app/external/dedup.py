@@ -0,0 +1,246 @@
+"""
+app/external/dedup.py
+======================
+Near-duplicate merge for fan-out search results.
+
+The same judgment usually comes back from several sources under slightly
+different titles ("State Of Kerala vs Kesavananda Bharati on 24 April, 1973",
+"Kesavananda Bharati v. State of Kerala & Ors"). Each result is reduced to a
+set of features:
+
+  title     character 4-gram shingles of the normalised party names
+            (case, punctuation, "v./vs/versus", "& Ors", trailing IK dates
+            stripped; the two sides are sorted so party order doesn't matter)
+  citation  normalised reporter citations of the judgment itself, e.g.
+            "(1973)4scc225", "air1973sc1461", taken from the title and
+            metadata["citation"] only: summaries and snippets quote the
+            precedents a judgment *cites*, which say nothing about identity
+  date      the year
+
+Candidates are found with MinHash signatures (NUM_PERM hashes, vectorised
+numpy) bucketed by LSH bands, so cost stays roughly linear in the number of
+results (see candidate_pairs); each candidate pair is then confirmed by exact
+Jaccard similarity (EXTERNAL_DEDUP_THRESHOLD). Results sharing a citation are
+merged without the similarity check; results whose years differ by more than
+EXTERNAL_DEDUP_YEAR_TOLERANCE never are, whatever they share.
+
+A merged record keeps the most relevant member's fields, fills the gaps from
+the others, lists every (source, doc_id) in `source_ids`, and gains
+EXTERNAL_DEDUP_CORROBORATION_BOOST relevance per extra source that agreed.
+"""
+from __future__ import annotations
+
+import re
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.config import settings
+from app.external.indian_kanoon.schemas import UnifiedSearchResult
+
+NUM_PERM = 64
+BANDS    = 16                  # 16 bands x 4 rows: ~99% recall at Jaccard 0.7
+ROWS     = NUM_PERM // BANDS
+SHINGLE  = 4
+WINDOW   = 8                   # neighbours compared per row within an LSH bucket
+
+_CHUNK = 512                   # documents per signature batch (bounds memory)
+
+_rng = np.random.default_rng(0x5EED)
+_A   = _rng.integers(0, 1 << 64, NUM_PERM, dtype=np.uint64, endpoint=False) | np.uint64(1)
+_B   = _rng.integers(0, 1 << 64, NUM_PERM, dtype=np.uint64, endpoint=False)
+
+_IK_DATE_RE = re.compile(r"\s+on\s+\d{1,2}\s+\w+,?\s+\d{4}\s*$", re.I)
+_SIDES_RE   = re.compile(r"\s+(?:v|vs|versus)\.?\s+", re.I)
+_NOISE_RE   = re.compile(
+    r"\b(?:(?:and|&)\s+(?:ors|others|anr|another)|ors|anr|the|etc)\b\.?", re.I,
+)
+_NONWORD_RE = re.compile(r"[^a-z0-9]+")
+_YEAR_RE    = re.compile(r"\b(1[89]\d\d|20\d\d)\b")
+_CITE_RE    = re.compile(
+    r"[(\[]\d{4}[)\]]\s*\d+\s*(?:SCC|SCR|SCALE|JT)\s*\d+"      # (1973) 4 SCC 225
+    r"|\d{4}\s+SCC\s+OnLine\s+[A-Za-z]+\s+\d+"                  # 2020 SCC OnLine SC 1
+    r"|AIR\s+\d{4}\s+[A-Za-z]+\s+\d+"                           # AIR 1973 SC 1461
+    r"|\d+\s+(?:U\.\s?S\.|F\.\s?(?:2d|3d|4th)|F\.\s?Supp\.(?:\s?[23]d)?)\s+\d+",   # US reporters
+    re.I,
+)
+
+_FILL = ("court", "date", "outcome", "summary", "full_text_url")
+
+
+# ── Features ──────────────────────────────────────────────────────────────────
+
+def normalise_title(title: str) -> str:
+    title = _IK_DATE_RE.sub("", title)
+    sides = [
+        " ".join(_NONWORD_RE.sub(" ", _NOISE_RE.sub(" ", s.lower())).split())
+        for s in _SIDES_RE.split(title)
+    ]
+    return " v ".join(sorted(s for s in sides if s))
+
+
+def citations_of(result: UnifiedSearchResult) -> set[str]:
+    """The result's own citations (title + metadata["citation"]), normalised."""
+    meta  = result.metadata.get("citation") or []
+    texts = [result.title, *([meta] if isinstance(meta, str) else meta)]
+    return {
+        _NONWORD_RE.sub("", m.lower())
+        for text in texts if isinstance(text, str)
+        for m in _CITE_RE.findall(text)
+    }
+
+
+def year_of(result: UnifiedSearchResult) -> int | None:
+    for text in (result.date, result.title):
+        m = _YEAR_RE.search(text or "")
+        if m:
+            return int(m.group(1))
+    return None
+
+
+@dataclass
+class _Doc:
+    features:  set[str]
+    citations: set[str]
+    year:      int | None = None
+
+
+def _features(result: UnifiedSearchResult) -> _Doc:
+    title = f" {normalise_title(result.title)} "
+    feats = {title[i:i + SHINGLE] for i in range(max(1, len(title) - SHINGLE + 1))} if title.strip() else set()
+    cites = citations_of(result)
+    year  = year_of(result)
+    feats |= {f"cite:{c}" for c in cites}
+    if year:
+        feats.add(f"year:{year}")
+    return _Doc(feats, cites, year)
+
+
+# ── MinHash + LSH ─────────────────────────────────────────────────────────────
+
+def signatures(feature_sets: list[set[str]]) -> np.ndarray:
+    """(n, NUM_PERM) uint64 MinHash signatures; empty sets get all-max rows."""
+    sig    = np.full((len(feature_sets), NUM_PERM), np.iinfo(np.uint64).max, dtype=np.uint64)
+    hashed = [
+        np.fromiter((zlib.crc32(f.encode()) for f in feats), dtype=np.uint64, count=len(feats))
+        for feats in feature_sets
+    ]
+    for lo in range(0, len(hashed), _CHUNK):
+        rows = [i for i in range(lo, min(lo + _CHUNK, len(hashed))) if hashed[i].size]
+        if not rows:
+            continue
+        flat   = np.concatenate([hashed[i] for i in rows])
+        starts = np.cumsum([0] + [hashed[i].size for i in rows[:-1]])
+        # Multiply-add-shift hashing: high 32 bits of (a*x + b) mod 2**64
+        perm   = (_A[:, None] * flat[None, :] + _B[:, None]) >> np.uint64(32)
+        sig[rows] = np.minimum.reduceat(perm, starts, axis=1).T
+    return sig
+
+
+def candidate_pairs(sig: np.ndarray, window: int = WINDOW) -> np.ndarray:
+    """
+    (m, 2) index pairs that share an LSH band. Within each band rows are sorted
+    by the band and then the following signature columns, so each row is only
+    paired with its next `window` neighbours in the same bucket; buckets grown
+    large by common shingles ("state of", "union of india") stay linear.
+    """
+    n = len(sig)
+    if n < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    found: list[np.ndarray] = []
+    for b in range(BANDS):
+        cols  = np.roll(np.arange(NUM_PERM), -b * ROWS)[:ROWS + window]
+        order = np.lexsort(sig[:, cols[::-1]].T)          # primary key: the band
+        band  = sig[order, b * ROWS:(b + 1) * ROWS]
+        for d in range(1, min(window, n - 1) + 1):
+            same = np.all(band[d:] == band[:-d], axis=1)
+            if same.any():
+                found.append(np.stack([order[:-d][same], order[d:][same]], axis=1))
+    if not found:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(found), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+class _UnionFind:
+
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+
+def _compatible(a: _Doc, b: _Doc) -> bool:
+    return a.year is None or b.year is None or abs(a.year - b.year) <= settings.EXTERNAL_DEDUP_YEAR_TOLERANCE
+
+
+def duplicate_groups(results: list[UnifiedSearchResult], threshold: float | None = None) -> list[list[int]]:
+    """Indices of `results` grouped into duplicate clusters, in first-seen order."""
+    threshold = settings.EXTERNAL_DEDUP_THRESHOLD if threshold is None else threshold
+    docs = [_features(r) for r in results]
+    uf   = _UnionFind(len(docs))
+
+    by_cite: dict[str, list[int]] = {}
+    for i, doc in enumerate(docs):
+        for cite in doc.citations:
+            seen = by_cite.setdefault(cite, [])
+            for j in seen:
+                if _compatible(docs[j], doc):
+                    uf.union(j, i)
+            seen.append(i)
+
+    for a, b in candidate_pairs(signatures([d.features for d in docs])).tolist():
+        if uf.find(a) == uf.find(b):
+            continue
+        if _compatible(docs[a], docs[b]) and _jaccard(docs[a].features, docs[b].features) >= threshold:
+            uf.union(a, b)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(docs)):
+        clusters.setdefault(uf.find(i), []).append(i)
+    return list(clusters.values())
+
+
+# ── Merge ─────────────────────────────────────────────────────────────────────
+
+def _merge(members: list[UnifiedSearchResult]) -> UnifiedSearchResult:
+    ranked = sorted(members, key=lambda r: r.relevance, reverse=True)
+    best   = ranked[0]
+    ids: dict[str, list[str]] = {}
+    for r in members:
+        for source, doc_ids in (r.source_ids or {r.source: [r.doc_id]}).items():
+            ids.setdefault(source, [])
+            ids[source].extend(d for d in doc_ids if d not in ids[source])
+    update: dict = {"source_ids": ids}
+    for name in _FILL:
+        if getattr(best, name) is None:
+            update[name] = next((getattr(r, name) for r in ranked if getattr(r, name) is not None), None)
+    if len(ids) > 1:
+        boost = settings.EXTERNAL_DEDUP_CORROBORATION_BOOST * (len(ids) - 1)
+        update["relevance"] = round(min(1.0, best.relevance + boost), 4)
+    return best.model_copy(update=update)
+
+
+def merge_duplicates(
+    results:   list[UnifiedSearchResult],
+    threshold: float | None = None,
+) -> list[UnifiedSearchResult]:
+    """One record per duplicate cluster, in order of each cluster's first result."""
+    return [_merge([results[i] for i in group]) for group in duplicate_groups(results, threshold)]
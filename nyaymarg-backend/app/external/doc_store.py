@@ -0,0 +1,318 @@
+"""
+app/external/doc_store.py
+==========================
+Local store for the cleaned text of fetched legal documents.
+
+Every IK judgment, CourtListener opinion or eCourts order that NyayMarg fetches
+is cleaned once and kept in a single SQLite file (DOC_STORE_PATH):
+
+  documents   zlib-compressed clean text + JSON metadata per (source, doc_id),
+              with fetch / clean timings and access bookkeeping
+  postings    positional index: for every term in a document, the character
+              offsets where it occurs (packed uint32 array)
+
+Phrase lookups read the postings row of the query's rarest interior term and
+verify each candidate offset against the text, so a search costs O(matches)
+rather than a scan of the whole judgment; short fragments fall back to a
+substring scan of the stored text. Metadata lookups and re-imports are served
+from the same rows without touching the network.
+
+The file is bounded by DOC_STORE_MAX_MB; least-recently-accessed documents are
+evicted first. SQLite calls run in a worker thread so the event loop never
+blocks on disk.
+"""
+from __future__ import annotations
+
+import asyncio
+import html
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_TERM_RE = re.compile(r"\w+")
+_TAG_RE  = re.compile(r"<[^>]*>")
+_WS_RE   = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    source       TEXT NOT NULL,
+    doc_id       TEXT NOT NULL,
+    meta         TEXT,
+    body         BLOB,
+    text_len     INTEGER NOT NULL DEFAULT 0,
+    stored_bytes INTEGER NOT NULL DEFAULT 0,
+    fetch_ms     REAL,
+    clean_ms     REAL,
+    fetched_at   REAL NOT NULL,
+    last_access  REAL NOT NULL,
+    hits         INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, doc_id)
+);
+CREATE INDEX IF NOT EXISTS ix_documents_last_access ON documents (last_access);
+CREATE TABLE IF NOT EXISTS postings (
+    source    TEXT NOT NULL,
+    doc_id    TEXT NOT NULL,
+    term      TEXT NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (source, doc_id, term)
+) WITHOUT ROWID;
+"""
+
+
+def clean_html(raw_html: str) -> str:
+    """Strip tags and normalize whitespace without external dependencies."""
+    text = html.unescape(raw_html)
+    text = _TAG_RE.sub(" ", text)
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _index(text: str) -> dict[str, array]:
+    postings: dict[str, array] = defaultdict(lambda: array("I"))
+    for m in _TERM_RE.finditer(text.lower()):
+        postings[m.group()].append(m.start())
+    return postings
+
+
+@dataclass
+class StoredDocument:
+    source:   str
+    doc_id:   str
+    text:     str | None
+    meta:     dict
+    fetch_ms: float | None
+    clean_ms: float | None
+
+
+@dataclass
+class DocStoreStats:
+    hits:      int = 0
+    misses:    int = 0
+    stored:    int = 0
+    evicted:   int = 0
+    fragments: int = 0
+
+
+class DocumentStore:
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path      = path
+        self.max_bytes = max_bytes
+        self.stats     = DocStoreStats()
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+
+    # ── Connection ────────────────────────────────────────────────────────────
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._total_bytes = conn.execute(
+                "SELECT COALESCE(SUM(stored_bytes), 0) FROM documents"
+            ).fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── Sync API (runs in a worker thread) ────────────────────────────────────
+
+    def get_sync(self, source: str, doc_id: str) -> StoredDocument | None:
+        with self._lock:
+            db  = self._db()
+            row = db.execute(
+                "SELECT meta, body, fetch_ms, clean_ms FROM documents WHERE source=? AND doc_id=?",
+                (source, doc_id),
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            db.execute(
+                "UPDATE documents SET last_access=?, hits=hits+1 WHERE source=? AND doc_id=?",
+                (time.time(), source, doc_id),
+            )
+            db.commit()
+        self.stats.hits += 1
+        meta, body, fetch_ms, clean_ms = row
+        return StoredDocument(
+            source=source,
+            doc_id=doc_id,
+            text=zlib.decompress(body).decode() if body is not None else None,
+            meta=json.loads(meta) if meta else {},
+            fetch_ms=fetch_ms,
+            clean_ms=clean_ms,
+        )
+
+    def put_sync(
+        self,
+        source:   str,
+        doc_id:   str,
+        text:     str | None = None,
+        meta:     dict | None = None,
+        fetch_ms: float | None = None,
+        clean_ms: float | None = None,
+    ) -> None:
+        """Insert or update a document. `text=None` keeps any existing body."""
+        body     = zlib.compress(text.encode(), 6) if text is not None else None
+        postings = _index(text) if text is not None else {}
+        size     = (len(body) if body else 0) + sum(4 * len(p) + len(t) for t, p in postings.items())
+        now      = time.time()
+
+        with self._lock:
+            db  = self._db()
+            old = db.execute(
+                "SELECT meta, stored_bytes FROM documents WHERE source=? AND doc_id=?",
+                (source, doc_id),
+            ).fetchone()
+            merged = {**(json.loads(old[0]) if old and old[0] else {}), **(meta or {})}
+            if old is not None and text is None:
+                db.execute(
+                    "UPDATE documents SET meta=?, last_access=? WHERE source=? AND doc_id=?",
+                    (json.dumps(merged), now, source, doc_id),
+                )
+                db.commit()
+                return
+
+            if old is not None:
+                self._total_bytes -= old[1]
+                db.execute("DELETE FROM postings WHERE source=? AND doc_id=?", (source, doc_id))
+            db.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(source, doc_id, meta, body, text_len, stored_bytes, fetch_ms, clean_ms, "
+                " fetched_at, last_access, hits) VALUES (?,?,?,?,?,?,?,?,?,?,0)",
+                (source, doc_id, json.dumps(merged), body, len(text or ""), size,
+                 fetch_ms, clean_ms, now, now),
+            )
+            db.executemany(
+                "INSERT INTO postings (source, doc_id, term, positions) VALUES (?,?,?,?)",
+                ((source, doc_id, term, pos.tobytes()) for term, pos in postings.items()),
+            )
+            self._total_bytes += size
+            self.stats.stored += 1
+            self._evict(db)
+            db.commit()
+
+    def find_sync(self, source: str, doc_id: str, query: str, limit: int = 1) -> list[int]:
+        """
+        Character offsets in the clean text where `query` occurs (case-insensitive,
+        substring semantics: "convict" matches inside "convicted").
+
+        Only the interior terms of a phrase are necessarily whole tokens in a
+        match, so those are anchored through the postings; queries of one or two
+        terms fall back to a substring scan of the text.
+        """
+        needle = _WS_RE.sub(" ", query).strip().lower()
+        if not needle:
+            return []
+        interior: dict[str, int] = {}
+        for m in list(_TERM_RE.finditer(needle))[1:-1]:
+            interior.setdefault(m.group(), m.start())
+        with self._lock:
+            db   = self._db()
+            rows = []
+            if interior:
+                marks = ",".join("?" * len(interior))
+                rows  = db.execute(
+                    f"SELECT term, positions FROM postings "
+                    f"WHERE source=? AND doc_id=? AND term IN ({marks})",
+                    (source, doc_id, *interior),
+                ).fetchall()
+                if len(rows) < len(interior):
+                    return []      # an interior term never occurs as a whole word
+            body = db.execute(
+                "SELECT body FROM documents WHERE source=? AND doc_id=?", (source, doc_id),
+            ).fetchone()
+        if body is None or body[0] is None:
+            return []
+        self.stats.fragments += 1
+        text = zlib.decompress(body[0]).decode().lower()
+
+        hits: list[int] = []
+        if rows:
+            # Anchor on the rarest interior term, then verify the phrase around each offset
+            rarest, blob = min(rows, key=lambda r: len(r[1]))
+            shift = interior[rarest]
+            for pos in array("I", blob):
+                start = pos - shift
+                if start >= 0 and text.startswith(needle, start):
+                    hits.append(start)
+                    if len(hits) >= limit:
+                        break
+            return hits
+
+        start = text.find(needle)
+        while start != -1 and len(hits) < limit:
+            hits.append(start)
+            start = text.find(needle, start + 1)
+        return hits
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        victims = db.execute(
+            "SELECT source, doc_id, stored_bytes FROM documents ORDER BY last_access"
+        ).fetchall()
+        for source, doc_id, size in victims:
+            if self._total_bytes <= target:
+                break
+            db.execute("DELETE FROM postings WHERE source=? AND doc_id=?", (source, doc_id))
+            db.execute("DELETE FROM documents WHERE source=? AND doc_id=?", (source, doc_id))
+            self._total_bytes -= size
+            self.stats.evicted += 1
+        logger.info("doc_store.evicted", total_mb=round(self._total_bytes / 2**20, 1))
+
+    # ── Async API ─────────────────────────────────────────────────────────────
+
+    async def get(self, source: str, doc_id: Any) -> StoredDocument | None:
+        return await asyncio.to_thread(self.get_sync, source, str(doc_id))
+
+    async def put(self, source: str, doc_id: Any, **kwargs: Any) -> None:
+        await asyncio.to_thread(self.put_sync, source, str(doc_id), **kwargs)
+
+    async def find(self, source: str, doc_id: Any, query: str, limit: int = 1) -> list[int]:
+        return await asyncio.to_thread(self.find_sync, source, str(doc_id), query, limit)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            db    = self._db()
+            count, fetch_ms, clean_ms = db.execute(
+                "SELECT COUNT(*), AVG(fetch_ms), AVG(clean_ms) FROM documents"
+            ).fetchone()
+        return {
+            "documents":    count,
+            "size_mb":      round(self._total_bytes / 2**20, 2),
+            "max_mb":       round(self.max_bytes / 2**20, 2),
+            "avg_fetch_ms": round(fetch_ms, 1) if fetch_ms is not None else None,
+            "avg_clean_ms": round(clean_ms, 1) if clean_ms is not None else None,
+            **asdict(self.stats),
+        }
+
+
+doc_store = DocumentStore(
+    path=settings.DOC_STORE_PATH,
+    max_bytes=settings.DOC_STORE_MAX_MB * 1024 * 1024,
+)
@@ -0,0 +1,182 @@
+"""
+app/external/ecourts/bulk_refresh.py
+=====================================
+Server-side orchestration of eCourtsIndia bulk CNR refreshes.
+
+`POST /partner/bulk-refresh` takes at most 50 CNRs and only queues a job that
+is ready ~30 s later. For an arbitrary CNR list the orchestrator:
+  1. normalises + dedupes the CNRs and drops those refreshed within
+     ECW_REFRESH_DEDUPE_SECONDS (they are already current in the store)
+  2. splits the rest into ECW_BULK_CHUNK_SIZE chunks and keeps up to
+     ECW_BULK_CONCURRENT_JOBS of them submitted and polled at once, so the
+     provider's ~30 s preparation time overlaps between jobs; every call
+     still goes through the source's shared rate limiter, which paces them
+  3. polls each job id with exponential backoff (first poll after the
+     provider's ready_in_seconds) until it completes, fails or times out
+  4. fetches every refreshed case with at most the limiter's max_in_flight
+     requests outstanding and writes it to the local document store
+     (source "ecourtsindia_case", doc id = CNR) with its refresh time.
+     Calls the limiter rejected never reached the provider, so they are
+     re-queued (up to ECW_RATE_LIMIT_REQUEUES times) instead of failed
+
+Run by the Celery task `tasks.ecw_bulk_refresh`; progress is reported through
+the task state. The store is a SQLite file under ./data, which docker-compose
+mounts into both the API and worker containers, so the API reads refreshed
+cases directly (stored_case).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable
+
+import structlog
+
+from app.config import settings
+from app.external.doc_store import doc_store
+
+logger = structlog.get_logger(__name__)
+
+STORE_SOURCE = "ecourtsindia_case"
+
+_DONE   = {"completed", "complete", "done", "finished", "success"}
+_FAILED = {"failed", "error", "cancelled"}
+
+ProgressFn = Callable[[dict], None]
+
+
+def normalise_cnrs(cnrs: list[str]) -> list[str]:
+    """Upper-case, strip and dedupe CNRs, keeping first-seen order."""
+    return list(dict.fromkeys(c.strip().upper() for c in cnrs if c and c.strip()))
+
+
+async def stored_case(cnr: str) -> dict | None:
+    """Last refreshed copy of a case: {"cnr", "refreshed_at", "case"} or None."""
+    doc = await doc_store.get(STORE_SOURCE, cnr.strip().upper())
+    if doc is None or "case" not in doc.meta:
+        return None
+    return {"cnr": doc.doc_id, "refreshed_at": doc.meta.get("refreshed_at"), "case": doc.meta["case"]}
+
+
+async def _recently_refreshed(cnr: str, now: float) -> bool:
+    doc = await doc_store.get(STORE_SOURCE, cnr)
+    refreshed_at = doc.meta.get("refreshed_at") if doc is not None else None
+    return refreshed_at is not None and now - refreshed_at < settings.ECW_REFRESH_DEDUPE_SECONDS
+
+
+async def _wait_for_job(client, job_id: str, ready_in: float) -> bool:
+    """Poll a bulk-refresh job with backoff. True once the provider reports it done."""
+    deadline = time.monotonic() + settings.ECW_BULK_TIMEOUT_SECONDS
+    delay    = ready_in
+    while True:
+        await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        status = await client.bulk_refresh_status(job_id)
+        state  = str(status.get("status", "")).lower() if isinstance(status, dict) else ""
+        if state in _DONE:
+            return True
+        if state in _FAILED:
+            logger.warning("ecw_refresh.job_failed", job_id=job_id, status=status)
+            return False
+        if time.monotonic() >= deadline:
+            logger.warning("ecw_refresh.job_timeout", job_id=job_id)
+            return False
+        # Not ready yet (or a transient error dict): back off and ask again
+        delay = min(max(delay, 1.0) * 2, settings.ECW_BULK_POLL_MAX_SECONDS)
+
+
+async def _submit(client, cnr_chunk: list[str]) -> dict:
+    """POST one bulk job, waiting out limiter rejections (they cost no credits)."""
+    for _ in range(settings.ECW_RATE_LIMIT_REQUEUES + 1):
+        job = await client.bulk_refresh(cnr_chunk)
+        if not (isinstance(job, dict) and job.get("rate_limited")):
+            break
+        await asyncio.sleep(settings.EXTERNAL_API_MAX_QUEUE_SECONDS)
+    return job
+
+
+async def run_bulk_refresh(cnrs: list[str], progress: ProgressFn | None = None) -> dict:
+    """Refresh every CNR in `cnrs` through eCourtsIndia bulk jobs. Returns a summary."""
+    from app.external.ecourts.ecourtsindia_client import ECourtsIndiaClient
+
+    client  = ECourtsIndiaClient()
+    started = time.monotonic()
+    unique  = normalise_cnrs(cnrs)
+    now     = time.time()
+    recent  = await asyncio.gather(*(_recently_refreshed(c, now) for c in unique))
+    todo    = [c for c, skip in zip(unique, recent) if not skip]
+    size    = settings.ECW_BULK_CHUNK_SIZE
+    chunks  = [todo[i:i + size] for i in range(0, len(todo), size)]
+    workers = max(1, client.max_in_flight)        # the limiter's concurrency cap
+    jobs    = asyncio.Semaphore(max(1, settings.ECW_BULK_CONCURRENT_JOBS))
+    counts  = {"chunks_done": 0, "refreshed": 0, "requeued": 0}
+    failed: list[str] = []
+
+    def report(step: str) -> None:
+        if progress is not None:
+            progress({
+                "step":         step,
+                "chunks_total": len(chunks),
+                "chunks_done":  counts["chunks_done"],
+                "refreshed":    counts["refreshed"],
+                "requeued":     counts["requeued"],
+                "failed":       len(failed),
+                "progress":     int(100 * counts["chunks_done"] / len(chunks)) if chunks else 100,
+            })
+
+    async def fetch_all(cnr_chunk: list[str]) -> None:
+        queue: deque[tuple[str, int]] = deque((c, 0) for c in cnr_chunk)
+
+        async def worker() -> None:
+            while queue:
+                cnr, requeues = queue.popleft()
+                case = await client.get_case(cnr, fresh=True)
+                if isinstance(case, dict) and case.get("rate_limited") \
+                        and requeues < settings.ECW_RATE_LIMIT_REQUEUES:
+                    counts["requeued"] += 1
+                    queue.append((cnr, requeues + 1))
+                    # The next slot was further away than the queue budget
+                    await asyncio.sleep(settings.EXTERNAL_API_MAX_QUEUE_SECONDS)
+                    continue
+                if not isinstance(case, dict) or "error" in case:
+                    failed.append(cnr)
+                    continue
+                await doc_store.put(STORE_SOURCE, cnr, meta={"case": case, "refreshed_at": time.time()})
+                counts["refreshed"] += 1
+
+        await asyncio.gather(*(worker() for _ in range(min(workers, len(cnr_chunk)))))
+
+    async def process(cnr_chunk: list[str]) -> None:
+        async with jobs:
+            job    = await _submit(client, cnr_chunk)
+            job_id = job.get("job_id") if isinstance(job, dict) else None
+            ready  = bool(job_id) and await _wait_for_job(
+                client, job_id, float(job.get("ready_in_seconds") or settings.ECW_BULK_POLL_SECONDS),
+            )
+            if not ready:
+                logger.warning("ecw_refresh.chunk_failed", job_id=job_id, cnrs=len(cnr_chunk),
+                               error=job.get("error") if isinstance(job, dict) else None)
+                failed.extend(cnr_chunk)
+            else:
+                await fetch_all(cnr_chunk)
+        counts["chunks_done"] += 1
+        report("polling")
+
+    report("submitting")
+    await asyncio.gather(*(process(c) for c in chunks))
+    report("done")
+
+    summary = {
+        "status":         "complete",
+        "requested":      len(cnrs),
+        "unique":         len(unique),
+        "skipped_recent": len(unique) - len(todo),
+        "chunks":         len(chunks),
+        "refreshed":      counts["refreshed"],
+        "requeued":       counts["requeued"],
+        "failed":         len(failed),
+        "failed_cnrs":    failed[:100],
+        "elapsed_s":      round(time.monotonic() - started, 1),
+    }
+    logger.info("ecw_refresh.complete", **{k: v for k, v in summary.items() if k != "failed_cnrs"})
+    return summary
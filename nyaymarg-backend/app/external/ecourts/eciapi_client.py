@@ -1,7 +1,8 @@
 """
 app/external/ecourts/eciapi_client.py
 ========================================
-ECIAPI — e-Courts India API (eciapi.akshit.me)
+ECIAPI — e-Courts India API (served by court-api.kleopatra.io; the original
+eciapi.akshit.me host is discontinued)
 
 100% FREE. No authentication required.
 Enterprise-grade public API covering:
@@ -19,6 +20,8 @@ from app.external.base_client import BaseAPIClient
 class ECIAPIClient(BaseAPIClient):
     name     = "eciapi"
     base_url = settings.ECIAPI_BASE
+    cache_ttl = 900      # hearing status changes daily
+    timeout   = 10       # per attempt; ECI_CNR_TIMEOUT_SECONDS bounds a whole lookup
     # No auth required
 
     # ── ENDPOINT 1: Get case by CNR ───────────────────────────────────────────
@@ -17,18 +17,20 @@ from app.external.base_client import BaseAPIClient
 class ECourtsIndiaClient(BaseAPIClient):
     name     = "ecourtsindia"
     base_url = settings.ECOURTSINDIA_BASE
+    cache_ttl = 900      # live case status — keep it short
 
     def _headers(self) -> dict:
         return {"Authorization": f"Bearer {settings.ECOURTSINDIA_TOKEN}"}
 
     # ── ENDPOINT 1: Get case by CNR ───────────────────────────────────────────
-    async def get_case(self, cnr: str) -> dict:
+    async def get_case(self, cnr: str, fresh: bool = False) -> dict:
         """
         GET /partner/case/{cnr}
         Real-time data from eCourts.gov.in — timeline, hearings, orders,
         parties, advocates, PDF links.
+        fresh=True bypasses the response cache (e.g. right after a refresh).
         """
-        return await self.get(f"/partner/case/{cnr}", headers=self._headers())
+        return await self.get(f"/partner/case/{cnr}", headers=self._headers(), use_cache=not fresh)
 
     # ── ENDPOINT 2: Cause list ────────────────────────────────────────────────
     async def get_causelist(
@@ -74,6 +76,18 @@ class ECourtsIndiaClient(BaseAPIClient):
             use_cache=False,
         )
 
+    async def bulk_refresh_status(self, job_id: str) -> dict:
+        """
+        GET /partner/bulk-refresh/{job_id}
+        Status of a queued bulk refresh.
+        Response: {"job_id": "...", "status": "queued|processing|completed|failed"}
+        """
+        return await self.get(
+            f"/partner/bulk-refresh/{job_id}",
+            headers=self._headers(),
+            use_cache=False,
+        )
+
     # ── ENDPOINT 5: Force re-scrape ───────────────────────────────────────────
     async def force_refresh(self, cnr: str) -> dict:
         """
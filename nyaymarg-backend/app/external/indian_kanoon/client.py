@@ -17,6 +17,7 @@ from app.external.base_client import BaseAPIClient
 class IndianKanoonClient(BaseAPIClient):
     name     = "indian_kanoon"
     base_url = settings.IK_API_BASE
+    cache_ttl = 86_400   # judgments are immutable once published
 
     def _ik_headers(self) -> dict:
         return {"Authorization": f"Token {settings.IK_API_TOKEN}"}
@@ -57,3 +57,4 @@ class UnifiedSearchResult(BaseModel):
     full_text_url: str  | None = None
     relevance:     float       = 0.0
     metadata:      dict[str, Any] = Field(default_factory=dict)
+    source_ids:    dict[str, list[str]] = Field(default_factory=dict)   # every source merged in
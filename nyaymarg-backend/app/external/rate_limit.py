@@ -0,0 +1,250 @@
+"""
+app/external/rate_limit.py
+===========================
+Client-side throttling for external legal APIs, one limiter per source.
+
+  token bucket   EXTERNAL_API_RATE_LIMIT_PER_MIN requests/min with a small
+                 burst allowance. Shared by every worker through a Redis Lua
+                 script when the shared cache is enabled; in-process otherwise.
+  in-flight cap  asyncio.Semaphore of `max_in_flight` concurrent requests per
+                 worker process.
+  429 cooldown   a 429 (with or without Retry-After) pauses the whole source,
+                 in every worker, until the provider's window has passed.
+
+Buckets use reservation ("virtual scheduling"): a caller takes a token even if
+the bucket is empty and sleeps until its slot comes up, so waiters are served
+in arrival order without polling. A caller whose slot is further away than
+EXTERNAL_API_MAX_QUEUE_SECONDS is rejected instead of queued.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator
+
+import httpx
+import structlog
+
+from app.config import settings
+from app.core.redis import get_async_redis, mark_redis_down, shared_state_enabled
+
+logger = structlog.get_logger(__name__)
+
+_KEY_PREFIX = "nyaymarg:rl"
+
+# KEYS[1] bucket hash, KEYS[2] cooldown key
+# ARGV[1] tokens per ms, ARGV[2] capacity, ARGV[3] max wait ms
+# Returns wait in ms (>= 0) on success, -1 if the wait would exceed max.
+_RESERVE_LUA = """
+local rate     = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local t   = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local b      = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or capacity
+local ts     = tonumber(b[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local wait = 0
+if tokens < 1 then wait = math.ceil((1 - tokens) / rate) end
+local cooldown = tonumber(redis.call('GET', KEYS[2]) or '0')
+if cooldown - now > wait then wait = cooldown - now end
+if wait > max_wait then
+  redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+  return -1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens - 1, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 60000)
+return wait
+"""
+
+
+class UpstreamRateLimited(httpx.HTTPStatusError):
+    """Provider answered 429; `retry_after` is seconds to back off."""
+
+    def __init__(self, response: httpx.Response, retry_after: float) -> None:
+        super().__init__(
+            f"429 Too Many Requests (retry after {retry_after:.0f}s)",
+            request=response.request,
+            response=response,
+        )
+        self.retry_after = retry_after
+
+
+class RateLimitQueueTimeout(Exception):
+    """The next free slot for this source is further away than the queue budget."""
+
+
+def parse_retry_after(response: httpx.Response, default: float = 30.0) -> float:
+    """Retry-After as delta-seconds or HTTP-date; falls back to `default`."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class LimiterStats:
+    acquired:           int   = 0
+    queued:             int   = 0     # acquisitions that had to wait
+    rejected:           int   = 0     # queue budget exceeded
+    upstream_429:       int   = 0
+    in_flight:          int   = 0
+    peak_in_flight:     int   = 0
+    queue_wait_total_s: float = 0.0
+    queue_wait_max_s:   float = 0.0
+
+
+class SourceLimiter:
+    """Token bucket + concurrency cap for one source inside one event loop."""
+
+    def __init__(
+        self,
+        source:        str,
+        rate_per_min:  int,
+        max_in_flight: int,
+        burst:         int,
+        stats:         LimiterStats,
+    ) -> None:
+        self.source   = source
+        self.rate     = max(0, rate_per_min) / 60.0   # tokens per second; 0 = no bucket
+        self.capacity = float(max(1, burst))
+        self.stats    = stats
+        self._tokens  = self.capacity
+        self._updated = time.monotonic()
+        self._cooldown_until = 0.0
+        self._sem = asyncio.Semaphore(max(1, max_in_flight))
+
+    # ── Reservation ───────────────────────────────────────────────────────────
+
+    def _reserve_local(self, max_wait: float) -> float | None:
+        now  = time.monotonic()
+        wait = max(0.0, self._cooldown_until - now)
+        if self.rate > 0:
+            self._tokens  = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(wait, (1 - self._tokens) / self.rate)
+        if wait > max_wait:
+            return None
+        self._tokens -= 1
+        return wait
+
+    async def _reserve_shared(self, redis, max_wait: float) -> float | None:
+        wait_ms = await redis.eval(
+            _RESERVE_LUA, 2,
+            f"{_KEY_PREFIX}:{self.source}:bucket",
+            f"{_KEY_PREFIX}:{self.source}:cooldown",
+            self.rate / 1000.0, self.capacity, int(max_wait * 1000),
+        )
+        return None if int(wait_ms) < 0 else int(wait_ms) / 1000.0
+
+    async def _reserve(self, max_wait: float) -> float | None:
+        redis = get_async_redis() if self.rate > 0 else None
+        if redis is not None:
+            try:
+                return await self._reserve_shared(redis, max_wait)
+            except Exception as exc:
+                mark_redis_down("rate_limit.reserve", exc)
+        return self._reserve_local(max_wait)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and a rate token, then run the request."""
+        start    = time.monotonic()
+        max_wait = float(settings.EXTERNAL_API_MAX_QUEUE_SECONDS)
+        await self._sem.acquire()
+        try:
+            remaining = max(0.0, max_wait - (time.monotonic() - start))
+            wait = await self._reserve(remaining)
+            if wait is None:
+                self.stats.rejected += 1
+                raise RateLimitQueueTimeout(
+                    f"{self.source}: no request slot within {max_wait:.0f}s"
+                )
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            queued = time.monotonic() - start
+            self.stats.acquired += 1
+            if queued > 0.001:
+                self.stats.queued += 1
+            self.stats.queue_wait_total_s += queued
+            self.stats.queue_wait_max_s = max(self.stats.queue_wait_max_s, queued)
+            self.stats.in_flight += 1
+            self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+            try:
+                yield
+            finally:
+                self.stats.in_flight -= 1
+        finally:
+            self._sem.release()
+
+    async def penalize(self, retry_after: float) -> None:
+        """Pause this source (in every worker) after an upstream 429."""
+        self.stats.upstream_429 += 1
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + retry_after)
+        logger.warning("external.rate_limited", source=self.source, retry_after_s=retry_after)
+        redis = get_async_redis()
+        if redis is not None:
+            try:
+                t = await redis.time()
+                until_ms = t[0] * 1000 + t[1] // 1000 + int(retry_after * 1000)
+                await redis.set(
+                    f"{_KEY_PREFIX}:{self.source}:cooldown", until_ms,
+                    px=int(retry_after * 1000) + 1000,
+                )
+            except Exception as exc:
+                mark_redis_down("rate_limit.penalize", exc)
+
+
+# ── Registry ──────────────────────────────────────────────────────────────────
+# asyncio primitives are bound to one loop (Celery tasks run asyncio.run per
+# task), so limiters are kept per loop while stats are per source.
+
+class RateLimiters:
+
+    def __init__(self) -> None:
+        self._by_loop: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.stats: dict[str, LimiterStats] = defaultdict(LimiterStats)
+
+    def get(self, source: str, rate_per_min: int, max_in_flight: int) -> SourceLimiter:
+        per_loop = self._by_loop.setdefault(asyncio.get_running_loop(), {})
+        limiter  = per_loop.get(source)
+        if limiter is None:
+            limiter = per_loop[source] = SourceLimiter(
+                source,
+                rate_per_min=rate_per_min,
+                max_in_flight=max_in_flight,
+                burst=settings.EXTERNAL_API_RATE_LIMIT_BURST,
+                stats=self.stats[source],
+            )
+        return limiter
+
+    def snapshot(self) -> dict:
+        out = {}
+        for src, s in self.stats.items():
+            row = asdict(s)
+            row["queue_wait_avg_s"] = round(s.queue_wait_total_s / s.acquired, 4) if s.acquired else 0.0
+            out[src] = row
+        return {"shared": shared_state_enabled(), "sources": out}
+
+    def reset(self) -> None:
+        self._by_loop.clear()
+        self.stats.clear()
+
+
+rate_limiters = RateLimiters()
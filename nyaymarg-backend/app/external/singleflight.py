@@ -0,0 +1,170 @@
+"""
+app/external/singleflight.py
+=============================
+Request coalescing for external API calls.
+
+Concurrent callers asking for the same cache key share one upstream request:
+
+  in-process   the first caller starts a task; everyone else awaits it
+  cross-process (shared cache enabled) the leader holds a short Redis lock;
+               workers that lose the race subscribe to a completion channel
+               and read the result from the shared cache once it is published
+
+The shared work runs in its own task, so a caller that disconnects does not
+cancel the request for everyone else.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+import structlog
+
+from app.config import settings
+from app.core.redis import get_async_redis, mark_redis_down
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+_LOCK_PREFIX    = "nyaymarg:sf:lock"
+_CHANNEL_PREFIX = "nyaymarg:sf:done"
+
+
+@dataclass
+class SingleFlightStats:
+    leaders:          int = 0   # calls that went upstream
+    coalesced:        int = 0   # in-process callers that joined a leader
+    remote_followers: int = 0   # calls satisfied by another worker's request
+    remote_timeouts:  int = 0   # waited on another worker, then fetched anyway
+
+
+class SingleFlight:
+
+    def __init__(self, lock_ttl: float, wait_timeout: float) -> None:
+        self.lock_ttl     = lock_ttl
+        self.wait_timeout = wait_timeout
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.stats: dict[str, SingleFlightStats] = defaultdict(SingleFlightStats)
+
+    async def do(
+        self,
+        source:    str,
+        key:       str,
+        fn:        Callable[[], Awaitable[T]],
+        on_remote: Callable[[], Awaitable[T | None]] | None = None,
+    ) -> T:
+        """
+        Run `fn` once per key across all concurrent callers.
+        `on_remote` reads the result another worker published (shared cache);
+        returning None means "not there yet".
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats[source].coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._lead(source, key, fn, on_remote))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finished(key, t))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()   # mark retrieved even if every caller went away
+
+    async def _lead(
+        self,
+        source:    str,
+        key:       str,
+        fn:        Callable[[], Awaitable[T]],
+        on_remote: Callable[[], Awaitable[T | None]] | None,
+    ) -> T:
+        redis = get_async_redis() if on_remote is not None else None
+        if redis is None:
+            self.stats[source].leaders += 1
+            return await fn()
+
+        lock_key = f"{_LOCK_PREFIX}:{source}:{key}"
+        channel  = f"{_CHANNEL_PREFIX}:{source}:{key}"
+        token    = uuid.uuid4().hex
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as exc:
+            mark_redis_down("singleflight.lock", exc)
+            self.stats[source].leaders += 1
+            return await fn()
+
+        if acquired:
+            self.stats[source].leaders += 1
+            try:
+                return await fn()
+            finally:
+                try:
+                    await redis.publish(channel, token)
+                    if await redis.get(lock_key) == token.encode():
+                        await redis.delete(lock_key)
+                except Exception as exc:
+                    mark_redis_down("singleflight.release", exc)
+
+        result = await self._await_remote(redis, lock_key, channel, on_remote)  # type: ignore[arg-type]
+        if result is not None:
+            self.stats[source].remote_followers += 1
+            return result
+
+        self.stats[source].remote_timeouts += 1
+        self.stats[source].leaders += 1
+        return await fn()
+
+    async def _await_remote(
+        self,
+        redis:     Any,
+        lock_key:  str,
+        channel:   str,
+        on_remote: Callable[[], Awaitable[T | None]],
+    ) -> T | None:
+        """Wait for the remote leader's completion message, then read the cache."""
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            # The leader may have finished between our lock attempt and subscribe
+            if not await redis.exists(lock_key):
+                return await on_remote()
+
+            deadline = time.monotonic() + self.wait_timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                msg = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=min(remaining, 1.0)
+                )
+                if msg is not None or not await redis.exists(lock_key):
+                    return await on_remote()
+            return await on_remote()
+        except Exception as exc:
+            mark_redis_down("singleflight.wait", exc)
+            return None
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    def snapshot(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "sources":   {src: asdict(s) for src, s in self.stats.items()},
+        }
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+single_flight = SingleFlight(
+    lock_ttl=settings.EXTERNAL_API_TIMEOUT_SECONDS * settings.EXTERNAL_API_MAX_RETRIES + 10,
+    wait_timeout=settings.EXTERNAL_API_TIMEOUT_SECONDS + 5,
+)
@@ -3,6 +3,7 @@ app/main.py — NyayMarg FastAPI application factory.
 """
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
@@ -16,6 +17,7 @@ from slowapi.util import get_remote_address
 
 import os
 from app.config import settings
+from app.core.audit import AuditMiddleware
 from app.core.logging import configure_logging
 from app.database import create_tables
 from app.data.seed import initialise_seed_data
@@ -39,6 +41,13 @@ async def lifespan(app: FastAPI):
     await create_tables()
     logger.info("nyaymarg.db_ready")
 
+    if settings.DB_DURABILITY_MODE == "write_behind":
+        from app.core.write_behind import write_behind
+        write_behind.start()
+    if settings.AUDIT_ENABLED:
+        from app.core.audit import audit_pipeline
+        audit_pipeline.start()
+
     await initialise_seed_data()
     logger.info("nyaymarg.seed_data_ready")
 
@@ -48,6 +57,14 @@ async def lifespan(app: FastAPI):
         loaded = await load_ddl_dataset()
         logger.info("nyaymarg.ddl_dataset", loaded=loaded)
 
+    # Mirror the registry into courts/judges/cases (also runs as tasks.sync_registry)
+    if settings.REGISTRY_SYNC_ON_STARTUP:
+        from app.data.registry_sync import sync_registry
+        try:
+            logger.info("nyaymarg.registry_sync", **await sync_registry())
+        except Exception as exc:
+            logger.warning("nyaymarg.registry_sync_failed", error=str(exc))
+
     # Skip heavy training on Render free tier
     if os.getenv("SKIP_MODEL_TRAINING", "False") != "True":
         await load_or_train_models()
@@ -60,10 +77,58 @@ async def lifespan(app: FastAPI):
     SimilarityService().build_index()
     logger.info("nyaymarg.similarity_index_ready")
 
+    # Follow model versions published by the Celery worker (Redis pub/sub)
+    if settings.MODEL_HOT_RELOAD_ENABLED:
+        from app.ml.artefact_store import model_reloader
+        model_reloader.start()
+
+    # Real IK judgments imported by earlier background jobs
+    from app.data.ik_import import load_imported_cases
+    from app.data.ik_enrich import load_enrichments
+    logger.info("nyaymarg.ik_imported_cases", merged=load_imported_cases())
+    logger.info("nyaymarg.ik_enrichments", applied=load_enrichments())
+
+    # Citation graph grown by crawl jobs
+    from app.external.citation_graph import citation_graph
+    if citation_graph.load():
+        logger.info("nyaymarg.citation_graph", **citation_graph.snapshot())
+
+    # data.gov.in resources mirrored by the sync job
+    from app.data.gov_sync import load_gov_frames
+    try:
+        logger.info("nyaymarg.gov_frames", rows=await load_gov_frames())
+    except Exception as exc:
+        logger.warning("nyaymarg.gov_frames_failed", error=str(exc))
+
+    # Reload the above whenever a background job announces new data
+    if settings.DATA_HOT_RELOAD_ENABLED:
+        from app.data.reload import data_reloader
+        data_reloader.start()
+
     logger.info("nyaymarg.ready")
     yield
 
     # ── Shutdown ─────────────────────────────────────────────
+    from app.core.audit import audit_pipeline
+    from app.core.write_behind import write_behind
+    from app.data.reload import data_reloader
+    from app.ml.artefact_store import model_reloader
+    await asyncio.to_thread(model_reloader.stop)
+    await asyncio.to_thread(data_reloader.stop)
+    await audit_pipeline.stop()
+    await write_behind.stop()
+
+    from app.core.redis import close_async_redis
+    from app.external.causelists import causelist_store
+    from app.external.doc_store import doc_store
+    await close_async_redis()
+    doc_store.close()
+    causelist_store.close()
+
+    from app.database import engine, read_engine
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
     logger.info("nyaymarg.shutdown")
 
 
@@ -105,12 +170,13 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(AuditMiddleware)
 
 # ── Routers ───────────────────────────────────────────────────────────────────
 from app.routers import (  # noqa: E402
     auth, courts, judges, cases, laws, predictions,
     analytics, similar, datasets, ml_models,
-    chat, bookmarks, notifications, users,
+    chat, bookmarks, notifications, users, admin,
 )
 from app.routers import external  # noqa: E402
 
@@ -131,6 +197,7 @@ app.include_router(chat.router,          prefix=f"{PREFIX}/chat",          tags=
 app.include_router(bookmarks.router,     prefix=f"{PREFIX}/bookmarks",     tags=["Bookmarks"])
 app.include_router(notifications.router, prefix=f"{PREFIX}/notifications", tags=["Notifications"])
 app.include_router(users.router,         prefix=f"{PREFIX}/users",         tags=["Users"])
+app.include_router(admin.router,         prefix=f"{PREFIX}/admin",         tags=["Admin"])
 
 # External Legal APIs
 app.include_router(external.router,      prefix=f"{PREFIX}",               tags=["External Legal APIs"])
@@ -150,7 +217,19 @@ async def favicon_handler():
 @app.get("/health", tags=["System"], summary="API health check")
 async def health_check():
     """Returns DB, Redis, and ML model loaded status. Always unauthenticated."""
-    from app.database import check_db_connection
+    from app.database import check_db_connection, pool_status
+    from app.core.audit import audit_pipeline
+    from app.core.write_behind import write_behind
+    from app.external.cache import response_cache
+    from app.external.causelists import causelist_store
+    from app.external.citation_graph import citation_graph
+    from app.external.circuit_breaker import circuit_breakers
+    from app.external.doc_store import doc_store
+    from app.external.rate_limit import rate_limiters
+    from app.external.singleflight import single_flight
+
+    from app.data.reload import data_reloader
+    from app.ml.artefact_store import model_reloader
 
     registry = get_model_registry()
 
@@ -168,11 +247,13 @@ async def health_check():
         "status":    "healthy",
         "version":   settings.VERSION,
         "database":  await check_db_connection(),
+        "database_pool": pool_status(),
         "redis":     redis_status,
         "models": {
             "rf_model":   registry.rf_model is not None,
             "lr_model":   registry.lr_model is not None,
             "vectorizer": registry.vectorizer is not None,
+            "reloader":   model_reloader.snapshot(),
         },
         "external_apis": {
             "indian_kanoon":  settings.IK_ENABLED,
@@ -183,5 +264,15 @@ async def health_check():
             "ddl_dataset":    settings.DDL_ENABLED,
             "courtlistener":  settings.COURTLISTENER_ENABLED,
         },
+        "external_cache": response_cache.snapshot(),
+        "external_coalescing": single_flight.snapshot(),
+        "external_rate_limits": rate_limiters.snapshot(),
+        "external_circuits": circuit_breakers.snapshot(),
+        "doc_store": await asyncio.to_thread(doc_store.snapshot),
+        "causelists": await asyncio.to_thread(causelist_store.snapshot),
+        "citation_graph": citation_graph.snapshot(),
+        "data_reloader": data_reloader.snapshot(),
+        "write_behind": write_behind.snapshot(),
+        "audit": audit_pipeline.snapshot(),
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
@@ -0,0 +1,289 @@
+"""
+app/ml/artefact_store.py
+========================
+Versioned model artefacts shared by the Celery worker and the API workers,
+which are separate processes with separate registries:
+
+  publish   the trainer writes rf_model / lr_model / vectorizer + manifest.json
+            to MODEL_ARTEFACTS_DIR/versions/<version>/ (temp dir, renamed),
+            then atomically repoints CURRENT at it; versions past
+            MODEL_VERSIONS_KEEP are pruned
+  announce  the new version is published on the Redis channel
+            MODEL_RELOAD_CHANNEL
+  reload    each API worker runs a ModelReloader thread subscribed to that
+            channel. It loads the CURRENT bundle and rebuilds the similarity
+            matrix off the event loop, then swaps `registry.models` in one
+            assignment; requests in flight finish on the bundle they read
+  catch-up  CURRENT is re-read on every (re)subscribe and every
+            MODEL_RELOAD_POLL_SECONDS while Redis is unreachable, so a missed
+            announcement delays a reload instead of losing it
+
+Artefacts from before versioning (flat *.joblib files in MODEL_ARTEFACTS_DIR)
+are loaded as version "legacy" while there is no CURRENT.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import joblib
+import scipy.sparse as sp
+import structlog
+
+from app.config import settings
+from app.data.seed import DataRegistry, ModelBundle, get_registry
+
+logger = structlog.get_logger(__name__)
+
+MODEL_FILES = ("rf_model", "lr_model", "vectorizer")
+
+
+def new_version() -> str:
+    """Sortable, unique version tag, e.g. v20261019T101500123456-3fa2c1."""
+    return f"v{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:6]}"
+
+
+class ArtefactStore:
+
+    def __init__(self, root: Path | str | None = None) -> None:
+        self._root = root
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or settings.MODEL_ARTEFACTS_DIR)
+
+    @property
+    def versions_dir(self) -> Path:
+        return self.root / "versions"
+
+    def current(self) -> str | None:
+        try:
+            return (self.root / "CURRENT").read_text().strip() or None
+        except OSError:
+            return None
+
+    def versions(self) -> list[str]:
+        """Published versions, oldest first."""
+        if not self.versions_dir.is_dir():
+            return []
+        return sorted(p.name for p in self.versions_dir.iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    def publish(self, bundle: ModelBundle, metrics: dict | None = None) -> str:
+        """Write `bundle` as a new version and make it CURRENT. Returns the version."""
+        missing = [name for name in MODEL_FILES if getattr(bundle, name) is None]
+        if missing:
+            raise ValueError(f"incomplete model bundle, missing: {missing}")
+        version = new_version()
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=self.versions_dir, prefix=".tmp-"))
+        try:
+            for name in MODEL_FILES:
+                joblib.dump(getattr(bundle, name), tmp / f"{name}.joblib")
+            (tmp / "manifest.json").write_text(json.dumps({
+                "version":    version,
+                "metrics":    metrics or {},
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }, default=str))
+            os.rename(tmp, self.versions_dir / version)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        pointer = self.root / f".CURRENT-{uuid.uuid4().hex}"
+        pointer.write_text(version)
+        os.replace(pointer, self.root / "CURRENT")     # readers see the old or the new version, never neither
+        self.prune()
+        logger.info("models.published", version=version)
+        return version
+
+    def load(self, version: str | None = None) -> tuple[ModelBundle, dict] | None:
+        """(bundle, manifest) for `version` (default CURRENT, else legacy flat files), or None."""
+        version = version or self.current()
+        if version:
+            directory = self.versions_dir / version
+            manifest  = json.loads((directory / "manifest.json").read_text())
+        elif all((self.root / f"{name}.joblib").exists() for name in MODEL_FILES):
+            directory, manifest, version = self.root, {}, "legacy"
+        else:
+            return None
+        models = {name: joblib.load(directory / f"{name}.joblib") for name in MODEL_FILES}
+        return ModelBundle(version=version, **models), manifest
+
+    def prune(self, keep: int | None = None) -> list[str]:
+        """Delete the oldest versions beyond `keep` (never CURRENT). Returns the removed versions."""
+        keep    = keep or settings.MODEL_VERSIONS_KEEP
+        current = self.current()
+        removed = [v for v in self.versions()[:-keep] if v != current]
+        for version in removed:
+            shutil.rmtree(self.versions_dir / version, ignore_errors=True)
+        return removed
+
+
+artefact_store = ArtefactStore()
+
+
+def activate(registry: DataRegistry, bundle: ModelBundle, manifest: dict | None = None) -> None:
+    """
+    Make `bundle` the registry's models. If the registry has a similarity
+    index, the new bundle's matrix is built first (outside the lock), so
+    the swap itself is a single assignment.
+    """
+    if bundle.corpus_vectors is None and bundle.vectorizer is not None \
+            and registry.corpus_vectors is not None and registry.df_cases is not None:
+        if registry.vectorizer is bundle.vectorizer:
+            bundle = dataclasses.replace(bundle, corpus_vectors=registry.corpus_vectors)
+        else:
+            texts  = registry.corpus_texts()
+            bundle = dataclasses.replace(bundle, corpus_vectors=bundle.vectorizer.transform(texts))
+
+    with registry.models_lock:
+        total = sum(len(df) for df in registry.corpus_frames())
+        n     = bundle.corpus_vectors.shape[0] if bundle.corpus_vectors is not None else None
+        if n is not None and n < total:                           # rows appended while building
+            tail   = bundle.vectorizer.transform(registry.corpus_texts(n))
+            bundle = dataclasses.replace(bundle, corpus_vectors=sp.vstack([bundle.corpus_vectors, tail], format="csr"))
+        registry.models = bundle
+        if manifest:
+            registry.model_metrics    = manifest.get("metrics", {})
+            registry.model_trained_at = datetime.fromisoformat(manifest["created_at"])
+
+
+def announce(version: str) -> bool:
+    """Tell API workers about a new version (best effort: they also poll CURRENT)."""
+    if not settings.MODEL_HOT_RELOAD_ENABLED:
+        return False
+    try:
+        import redis
+        client = redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        try:
+            client.publish(settings.MODEL_RELOAD_CHANNEL, json.dumps({"version": version}))
+        finally:
+            client.close()
+        return True
+    except Exception as exc:
+        logger.warning("models.announce_failed", version=version, error=str(exc))
+        return False
+
+
+# ── API-side hot reload ───────────────────────────────────────────────────────
+
+class ModelReloader:
+    """Background thread that keeps this process's registry on the store's CURRENT version."""
+
+    def __init__(self, store: ArtefactStore | None = None, registry: DataRegistry | None = None) -> None:
+        self.store      = store or artefact_store
+        self._registry  = registry
+        self._stop      = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.subscribed = False
+        self.reloads    = 0
+        self.last_error: str | None = None
+
+    @property
+    def registry(self) -> DataRegistry:
+        return self._registry or get_registry()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+        self._thread.start()
+        logger.info("models.reloader_started", channel=settings.MODEL_RELOAD_CHANNEL)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _connect(self) -> Any:
+        import redis
+        client = redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, health_check_interval=30)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(settings.MODEL_RELOAD_CHANNEL)
+        return pubsub
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                pubsub = self._connect()
+            except Exception as exc:
+                self._failed("subscribe", exc)
+                self.sync()                                 # Redis down: poll instead
+                self._stop.wait(settings.MODEL_RELOAD_POLL_SECONDS)
+                continue
+            self.subscribed = True
+            try:
+                self.sync()                                 # anything announced while unsubscribed
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle(message["data"])
+            except Exception as exc:
+                self._failed("listen", exc)
+            finally:
+                self.subscribed = False
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+    def handle(self, data: bytes | str) -> bool:
+        """An announcement is a wake-up call: CURRENT decides, so late or reordered messages are harmless."""
+        try:
+            announced = json.loads(data).get("version")
+        except (ValueError, AttributeError):
+            announced = None
+        logger.info("models.announced", version=announced)
+        return self.sync()
+
+    def sync(self) -> bool:
+        """Load CURRENT if this process serves another version. Returns True on a swap."""
+        version = self.store.current()
+        if not version or version == self.registry.models.version:
+            return False
+        started = time.perf_counter()
+        try:
+            loaded = self.store.load(version)
+            if loaded is None:
+                return False
+            activate(self.registry, *loaded)
+        except Exception as exc:
+            self._failed("load", exc)
+            return False
+        self.reloads += 1
+        logger.info("models.reloaded", version=version, elapsed_s=round(time.perf_counter() - started, 2))
+        return True
+
+    def _failed(self, op: str, exc: Exception) -> None:
+        error = f"{op}: {exc}"
+        if error != self.last_error:                   # once per outage, not once per poll
+            logger.warning("models.reloader_error", op=op, error=str(exc))
+        self.last_error = error
+
+    def snapshot(self) -> dict:
+        return {
+            "running":    self.running,
+            "subscribed": self.subscribed,
+            "version":    self.registry.models.version,
+            "current":    self.store.current(),
+            "reloads":    self.reloads,
+            "last_error": self.last_error,
+        }
+
+
+model_reloader = ModelReloader()
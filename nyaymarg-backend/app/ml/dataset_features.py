@@ -0,0 +1,211 @@
+"""
+app/ml/dataset_features.py
+==========================
+Feature matrices for training on an uploaded dataset (tasks.train_models
+with a dataset_id). Only the columns a model needs are read from the
+dataset's Parquet conversion, a record batch at a time, and the vectorised
+result is cached on disk so a re-run with other hyperparameters goes
+straight to fitting:
+
+  columns   matched ignoring case and spacing ("Judge Strength" →
+            judge_strength). RF_FEATURES + backlog_risk_score feed the
+            backlog model; clean_text (or case_text, cleaned here) +
+            outcome (or status == "Decided") feed the outcome model
+  text      split and TF-IDF fitted on the train split as in the trainer;
+            stored as CSR .npz matrices with the fitted vectorizer
+  numeric   float32 feature matrix + labels as .npy
+  cache     FEATURE_CACHE_DIR/<sha256>-<spec>/, <spec> hashing the
+            vectoriser, split and column settings; built in a temp dir
+            and renamed into place
+
+A model whose columns are missing, or with fewer than MIN_CLASS_ROWS rows
+in either class, is skipped (reason in `skipped`); the other still trains.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import structlog
+
+from app.config import settings
+from app.ml.pipeline import clean_text
+from app.ml.trainer import (
+    BACKLOG_RISK_THRESHOLD, LR_TEST_SIZE, RANDOM_STATE, RF_FEATURES, TFIDF_PARAMS, vectorize_corpus,
+)
+
+logger = structlog.get_logger(__name__)
+
+CACHE_VERSION  = 1
+MIN_CLASS_ROWS = 5               # per class: 5-fold CV needs one per fold
+RF_LABEL       = "backlog_risk_score"
+
+
+@dataclass
+class DatasetFeatures:
+    rows:    int
+    rf:      tuple[np.ndarray, np.ndarray] | None = None   # (X [n × RF_FEATURES], y)
+    text:    tuple | None = None                           # (vectorizer, (X_train, X_test, y_train, y_test))
+    skipped: dict[str, str] = field(default_factory=dict)
+    cached:  bool = False
+
+
+def _normalise(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(name).strip().lower()).strip("_")
+
+
+def _numeric(column) -> np.ndarray:
+    return pd.to_numeric(column.to_pandas(), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _balanced(y: np.ndarray) -> str | None:
+    counts = np.bincount(y.astype(int), minlength=2)
+    if counts.min() < MIN_CLASS_ROWS:
+        return f"needs {MIN_CLASS_ROWS}+ rows per class, got {counts.tolist()}"
+    return None
+
+
+def cache_dir(parquet_path: str | Path, checksum: str | None = None) -> Path:
+    """Cache location for a dataset: content checksum + a hash of every setting baked into the matrices."""
+    spec = json.dumps({
+        "v": CACHE_VERSION, "tfidf": TFIDF_PARAMS, "test_size": LR_TEST_SIZE, "seed": RANDOM_STATE,
+        "features": RF_FEATURES, "threshold": BACKLOG_RISK_THRESHOLD, "min_class": MIN_CLASS_ROWS,
+    }, sort_keys=True, default=str)
+    if not checksum:                                  # rows from before checksums were recorded
+        st       = os.stat(parquet_path)
+        checksum = hashlib.sha256(f"{Path(parquet_path).resolve()}:{st.st_size}:{st.st_mtime_ns}".encode()).hexdigest()
+    return Path(settings.FEATURE_CACHE_DIR) / f"{checksum}-{hashlib.sha256(spec.encode()).hexdigest()[:12]}"
+
+
+# ── Build ─────────────────────────────────────────────────────────────────────
+
+def build_features(parquet_path: str | Path) -> DatasetFeatures:
+    """Read the needed columns of a dataset's Parquet file and vectorise them (no caching)."""
+    import pyarrow.parquet as pq
+
+    pf      = pq.ParquetFile(parquet_path)
+    columns = {_normalise(c): c for c in pf.schema_arrow.names}
+    skipped: dict[str, str] = {}
+
+    rf_cols  = [columns.get(f) for f in RF_FEATURES + [RF_LABEL]]
+    if None in rf_cols:
+        missing = [f for f, c in zip(RF_FEATURES + [RF_LABEL], rf_cols) if c is None]
+        skipped["rf_model"] = f"missing columns: {missing}"
+        rf_cols = []
+    text_col  = columns.get("clean_text") or columns.get("case_text")
+    label_col = columns.get("outcome") or columns.get("status")
+    if text_col is None or label_col is None:
+        skipped["lr_model"] = "needs case_text (or clean_text) and outcome (or status)"
+        text_col = label_col = None
+
+    wanted   = list(dict.fromkeys(c for c in [*rf_cols, text_col, label_col] if c))
+    numeric: list[np.ndarray] = []
+    corpus:  list[str]        = []
+    labels:  list[np.ndarray] = []
+    rows = 0
+    if wanted:
+        for batch in pf.iter_batches(batch_size=settings.DATASET_INGEST_CHUNK_ROWS, columns=wanted):
+            rows += batch.num_rows
+            if rf_cols:
+                numeric.append(np.column_stack([_numeric(batch.column(c)) for c in rf_cols]))
+            if text_col:
+                raw = batch.column(text_col).to_pylist()
+                corpus.extend(raw if text_col == columns.get("clean_text") else map(clean_text, raw))
+                if label_col == columns.get("outcome"):
+                    labels.append(_numeric(batch.column(label_col)))
+                else:
+                    status = batch.column(label_col).to_pandas().astype("string").str.strip().str.lower()
+                    labels.append(np.where(status.isna(), np.nan, status == "decided").astype("float64"))
+    else:
+        rows = pf.metadata.num_rows
+    features = DatasetFeatures(rows=rows, skipped=skipped)
+
+    if rf_cols:
+        matrix = np.vstack(numeric) if numeric else np.empty((0, len(rf_cols)))
+        matrix = matrix[~np.isnan(matrix).any(axis=1)]
+        X, y   = matrix[:, :-1].astype("float32"), (matrix[:, -1] > BACKLOG_RISK_THRESHOLD).astype("int8")
+        if reason := _balanced(y):
+            skipped["rf_model"] = reason
+        else:
+            features.rf = (X, y)
+
+    if text_col:
+        y    = np.concatenate(labels) if labels else np.empty(0)
+        keep = ~np.isnan(y) & np.array([bool(t) for t in corpus], dtype=bool)
+        y    = y[keep].astype("int8")
+        if reason := _balanced(y):
+            skipped["lr_model"] = reason
+        else:
+            texts = [t for t, k in zip(corpus, keep) if k]
+            features.text = vectorize_corpus(texts, y)
+    return features
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+def _write(features: DatasetFeatures, directory: Path) -> None:
+    if features.rf is not None:
+        np.save(directory / "rf_X.npy", features.rf[0])
+        np.save(directory / "rf_y.npy", features.rf[1])
+    if features.text is not None:
+        vec, (X_train, X_test, y_train, y_test) = features.text
+        sp.save_npz(directory / "text_train.npz", X_train.tocsr())
+        sp.save_npz(directory / "text_test.npz", X_test.tocsr())
+        np.save(directory / "text_y_train.npy", y_train)
+        np.save(directory / "text_y_test.npy", y_test)
+        joblib.dump(vec, directory / "vectorizer.joblib")
+    (directory / "meta.json").write_text(json.dumps({
+        "rows": features.rows, "skipped": features.skipped,
+        "rf": features.rf is not None, "text": features.text is not None,
+    }))
+
+
+def _read(directory: Path) -> DatasetFeatures:
+    meta     = json.loads((directory / "meta.json").read_text())
+    features = DatasetFeatures(rows=meta["rows"], skipped=meta["skipped"], cached=True)
+    if meta["rf"]:
+        features.rf = (np.load(directory / "rf_X.npy"), np.load(directory / "rf_y.npy"))
+    if meta["text"]:
+        features.text = (joblib.load(directory / "vectorizer.joblib"), (
+            sp.load_npz(directory / "text_train.npz"), sp.load_npz(directory / "text_test.npz"),
+            np.load(directory / "text_y_train.npy"), np.load(directory / "text_y_test.npy"),
+        ))
+    return features
+
+
+def load_features(parquet_path: str | Path, checksum: str | None = None) -> DatasetFeatures:
+    """Cached features for a dataset, building (and caching) them on a miss."""
+    directory = cache_dir(parquet_path, checksum)
+    if (directory / "meta.json").exists():
+        logger.info("features.cache_hit", dataset=directory.name)
+        return _read(directory)
+
+    started  = time.perf_counter()
+    features = build_features(parquet_path)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=directory.parent, prefix=".build-"))
+    try:
+        _write(features, tmp)
+        os.rename(tmp, directory)
+    except OSError:                                   # a concurrent run cached it first
+        shutil.rmtree(tmp, ignore_errors=True)
+    logger.info("features.built", dataset=directory.name, rows=features.rows,
+                skipped=features.skipped, elapsed_s=round(time.perf_counter() - started, 2))
+    return features
+
+
+def drop_cache(checksum: str) -> None:
+    """Remove every cached feature set of a dataset's content (all specs)."""
+    for directory in Path(settings.FEATURE_CACHE_DIR).glob(f"{checksum}-*"):
+        shutil.rmtree(directory, ignore_errors=True)
@@ -1,41 +1,33 @@
 """
-app/ml/loader.py — Load artefacts from disk or trigger fresh training.
+app/ml/loader.py — Load the current artefact version from disk or trigger fresh training.
 """
 from __future__ import annotations
 
-from pathlib import Path
+import asyncio
 
-import joblib
 import structlog
 
-from app.config import settings
 from app.data.seed import get_registry
 
 logger = structlog.get_logger(__name__)
 
-ARTEFACT_DIR = Path(settings.MODEL_ARTEFACTS_DIR)
-
 
 async def load_or_train_models() -> None:
     """
     Called once on startup (after initialise_seed_data).
-    Loads rf_model, lr_model, vectorizer from disk if ALL three artefacts exist,
-    otherwise trains fresh and saves them.
+    Loads the store's CURRENT version (or pre-versioning artefacts) if there
+    is one, otherwise trains fresh and publishes the result.
     """
+    from app.ml.artefact_store import activate, artefact_store
     from app.ml.trainer import train_all_models  # local import avoids circular
 
-    rf_path  = ARTEFACT_DIR / "rf_model.joblib"
-    lr_path  = ARTEFACT_DIR / "lr_model.joblib"
-    vec_path = ARTEFACT_DIR / "vectorizer.joblib"
-
     registry = get_registry()
+    loaded   = await asyncio.to_thread(artefact_store.load)
 
-    if rf_path.exists() and lr_path.exists() and vec_path.exists():
-        logger.info("models.loading_from_disk")
-        registry.rf_model   = joblib.load(rf_path)
-        registry.lr_model   = joblib.load(lr_path)
-        registry.vectorizer = joblib.load(vec_path)
-        logger.info("models.loaded")
+    if loaded is not None:
+        logger.info("models.loading_from_disk", version=loaded[0].version)
+        activate(registry, *loaded)
+        logger.info("models.loaded", version=loaded[0].version)
     else:
         logger.info("models.training_fresh")
         metrics = await train_all_models()
@@ -1,21 +1,24 @@
 """
 app/ml/trainer.py
 =================
-Trains both ML models from the DataRegistry synthetic corpus:
+Trains both ML models from the DataRegistry synthetic corpus, or from an
+uploaded dataset's Parquet conversion (app/ml/dataset_features.py):
   - Model 1: RandomForestClassifier — court backlog risk (binary)
   - Model 2: LogisticRegression + TfidfVectorizer — case outcome (binary)
 
-All hyperparameters mirror the JusticeGraph spec.
-Artefacts are persisted via joblib to MODEL_ARTEFACTS_DIR.
+Default hyperparameters mirror the JusticeGraph spec (HYPERPARAMETERS);
+a training run may override them.
+Every run publishes a new model version to the artefact store
+(app/ml/artefact_store.py), which API workers hot-reload.
 """
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 from datetime import datetime, timezone
-from pathlib import Path
 
-import joblib
 import numpy as np
+import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
@@ -25,8 +28,6 @@ from sklearn.model_selection import cross_val_score, train_test_split
 from app.config import settings
 from app.data.seed import get_registry
 
-ARTEFACT_DIR = Path(settings.MODEL_ARTEFACTS_DIR)
-
 RF_FEATURES: list[str] = [
     "judge_strength",
     "pending_cases",
@@ -37,90 +38,181 @@ RF_FEATURES: list[str] = [
     "digitization_level",
 ]
 
+# Vectoriser / split settings. Part of the dataset feature-cache key:
+# changing them invalidates cached matrices, changing HYPERPARAMETERS doesn't.
+TFIDF_PARAMS: dict = {"max_features": 500, "ngram_range": (1, 2)}
+LR_TEST_SIZE = 0.2
+RANDOM_STATE = 42
+BACKLOG_RISK_THRESHOLD = 0.6     # backlog_risk_score above this → high-risk court
+
+HYPERPARAMETERS: dict = {
+    "n_estimators": settings.DEFAULT_N_ESTIMATORS,
+    "max_depth":    10,
+    "C":            1.0,
+    "max_iter":     500,
+}
+
 
-async def train_all_models() -> dict:
+async def train_all_models(dataset_path: str | None = None, checksum: str | None = None,
+                           hyperparameters: dict | None = None) -> dict:
     """
     Public async entry point — runs training in a thread executor to avoid
-    blocking the event loop.
+    blocking the event loop. With `dataset_path` (a dataset's Parquet file)
+    trains on that dataset instead of the synthetic corpus.
     Returns evaluation metrics dict.
     """
     loop = asyncio.get_event_loop()
     registry = get_registry()
-    metrics = await loop.run_in_executor(None, _train_sync, registry)
-    registry.model_metrics   = metrics
-    registry.model_trained_at = datetime.now(timezone.utc)
+    if dataset_path:
+        metrics = await loop.run_in_executor(
+            None, _train_dataset_sync, registry, dataset_path, checksum, hyperparameters
+        )
+    else:
+        metrics = await loop.run_in_executor(None, _train_sync, registry, hyperparameters)
     return metrics
 
 
-def _train_sync(registry) -> dict:
-    """Blocking training routine — called inside executor."""
-    ARTEFACT_DIR.mkdir(parents=True, exist_ok=True)
-    
-    import warnings
-    warnings.filterwarnings("ignore")
+def _params(overrides: dict | None) -> dict:
+    return {**HYPERPARAMETERS, **{k: v for k, v in (overrides or {}).items() if v is not None}}
 
-    # ── Model 1: Court Backlog Risk (RandomForest) ───────────────────────────
-    X_rf = registry.df_courts[RF_FEATURES]
-    y_rf = (registry.df_courts["backlog_risk_score"] > 0.6).astype(int)
 
+# ── Model fitting (shared by the synthetic and dataset paths) ────────────────
+
+def fit_backlog_model(X_rf, y_rf, params: dict) -> tuple[RandomForestClassifier, dict]:
     X_rf_train, X_rf_test, y_rf_train, y_rf_test = train_test_split(
-        X_rf, y_rf, test_size=0.25, random_state=42
+        X_rf, y_rf, test_size=0.25, random_state=RANDOM_STATE
     )
 
     rf = RandomForestClassifier(
-        n_estimators=settings.DEFAULT_N_ESTIMATORS,
-        max_depth=10,
-        random_state=42,
+        n_estimators=params["n_estimators"],
+        max_depth=params["max_depth"],
+        random_state=RANDOM_STATE,
         class_weight="balanced",
     )
     rf.fit(X_rf_train, y_rf_train)
 
     rf_cv  = float(cross_val_score(rf, X_rf, y_rf, cv=5, scoring="f1").mean())
     rf_acc = float(accuracy_score(y_rf_test, rf.predict(X_rf_test)))
+    return rf, {
+        "accuracy": round(rf_acc, 4),
+        "cv_f1":    round(rf_cv, 4),
+        "features": RF_FEATURES,
+    }
 
-    # ── Model 2: Case Outcome (LogisticRegression + TF-IDF) ─────────────────
-    from app.ml.pipeline import clean_text  # noqa: PLC0415
-
-    corpus  = registry.df_cases["clean_text"].fillna("").tolist()
-    labels  = registry.df_cases["outcome"].astype(int).tolist()
 
+def vectorize_corpus(corpus: list[str], labels) -> tuple[TfidfVectorizer, tuple]:
+    """Split, then fit TF-IDF on the train split. Returns (vectorizer, (X_train, X_test, y_train, y_test))."""
     X_lr_train, X_lr_test, y_lr_train, y_lr_test = train_test_split(
-        corpus, labels, test_size=0.2, random_state=42
+        corpus, labels, test_size=LR_TEST_SIZE, random_state=RANDOM_STATE
     )
 
-    vec = TfidfVectorizer(max_features=500, ngram_range=(1, 2))
+    vec = TfidfVectorizer(**TFIDF_PARAMS)
     X_train_vec = vec.fit_transform(X_lr_train)
     X_test_vec  = vec.transform(X_lr_test)
+    return vec, (X_train_vec, X_test_vec, np.asarray(y_lr_train), np.asarray(y_lr_test))
+
 
-    lr = LogisticRegression(max_iter=500, random_state=42, C=1.0)
+def fit_outcome_model(split: tuple, params: dict) -> tuple[LogisticRegression, dict]:
+    X_train_vec, X_test_vec, y_lr_train, y_lr_test = split
+
+    lr = LogisticRegression(max_iter=params["max_iter"], random_state=RANDOM_STATE, C=params["C"])
     lr.fit(X_train_vec, y_lr_train)
 
     y_pred    = lr.predict(X_test_vec)
     y_proba   = lr.predict_proba(X_test_vec)[:, 1]
     lr_acc    = float(accuracy_score(y_lr_test, y_pred))
     lr_f1     = float(f1_score(y_lr_test, y_pred))
-    lr_auc    = float(roc_auc_score(y_lr_test, y_proba))
-
-    # ── Persist artefacts ────────────────────────────────────────────────────
-    joblib.dump(rf,  ARTEFACT_DIR / "rf_model.joblib")
-    joblib.dump(lr,  ARTEFACT_DIR / "lr_model.joblib")
-    joblib.dump(vec, ARTEFACT_DIR / "vectorizer.joblib")
-
-    # ── Update in-memory registry ────────────────────────────────────────────
-    registry.rf_model   = rf
-    registry.lr_model   = lr
-    registry.vectorizer = vec
-
-    return {
-        "rf_model": {
-            "accuracy": round(rf_acc, 4),
-            "cv_f1":    round(rf_cv, 4),
-            "features": RF_FEATURES,
-        },
-        "lr_model": {
-            "accuracy": round(lr_acc, 4),
-            "f1":       round(lr_f1, 4),
-            "auc_roc":  round(lr_auc, 4),
+    lr_auc    = float(roc_auc_score(y_lr_test, y_proba)) if len(set(y_lr_test)) > 1 else None
+    return lr, {
+        "accuracy": round(lr_acc, 4),
+        "f1":       round(lr_f1, 4),
+        "auc_roc":  round(lr_auc, 4) if lr_auc is not None else None,
+    }
+
+
+def _publish(registry, metrics: dict, rf=None, lr=None, vec=None) -> str:
+    """
+    Publish a new version (models not retrained carry over from the current
+    bundle), switch this process to it and announce it to the API workers.
+    """
+    from app.ml.artefact_store import activate, announce, artefact_store  # noqa: PLC0415
+
+    changes = {"version": None}
+    if rf is not None:
+        changes["rf_model"] = rf
+    if lr is not None:
+        changes.update(lr_model=lr, vectorizer=vec, corpus_vectors=None)
+    bundle  = dataclasses.replace(registry.models, **changes)
+    version = artefact_store.publish(bundle, metrics)
+    activate(registry, dataclasses.replace(bundle, version=version), {
+        "metrics": metrics, "created_at": metrics["trained_at"],
+    })
+    announce(version)
+    return version
+
+
+# ── Training routines (run inside an executor / Celery worker) ───────────────
+
+def _train_sync(registry, hyperparameters: dict | None = None) -> dict:
+    """Blocking training routine — called inside executor."""
+    import warnings
+    warnings.filterwarnings("ignore")
+    params = _params(hyperparameters)
+
+    # ── Model 1: Court Backlog Risk (RandomForest) ───────────────────────────
+    X_rf = registry.df_courts[RF_FEATURES]
+    y_rf = (registry.df_courts["backlog_risk_score"] > BACKLOG_RISK_THRESHOLD).astype(int)
+    rf, rf_metrics = fit_backlog_model(X_rf, y_rf, params)
+
+    # ── Model 2: Case Outcome (LogisticRegression + TF-IDF) ─────────────────
+    corpus  = registry.df_cases["clean_text"].fillna("").tolist()
+    labels  = registry.df_cases["outcome"].astype(int).tolist()
+    vec, split     = vectorize_corpus(corpus, labels)
+    lr, lr_metrics = fit_outcome_model(split, params)
+
+    # ── Publish artefacts + update in-memory registry ────────────────────────
+    metrics = {
+        "rf_model":        rf_metrics,
+        "lr_model":        lr_metrics,
+        "hyperparameters": params,
+        "trained_at":      datetime.now(timezone.utc).isoformat(),
+    }
+    metrics["version"] = _publish(registry, metrics, rf=rf, lr=lr, vec=vec)
+    return metrics
+
+
+def _train_dataset_sync(registry, parquet_path: str, checksum: str | None = None,
+                        hyperparameters: dict | None = None) -> dict:
+    """
+    Train on an uploaded dataset. Only the models the dataset has columns
+    for are replaced; the others keep their current artefacts.
+    """
+    import warnings
+    warnings.filterwarnings("ignore")
+    from app.ml.dataset_features import load_features  # noqa: PLC0415
+
+    params   = _params(hyperparameters)
+    features = load_features(parquet_path, checksum)
+    metrics: dict = {}
+    rf = lr = vec = None
+
+    if features.rf is not None:
+        X_rf, y_rf = features.rf
+        rf, metrics["rf_model"] = fit_backlog_model(pd.DataFrame(X_rf, columns=RF_FEATURES), y_rf, params)
+    if features.text is not None:
+        vec, split = features.text
+        lr, metrics["lr_model"] = fit_outcome_model(split, params)
+    if rf is None and lr is None:
+        raise ValueError(f"dataset has no trainable columns: {features.skipped}")
+
+    metrics.update({
+        "hyperparameters": params,
+        "dataset": {
+            "rows":          features.rows,
+            "feature_cache": "hit" if features.cached else "miss",
+            "skipped":       features.skipped,
         },
         "trained_at": datetime.now(timezone.utc).isoformat(),
-    }
+    })
+    metrics["version"] = _publish(registry, metrics, rf=rf, lr=lr, vec=vec)
+    return metrics
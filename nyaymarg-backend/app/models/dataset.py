@@ -6,7 +6,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -22,9 +22,14 @@ class Dataset(Base):
     filename:    Mapped[str]        = mapped_column(String(300))
     file_path:   Mapped[str]        = mapped_column(String(500))
     file_size:   Mapped[int]        = mapped_column(Integer)    # bytes
+    checksum:    Mapped[str | None] = mapped_column(String(64), nullable=True)  # SHA-256 hex of the file
     row_count:   Mapped[int | None] = mapped_column(Integer, nullable=True)
     status:      Mapped[str]        = mapped_column(String(20), default="pending")  # pending | processing | ready | failed
     schema_info: Mapped[dict | None]= mapped_column(JSON, nullable=True)
     error_msg:   Mapped[str | None] = mapped_column(String(500), nullable=True)
     created_at:  Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow)
     processed_at:Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_datasets_user_checksum", "user_id", "checksum"),
+    )
@@ -0,0 +1,28 @@
+"""
+app/models/gov_record.py — Local mirror of data.gov.in judiciary resources.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, JSON, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class GovRecord(Base):
+    __tablename__ = "gov_records"
+    __table_args__ = (
+        UniqueConstraint("resource", "record_key", name="uq_gov_records_resource_key"),
+        Index("ix_gov_records_resource_state_year", "resource", "state_key", "year"),
+    )
+
+    id:         Mapped[int]        = mapped_column(Integer, primary_key=True, autoincrement=True)
+    resource:   Mapped[str]        = mapped_column(String(30))    # infrastructure | pendency | disposal
+    record_key: Mapped[str]        = mapped_column(String(32))    # md5 of the record's fields
+    state:      Mapped[str | None] = mapped_column(String(100), nullable=True)
+    state_key:  Mapped[str | None] = mapped_column(String(100), nullable=True)   # lower-cased, for joins
+    year:       Mapped[int | None] = mapped_column(Integer, nullable=True)
+    data:       Mapped[dict]       = mapped_column(JSON)
+    synced_at:  Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow)
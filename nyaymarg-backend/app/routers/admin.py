@@ -0,0 +1,41 @@
+"""
+app/routers/admin.py — Admin-only maintenance jobs.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, Query
+
+from app.core.audit import audited
+from app.core.security import require_role
+from app.models.user import UserRole
+
+router = APIRouter(dependencies=[require_role(UserRole.admin)])
+
+
+@router.post("/registry/sync")
+@audited("registry.sync", "registry")
+async def sync_registry(
+    cases_dir: str | None = Query(None, description="Directory of Parquet case partitions (df_cases schema)"),
+):
+    """
+    Bulk-load the in-memory courts/judges/cases into the SQL tables (or cases
+    from Parquet partitions under `cases_dir`) as a Celery job. With no worker
+    answering a ping (local dev) the load runs in this request instead.
+    """
+    from app.tasks.celery_app import workers_available
+    if await asyncio.to_thread(workers_available):
+        from app.tasks.ingestion_tasks import sync_registry_task
+        task = sync_registry_task.delay(cases_dir)
+        return {"job_id": task.id, "status": "queued"}
+
+    from app.data.registry_sync import sync_registry as run_sync
+    return {"job_id": "sync", "status": "done", "result": await run_sync(cases_dir=cases_dir)}
+
+
+@router.get("/registry/sync/{job_id}")
+async def sync_registry_status(job_id: str):
+    """Poll a registry sync job; the result holds per-table row counts."""
+    from app.tasks.celery_app import job_status
+    return job_status(job_id, result_key="result")
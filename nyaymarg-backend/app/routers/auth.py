@@ -11,6 +11,7 @@ from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit import audited
 from app.core.security import (
     create_access_token,
     create_refresh_token,
@@ -19,7 +20,7 @@ from app.core.security import (
     hash_password,
     verify_password,
 )
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.schemas.user import (
     AdminRoleChange,
@@ -39,6 +40,7 @@ def _to_username(email: str) -> str:
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
+@audited("user.register", "user", target=lambda r: r.user.id, actor=lambda r: r.user.id, body="body")
 async def register(body: UserRegisterRequest, db: AsyncSession = Depends(get_db)):
     """Register a new NyayMarg account."""
     body.full_name = bleach.clean(body.full_name)
@@ -86,6 +88,7 @@ async def register(body: UserRegisterRequest, db: AsyncSession = Depends(get_db)
 
 
 @router.post("/login", response_model=TokenResponse)
+@audited("user.login", "user", actor=lambda r: r.user.id, body="body")
 async def login(body: UserLoginRequest, db: AsyncSession = Depends(get_db)):
     email_str = str(body.email).strip().lower()
     result = await db.execute(select(User).where(User.email == email_str))
@@ -135,7 +138,7 @@ async def logout():
 @router.get("/me", response_model=UserOut)
 async def get_me(
     current: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(select(User).where(User.id == current["id"]))
     user   = result.scalar_one_or_none()
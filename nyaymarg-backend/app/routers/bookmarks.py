@@ -3,6 +3,7 @@ app/routers/bookmarks.py — Bookmark endpoints.
 """
 from __future__ import annotations
 
+from datetime import date, timedelta
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
@@ -10,10 +11,11 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.bookmark import Bookmark
 from app.schemas.common import PaginatedResponse
 from app.schemas.notification import BookmarkCreateRequest, BookmarkOut
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
@@ -41,23 +43,49 @@ async def list_bookmarks(
     entity_type: str | None = Query(None),
     page:        int        = Query(1, ge=1),
     page_size:   int        = Query(20, ge=1, le=100),
+    cursor:      str | None = Query(None, description="next_cursor of the previous page (keyset)"),
     current: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     stmt = select(Bookmark).where(Bookmark.user_id == current["id"])
     if entity_type:
         stmt = stmt.where(Bookmark.entity_type == entity_type)
-    stmt = stmt.order_by(Bookmark.created_at.desc())
 
-    result   = await db.execute(stmt)
-    all_bm   = result.scalars().all()
-    total    = len(all_bm)
-    start    = (page - 1) * page_size
-    page_bm  = list(all_bm[start : start + page_size])
-    return PaginatedResponse.build(
-        [BookmarkOut.model_validate(b) for b in page_bm],
-        total, page, page_size
+    result = await paginate(
+        db, stmt, keys=(Bookmark.created_at, Bookmark.id),
+        page=page, page_size=page_size, cursor=cursor,
+    )
+    return PaginatedResponse.from_page(
+        result, [BookmarkOut.model_validate(b) for b in result.items]
+    )
+
+
+@router.get("/hearings")
+async def bookmarked_hearings(
+    start:   date | None = Query(None, description="Defaults to today"),
+    days:    int         = Query(7, ge=1, le=31),
+    current: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Cause-list listings of the caller's bookmarked CNRs, answered from the local
+    cause-list snapshots (no upstream calls).
+    """
+    from app.external.causelists import causelist_store
+    from app.services.external_service import ExternalService
+
+    result = await db.execute(
+        select(Bookmark.entity_id).where(
+            Bookmark.user_id == current["id"],
+            Bookmark.entity_type.in_(("case", "cnr")),
+        )
     )
+    cnrs  = sorted({e.strip().upper() for e in result.scalars().all() if e})
+    cnrs  = [c for c in cnrs if ExternalService._valid_cnr(c)]
+    first = start or date.today()
+    last  = first + timedelta(days=days - 1)
+    hearings = await causelist_store.hearings(cnrs, first.isoformat(), last.isoformat())
+    return {"from": first, "to": last, "cnrs": len(cnrs), "hearings": hearings}
 
 
 @router.delete("/{bookmark_id}", status_code=204)
@@ -8,11 +8,12 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.chat_message import ChatMessage
 from app.schemas.chat import ChatHistoryItem, ChatRequest, ChatResponse
 from app.schemas.common import PaginatedResponse
 from app.services.chat_service import ChatService
+from app.utils.pagination import paginate
 
 router = APIRouter()
 _svc   = ChatService()
@@ -32,22 +33,19 @@ async def chat_history(
     session_id: str = Query("default"),
     page:       int = Query(1, ge=1),
     page_size:  int = Query(20, ge=1, le=100),
+    cursor:     str | None = Query(None, description="next_cursor of the previous page (keyset)"),
     current:    dict = Depends(get_current_user),
-    db:         AsyncSession = Depends(get_db),
+    db:         AsyncSession = Depends(get_read_db),
 ):
-    stmt = (
-        select(ChatMessage)
-        .where(ChatMessage.user_id == current["id"], ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.created_at.asc())
+    stmt = select(ChatMessage).where(
+        ChatMessage.user_id == current["id"], ChatMessage.session_id == session_id
+    )
+    result = await paginate(
+        db, stmt, keys=(ChatMessage.created_at, ChatMessage.id),
+        page=page, page_size=page_size, cursor=cursor, descending=False,
     )
-    result = await db.execute(stmt)
-    all_m  = result.scalars().all()
-    total  = len(all_m)
-    start  = (page - 1) * page_size
-    items  = list(all_m[start : start + page_size])
-    return PaginatedResponse.build(
-        [ChatHistoryItem.model_validate(m) for m in items],
-        total, page, page_size
+    return PaginatedResponse.from_page(
+        result, [ChatHistoryItem.model_validate(m) for m in result.items]
     )
 
 
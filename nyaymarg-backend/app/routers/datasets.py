@@ -5,52 +5,78 @@ from __future__ import annotations
 
 import os
 import uuid
-from pathlib import Path
+from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import settings
-from app.core.security import get_current_user, require_role
-from app.models.user import UserRole
-from app.database import get_db
+from app.core.audit import audit_context, audited
+from app.core.security import get_current_user
+from app.database import get_db, get_read_db
 from app.models.dataset import Dataset
-from app.schemas.notification import DatasetOut, DatasetStatusResponse
+from app.schemas.notification import (
+    DatasetOut, DatasetStatusResponse, UploadInitRequest, UploadPartOut, UploadSessionOut,
+)
+from app.services.upload_service import (
+    ResumableUpload, StoredUpload, UploadError, UploadService, UploadTooLarge,
+)
 
-router = APIRouter()
-_UPLOAD_DIR = Path(settings.UPLOAD_DIR)
+router   = APIRouter()
+_uploads = UploadService()
 
+# The body is parsed by hand, so describe the form for the OpenAPI docs
+_UPLOAD_FORM = {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+    "type": "object", "required": ["file"],
+    "properties": {"file": {"type": "string", "format": "binary"}},
+}}}}}
 
-@router.post("/upload", response_model=DatasetOut, status_code=201)
+
+@router.post("/upload", response_model=DatasetOut, status_code=201, openapi_extra=_UPLOAD_FORM)
+@audited("dataset.upload", "dataset", target=lambda r: r.id)
 async def upload_dataset(
-    file:    UploadFile = File(...),
-    current: dict = Depends(get_current_user),
-    db:      AsyncSession = Depends(get_db),
+    request:  Request,
+    response: Response,
+    current:  dict = Depends(get_current_user),
+    db:       AsyncSession = Depends(get_db),
 ):
-    ext = Path(file.filename or "").suffix.lower()
-    if ext not in settings.ALLOWED_EXTENSIONS:
-        raise HTTPException(400, f"Only {settings.ALLOWED_EXTENSIONS} files are allowed")
-
-    _UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    ds_id    = uuid.uuid4()
-    filename = f"{ds_id}{ext}"
-    dest     = _UPLOAD_DIR / filename
-
-    content = await file.read()
-    if len(content) > settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+    """
+    Multipart form with a `file` field, parsed from the request stream and
+    written to disk while hashed; an oversized or disallowed file is refused
+    before its bytes are read. Re-uploading content the caller already has
+    returns that dataset with 200 instead of creating a new one.
+    """
+    length = request.headers.get("content-length")
+    try:
+        stored, filename = await _uploads.store_form(
+            request.stream(), request.headers.get("content-type", ""),
+            int(length) if length and length.isdigit() else None,
+        )
+    except UploadTooLarge:
         raise HTTPException(400, "File exceeds maximum size")
+    except UploadError as exc:
+        raise HTTPException(400, str(exc))
+    return await _register(db, response, current, stored, filename or stored.path.name)
+
 
-    dest.write_bytes(content)
+async def _register(db: AsyncSession, response: Response, current: dict, stored: StoredUpload, name: str) -> DatasetOut:
+    """Create the dataset row for a stored file (or return the caller's duplicate) and queue ingestion."""
+    audit_context(filename=name, size=stored.size, sha256=stored.sha256)
+    existing = await _uploads.find_duplicate(db, current["id"], stored.sha256)
+    if existing is not None:
+        audit_context(duplicate_of=str(existing.id))
+        response.status_code = status.HTTP_200_OK
+        return DatasetOut.model_validate(existing)
 
     ds = Dataset(
-        id=ds_id,
+        id=uuid.uuid4(),
         user_id=current["id"],
-        name=file.filename or filename,
-        filename=filename,
-        file_path=str(dest),
-        file_size=len(content),
+        name=name,
+        filename=stored.path.name,
+        file_path=str(stored.path),
+        file_size=stored.size,
+        checksum=stored.sha256,
         status="pending",
     )
     db.add(ds)
@@ -59,17 +85,98 @@ async def upload_dataset(
     # Trigger background Celery task
     try:
         from app.tasks.ingestion_tasks import process_dataset_task
-        process_dataset_task.delay(str(ds_id), str(dest))
+        process_dataset_task.delay(str(ds.id), str(stored.path))
     except Exception:
         pass  # Celery unavailable in dev — dataset remains in 'pending'
 
     return DatasetOut.model_validate(ds)
 
 
+# ── Resumable uploads ─────────────────────────────────────────────────────────
+
+def _session_out(upload: ResumableUpload) -> UploadSessionOut:
+    received = _uploads.received(upload)
+    missing  = sorted(set(range(1, upload.total_parts + 1)) - set(received))
+    return UploadSessionOut(
+        upload_id=upload.upload_id,
+        filename=upload.filename,
+        size=upload.size,
+        part_size=upload.part_size,
+        total_parts=upload.total_parts,
+        received_parts=received,
+        received_bytes=sum(upload.part_length(p) for p in received),
+        next_part=missing[0] if missing else None,
+        expires_at=datetime.fromtimestamp(_uploads.expires_at(upload), timezone.utc),
+    )
+
+
+def _owned_upload(upload_id: str, current: dict) -> ResumableUpload:
+    upload = _uploads.get(upload_id, current["id"])
+    if upload is None:
+        raise HTTPException(404, "Upload not found")
+    return upload
+
+
+@router.post("/uploads", response_model=UploadSessionOut, status_code=201)
+async def initiate_upload(body: UploadInitRequest, current: dict = Depends(get_current_user)):
+    """
+    Start a resumable upload for files too large for /upload. Send each part
+    with PUT /uploads/{upload_id}/parts/{n}, then POST .../complete.
+    """
+    try:
+        upload = _uploads.initiate(current["id"], body.filename, body.size, body.part_size)
+    except UploadError as exc:
+        raise HTTPException(400, str(exc))
+    return _session_out(upload)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionOut)
+async def upload_progress(upload_id: str, current: dict = Depends(get_current_user)):
+    """Parts received so far; an interrupted client resumes from `next_part`."""
+    return _session_out(_owned_upload(upload_id, current))
+
+
+@router.put("/uploads/{upload_id}/parts/{part}", response_model=UploadPartOut)
+async def upload_part(
+    upload_id: str,
+    part:      int,
+    request:   Request,
+    current:   dict = Depends(get_current_user),
+):
+    """Raw request body = bytes of part `part` (1-based). Re-sending a part replaces it."""
+    upload = _owned_upload(upload_id, current)
+    try:
+        return UploadPartOut(**await _uploads.put_part(upload, part, request.stream()))
+    except UploadError as exc:
+        raise HTTPException(400, str(exc))
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=DatasetOut, status_code=201)
+@audited("dataset.upload", "dataset", target=lambda r: r.id)
+async def complete_upload(
+    upload_id: str,
+    response:  Response,
+    current:   dict = Depends(get_current_user),
+    db:        AsyncSession = Depends(get_db),
+):
+    """Assemble the parts into a dataset (deduplicated like /upload) and queue ingestion."""
+    upload = _owned_upload(upload_id, current)
+    try:
+        stored = await _uploads.complete(upload)
+    except UploadError as exc:
+        raise HTTPException(400, str(exc))
+    return await _register(db, response, current, stored, upload.filename)
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+async def abort_upload(upload_id: str, current: dict = Depends(get_current_user)):
+    _uploads.abort(_owned_upload(upload_id, current))
+
+
 @router.get("/", response_model=list[DatasetOut])
 async def list_datasets(
     current: dict = Depends(get_current_user),
-    db:      AsyncSession = Depends(get_db),
+    db:      AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(
         select(Dataset).where(Dataset.user_id == current["id"]).order_by(Dataset.created_at.desc())
@@ -81,7 +188,7 @@ async def list_datasets(
 async def get_dataset(
     dataset_id: UUID,
     current: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(
         select(Dataset).where(Dataset.id == dataset_id, Dataset.user_id == current["id"])
@@ -96,7 +203,7 @@ async def get_dataset(
 async def dataset_status(
     dataset_id: UUID,
     current: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(
         select(Dataset).where(Dataset.id == dataset_id, Dataset.user_id == current["id"])
@@ -108,6 +215,7 @@ async def dataset_status(
 
 
 @router.delete("/{dataset_id}", status_code=204)
+@audited("dataset.delete", "dataset", target="dataset_id")
 async def delete_dataset(
     dataset_id: UUID,
     current: dict = Depends(get_current_user),
@@ -120,9 +228,9 @@ async def delete_dataset(
     ds = result.scalar_one_or_none()
     if not ds:
         raise HTTPException(404, "Dataset not found")
-    # Delete file
+    # Delete file (kept while another dataset shares the same content)
     try:
-        Path(str(ds.file_path)).unlink(missing_ok=True)
+        await _uploads.release(db, ds)
     except Exception:
         pass
     await db.execute(delete(Dataset).where(Dataset.id == dataset_id))
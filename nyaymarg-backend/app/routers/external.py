@@ -10,65 +10,21 @@ Organised into groups:
   /ecw/*         — eCourtsIndia.com (₹200 free credits)
   /gov/*         — data.gov.in
   /cl/*          — CourtListener (US)
-  /search/*      — Aggregated cross-API search
+  /search/*      — Aggregated cross-API search (ranked or streamed per source)
 """
 from __future__ import annotations
 
+import json
 from typing import Any
-from fastapi import APIRouter, Query
-import httpx
-import logging
+from fastapi import APIRouter, Body, Query
+from fastapi.responses import StreamingResponse
+from app.config import settings
 from app.services.external_service import ExternalService
 
 router = APIRouter()
 _svc = ExternalService()
 
 
-def fetch_case_from_kleopatra(cnr: str):
-    """
-    Helper function to fetch case details from Kleopatra API.
-    CNR format validation: Uppercase, ~16 characters.
-    """
-    # 1. Validation
-    if not isinstance(cnr, str) or not cnr.isupper() or not (15 <= len(cnr) <= 17):
-        return {
-            "status": "invalid",
-            "message": "Invalid CNR format"
-        }
-
-    url = f"https://court-api.kleopatra.io/case/{cnr}"
-
-    # 2. Fetch with 10s timeout
-    try:
-        with httpx.Client(timeout=10.0) as client:
-            resp = client.get(url)
-
-            # 3. Handle Responses
-            if resp.status_code == 200:
-                return {
-                    "status": "success",
-                    "data": resp.json()
-                }
-            elif resp.status_code == 404:
-                return {
-                    "status": "not_found",
-                    "message": "Case not found in provider",
-                    "cnr": cnr
-                }
-            else:
-                logging.error(f"Kleopatra API error: {resp.status_code} for CNR {cnr}")
-                return {
-                    "status": "error",
-                    "message": "External API failed"
-                }
-    except Exception as exc:
-        logging.error(f"Kleopatra API connection failed: {exc}")
-        return {
-            "status": "error",
-            "message": "External API failed"
-        }
-
-
 # ══════════════════════════════════════════════════════════════════════════════
 # Indian Kanoon (IK)
 # ══════════════════════════════════════════════════════════════════════════════
@@ -139,7 +95,29 @@ async def eci_case(cnr: str):
     Full case status from India's eCourts system using the CNR number.
     Uses the Kleopatra API provider.
     """
-    return fetch_case_from_kleopatra(cnr)
+    return await _svc.eci_case(cnr)
+
+
+@router.get("/eci/causelist", summary="Daily cause list for a court")
+async def eci_causelist(
+    court: str = Query(..., description="Court code"),
+    date:  str = Query(..., description="YYYY-MM-DD"),
+):
+    """
+    Scheduled hearings for a court on a date. Each court/date is fetched once
+    and then served from the local snapshot.
+    """
+    return await _svc.eci_causelist(court, date)
+
+
+@router.post("/eci/cases", summary="Get many eCourts cases by CNR")
+async def eci_cases(cnrs: list[str] = Body(..., max_length=settings.ECI_BATCH_MAX_CNRS)):
+    """
+    Resolve a list of CNRs concurrently. Each CNR gets the same result shape as
+    GET /eci/case/{cnr}; duplicates are looked up once. Batches the eciapi
+    rate limit cannot serve within ECI_BATCH_MAX_SECONDS are rejected (422).
+    """
+    return await _svc.eci_cases(cnrs)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -174,6 +152,27 @@ async def ecw_bulk_refresh(cnr_list: list[str]):
     return await _svc.ecw_bulk_refresh(cnr_list)
 
 
+@router.post("/ecw/refresh/jobs", summary="Server-side bulk refresh of many CNRs")
+async def ecw_refresh_job(cnr_list: list[str]):
+    """
+    Accepts any number of CNRs. They are refreshed in 50-CNR provider jobs in
+    the background; CNRs refreshed within the last hour are skipped.
+    """
+    return await _svc.ecw_refresh_job(cnr_list)
+
+
+@router.get("/ecw/refresh/jobs/{job_id}", summary="Bulk refresh job status")
+async def ecw_refresh_job_status(job_id: str):
+    """Poll a bulk refresh job (chunks done, refreshed, failed, progress)."""
+    return await _svc.ecw_refresh_job_status(job_id)
+
+
+@router.get("/ecw/refreshed/{cnr}", summary="Case as of its last bulk refresh")
+async def ecw_refreshed_case(cnr: str):
+    """Serve a bulk-refreshed case from the local store (no credits used)."""
+    return await _svc.ecw_refreshed_case(cnr)
+
+
 @router.get("/ecw/refresh/{cnr}", summary="Force refresh single case")
 async def ecw_force_refresh(cnr: str):
     """Force a live update for a single case."""
@@ -186,6 +185,44 @@ async def ecw_enums():
     return await _svc.ecw_enums()
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# Citation graph (IK precedents + CourtListener citations)
+# ══════════════════════════════════════════════════════════════════════════════
+
+@router.post("/citations/crawl", summary="Grow the local citation graph")
+async def citation_crawl(
+    seeds:     list[str]  = Body(..., description='Node keys, e.g. ["ik:1234567", "cl:2812209"]'),
+    depth:     int        = Query(1, ge=0, le=3),
+    max_nodes: int | None = Query(None, ge=1),
+):
+    """
+    Queue a breadth-first crawl of citation edges from the seed documents.
+    Documents crawled before are expanded from the local graph, not refetched.
+    """
+    return await _svc.citation_crawl(seeds, depth=depth, max_nodes=max_nodes)
+
+
+@router.get("/citations/crawl/{job_id}", summary="Citation crawl job status")
+async def citation_crawl_status(job_id: str):
+    """Poll a crawl job; every API process loads the graph when it finishes."""
+    return await _svc.citation_crawl_status(job_id)
+
+
+@router.get("/citations/top", summary="Most authoritative precedents")
+async def citation_top(
+    n:      int        = Query(20, ge=1, le=200),
+    source: str | None = Query(None, pattern="^(ik|cl)$"),
+):
+    """Documents ranked by PageRank authority over the citation graph."""
+    return await _svc.citation_top(n=n, source=source)
+
+
+@router.get("/citations/{source}/{doc_id}", summary="Citation stats for a document")
+async def citation_node(source: str, doc_id: str, k: int = Query(1, ge=1, le=3)):
+    """In/out degree, authority score and k-hop citation neighbourhood."""
+    return await _svc.citation_node(source, doc_id, k=k)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # data.gov.in (OGD Platform)
 # ══════════════════════════════════════════════════════════════════════════════
@@ -208,6 +245,21 @@ async def gov_disposal(year: int | None = Query(None, ge=2000)):
     return await _svc.gov_disposal(year=year)
 
 
+@router.post("/gov/sync", summary="Sync data.gov.in resources locally")
+async def gov_sync(resources: list[str] | None = Query(None)):
+    """
+    Queue a paginated sync of the data.gov.in resources into local tables.
+    Runs weekly on its own; /gov/* endpoints are answered locally afterwards.
+    """
+    return await _svc.gov_sync(resources)
+
+
+@router.get("/gov/sync/{job_id}", summary="data.gov.in sync job status")
+async def gov_sync_status(job_id: str):
+    """Poll a sync job; every API process refreshes its DataFrames when it finishes."""
+    return await _svc.gov_sync_status(job_id)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # CourtListener (International / Reference)
 # ══════════════════════════════════════════════════════════════════════════════
@@ -263,6 +315,32 @@ async def search_all(
     return await _svc.fan_out_search(q, include_international=intl, max_results=max)
 
 
+@router.get("/search/stream", summary="Stream cross-API search results per source")
+async def search_stream(
+    q:      str  = Query(...),
+    intl:   bool = Query(False, description="Include international results (CourtListener)"),
+    max:    int  = Query(20, ge=1, le=100),
+    format: str  = Query("ndjson", pattern="^(ndjson|sse)$"),
+):
+    """
+    Same fan-out as /search/all, but each source's results are sent as soon as
+    that source answers. Emits one `source` event per API (ok | error | timeout |
+    skipped) and a final `done` event with the merged, ranked list.
+    """
+    events = _svc.fan_out_search_stream(q, include_international=intl, max_results=max)
+
+    async def body():
+        async for event in events:
+            payload = json.dumps(event, default=str)
+            if format == "sse":
+                yield f"event: {event['event']}\ndata: {payload}\n\n"
+            else:
+                yield payload + "\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
 @router.post("/case/{case_id}/enrich", summary="Enrich synthetic case with real data")
 async def enrich_case(case_id: str):
     """
@@ -272,6 +350,26 @@ async def enrich_case(case_id: str):
     return await _svc.enrich_case(case_id)
 
 
+@router.post("/enrich/batch", summary="Batch-enrich synthetic cases with real data")
+async def enrich_batch(
+    court_id:  str | None = Query(None),
+    state:     str | None = Query(None),
+    case_type: str | None = Query(None),
+    limit:     int | None = Query(None, ge=1),
+):
+    """
+    Queues a background job that enriches every matching case. Cases sharing the
+    same text template share one IK lookup; previously answered lookups are free.
+    """
+    return await _svc.enrich_cases_batch(court_id=court_id, state=state, case_type=case_type, limit=limit)
+
+
+@router.get("/enrich/batch/{job_id}", summary="Batch enrichment job status")
+async def enrich_batch_status(job_id: str):
+    """Poll a batch enrichment job; every API process applies the results when it finishes."""
+    return await _svc.enrich_batch_status(job_id)
+
+
 @router.post("/ik/import", summary="Import real cases into analytics")
 async def import_ik_cases(query: str = Query(...), count: int = Query(50, ge=1, le=200)):
     """
@@ -279,3 +377,12 @@ async def import_ik_cases(query: str = Query(...), count: int = Query(50, ge=1,
     similarity index. Triggers an async Celery worker.
     """
     return await _svc.import_ik_cases(query, max_cases=count)
+
+
+@router.get("/ik/import/{job_id}", summary="IK import job status")
+async def import_ik_status(job_id: str):
+    """
+    Poll an IK import job (page, imported, failed, progress). When the job has
+    finished, every API process merges its cases into the similarity index.
+    """
+    return await _svc.import_ik_status(job_id)
@@ -3,14 +3,18 @@ app/routers/ml_models.py — ML model management (Admin/Researcher only).
 """
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user, require_role
+from app.models.dataset import Dataset
 from app.models.user import UserRole
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.data.seed import get_registry
-from app.schemas.notification import TrainJobResponse, TrainJobStatus
+from app.schemas.notification import TrainJobResponse, TrainJobStatus, TrainRequest
 
 router = APIRouter()
 
@@ -21,6 +25,7 @@ async def active_model(
 ):
     registry = get_registry()
     return {
+        "version":           registry.models.version,
         "rf_model_loaded":   registry.rf_model is not None,
         "lr_model_loaded":   registry.lr_model is not None,
         "vectorizer_loaded": registry.vectorizer is not None,
@@ -32,18 +37,41 @@ async def active_model(
 @router.post("/train", response_model=TrainJobResponse,
              dependencies=[require_role(UserRole.admin, UserRole.researcher)])
 async def trigger_training(
+    body: Optional[TrainRequest] = None,
     current: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Trigger model retraining as a background Celery task."""
+    """
+    Trigger model retraining as a background Celery task. With a dataset_id,
+    trains on that (ready) dataset's Parquet conversion; hyperparameters
+    left out keep their defaults.
+    """
+    body = body or TrainRequest()
+    hyperparameters = body.model_dump(exclude={"dataset_id"}, exclude_none=True)
+    dataset = {}
+    if body.dataset_id:
+        ds = (await db.execute(
+            select(Dataset).where(Dataset.id == body.dataset_id, Dataset.user_id == current["id"])
+        )).scalar_one_or_none()
+        if not ds:
+            raise HTTPException(404, "Dataset not found")
+        parquet = (ds.schema_info or {}).get("parquet")
+        if ds.status != "ready" or not parquet:
+            raise HTTPException(409, "Dataset is not ready for training (needs status 'ready' and a Parquet conversion)")
+        dataset = {"dataset_id": str(ds.id), "dataset_path": parquet, "checksum": ds.checksum}
+
     try:
         from app.tasks.training_tasks import train_models_task
-        task = train_models_task.delay(triggered_by=current.get("email", "unknown"))
+        task = train_models_task.delay(triggered_by=current.get("email", "unknown"),
+                                       hyperparameters=hyperparameters, **dataset)
         return TrainJobResponse(job_id=task.id, message="Training job queued")
     except Exception:
         # Celery not running — run synchronously
         from app.ml.trainer import train_all_models
-        import asyncio
-        metrics = await train_all_models()
+        try:
+            await train_all_models(dataset.get("dataset_path"), dataset.get("checksum"), hyperparameters)
+        except ValueError as exc:
+            raise HTTPException(422, str(exc))
         return TrainJobResponse(job_id="sync", message="Trained synchronously (Celery unavailable)")
 
 
@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.schemas.common import PaginatedResponse
 from app.schemas.notification import NotificationOut, UnreadCountResponse
 from app.services.notification_service import NotificationService
@@ -23,20 +23,20 @@ async def list_notifications(
     unread_only: bool = Query(False),
     page:        int  = Query(1, ge=1),
     page_size:   int  = Query(20, ge=1, le=100),
+    cursor:      str | None = Query(None, description="next_cursor of the previous page (keyset)"),
     current: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    items, total = await _svc.list_for_user(db, current["id"], unread_only, page, page_size)
-    return PaginatedResponse.build(
-        [NotificationOut.model_validate(n) for n in items],
-        total, page, page_size
+    result = await _svc.list_for_user(db, current["id"], unread_only, page, page_size, cursor)
+    return PaginatedResponse.from_page(
+        result, [NotificationOut.model_validate(n) for n in result.items]
     )
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
 async def unread_count(
     current: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     count = await _svc.unread_count(db, current["id"])
     return UnreadCountResponse(count=count)
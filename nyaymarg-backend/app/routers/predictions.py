@@ -11,10 +11,11 @@ from fastapi.responses import Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit import audited
 from app.core.exceptions import NotFoundError
 from app.core.security import detect_pii, get_current_user
 from app.core.exceptions import PIIDetectedError
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.prediction import Prediction
 from app.schemas.common import PaginatedResponse
 from app.schemas.prediction import (
@@ -25,6 +26,7 @@ from app.schemas.prediction import (
 )
 from app.services.export_service import ExportService
 from app.services.prediction_service import PredictionService
+from app.utils.pagination import paginate
 
 router   = APIRouter()
 _svc     = PredictionService()
@@ -32,6 +34,7 @@ _exporter = ExportService()
 
 
 @router.post("/", response_model=PredictionResponse, status_code=201)
+@audited("prediction.create", "prediction", target=lambda r: r.prediction_id)
 async def predict(
     req:     PredictionRequest,
     current: dict = Depends(get_current_user),
@@ -44,6 +47,7 @@ async def predict(
 
 
 @router.post("/batch", response_model=list[PredictionResponse])
+@audited("prediction.batch", "prediction", target=lambda r: len(r))
 async def predict_batch(
     req:     BatchPredictionRequest,
     current: dict = Depends(get_current_user),
@@ -65,22 +69,17 @@ async def predict_court_risk(req):
 async def prediction_history(
     page:      int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor:    str | None = Query(None, description="next_cursor of the previous page (keyset)"),
     current:   dict = Depends(get_current_user),
-    db:        AsyncSession = Depends(get_db),
+    db:        AsyncSession = Depends(get_read_db),
 ):
-    stmt = (
-        select(Prediction)
-        .where(Prediction.user_id == current["id"])
-        .order_by(Prediction.created_at.desc())
+    stmt   = select(Prediction).where(Prediction.user_id == current["id"])
+    result = await paginate(
+        db, stmt, keys=(Prediction.created_at, Prediction.id),
+        page=page, page_size=page_size, cursor=cursor,
     )
-    result = await db.execute(stmt)
-    all_p  = result.scalars().all()
-    total  = len(all_p)
-    start  = (page - 1) * page_size
-    page_items = list(all_p[start : start + page_size])
-    return PaginatedResponse.build(
-        [PredictionHistoryItem.model_validate(p) for p in page_items],
-        total, page, page_size
+    return PaginatedResponse.from_page(
+        result, [PredictionHistoryItem.model_validate(p) for p in result.items]
     )
 
 
@@ -88,7 +87,7 @@ async def prediction_history(
 async def export_prediction(
     prediction_id: UUID,
     current: dict  = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(
         select(Prediction).where(
@@ -118,7 +117,7 @@ async def export_prediction(
 async def get_prediction(
     prediction_id: UUID,
     current: dict  = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     result = await db.execute(
         select(Prediction).where(
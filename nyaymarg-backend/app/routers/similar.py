@@ -19,6 +19,7 @@ async def search_similar(req: SimilaritySearchRequest):
         top_n=req.top_n,
         court_filter=req.court_filter,
         outcome_filter=req.outcome_filter,
+        authority_weight=req.authority_weight,
     )
 
 
@@ -9,11 +9,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.audit import audited
 from app.core.security import require_role
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.schemas.common import PaginatedResponse
 from app.schemas.user import AdminRoleChange, UserOut
+from app.utils.pagination import paginate
 
 router = APIRouter()
 _admin_only = require_role(UserRole.admin)
@@ -24,20 +26,18 @@ _admin_only = require_role(UserRole.admin)
 async def list_users(
     page:      int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor:    str | None = Query(None, description="next_cursor of the previous page (keyset)"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    result = await db.execute(select(User).order_by(User.created_at.desc()))
-    all_u  = result.scalars().all()
-    total  = len(all_u)
-    start  = (page - 1) * page_size
-    return PaginatedResponse.build(
-        [UserOut.model_validate(u) for u in all_u[start : start + page_size]],
-        total, page, page_size
+    result = await paginate(
+        db, select(User), keys=(User.created_at, User.id),
+        page=page, page_size=page_size, cursor=cursor,
     )
+    return PaginatedResponse.from_page(result, [UserOut.model_validate(u) for u in result.items])
 
 
 @router.get("/{user_id}", response_model=UserOut, dependencies=[_admin_only])
-async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_user(user_id: UUID, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(User).where(User.id == user_id))
     user   = result.scalar_one_or_none()
     if not user:
@@ -46,6 +46,7 @@ async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
 
 
 @router.put("/{user_id}/role", response_model=UserOut, dependencies=[_admin_only])
+@audited("user.role_change", "user", target="user_id", body="body")
 async def change_role(
     user_id: UUID,
     body:    AdminRoleChange,
@@ -61,5 +62,6 @@ async def change_role(
 
 
 @router.put("/{user_id}/deactivate", status_code=204, dependencies=[_admin_only])
+@audited("user.deactivate", "user", target="user_id")
 async def deactivate_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
     await db.execute(update(User).where(User.id == user_id).values(is_active=False))
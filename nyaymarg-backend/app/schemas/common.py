@@ -3,10 +3,13 @@ app/schemas/common.py — Shared pagination and base response schemas.
 """
 from __future__ import annotations
 
-from typing import Generic, List, TypeVar
+from typing import TYPE_CHECKING, Generic, List, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from app.utils.pagination import Page
+
 T = TypeVar("T")
 
 
@@ -17,11 +20,21 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page:        int
     page_size:   int
     total_pages: int
+    next_cursor:     Optional[str] = None   # pass as ?cursor= for the next page (keyset)
+    total_estimated: bool          = False  # total is a planner estimate, not a COUNT
 
     @classmethod
-    def build(cls, items: List[T], total: int, page: int, page_size: int) -> "PaginatedResponse[T]":
+    def build(cls, items: List[T], total: int, page: int, page_size: int, **extra) -> "PaginatedResponse[T]":
         pages = (total + page_size - 1) // page_size if page_size else 1
-        return cls(items=items, total=total, page=page, page_size=page_size, total_pages=pages)
+        return cls(items=items, total=total, page=page, page_size=page_size, total_pages=pages, **extra)
+
+    @classmethod
+    def from_page(cls, page: "Page", items: List[T]) -> "PaginatedResponse[T]":
+        """Wrap a utils.pagination.Page whose ORM rows were converted to `items`."""
+        return cls.build(
+            items, page.total, page.page, page.page_size,
+            next_cursor=page.next_cursor, total_estimated=page.total_estimated,
+        )
 
 
 class MessageResponse(BaseModel):
@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class NotificationOut(BaseModel):
@@ -33,6 +33,7 @@ class DatasetOut(BaseModel):
     name:         str
     filename:     str
     file_size:    int
+    checksum:     Optional[str] = None
     row_count:    Optional[int]
     status:       str
     schema_info:  Optional[dict]
@@ -78,13 +79,15 @@ class SimilarCase(BaseModel):
     outcome_label:    str
     similarity_score: float
     filing_date:      Optional[str]
+    authority:        Optional[float] = None   # citation-graph PageRank, 0..1
 
 
 class SimilaritySearchRequest(BaseModel):
-    query:          str
-    top_n:          int = 5
-    court_filter:   Optional[str] = None
-    outcome_filter: Optional[str] = None   # Decided | Pending
+    query:            str
+    top_n:            int = 5
+    court_filter:     Optional[str] = None
+    outcome_filter:   Optional[str] = None     # Decided | Pending
+    authority_weight: Optional[float] = None   # boost for cited authority; None = server default
 
 
 # ── ML Model schemas ───────────────────────────────────────────────────────────
@@ -102,6 +105,14 @@ class MLModelVersionOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TrainRequest(BaseModel):
+    dataset_id:   Optional[uuid.UUID] = Field(None, description="Train on this ready dataset instead of the synthetic corpus")
+    n_estimators: Optional[int]       = Field(None, ge=10, le=2000)
+    max_depth:    Optional[int]       = Field(None, ge=1, le=100)
+    C:            Optional[float]     = Field(None, gt=0, le=1000)
+    max_iter:     Optional[int]       = Field(None, ge=50, le=10_000)
+
+
 class TrainJobResponse(BaseModel):
     job_id:  str
     message: str
@@ -115,3 +126,27 @@ class TrainJobStatus(BaseModel):
     label:    Optional[str]
     result:   Optional[dict]
     error:    Optional[str]
+
+
+class UploadInitRequest(BaseModel):
+    filename:  str           = Field(min_length=1, max_length=200)
+    size:      int           = Field(gt=0, description="Total file size in bytes")
+    part_size: Optional[int] = Field(None, description="Bytes per part; default RESUMABLE_UPLOAD_PART_SIZE_MB")
+
+
+class UploadSessionOut(BaseModel):
+    upload_id:      str
+    filename:       str
+    size:           int
+    part_size:      int
+    total_parts:    int
+    received_parts: list[int]
+    received_bytes: int
+    next_part:      Optional[int]   # first part not yet received; None when complete
+    expires_at:     datetime
+
+
+class UploadPartOut(BaseModel):
+    part:   int
+    size:   int
+    sha256: str
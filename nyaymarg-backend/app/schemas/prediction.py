@@ -32,6 +32,7 @@ class PredictionResponse(BaseModel):
     top_features:        list[dict]
     similar_cases_count: int = 0
     analyzed_at:         datetime
+    model_version:       Optional[str] = None   # artefact store version that answered
 
 
 class PredictionHistoryItem(BaseModel):
@@ -7,7 +7,7 @@ Architecture is LLM-ready — swap _generate_reply() for an LLM call in v3.0.
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app.schemas.chat import ChatResponse
 
@@ -103,8 +103,7 @@ class ChatService:
         now    = datetime.now(timezone.utc)
 
         if db is not None:
-            await self._persist(db, user_id, session_id, "user",      message, intent, None)
-            await self._persist(db, user_id, session_id, "assistant", reply,   intent, cta)
+            await self._persist(db, user_id, session_id, message, reply, intent, cta)
 
         return ChatResponse(
             reply=reply,
@@ -115,15 +114,16 @@ class ChatService:
         )
 
     @staticmethod
-    async def _persist(db, user_id, session_id, role, content, intent, cta):
+    async def _persist(db, user_id, session_id, message, reply, intent, cta):
+        """Store the exchange in one write; the reply is stamped 1µs after the question."""
+        from app.core.write_behind import persist
         from app.models.chat_message import ChatMessage
-        msg = ChatMessage(
-            user_id=user_id,
-            session_id=session_id,
-            role=role,
-            content=content,
-            intent=intent,
-            cta=cta,
+        asked = datetime.utcnow()
+        await persist(
+            db,
+            ChatMessage(user_id=user_id, session_id=session_id, role="user",
+                        content=message, intent=intent, cta=None, created_at=asked),
+            ChatMessage(user_id=user_id, session_id=session_id, role="assistant",
+                        content=reply, intent=intent, cta=cta,
+                        created_at=asked + timedelta(microseconds=1)),
         )
-        db.add(msg)
-        await db.flush()
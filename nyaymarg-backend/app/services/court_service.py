@@ -81,7 +81,8 @@ class CourtService:
         from app.core.exceptions import ModelNotReadyError
 
         registry = get_registry()
-        if registry.rf_model is None:
+        rf_model = registry.rf_model        # one model for probability + importances
+        if rf_model is None:
             raise ModelNotReadyError()
 
         import numpy as np
@@ -98,7 +99,7 @@ class CourtService:
         ]
         import pandas as pd
         X = pd.DataFrame([feature_vec], columns=RF_FEATURES)
-        prob = float(registry.rf_model.predict_proba(X)[0][1])
+        prob = float(rf_model.predict_proba(X)[0][1])
 
         if prob > 0.6:
             label = "High Risk"
@@ -108,7 +109,7 @@ class CourtService:
             label = "Low Risk"
 
         # Feature importances
-        importances = registry.rf_model.feature_importances_
+        importances = rf_model.feature_importances_
         factors = [
             {"feature": f, "importance": round(float(imp), 4), "value": float(val)}
             for f, imp, val in sorted(
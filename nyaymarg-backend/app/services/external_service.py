@@ -8,18 +8,20 @@ Responsibilities:
   - Enforce ENABLED flag before calling (fallback to empty list)
   - Integrate real IK results into the similarity index
   - Enrich synthetic cases with real judgment text
+  - Keep cleaned text of fetched documents in the local store (doc_store.py)
+    so fragments and metadata are answered without refetching
 """
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+import time
+from typing import Any, AsyncIterator
 
-import re
-import html
 import structlog
 
 from app.config import settings
 from app.external.aggregator import LegalSearchAggregator
+from app.external.doc_store import StoredDocument, clean_html, doc_store
 
 logger = structlog.get_logger(__name__)
 aggregator = LegalSearchAggregator()
@@ -43,40 +45,35 @@ class ExternalService:
         if not settings.IK_ENABLED:
             return _disabled("IK")
         from app.external.indian_kanoon.client import IndianKanoonClient
-        return await IndianKanoonClient().get_document(doc_id)
+        start    = time.perf_counter()
+        doc_data = await IndianKanoonClient().get_document(doc_id)
+        if isinstance(doc_data, dict):
+            await self._remember(
+                "indian_kanoon", doc_id, doc_data, doc_data.get("doc") or "",
+                (time.perf_counter() - start) * 1000,
+            )
+        return doc_data
 
     async def ik_fragment(self, doc_id: int, query: str) -> dict:
         if not settings.IK_ENABLED:
             return _disabled("IK")
-        
-        from app.external.indian_kanoon.client import IndianKanoonClient
-        client = IndianKanoonClient()
-        
+
         try:
-            # Get full document text (HTML)
-            doc_data = await client.get_document(doc_id)
-            if isinstance(doc_data, dict) and "error" in doc_data:
-                return doc_data
-            
-            # HTML cleaning
-            html_content = doc_data.get("doc", "")
-            if not html_content:
+            # Clean text + positional index from the local store; fetched once
+            doc = await self.ik_stored_document(doc_id)
+            if isinstance(doc, dict):
+                return doc
+            if not doc.text:
                 return {"fragment": "No match found"}
-                
-            clean_text = self._clean_html(html_content)
-            
-            # Case-insensitive search
-            query_lower = query.lower()
-            text_lower = clean_text.lower()
-            
-            idx = text_lower.find(query_lower)
-            if idx == -1:
+
+            hits = await doc_store.find("indian_kanoon", doc_id, query)
+            if not hits:
                 return {"fragment": "No match found"}
-            
+
             # Extract snippet (±80 chars)
-            snippet = self._extract_snippet(clean_text, idx, len(query))
+            snippet = self._extract_snippet(doc.text, hits[0], len(query))
             return {"fragment": snippet}
-            
+
         except Exception as exc:
             logger.error("ik.fragment_failed", doc_id=doc_id, error=str(exc))
             return {"error": "Error in evaluating the fragments", "detail": str(exc)}
@@ -84,14 +81,18 @@ class ExternalService:
     async def ik_metadata(self, doc_id: int) -> dict:
         if not settings.IK_ENABLED:
             return _disabled("IK")
-            
+
+        stored = await doc_store.get("indian_kanoon", doc_id)
+        if stored is not None and stored.meta.get("title"):
+            return self._normalise_ik_meta(stored.meta)
+
         from app.external.indian_kanoon.client import IndianKanoonClient
         client = IndianKanoonClient()
-        
+
         try:
             # Try getting metadata directly
             meta = await client.get_metadata(doc_id)
-            
+
             # Check if metadata failed or returned an error
             has_error = False
             if isinstance(meta, dict):
@@ -101,34 +102,81 @@ class ExternalService:
                     has_error = True
 
             if has_error:
-                # Fallback to get_document which often contains metadata in its wrapper
-                doc_data = await client.get_document(doc_id)
-                if isinstance(doc_data, dict) and "error" in doc_data:
+                # Fallback to the full document, whose wrapper carries the metadata
+                doc = await self.ik_stored_document(doc_id)
+                if isinstance(doc, dict):
                     return {"error": "Document not found"}
-                meta = doc_data
-
-            # Normalize response to requested structure
-            return {
-                "title":    meta.get("title") or meta.get("headline", "Unknown Title"),
-                "date":     meta.get("publishdate") or meta.get("date", "Unknown Date"),
-                "court":    meta.get("court") or "Unknown Court",
-                "citation": meta.get("docsource") or meta.get("citation", "Unknown Citation")
-            }
-            
+                meta = doc.meta
+            else:
+                await doc_store.put("indian_kanoon", doc_id, meta=self._ik_meta_fields(meta))
+
+            return self._normalise_ik_meta(meta)
+
         except Exception as exc:
             logger.error("ik.metadata_failed", doc_id=doc_id, error=str(exc))
             return {"error": "Document not found"}
 
+    async def ik_stored_document(self, doc_id: int) -> StoredDocument | dict:
+        """Stored IK document, fetching + cleaning it on first use. Error dict on failure."""
+        stored = await doc_store.get("indian_kanoon", doc_id)
+        if stored is not None and stored.text is not None:
+            return stored
+
+        from app.external.indian_kanoon.client import IndianKanoonClient
+        start    = time.perf_counter()
+        doc_data = await IndianKanoonClient().get_document(doc_id)
+        fetch_ms = (time.perf_counter() - start) * 1000
+        if isinstance(doc_data, dict) and "error" in doc_data:
+            return doc_data
+
+        start    = time.perf_counter()
+        text     = self._clean_html(doc_data.get("doc", ""))
+        clean_ms = (time.perf_counter() - start) * 1000
+        meta     = self._ik_meta_fields(doc_data)
+        await doc_store.put(
+            "indian_kanoon", doc_id, text=text, meta=meta, fetch_ms=fetch_ms, clean_ms=clean_ms,
+        )
+        return StoredDocument(
+            source="indian_kanoon", doc_id=str(doc_id), text=text, meta=meta,
+            fetch_ms=fetch_ms, clean_ms=clean_ms,
+        )
+
+    @staticmethod
+    def _ik_meta_fields(data: dict) -> dict:
+        """The small metadata fields of an IK doc/docmeta payload (never the HTML)."""
+        keys = ("title", "headline", "publishdate", "date", "court", "docsource",
+                "citation", "citeList", "citedbyList", "ai_tags", "precedents")
+        return {k: data[k] for k in keys if data.get(k) is not None}
+
+    @staticmethod
+    def _normalise_ik_meta(meta: dict) -> dict:
+        return {
+            "title":    meta.get("title") or meta.get("headline", "Unknown Title"),
+            "date":     meta.get("publishdate") or meta.get("date", "Unknown Date"),
+            "court":    meta.get("court") or "Unknown Court",
+            "citation": meta.get("docsource") or meta.get("citation", "Unknown Citation")
+        }
+
+    async def _remember(self, source: str, doc_id: Any, data: Any, text: str, fetch_ms: float) -> None:
+        """Keep the cleaned text of a fetched document; never fails the request."""
+        if not isinstance(data, dict) or "error" in data or not text:
+            return
+        try:
+            start = time.perf_counter()
+            clean = self._clean_html(text)
+            await doc_store.put(
+                source, doc_id, text=clean,
+                meta={k: v for k, v in data.items() if isinstance(v, (str, int, float)) and len(str(v)) < 512},
+                fetch_ms=fetch_ms, clean_ms=(time.perf_counter() - start) * 1000,
+            )
+        except Exception as exc:
+            logger.warning("doc_store.put_failed", source=source, doc_id=doc_id, error=str(exc))
+
     # ── Helpers ───────────────────────────────────────────────────────────────
 
     def _clean_html(self, raw_html: str) -> str:
         """Strip tags and normalize whitespace without external dependencies."""
-        # Unescape HTML entities
-        text = html.unescape(raw_html)
-        # Strip tags using regex
-        text = re.sub(r'<[^>]*>', ' ', text)
-        # Normalize whitespace
-        return re.sub(r'\s+', ' ', text).strip()
+        return clean_html(raw_html)
 
     def _extract_snippet(self, text: str, match_idx: int, query_len: int, context: int = 80) -> str:
         """Extract a meaningful snippet around a match."""
@@ -168,7 +216,82 @@ class ExternalService:
         from app.external.kanoon_dev.client import KanoonDevClient
         return await KanoonDevClient().get_insights(case_id)
 
-    # ══ ECIAPI (discontinued akshit.me provider removed) ═════════════════════
+    # ══ ECIAPI (Kleopatra court-api) ═════════════════════════════════════════
+
+    @staticmethod
+    def _valid_cnr(cnr: Any) -> bool:
+        """CNR format: upper-case, ~16 characters (e.g. DLHC010001232024)."""
+        return isinstance(cnr, str) and cnr.isupper() and 15 <= len(cnr) <= 17
+
+    async def eci_case(self, cnr: str, timeout: float | None = None) -> dict:
+        """
+        Case status by CNR through the shared async client (cache, coalescing,
+        rate limit, circuit breaker), bounded by `timeout` (default
+        ECI_CNR_TIMEOUT_SECONDS).
+        """
+        if not self._valid_cnr(cnr):
+            return {"status": "invalid", "message": "Invalid CNR format"}
+        from app.external.ecourts.eciapi_client import ECIAPIClient
+        try:
+            data = await asyncio.wait_for(
+                ECIAPIClient().get_case_by_cnr(cnr), timeout or settings.ECI_CNR_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("eci.case_timeout", cnr=cnr)
+            return {"status": "error", "message": "External API timed out", "cnr": cnr}
+
+        if isinstance(data, dict) and "error" in data:
+            if data.get("status") == 404:
+                return {"status": "not_found", "message": "Case not found in provider", "cnr": cnr}
+            logger.error("eci.case_failed", cnr=cnr, error=data["error"])
+            return {"status": "error", "message": "External API failed"}
+        return {"status": "success", "data": data}
+
+    async def eci_causelist(self, court: str, date: str) -> Any:
+        """Daily cause list, served from the local snapshot after the first fetch."""
+        from app.external.causelists import get_causelist
+        return await get_causelist("eciapi", court, date)
+
+    async def eci_cases(self, cnrs: list[str]) -> dict:
+        """
+        Resolve many CNRs concurrently; duplicates are looked up once.
+
+        At most the limiter's max_in_flight lookups run at a time, so a CNR's
+        deadline only starts once it is next in line. It then covers the
+        upstream call plus at most one full round of rate tokens. Batches the
+        source's rate cannot get through within ECI_BATCH_MAX_SECONDS are
+        rejected up front instead of timing out CNR by CNR.
+        """
+        from app.core.exceptions import ValidationError
+        from app.external.ecourts.eciapi_client import ECIAPIClient
+
+        unique  = list(dict.fromkeys(cnrs))
+        client  = ECIAPIClient()
+        limiter = client._limiter()
+        lookups = sum(1 for c in unique if self._valid_cnr(c))
+        if limiter.rate > 0:
+            needed = max(0, lookups - limiter.capacity) / limiter.rate
+            if needed > settings.ECI_BATCH_MAX_SECONDS:
+                most = int(limiter.capacity + limiter.rate * settings.ECI_BATCH_MAX_SECONDS)
+                raise ValidationError(
+                    f"{lookups} CNR lookups need ~{needed:.0f}s at the eciapi rate limit "
+                    f"({limiter.rate * 60:.0f}/min); send at most {most} per request",
+                )
+
+        in_flight = max(1, client.max_in_flight)
+        token_gap = in_flight / limiter.rate if limiter.rate > 0 else 0.0
+        sem       = asyncio.Semaphore(in_flight)
+
+        async def lookup(cnr: str) -> dict:
+            async with sem:
+                return await self.eci_case(cnr, timeout=settings.ECI_CNR_TIMEOUT_SECONDS + token_gap)
+
+        results = await asyncio.gather(*(lookup(c) for c in unique))
+        by_cnr  = dict(zip(unique, results))
+        counts: dict[str, int] = {}
+        for r in results:
+            counts[r["status"]] = counts.get(r["status"], 0) + 1
+        return {"results": by_cnr, "counts": counts}
 
     # ══ eCourtsIndia.com ═════════════════════════════════════════════════════
 
@@ -181,14 +304,21 @@ class ExternalService:
     async def ecw_causelist(self, court: str, date: str, bench: str | None = None) -> Any:
         if not settings.ECOURTSINDIA_ENABLED:
             return _disabled("ECOURTSINDIA")
-        from app.external.ecourts.ecourtsindia_client import ECourtsIndiaClient
-        return await ECourtsIndiaClient().get_causelist(court, date, bench=bench)
+        from app.external.causelists import get_causelist
+        return await get_causelist("ecourtsindia", court, date, bench=bench or "")
 
     async def ecw_order(self, cnr: str, order_id: str) -> Any:
         if not settings.ECOURTSINDIA_ENABLED:
             return _disabled("ECOURTSINDIA")
         from app.external.ecourts.ecourtsindia_client import ECourtsIndiaClient
-        return await ECourtsIndiaClient().get_order(cnr, order_id)
+        start = time.perf_counter()
+        order = await ECourtsIndiaClient().get_order(cnr, order_id)
+        if isinstance(order, dict):
+            await self._remember(
+                "ecourtsindia", f"{cnr}/{order_id}", order,
+                order.get("markdown_text") or "", (time.perf_counter() - start) * 1000,
+            )
+        return order
 
     async def ecw_bulk_refresh(self, cnr_list: list[str]) -> Any:
         if not settings.ECOURTSINDIA_ENABLED:
@@ -196,6 +326,26 @@ class ExternalService:
         from app.external.ecourts.ecourtsindia_client import ECourtsIndiaClient
         return await ECourtsIndiaClient().bulk_refresh(cnr_list)
 
+    async def ecw_refresh_job(self, cnr_list: list[str]) -> dict:
+        """Queue a server-side bulk refresh of any number of CNRs."""
+        if not settings.ECOURTSINDIA_ENABLED:
+            return _disabled("ECOURTSINDIA")
+        from app.external.ecourts.bulk_refresh import normalise_cnrs
+        from app.tasks.ingestion_tasks import ecw_bulk_refresh_task
+        cnrs = normalise_cnrs(cnr_list)
+        task = ecw_bulk_refresh_task.delay(cnrs)
+        return {"job_id": task.id, "status": "queued", "cnrs": len(cnrs)}
+
+    async def ecw_refresh_job_status(self, job_id: str) -> dict:
+        from app.tasks.celery_app import job_status
+        return job_status(job_id)
+
+    async def ecw_refreshed_case(self, cnr: str) -> dict:
+        """Locally stored copy of a case from the last bulk refresh."""
+        from app.external.ecourts.bulk_refresh import stored_case
+        case = await stored_case(cnr)
+        return case if case is not None else {"error": "CNR not refreshed yet", "cnr": cnr}
+
     async def ecw_force_refresh(self, cnr: str) -> Any:
         if not settings.ECOURTSINDIA_ENABLED:
             return _disabled("ECOURTSINDIA")
@@ -213,21 +363,82 @@ class ExternalService:
     async def gov_infrastructure(self, state: str | None = None) -> Any:
         if not settings.DATA_GOV_ENABLED:
             return _disabled("DATA_GOV")
+        local = await self._gov_local("infrastructure", state=state)
+        if local is not None:
+            return local
         from app.external.data_gov.client import DataGovClient
-        return await DataGovClient().get_court_infrastructure()
+        return await DataGovClient().get_court_infrastructure(state=state)
 
     async def gov_pendency(self, state: str | None = None) -> Any:
         if not settings.DATA_GOV_ENABLED:
             return _disabled("DATA_GOV")
+        local = await self._gov_local("pendency", state=state)
+        if local is not None:
+            return local
         from app.external.data_gov.client import DataGovClient
         return await DataGovClient().get_pendency_stats(state=state)
 
     async def gov_disposal(self, year: int | None = None) -> Any:
         if not settings.DATA_GOV_ENABLED:
             return _disabled("DATA_GOV")
+        local = await self._gov_local("disposal", year=year)
+        if local is not None:
+            return local
         from app.external.data_gov.client import DataGovClient
         return await DataGovClient().get_disposal_rates(year=year)
 
+    async def _gov_local(self, resource: str, **filters: Any) -> dict | None:
+        """Answer from the synced mirror; None (→ proxy upstream) if never synced."""
+        from app.data.gov_sync import query_records
+        try:
+            return await query_records(resource, **filters)
+        except Exception as exc:
+            logger.warning("gov.local_query_failed", resource=resource, error=str(exc))
+            return None
+
+    async def gov_sync(self, resources: list[str] | None = None) -> dict:
+        """Queue a full data.gov.in sync (normally run weekly by Celery beat)."""
+        if not settings.DATA_GOV_ENABLED:
+            return _disabled("DATA_GOV")
+        from app.external.data_gov.client import RESOURCES
+        unknown = [r for r in resources or [] if r not in RESOURCES]
+        if unknown:
+            return {"error": f"Unknown resources {unknown}; expected any of {sorted(RESOURCES)}"}
+        from app.tasks.ingestion_tasks import sync_data_gov_task
+        task = sync_data_gov_task.delay(resources)
+        return {"job_id": task.id, "status": "queued"}
+
+    async def gov_sync_status(self, job_id: str) -> dict:
+        """Poll a sync job (API processes reload the mirror when it announces completion)."""
+        from app.tasks.celery_app import job_status
+        return job_status(job_id)
+
+    # ══ Citation graph ═══════════════════════════════════════════════════════
+
+    async def citation_crawl(self, seeds: list[str], depth: int = 1, max_nodes: int | None = None) -> dict:
+        """Queue a citation crawl from node keys like "ik:1234567" or "cl:2812209"."""
+        from app.external.citation_graph import SOURCES
+        bad = [s for s in seeds if s.split(":", 1)[0] not in SOURCES or ":" not in s]
+        if bad:
+            return {"error": f"Seeds must look like ik:<tid> or cl:<opinion_id>; got {bad[:5]}"}
+        from app.tasks.ingestion_tasks import crawl_citations_task
+        task = crawl_citations_task.delay(seeds, depth=depth, max_nodes=max_nodes)
+        return {"job_id": task.id, "status": "queued", "seeds": len(seeds), "depth": depth}
+
+    async def citation_crawl_status(self, job_id: str) -> dict:
+        """Poll a crawl job (API processes reload the graph when it announces completion)."""
+        from app.tasks.celery_app import job_status
+        return job_status(job_id)
+
+    async def citation_node(self, source: str, doc_id: str, k: int = 1) -> dict:
+        from app.external.citation_graph import citation_graph, node_key
+        node = await asyncio.to_thread(citation_graph.node, node_key(source, doc_id), k)
+        return node if node is not None else {"error": "Document not in citation graph"}
+
+    async def citation_top(self, n: int = 20, source: str | None = None) -> dict:
+        from app.external.citation_graph import citation_graph
+        return {"results": await asyncio.to_thread(citation_graph.top, n, source), **citation_graph.snapshot()}
+
     # ══ CourtListener ════════════════════════════════════════════════════════
 
     async def cl_search(self, query: str, court: str | None = None, cursor: str | None = None) -> Any:
@@ -240,7 +451,15 @@ class ExternalService:
         if not settings.COURTLISTENER_ENABLED:
             return _disabled("COURTLISTENER")
         from app.external.courtlistener.client import CourtListenerClient
-        return await CourtListenerClient().get_opinion(opinion_id)
+        start   = time.perf_counter()
+        opinion = await CourtListenerClient().get_opinion(opinion_id)
+        if isinstance(opinion, dict):
+            await self._remember(
+                "courtlistener", opinion_id, opinion,
+                opinion.get("plain_text") or opinion.get("html_with_citations") or "",
+                (time.perf_counter() - start) * 1000,
+            )
+        return opinion
 
     async def cl_docket(self, docket_id: int) -> Any:
         if not settings.COURTLISTENER_ENABLED:
@@ -275,14 +494,29 @@ class ExternalService:
             max_results=max_results,
         )
 
+    def fan_out_search_stream(
+        self,
+        query:                 str,
+        include_international: bool = False,
+        max_results:           int  = 20,
+    ) -> AsyncIterator[dict]:
+        """Per-source result events as each API completes, then the merged ranking."""
+        return aggregator.iter_search(
+            query,
+            include_international=include_international,
+            max_results=max_results,
+        )
+
     async def enrich_case(self, case_id: str) -> dict:
         """
         Find real counterpart of a NyayMarg synthetic case on Indian Kanoon.
         Fetches AI tags + structure for enrichment.
         Returns enriched metadata or {"enriched": False} if not found.
+        Results are stored per search query, so every case sharing the same
+        text template is enriched by one lookup.
         """
+        from app.data.ik_enrich import enrich_query, query_for, record_result, stored_result
         from app.data.seed import get_registry
-        from app.external.indian_kanoon.client import IndianKanoonClient
 
         if not settings.IK_ENABLED:
             return {"enriched": False, "reason": "IK disabled"}
@@ -293,27 +527,54 @@ class ExternalService:
         if row.empty:
             return {"enriched": False, "reason": "case not found"}
 
-        query  = row.iloc[0].get("clean_text", "")[:100]
-        client = IndianKanoonClient()
+        query  = query_for(row.iloc[0].get("clean_text", ""))
+        cached = stored_result(query)
+        if cached is not None:
+            return cached
 
         try:
-            results = await client.search(query, page=0)
-            docs    = results.get("docs", [])
-            if not docs:
-                return {"enriched": False, "reason": "no IK match"}
-            top = docs[0]
-            meta = await self.ik_metadata(top["tid"])
-            return {"enriched": True, "ik_doc_id": top["tid"], **meta}
+            result = await enrich_query(query)
         except Exception as exc:
             logger.warning("enrich.failed", case_id=case_id, error=str(exc))
             return {"enriched": False, "reason": str(exc)}
+        record_result(query, result)
+        return result
+
+    async def enrich_cases_batch(
+        self,
+        court_id:  str | None = None,
+        state:     str | None = None,
+        case_type: str | None = None,
+        limit:     int | None = None,
+    ) -> dict:
+        """Queue a batch enrichment job for every matching, not-yet-enriched case."""
+        if not settings.IK_ENABLED:
+            return _disabled("IK")
+        from app.tasks.ingestion_tasks import enrich_cases_task
+        task = enrich_cases_task.delay(court_id=court_id, state=state, case_type=case_type, limit=limit)
+        return {
+            "job_id": task.id, "status": "queued",
+            "filter": {"court_id": court_id, "state": state, "case_type": case_type, "limit": limit},
+        }
+
+    async def enrich_batch_status(self, job_id: str) -> dict:
+        """Poll a batch enrichment job (API processes apply its results when it announces completion)."""
+        from app.tasks.celery_app import job_status
+        return job_status(job_id)
 
     async def import_ik_cases(self, query: str, max_cases: int = 50) -> dict:
         """
         Import real IK cases into the similarity index.
-        Background-friendly: returns immediately with count of queued cases.
-        The actual import runs in a Celery task.
+        Background-friendly: returns immediately with the Celery job id.
+        Re-queueing the same query + count resumes an interrupted import.
         """
-        from app.tasks.training_tasks import import_ik_cases_task  # type: ignore[import]
+        if not settings.IK_ENABLED:
+            return _disabled("IK")
+        from app.tasks.ingestion_tasks import import_ik_cases_task
         task = import_ik_cases_task.delay(query, max_cases)
         return {"job_id": task.id, "status": "queued", "query": query, "max_cases": max_cases}
+
+    async def import_ik_status(self, job_id: str) -> dict:
+        """Poll an import job (API processes merge its rows when it announces completion)."""
+        from app.tasks.celery_app import job_status
+        return job_status(job_id)
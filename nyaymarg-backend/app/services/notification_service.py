@@ -10,6 +10,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.notification import Notification
+from app.utils.pagination import Page, paginate
 
 
 class NotificationService:
@@ -43,17 +44,15 @@ class NotificationService:
         unread_only: bool = False,
         page:        int = 1,
         page_size:   int = 20,
-    ) -> tuple[list[Notification], int]:
+        cursor:      str | None = None,
+    ) -> Page[Notification]:
         stmt = select(Notification).where(Notification.user_id == user_id)
         if unread_only:
             stmt = stmt.where(Notification.is_read.is_(False))
-        stmt = stmt.order_by(Notification.created_at.desc())
-
-        result = await db.execute(stmt)
-        all_items = result.scalars().all()
-        total     = len(all_items)
-        start     = (page - 1) * page_size
-        return list(all_items[start : start + page_size]), total
+        return await paginate(
+            db, stmt, keys=(Notification.created_at, Notification.id),
+            page=page, page_size=page_size, cursor=cursor,
+        )
 
     async def unread_count(self, db: AsyncSession, user_id: uuid.UUID) -> int:
         from sqlalchemy import func
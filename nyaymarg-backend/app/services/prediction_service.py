@@ -41,25 +41,26 @@ class PredictionService:
         from app.core.exceptions import ModelNotReadyError
 
         registry = get_registry()
-        if registry.lr_model is None or registry.rf_model is None:
+        models   = registry.models      # one snapshot: a hot reload can't mix versions mid-request
+        if models.lr_model is None or models.rf_model is None:
             raise ModelNotReadyError()
 
         # ── 1. NLP pathway (LogReg) ───────────────────────────────────────────
         cleaned   = clean_text(request.judgment_text)
-        vec       = registry.vectorizer.transform([cleaned])
-        lr_prob   = float(registry.lr_model.predict_proba(vec)[0][1])
+        vec       = models.vectorizer.transform([cleaned])
+        lr_prob   = float(models.lr_model.predict_proba(vec)[0][1])
 
         # ── 2. Structured pathway (RFC) ───────────────────────────────────────
         rf_features = self._build_rf_features(request)
         X           = pd.DataFrame([rf_features], columns=RF_FEATURES)
-        rf_prob     = float(registry.rf_model.predict_proba(X)[0][1])
+        rf_prob     = float(models.rf_model.predict_proba(X)[0][1])
 
         # ── 3. Weighted ensemble ──────────────────────────────────────────────
         ensemble = settings.RFC_WEIGHT * rf_prob + settings.LR_WEIGHT * lr_prob
         outcome  = "Allowed" if ensemble >= 0.5 else "Dismissed"
 
         # ── 4. Feature importances ────────────────────────────────────────────
-        importances  = registry.rf_model.feature_importances_
+        importances  = models.rf_model.feature_importances_
         top_features = [
             {"feature": f, "importance": round(float(imp), 4)}
             for f, imp in sorted(
@@ -67,10 +68,11 @@ class PredictionService:
             )[:5]
         ]
 
-        # ── 5. Persist to DB (if session provided) ────────────────────────────
+        # ── 5. Persist (if session provided; DB_DURABILITY_MODE) ──────────────
         pred_id    = uuid.uuid4()
         created_at = datetime.now(timezone.utc)
         if db is not None:
+            from app.core.write_behind import persist
             from app.models.prediction import Prediction
             pred = Prediction(
                 id=pred_id,
@@ -88,8 +90,7 @@ class PredictionService:
                 input_snapshot=request.model_dump(),
                 created_at=created_at,
             )
-            db.add(pred)
-            await db.flush()
+            await persist(db, pred)
 
         # ── 6. Count similar cases (quick estimate) ───────────────────────────
         similar_count = min(int(len(registry.df_cases) * 0.01), 5)
@@ -103,6 +104,7 @@ class PredictionService:
             top_features=top_features,
             similar_cases_count=similar_count,
             analyzed_at=created_at,
+            model_version=models.version,
         )
 
     # ── Batch ─────────────────────────────────────────────────────────────────
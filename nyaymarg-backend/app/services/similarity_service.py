@@ -3,20 +3,51 @@ app/services/similarity_service.py — TF-IDF cosine similarity search.
 """
 from __future__ import annotations
 
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
 import structlog
 from sklearn.metrics.pairwise import cosine_similarity
 
+from app.config import settings
 from app.data.seed import get_registry
 from app.ml.pipeline import clean_text
 from app.schemas.notification import SimilarCase
 
 logger = structlog.get_logger(__name__)
 
+# id(frame) → ((graph, graph version, frame, rows, linked rows), per-row citation authority)
+_authority_cache: dict[int, tuple[tuple, np.ndarray]] = {}
+
+
+def case_authority(df: pd.DataFrame) -> np.ndarray:
+    """
+    Citation-graph authority (0..1) for every row of a corpus frame: rows with
+    an IK doc id (imported or enriched) take the score of that judgment, others 0.
+    """
+    from app.external.citation_graph import citation_graph
+
+    linked = int(df["ik_doc_id"].count()) if "ik_doc_id" in df.columns else 0
+    key    = (id(citation_graph), citation_graph.version, id(df), len(df), linked)
+    cached = _authority_cache.get(id(df))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    scores = np.zeros(len(df))
+    if linked and citation_graph.n_nodes:
+        ids  = pd.to_numeric(df["ik_doc_id"], errors="coerce")
+        rows = np.flatnonzero(ids.notna().to_numpy())
+        scores[rows] = [citation_graph.authority_of(f"ik:{int(ids.iloc[r])}") for r in rows]
+    if len(_authority_cache) >= 4:          # replaced frames
+        _authority_cache.clear()
+    _authority_cache[id(df)] = (key, scores)
+    return scores
+
 
 class SimilarityService:
     """
-    Builds a precomputed TF-IDF matrix of the entire df_cases corpus on startup,
-    then responds to similarity queries in O(n*d) time.
+    Builds a precomputed TF-IDF matrix of the similarity corpus (df_cases, then
+    imported IK judgments) on startup, then responds to similarity queries in
+    O(n*d) time.
     """
 
     def build_index(self) -> None:
@@ -25,38 +56,74 @@ class SimilarityService:
         the sparse matrix in the DataRegistry for fast querying.
         """
         registry = get_registry()
-        if registry.vectorizer is None:
-            logger.warning("similarity.index_skipped", reason="vectorizer not loaded")
-            return
-
-        texts = registry.df_cases["clean_text"].fillna("").tolist()
-        registry.corpus_vectors = registry.vectorizer.transform(texts)
+        with registry.models_lock:                  # not across a model hot reload
+            vectorizer = registry.vectorizer
+            if vectorizer is None:
+                logger.warning("similarity.index_skipped", reason="vectorizer not loaded")
+                return
+
+            texts = registry.corpus_texts()
+            registry.corpus_vectors = vectorizer.transform(texts)
         logger.info("similarity.index_built", n_cases=len(texts))
 
+    def extend_index(self, df_new: pd.DataFrame) -> None:
+        """
+        Append imported rows to df_imported and vectorise only those rows,
+        stacking them under the existing matrix instead of re-transforming the
+        whole corpus.
+        """
+        registry = get_registry()
+        with registry.models_lock:
+            # Frame first: a concurrent search may then see a matrix that is
+            # shorter than the corpus, never one that indexes past its end
+            registry.df_imported = pd.concat(
+                [df for df in (registry.df_imported, df_new) if df is not None], ignore_index=True,
+            )
+            models = registry.models
+            if models.vectorizer is None or models.corpus_vectors is None:
+                return
+            new_vecs = models.vectorizer.transform(df_new["clean_text"].fillna("").tolist())
+            registry.corpus_vectors = sp.vstack([models.corpus_vectors, new_vecs], format="csr")
+        logger.info("similarity.index_extended", added=len(df_new), n_cases=registry.corpus_vectors.shape[0])
+
     def search(
         self,
-        query_text:     str,
-        top_n:          int = 5,
-        court_filter:   str | None = None,
-        outcome_filter: str | None = None,
+        query_text:       str,
+        top_n:            int = 5,
+        court_filter:     str | None = None,
+        outcome_filter:   str | None = None,
+        authority_weight: float | None = None,
     ) -> list[SimilarCase]:
+        """
+        Cosine similarity, ranked with a citation-authority boost:
+        rank = similarity + authority_weight * authority (default
+        CITATION_AUTHORITY_WEIGHT; 0 disables). similarity_score stays the
+        plain cosine score.
+        """
         registry = get_registry()
-        if registry.corpus_vectors is None or registry.vectorizer is None:
+        models   = registry.models                  # one version for the whole query
+        if models.corpus_vectors is None or models.vectorizer is None:
             return []
 
         cleaned   = clean_text(query_text)
-        query_vec = registry.vectorizer.transform([cleaned])
-        scores    = cosine_similarity(query_vec, registry.corpus_vectors).flatten()
-        top_idx   = scores.argsort()[::-1]
+        query_vec = models.vectorizer.transform([cleaned])
+        scores    = cosine_similarity(query_vec, models.corpus_vectors).flatten()
+        frames    = registry.corpus_frames()
+        offsets   = np.cumsum([0] + [len(df) for df in frames])
+
+        weight    = settings.CITATION_AUTHORITY_WEIGHT if authority_weight is None else authority_weight
+        authority = np.concatenate([case_authority(df) for df in frames])[: len(scores)]
+        rank      = scores + weight * authority if weight and authority.any() else scores
+        top_idx   = rank.argsort()[::-1]
 
         results: list[SimilarCase] = []
-        df = registry.df_cases
 
         for idx in top_idx:
             if len(results) >= top_n:
                 break
 
-            case  = df.iloc[int(idx)]
+            part  = int(np.searchsorted(offsets, idx, side="right")) - 1
+            case  = frames[part].iloc[int(idx - offsets[part])]
             score = float(scores[int(idx)])
 
             # Apply filters
@@ -65,7 +132,10 @@ class SimilarityService:
                 if court_filter.lower() not in ct.lower():
                     continue
 
-            outcome_label = "Decided" if int(case["outcome"]) == 1 else "Pending"
+            if pd.isna(case["outcome"]):            # imported judgments carry no label
+                outcome_label = str(case.get("status") or "Decided")
+            else:
+                outcome_label = "Decided" if int(case["outcome"]) == 1 else "Pending"
             if outcome_filter and outcome_filter.lower() != outcome_label.lower():
                 continue
 
@@ -79,6 +149,7 @@ class SimilarityService:
                 outcome_label=outcome_label,
                 similarity_score=round(score, 4),
                 filing_date=str(filing) if filing else None,
+                authority=round(float(authority[int(idx)]), 4) if authority[int(idx)] else None,
             ))
 
         return results
@@ -0,0 +1,422 @@
+"""
+app/services/upload_service.py — Streaming and resumable dataset uploads.
+
+Uploads are copied to a temp file in UPLOAD_DIR in UPLOAD_CHUNK_SIZE_KB
+chunks (writes and hashing off the event loop), so memory per upload stays
+at one chunk and an oversized file is rejected as soon as it crosses its
+limit. The finished file is fsynced and atomically renamed to
+UPLOAD_DIR/<sha256><ext>: identical content shares one file, and a caller
+re-uploading a file they already have gets their existing dataset back.
+
+POST /data/upload bodies are parsed straight from the request stream
+(MultipartForm): a declared Content-Length past the limit is refused before
+the body is read, a disallowed extension as soon as the file part's headers
+arrive, and the file data goes to disk as it is parsed — never spooled by
+the framework first.
+
+Resumable uploads (multi-GB files, parts below nginx's body limit):
+
+  initiate   UPLOAD_DIR/.resumable/<upload_id>/manifest.json records owner,
+             size and part size
+  put part   part N (1-based) is spooled and renamed to <N>.part; re-sending
+             a part replaces it, so a client resumes by asking which parts
+             arrived and sending the rest
+  complete   parts are hashed and concatenated with copy_file_range (no
+             userspace copy) into the content-addressed file
+  purge      sessions idle past RESUMABLE_UPLOAD_TTL_HOURS (hourly beat)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO
+
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.dataset import Dataset
+
+_MB = 1024 * 1024
+MIN_PART_SIZE = 5 * _MB       # every part but the last
+MAX_PART_SIZE = 256 * _MB     # stays under nginx client_max_body_size
+FORM_OVERHEAD = 64 * 1024     # multipart envelope allowed on top of the file itself
+
+
+class UploadError(Exception):
+    """Client-side problem with an upload (surfaced as 400)."""
+
+
+class UploadTooLarge(UploadError):
+    """The stream passed its size limit; nothing was kept on disk."""
+
+
+@dataclass
+class StoredUpload:
+    path:   Path
+    size:   int
+    sha256: str
+
+
+@dataclass
+class ResumableUpload:
+    upload_id:  str
+    user_id:    str
+    filename:   str
+    ext:        str
+    size:       int
+    part_size:  int
+    created_at: float
+
+    @property
+    def total_parts(self) -> int:
+        return -(-self.size // self.part_size)
+
+    def part_length(self, part: int) -> int:
+        return self.part_size if part < self.total_parts else self.size - self.part_size * (self.total_parts - 1)
+
+
+def _write(out: BinaryIO, digest: Any, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def _finish(out: BinaryIO) -> None:
+    out.flush()
+    os.fsync(out.fileno())
+    out.close()
+
+
+async def _read_chunks(source: Any, size: int) -> AsyncIterator[bytes]:
+    while chunk := await source.read(size):
+        yield chunk
+
+
+class MultipartForm:
+    """
+    Incremental reader for the file field of a multipart/form-data body.
+
+    `start()` reads only as far as that part's headers and returns the client
+    filename; `chunks()` then yields the file's bytes as they are parsed and
+    stops at the end of the part without reading the rest of the body.
+    """
+
+    def __init__(self, stream: AsyncIterator[bytes], content_type: str, field: str = "file") -> None:
+        ctype, params = parse_options_header(content_type or "")
+        if ctype != b"multipart/form-data" or not params.get(b"boundary"):
+            raise UploadError("expected a multipart/form-data body")
+        self.field    = field
+        self.filename: str | None = None
+        self.consumed = 0                             # body bytes read so far
+        self._stream  = stream.__aiter__()
+        self._data:   list[bytes] = []
+        self._header  = [b"", b""]
+        self._headers: dict[bytes, bytes] = {}
+        self._in_file = False
+        self._done    = False
+        self._parser  = MultipartParser(params[b"boundary"], {
+            "on_part_begin":       self._part_begin,
+            "on_header_field":     lambda data, start, end: self._add_header(0, data[start:end]),
+            "on_header_value":     lambda data, start, end: self._add_header(1, data[start:end]),
+            "on_header_end":       self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data":        self._part_data,
+            "on_part_end":         self._part_end,
+        })
+
+    # ── Parser callbacks ──────────────────────────────────────────────────────
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+
+    def _add_header(self, i: int, data: bytes) -> None:
+        self._header[i] += data
+
+    def _header_end(self) -> None:
+        self._headers[self._header[0].lower()] = self._header[1]
+        self._header = [b"", b""]
+
+    def _headers_finished(self) -> None:
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if self.filename is None and params.get(b"name") == self.field.encode() and b"filename" in params:
+            self.filename = Path(params[b"filename"].decode("utf-8", "replace")).name
+            self._in_file = True
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._data.append(data[start:end])
+
+    def _part_end(self) -> None:
+        if self._in_file:
+            self._in_file, self._done = False, True
+
+    # ── Reading ───────────────────────────────────────────────────────────────
+
+    async def _feed(self) -> bool:
+        """Parse the next body chunk; False once the body is exhausted."""
+        try:
+            chunk = await self._stream.__anext__()
+        except StopAsyncIteration:
+            return False
+        self.consumed += len(chunk)
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as exc:
+            raise UploadError(f"malformed multipart body: {exc}") from None
+        return True
+
+    async def start(self) -> str:
+        """Read up to the file part's headers; returns its filename."""
+        while self.filename is None:
+            if self.consumed > FORM_OVERHEAD or not await self._feed():
+                raise UploadError(f"no '{self.field}' file in the form")
+        return self.filename
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        while True:
+            if self._data:
+                data = b"".join(self._data)
+                self._data.clear()
+                yield data
+            if self._done:
+                return
+            if not await self._feed():
+                raise UploadError("multipart body ended inside the file")
+
+
+def _append(src_path: Path, out: BinaryIO) -> None:
+    """Append a whole file to `out` in-kernel where the platform allows it."""
+    with open(src_path, "rb") as src:
+        size = remaining = os.fstat(src.fileno()).st_size
+        if hasattr(os, "copy_file_range"):
+            try:
+                while remaining:
+                    copied = os.copy_file_range(src.fileno(), out.fileno(), remaining)
+                    if not copied:
+                        break
+                    remaining -= copied
+                return
+            except OSError:
+                if remaining != size:
+                    raise                             # failed midway: don't guess offsets
+        shutil.copyfileobj(src, out, _MB)
+
+
+class UploadService:
+
+    def __init__(
+        self,
+        upload_dir: Path | str | None = None,
+        max_bytes:  int | None = None,
+        chunk_size: int | None = None,
+    ) -> None:
+        self.upload_dir = Path(upload_dir or settings.UPLOAD_DIR)
+        self.max_bytes  = max_bytes or settings.MAX_UPLOAD_SIZE_MB * _MB
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE_KB * 1024
+
+    @property
+    def sessions_dir(self) -> Path:
+        return self.upload_dir / ".resumable"
+
+    async def _spool(self, chunks: AsyncIterator[bytes], directory: Path, max_bytes: int) -> tuple[Path, int, str]:
+        """Write `chunks` to a fsynced temp file in `directory`; returns (path, size, sha256)."""
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".tmp")
+        out     = os.fdopen(fd, "wb")
+        digest  = hashlib.sha256()
+        size    = 0
+        pending = bytearray()
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"upload exceeds {max_bytes} bytes")
+                pending += chunk
+                if len(pending) >= self.chunk_size:   # request bodies arrive in small pieces
+                    await asyncio.to_thread(_write, out, digest, bytes(pending))
+                    pending.clear()
+            if pending:
+                await asyncio.to_thread(_write, out, digest, bytes(pending))
+            await asyncio.to_thread(_finish, out)
+        except BaseException:
+            out.close()
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return Path(tmp), size, digest.hexdigest()
+
+    async def store(self, source: Any, ext: str) -> StoredUpload:
+        """
+        Stream `source` (anything with `async read(n)`, e.g. UploadFile) into
+        UPLOAD_DIR. Raises UploadTooLarge past max_bytes.
+        """
+        tmp, size, sha256 = await self._spool(_read_chunks(source, self.chunk_size), self.upload_dir, self.max_bytes)
+        return self._keep(tmp, size, sha256, ext)
+
+    async def store_form(
+        self, stream: AsyncIterator[bytes], content_type: str, content_length: int | None = None,
+    ) -> tuple[StoredUpload, str]:
+        """
+        Stream the `file` field of a multipart/form-data request body into
+        UPLOAD_DIR. Returns (stored file, client filename). Raises
+        UploadTooLarge past max_bytes (before reading anything when the
+        declared Content-Length already is), UploadError for a bad form or
+        extension.
+        """
+        if content_length is not None and content_length > self.max_bytes + FORM_OVERHEAD:
+            raise UploadTooLarge(f"upload exceeds {self.max_bytes} bytes")
+        form     = MultipartForm(stream, content_type)
+        filename = await form.start()
+        ext      = Path(filename).suffix.lower()
+        if ext not in settings.ALLOWED_EXTENSIONS:
+            raise UploadError(f"Only {settings.ALLOWED_EXTENSIONS} files are allowed")
+        tmp, size, sha256 = await self._spool(form.chunks(), self.upload_dir, self.max_bytes)
+        return self._keep(tmp, size, sha256, ext), filename
+
+    def _keep(self, tmp: Path, size: int, sha256: str, ext: str) -> StoredUpload:
+        dest = self.upload_dir / f"{sha256}{ext}"
+        os.replace(tmp, dest)                         # atomic; same content if dest existed
+        return StoredUpload(path=dest, size=size, sha256=sha256)
+
+    async def find_duplicate(self, db: AsyncSession, user_id: uuid.UUID, sha256: str) -> Dataset | None:
+        """The caller's existing, non-failed dataset with this content, if any."""
+        result = await db.execute(
+            select(Dataset)
+            .where(Dataset.user_id == user_id, Dataset.checksum == sha256, Dataset.status != "failed")
+            .order_by(Dataset.created_at)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def release(self, db: AsyncSession, ds: Dataset) -> None:
+        """Delete the dataset's files unless another dataset row still points at them."""
+        others = await db.scalar(
+            select(func.count()).select_from(Dataset)
+            .where(Dataset.file_path == ds.file_path, Dataset.id != ds.id)
+        )
+        if not others:
+            path = Path(str(ds.file_path))
+            path.unlink(missing_ok=True)
+            path.with_suffix(".parquet").unlink(missing_ok=True)     # written by ingestion
+            if ds.checksum:
+                from app.ml.dataset_features import drop_cache
+                drop_cache(ds.checksum)                                 # training matrices
+
+    # ── Resumable uploads ─────────────────────────────────────────────────────
+
+    def initiate(self, user_id: Any, filename: str, size: int, part_size: int | None = None) -> ResumableUpload:
+        ext = Path(filename).suffix.lower()
+        if ext not in settings.ALLOWED_EXTENSIONS:
+            raise UploadError(f"Only {settings.ALLOWED_EXTENSIONS} files are allowed")
+        if size > settings.RESUMABLE_UPLOAD_MAX_SIZE_MB * _MB:
+            raise UploadTooLarge(f"File exceeds {settings.RESUMABLE_UPLOAD_MAX_SIZE_MB} MB")
+        part_size = part_size or settings.RESUMABLE_UPLOAD_PART_SIZE_MB * _MB
+        if not MIN_PART_SIZE <= part_size <= MAX_PART_SIZE:
+            raise UploadError(f"part_size must be between {MIN_PART_SIZE} and {MAX_PART_SIZE} bytes")
+
+        upload = ResumableUpload(
+            upload_id=uuid.uuid4().hex, user_id=str(user_id), filename=filename, ext=ext,
+            size=size, part_size=part_size, created_at=time.time(),
+        )
+        directory = self.sessions_dir / upload.upload_id
+        directory.mkdir(parents=True)
+        (directory / "manifest.json").write_text(json.dumps(asdict(upload)))
+        return upload
+
+    def get(self, upload_id: str, user_id: Any) -> ResumableUpload | None:
+        """The caller's upload session, or None (unknown, expired or someone else's)."""
+        if not upload_id.isalnum():
+            return None
+        try:
+            upload = ResumableUpload(**json.loads((self.sessions_dir / upload_id / "manifest.json").read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+        return upload if upload.user_id == str(user_id) else None
+
+    def received(self, upload: ResumableUpload) -> list[int]:
+        directory = self.sessions_dir / upload.upload_id
+        return sorted(int(p.stem) for p in directory.glob("*.part") if p.stem.isdigit())
+
+    def expires_at(self, upload: ResumableUpload) -> float:
+        manifest = self.sessions_dir / upload.upload_id / "manifest.json"
+        return manifest.stat().st_mtime + settings.RESUMABLE_UPLOAD_TTL_HOURS * 3600
+
+    async def put_part(self, upload: ResumableUpload, part: int, chunks: AsyncIterator[bytes]) -> dict:
+        """Store part `part` (1-based) from a request body stream; replaces an earlier copy."""
+        if not 1 <= part <= upload.total_parts:
+            raise UploadError(f"part must be between 1 and {upload.total_parts}")
+        expected  = upload.part_length(part)
+        directory = self.sessions_dir / upload.upload_id
+        tmp, size, sha256 = await self._spool(chunks, directory, expected)
+        if size != expected:
+            tmp.unlink(missing_ok=True)
+            raise UploadError(f"part {part} must be {expected} bytes, got {size}")
+        os.replace(tmp, directory / f"{part}.part")
+        os.utime(directory / "manifest.json")         # activity keeps the session alive
+        return {"part": part, "size": size, "sha256": sha256}
+
+    async def complete(self, upload: ResumableUpload) -> StoredUpload:
+        """Assemble all parts into UPLOAD_DIR/<sha256><ext> and drop the session."""
+        missing = sorted(set(range(1, upload.total_parts + 1)) - set(self.received(upload)))
+        if missing:
+            raise UploadError(f"missing parts: {missing[:20]}")
+        directory = self.sessions_dir / upload.upload_id
+        try:
+            os.close(os.open(directory / "complete.lock", os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            raise UploadError("upload is already being completed")
+        try:
+            tmp, sha256 = await asyncio.to_thread(self._assemble, upload, directory)
+        except BaseException:
+            (directory / "complete.lock").unlink(missing_ok=True)
+            raise
+        dest = self.upload_dir / f"{sha256}{upload.ext}"
+        os.replace(tmp, dest)
+        shutil.rmtree(directory, ignore_errors=True)
+        return StoredUpload(path=dest, size=upload.size, sha256=sha256)
+
+    def _assemble(self, upload: ResumableUpload, directory: Path) -> tuple[Path, str]:
+        fd, tmp = tempfile.mkstemp(dir=self.upload_dir, prefix=".upload-", suffix=".tmp")
+        digest  = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb", buffering=0) as out:
+                for part in range(1, upload.total_parts + 1):
+                    path = directory / f"{part}.part"
+                    with open(path, "rb") as src:
+                        while block := src.read(self.chunk_size):
+                            digest.update(block)
+                    _append(path, out)
+                os.fsync(out.fileno())
+            if os.path.getsize(tmp) != upload.size:
+                raise UploadError("assembled size does not match the declared size")
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return Path(tmp), digest.hexdigest()
+
+    def abort(self, upload: ResumableUpload) -> None:
+        shutil.rmtree(self.sessions_dir / upload.upload_id, ignore_errors=True)
+
+    def purge_stale(self) -> int:
+        """Remove sessions idle past RESUMABLE_UPLOAD_TTL_HOURS. Returns sessions removed."""
+        cutoff  = time.time() - settings.RESUMABLE_UPLOAD_TTL_HOURS * 3600
+        removed = 0
+        for directory in self.sessions_dir.glob("*"):
+            manifest = directory / "manifest.json"
+            try:
+                stale = manifest.stat().st_mtime < cutoff
+            except OSError:                           # half-created session
+                stale = directory.stat().st_mtime < cutoff
+            if stale:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+        return removed
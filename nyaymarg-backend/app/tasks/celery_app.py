@@ -3,14 +3,18 @@ app/tasks/celery_app.py — Celery application instance.
 """
 from __future__ import annotations
 
+import asyncio
+from typing import Any, Coroutine
+
 from celery import Celery
+from celery.schedules import crontab
 from app.config import settings
 
 celery_app = Celery(
     "nyaymarg",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.training_tasks", "app.tasks.ingestion_tasks"],
+    include=["app.tasks.training_tasks", "app.tasks.ingestion_tasks", "app.tasks.maintenance_tasks"],
 )
 
 celery_app.conf.update(
@@ -22,4 +26,72 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     result_expires=3600,
     broker_connection_retry_on_startup=True,
+    timezone="Asia/Kolkata",
+    # Sent by the separate `beat` service (docker-compose.yml, render.yaml)
+    beat_schedule={
+        "snapshot-causelists": {
+            "task":     "tasks.snapshot_causelists",
+            "schedule": crontab(hour=settings.CAUSELIST_SNAPSHOT_HOUR, minute=0),
+        },
+        "sync-data-gov": {
+            "task":     "tasks.sync_data_gov",
+            "schedule": crontab(hour=3, minute=0, day_of_week=settings.DATA_GOV_SYNC_WEEKDAY),
+        },
+        "maintain-partitions": {
+            "task":     "tasks.maintain_partitions",
+            "schedule": crontab(hour=2, minute=30),
+        },
+        "purge-stale-uploads": {
+            "task":     "tasks.purge_stale_uploads",
+            "schedule": crontab(minute=15),
+        },
+    },
 )
+
+
+def workers_available(timeout: float = 1.0) -> bool:
+    """True if at least one worker answers a broker ping (blocking; False if the broker is down)."""
+    try:
+        return bool(celery_app.control.ping(timeout=timeout))
+    except Exception:
+        return False
+
+
+def job_status(job_id: str, result_key: str | None = None) -> dict:
+    """
+    Poll a Celery job: {"job_id", "state", **meta}, where meta is the progress
+    dict a running task reports or the summary it returned, plus "error" once
+    it failed. With `result_key` the success summary is nested under that key.
+    """
+    task   = celery_app.AsyncResult(job_id)
+    info   = task.info if isinstance(task.info, dict) else {}
+    status = {"job_id": job_id, "state": str(task.state)}
+    if result_key is None:
+        status.update(info)
+    elif task.state == "SUCCESS":
+        status[result_key] = info
+    if task.state == "FAILURE":
+        status["error"] = str(task.info)
+    return status
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    asyncio.run for every async task: the loop's shared Redis client and the
+    DB engines' pooled connections are closed before the loop goes away, so
+    the next task in this worker process gets fresh ones bound to its own loop
+    (asyncpg connections cannot outlive the loop that opened them).
+    """
+    from app.core.redis import close_async_redis
+    from app.database import engine, read_engine
+
+    async def _main() -> Any:
+        try:
+            return await coro
+        finally:
+            await close_async_redis()
+            await engine.dispose()
+            if read_engine is not engine:
+                await read_engine.dispose()
+
+    return asyncio.run(_main())
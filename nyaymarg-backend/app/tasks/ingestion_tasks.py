@@ -1,74 +1,209 @@
 """
-app/tasks/ingestion_tasks.py — Dataset ingestion background task.
+app/tasks/ingestion_tasks.py — Dataset ingestion and external import background tasks.
 """
 from __future__ import annotations
 
-from app.tasks.celery_app import celery_app
+import structlog
+
+from app.tasks.celery_app import celery_app, run_async
+
+logger = structlog.get_logger(__name__)
 
 
 @celery_app.task(name="tasks.process_dataset")
 def process_dataset_task(dataset_id: str, file_path: str):
     """
-    Parse uploaded CSV/JSON, validate schema, update Dataset record.
+    Stream the uploaded CSV/JSON: infer its schema, validate rows against the
+    case schema, convert it to Parquet and update the Dataset record
+    (app/data/dataset_ingest.py).
     """
-    import json
     import asyncio
-    from pathlib import Path
+    import uuid
     from datetime import datetime
 
-    path = Path(file_path)
-    status = "ready"
-    row_count = None
-    schema_info = {}
-    error_msg = None
+    from sqlalchemy import update
 
-    try:
-        if path.suffix.lower() == ".csv":
-            import pandas as pd
-            df = pd.read_csv(path)
-            row_count   = int(len(df))
-            schema_info = {
-                "columns": list(df.columns),
-                "dtypes":  df.dtypes.astype(str).to_dict(),
-            }
-        elif path.suffix.lower() == ".json":
-            data = json.loads(path.read_text())
-            if isinstance(data, list):
-                row_count = len(data)
-                schema_info = {"type": "array", "keys": list(data[0].keys()) if data else []}
-            else:
-                row_count   = 1
-                schema_info = {"type": "object", "keys": list(data.keys())}
-        else:
-            raise ValueError(f"Unsupported file type: {path.suffix}")
+    from app.data.dataset_ingest import ingest
+    from app.database import AsyncSessionLocal
+    from app.models.dataset import Dataset
 
-    except Exception as exc:
-        status    = "failed"
-        error_msg = str(exc)
-
-    # Update DB record (synchronous via asyncio.run)
-    async def _update():
-        from app.database import AsyncSessionLocal
-        from app.models.dataset import Dataset
-        from sqlalchemy import update
-        import uuid
+    async def _update(**values) -> None:
         async with AsyncSessionLocal() as db:
             await db.execute(
-                update(Dataset)
-                .where(Dataset.id == uuid.UUID(dataset_id))
-                .values(
-                    status=status,
-                    row_count=row_count,
-                    schema_info=schema_info,
-                    error_msg=error_msg,
-                    processed_at=datetime.utcnow(),
-                )
+                update(Dataset).where(Dataset.id == uuid.UUID(dataset_id)).values(**values)
             )
             await db.commit()
 
-    try:
-        asyncio.run(_update())
-    except Exception:
-        pass   # DB update best-effort
+    # One loop for both updates and the (threaded) ingest: pooled DB
+    # connections are bound to the loop that opened them
+    async def _run() -> tuple:
+        try:
+            await _update(status="processing")
+        except Exception as exc:
+            logger.warning("dataset.status_update_failed", dataset_id=dataset_id,
+                           status="processing", error=str(exc))
+        status, row_count, schema_info, error_msg = "ready", None, {}, None
+        try:
+            row_count, schema_info = await asyncio.to_thread(ingest, file_path)
+        except Exception as exc:
+            status    = "failed"
+            error_msg = str(exc)[:500]
+            logger.warning("dataset.ingest_failed", dataset_id=dataset_id, error=error_msg)
+        try:
+            await _update(
+                status=status,
+                row_count=row_count,
+                schema_info=schema_info,
+                error_msg=error_msg,
+                processed_at=datetime.utcnow(),
+            )
+        except Exception as exc:
+            # Fail the task rather than report a result the row does not show
+            logger.error("dataset.status_update_failed", dataset_id=dataset_id,
+                         status=status, error=str(exc))
+            raise
+        return status, row_count
 
+    status, row_count = run_async(_run())
     return {"dataset_id": dataset_id, "status": status, "row_count": row_count}
+
+
+@celery_app.task(bind=True, max_retries=3, name="tasks.import_ik_cases")
+def import_ik_cases_task(self, query: str, max_cases: int = 50):
+    """
+    Import real judgments from Indian Kanoon into the similarity corpus.
+    Progress is reported via Celery state; failures retry from the checkpoint.
+    """
+    from app.data.ik_import import run_import
+    from app.data.reload import announce
+
+    def progress(meta: dict) -> None:
+        self.update_state(state="PROGRESS", meta=meta)
+
+    try:
+        result = run_async(run_import(query, max_cases, progress=progress))
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=30)
+    announce("ik_import")
+    return result
+
+
+@celery_app.task(bind=True, max_retries=3, name="tasks.ecw_bulk_refresh")
+def ecw_bulk_refresh_task(self, cnrs: list[str]):
+    """
+    Refresh many CNRs through eCourtsIndia bulk jobs into the local store.
+    A retry skips CNRs the failed attempt already refreshed.
+    """
+    from app.external.ecourts.bulk_refresh import run_bulk_refresh
+
+    def progress(meta: dict) -> None:
+        self.update_state(state="PROGRESS", meta=meta)
+
+    try:
+        return run_async(run_bulk_refresh(cnrs, progress=progress))
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=30)
+
+
+@celery_app.task(bind=True, max_retries=2, name="tasks.snapshot_causelists")
+def snapshot_causelists_task(self, days_ahead: int | None = None):
+    """Daily (beat) refresh of cause-list snapshots for CAUSELIST_TRACKED_COURTS."""
+    from app.external.causelists import snapshot_tracked
+
+    try:
+        return run_async(snapshot_tracked(days_ahead))
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=300)
+
+
+@celery_app.task(bind=True, max_retries=3, name="tasks.sync_data_gov")
+def sync_data_gov_task(self, resources: list[str] | None = None):
+    """Mirror data.gov.in judiciary resources into the gov_records table."""
+    from app.data.gov_sync import run_sync
+    from app.data.reload import announce
+
+    try:
+        result = run_async(run_sync(resources))
+    except ValueError:
+        raise                                   # unknown resource names: retrying won't help
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=600)
+    announce("gov_records")
+    return result
+
+
+@celery_app.task(bind=True, max_retries=3, name="tasks.crawl_citations")
+def crawl_citations_task(self, seeds: list[str], depth: int = 1, max_nodes: int | None = None):
+    """
+    Grow the citation graph breadth-first from `seeds` ("ik:<tid>" / "cl:<id>").
+    Nodes crawled by earlier jobs are not refetched.
+    """
+    from app.data.reload import announce
+    from app.external.citation_graph import citation_graph, crawl
+
+    def progress(meta: dict) -> None:
+        self.update_state(state="PROGRESS", meta=meta)
+
+    citation_graph.load()
+    try:
+        result = run_async(crawl(seeds, depth=depth, max_nodes=max_nodes, progress=progress))
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=30)
+    announce("citation_graph")
+    return result
+
+
+@celery_app.task(bind=True, max_retries=3, name="tasks.enrich_cases")
+def enrich_cases_task(
+    self,
+    court_id:  str | None = None,
+    state:     str | None = None,
+    case_type: str | None = None,
+    limit:     int | None = None,
+):
+    """
+    Enrich synthetic cases matching the filter with their closest IK judgment.
+    Already-answered queries are skipped, so a retry only redoes failed ones.
+    """
+    from app.data.ik_enrich import run_enrichment
+    from app.data.reload import announce
+    from app.data.seed import get_registry, initialise_seed_data
+
+    def progress(meta: dict) -> None:
+        self.update_state(state="PROGRESS", meta=meta)
+
+    async def _run() -> dict:
+        if get_registry().df_cases is None:
+            await initialise_seed_data()
+        return await run_enrichment(court_id, state, case_type, limit, progress=progress)
+
+    try:
+        result = run_async(_run())
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=30)
+    announce("ik_enrich")
+    return result
+
+
+@celery_app.task(bind=True, max_retries=3, name="tasks.sync_registry")
+def sync_registry_task(self, cases_dir: str | None = None):
+    """
+    Bulk-load df_courts / df_judges / df_cases (or Parquet case partitions)
+    into the relational tables with COPY + staging-table upserts.
+    """
+    from app.config import settings
+    from app.data.registry_sync import sync_registry
+    from app.data.seed import get_registry, initialise_seed_data
+
+    async def _run() -> dict:
+        if get_registry().df_cases is None:
+            await initialise_seed_data()
+            if settings.DDL_ENABLED:
+                from app.data.ddl_loader import load_ddl_dataset
+                await load_ddl_dataset()
+        return await sync_registry(cases_dir=cases_dir)
+
+    try:
+        return run_async(_run())
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=60)
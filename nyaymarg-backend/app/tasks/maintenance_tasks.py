@@ -0,0 +1,25 @@
+"""
+app/tasks/maintenance_tasks.py — Periodic housekeeping: history partitions, stale upload sessions.
+"""
+from __future__ import annotations
+
+from app.tasks.celery_app import celery_app, run_async
+
+
+@celery_app.task(bind=True, max_retries=3, name="tasks.maintain_partitions")
+def maintain_partitions_task(self):
+    """Daily (beat): premake monthly history partitions and apply retention."""
+    from app.data.partitions import maintain_partitions
+
+    try:
+        return run_async(maintain_partitions())
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=600)
+
+
+@celery_app.task(name="tasks.purge_stale_uploads")
+def purge_stale_uploads_task():
+    """Hourly (beat): delete resumable upload sessions idle past RESUMABLE_UPLOAD_TTL_HOURS."""
+    from app.services.upload_service import UploadService
+
+    return {"purged": UploadService().purge_stale()}
@@ -1,5 +1,9 @@
 """
 app/tasks/training_tasks.py — ML model retraining background task.
+
+The worker is its own process: it starts from the artefact store's CURRENT
+version, trains, and publishes the result as a new version that the API
+workers hot-reload (app/ml/artefact_store.py).
 """
 from __future__ import annotations
 
@@ -19,9 +23,13 @@ _STEPS = [
 
 
 @celery_app.task(bind=True, max_retries=3, name="tasks.train_models")
-def train_models_task(self, triggered_by: str = "api"):
+def train_models_task(self, triggered_by: str = "api", hyperparameters: dict | None = None,
+                      dataset_id: str | None = None, dataset_path: str | None = None,
+                      checksum: str | None = None):
     """
-    Retrain both ML models in the background.
+    Retrain both ML models in the background — on the synthetic corpus, or
+    on an uploaded dataset's Parquet file (dataset_path) when given — and
+    publish them as a new model version.
     Provides real progress updates via Celery state.
     """
     n = len(_STEPS)
@@ -37,14 +45,22 @@ def train_models_task(self, triggered_by: str = "api"):
 
     # Actual training (synchronous in worker context)
     from app.data.seed import get_registry, initialise_seed_data
-    from app.ml.trainer import _train_sync
+    from app.ml.artefact_store import activate, artefact_store
+    from app.ml.trainer import _train_dataset_sync, _train_sync
 
-    # Re-use existing registry (worker shares memory)
+    # Models not retrained carry over from the published version, not from
+    # whatever this worker process trained last
     registry = get_registry()
-    if registry.df_courts is None:
-        asyncio.run(initialise_seed_data())
-
-    result = _train_sync(registry)
+    loaded   = artefact_store.load()
+    if loaded is not None:
+        activate(registry, *loaded)
+    if dataset_path:
+        result = _train_dataset_sync(registry, dataset_path, checksum, hyperparameters)
+    else:
+        if registry.df_courts is None:
+            asyncio.run(initialise_seed_data())
+        result = _train_sync(registry, hyperparameters)
 
     self.update_state(state="PROGRESS", meta={"step": "done", "label": "Complete", "progress": 100})
-    return {"status": "complete", "metrics": result, "triggered_by": triggered_by}
+    return {"status": "complete", "metrics": result, "version": result["version"],
+            "triggered_by": triggered_by, "dataset_id": dataset_id}
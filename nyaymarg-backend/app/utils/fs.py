@@ -1,7 +1,15 @@
+import json
 import os
 from pathlib import Path
+from typing import Iterator
+
+import structlog
+
 from app.config import settings
 
+logger = structlog.get_logger(__name__)
+
+
 def ensure_runtime_dirs():
     artefacts = Path(settings.MODEL_ARTEFACTS_DIR)
     uploads = Path(settings.UPLOAD_DIR)
@@ -10,3 +18,32 @@ def ensure_runtime_dirs():
     uploads.mkdir(parents=True, exist_ok=True)
 
     return artefacts, uploads
+
+
+def append_jsonl(path: Path, records: list[dict]) -> None:
+    """
+    Append records as JSON lines, one os.write per record on an O_APPEND fd, so
+    concurrent writers (API process + Celery workers) never interleave lines.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        for rec in records:
+            os.write(fd, (json.dumps(rec) + "\n").encode())
+    finally:
+        os.close(fd)
+
+
+def read_jsonl(path: Path, key: str) -> Iterator[dict]:
+    """JSON-line records that carry `key`; blank, truncated or malformed lines are logged and skipped."""
+    with path.open() as fh:
+        for lineno, line in enumerate(fh, 1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                rec = None
+            if not isinstance(rec, dict) or key not in rec:
+                logger.warning("jsonl.bad_line", path=str(path), line=lineno)
+                continue
+            yield rec
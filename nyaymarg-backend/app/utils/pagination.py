@@ -0,0 +1,136 @@
+"""
+app/utils/pagination.py
+========================
+Database-side pagination for list endpoints.
+
+`paginate(db, stmt, ...)` runs the caller's filtered SELECT with an ORDER BY on
+the sort keys (default created_at, id) and LIMIT page_size + 1, so only one
+page of rows is ever hydrated:
+
+  offset   ?page=N                 LIMIT / OFFSET (cheap for the first pages)
+  keyset   ?cursor=<next_cursor>   WHERE (created_at, id) < (last row) — cost
+                                   is independent of how deep the page is
+
+The total is a COUNT(*) over the same filters, capped at
+PAGINATION_EXACT_COUNT_LIMIT rows so it stays bounded as history grows. Past
+the cap, Postgres answers with the planner's row estimate (EXPLAIN) and the
+response is flagged `total_estimated`; other databases report the cap.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, Sequence, TypeVar
+
+import structlog
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.exceptions import ValidationError
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    items:           list[T]
+    total:           int
+    page:            int
+    page_size:       int
+    next_cursor:     str | None = None
+    total_estimated: bool = False
+
+
+# ── Cursors ───────────────────────────────────────────────────────────────────
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> list[Any]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(raw) != len(keys):
+            raise ValueError("cursor length")
+        values = []
+        for key, value in zip(keys, raw):
+            kind = key.type.python_type
+            values.append(kind.fromisoformat(value) if kind is datetime else kind(value))
+        return values
+    except (ValueError, TypeError, json.JSONDecodeError) as exc:
+        raise ValidationError("Invalid pagination cursor") from exc
+
+
+def _after(keys: Sequence[Any], values: Sequence[Any], descending: bool):
+    """Row-value comparison (k1, k2, …) < / > (v1, v2, …); one index range scan."""
+    row, bound = tuple_(*keys), tuple_(*values)
+    return row < bound if descending else row > bound
+
+
+# ── Counting ──────────────────────────────────────────────────────────────────
+
+async def _planner_estimate(db: AsyncSession, stmt: Select) -> int | None:
+    try:
+        sql  = stmt.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+        plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as exc:
+        logger.warning("pagination.estimate_failed", error=str(exc))
+        return None
+
+
+async def count_rows(db: AsyncSession, stmt: Select, limit: int | None = None) -> tuple[int, bool]:
+    """(total, estimated). Counts at most `limit` + 1 rows exactly."""
+    limit = settings.PAGINATION_EXACT_COUNT_LIMIT if limit is None else limit
+    inner = stmt.order_by(None)
+    if limit:
+        inner = inner.limit(limit + 1)
+    total = int((await db.execute(select(func.count()).select_from(inner.subquery()))).scalar() or 0)
+    if not limit or total <= limit:
+        return total, False
+    if db.bind.dialect.name == "postgresql":
+        estimate = await _planner_estimate(db, stmt.order_by(None))
+        if estimate is not None:
+            return max(estimate, limit + 1), True
+    return limit, True
+
+
+# ── Paging ────────────────────────────────────────────────────────────────────
+
+async def paginate(
+    db:         AsyncSession,
+    stmt:       Select,
+    *,
+    keys:       Sequence[Any],
+    page:       int = 1,
+    page_size:  int = 20,
+    cursor:     str | None = None,
+    descending: bool = True,
+) -> Page:
+    """
+    One page of `stmt` (a filtered SELECT of a single entity) ordered by `keys`,
+    e.g. (Model.created_at, Model.id). `keys` must end in a unique column.
+    With a cursor the page number is ignored and a keyset query is used.
+    """
+    total, estimated = await count_rows(db, stmt)
+
+    ordered = stmt.order_by(*(k.desc() if descending else k.asc() for k in keys))
+    if cursor:
+        ordered = ordered.where(_after(keys, decode_cursor(cursor, keys), descending))
+    else:
+        ordered = ordered.offset((page - 1) * page_size)
+    rows  = list((await db.execute(ordered.limit(page_size + 1))).scalars().all())
+    items = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        last        = items[-1]
+        next_cursor = encode_cursor([getattr(last, k.key) for k in keys])
+    return Page(items, total, page, page_size, next_cursor, estimated)
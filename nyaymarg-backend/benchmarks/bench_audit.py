@@ -0,0 +1,90 @@
+"""
+benchmarks/bench_audit.py
+==========================
+Latency the audit pipeline adds to a mutating request.
+
+Two otherwise identical FastAPI apps serve POST /login (pydantic body, no DB):
+one plain, one with AuditMiddleware + @audited (body recorded and redacted,
+bearer token decoded for the actor). Requests alternate between the apps so
+both see the same machine noise; the difference of per-request percentiles
+is compared with the budget documented in app/core/audit.py.
+
+    cd nyaymarg-backend && python -m benchmarks.bench_audit [--requests 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.core import audit
+from app.core.audit import AuditMiddleware, AuditPipeline, audited
+from app.core.security import create_access_token
+
+BUDGET_P99_MS = 0.5
+
+
+class Login(BaseModel):
+    email:    str
+    password: str
+
+
+def _app(with_audit: bool) -> FastAPI:
+    app = FastAPI()
+
+    async def login(body: Login) -> dict:
+        return {"user": body.email}
+
+    if with_audit:
+        login = audited("user.login", "user", body="body")(login)
+        app.add_middleware(AuditMiddleware)
+    app.post("/login")(login)
+    return app
+
+
+def _pct(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def run(n: int) -> int:
+    audit.audit_pipeline = AuditPipeline(capacity=n + 1, flush_interval_ms=60_000)
+    token   = create_access_token({"sub": "bench-user", "email": "b@nyaymarg.in", "role": "citizen"})
+    headers = {"Authorization": f"Bearer {token}", "user-agent": "bench"}
+    body    = {"email": "b@nyaymarg.in", "password": "secret"}
+    timings: dict[bool, list[float]] = {False: [], True: []}
+
+    async with AsyncClient(transport=ASGITransport(app=_app(False)), base_url="http://t") as plain, \
+               AsyncClient(transport=ASGITransport(app=_app(True)), base_url="http://t") as audited_:
+        for c in (plain, audited_):                   # warm up
+            for _ in range(200):
+                await c.post("/login", json=body, headers=headers)
+        for i in range(n):
+            for flag, c in ((False, plain), (True, audited_)) if i % 2 else ((True, audited_), (False, plain)):
+                started = time.perf_counter()
+                await c.post("/login", json=body, headers=headers)
+                timings[flag].append((time.perf_counter() - started) * 1000)
+
+    plain_t, audit_t = sorted(timings[False]), sorted(timings[True])
+    print(f"{'':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    print(f"{'plain':>8} {_pct(plain_t, .5):8.3f} {_pct(plain_t, .99):8.3f}")
+    print(f"{'audited':>8} {_pct(audit_t, .5):8.3f} {_pct(audit_t, .99):8.3f}")
+    added = _pct(audit_t, .99) - _pct(plain_t, .99)
+    print(f"added p99 {added:.3f} ms (budget {BUDGET_P99_MS} ms), "
+          f"events buffered {audit.audit_pipeline.depth}")
+    return 0 if added <= BUDGET_P99_MS else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.requests)))
+
+
+if __name__ == "__main__":
+    main()
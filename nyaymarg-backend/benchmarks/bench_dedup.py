@@ -0,0 +1,127 @@
+"""
+benchmarks/bench_dedup.py
+==========================
+Aggregator deduplication at 1k–10k raw results.
+
+Generates synthetic fan-out results in which ~40% of judgments come back from
+2–3 sources with source-style title variants (IK "on <date>" suffixes,
+"v." / "vs" / "versus", "& Ors", party order swapped, case changes) and
+compares the old exact 50-character title prefix match with the MinHash/LSH
+merge in app/external/dedup.py: wall time, clusters found, and pairwise
+precision / recall against the known duplicates.
+
+    cd nyaymarg-backend && python -m benchmarks.bench_dedup [--sizes 1000 5000 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from itertools import combinations
+
+from app.external.dedup import duplicate_groups
+from app.external.indian_kanoon.schemas import UnifiedSearchResult
+
+_FIRST = ["Rajesh", "Sunita", "Mohammed", "Anil", "Priya", "Harbans", "Lakshmi", "Arjun",
+          "Kavita", "Suresh", "Fatima", "Gurpreet", "Venkatesh", "Meena", "Joseph", "Deepak"]
+_LAST  = ["Kumar", "Sharma", "Iqbal", "Reddy", "Nair", "Singh", "Das", "Patil", "Menon",
+          "Chatterjee", "Khan", "Gupta", "Pillai", "Yadav", "Joshi", "Banerjee"]
+_STATE = ["Maharashtra", "Kerala", "Punjab", "Uttar Pradesh", "Tamil Nadu", "Karnataka",
+          "West Bengal", "Gujarat", "Rajasthan", "Bihar"]
+_MONTH = ["January", "March", "May", "July", "September", "November"]
+_SYLL  = ["ra", "ja", "van", "kri", "shna", "mur", "thi", "sel", "vam", "pra", "kash", "deo",
+          "nan", "dan", "gup", "ta", "var", "ma", "cha", "ndra", "bho", "sle", "kul", "kar"]
+_SOURCES = ["indian_kanoon", "eciapi", "kanoon_dev", "courtlistener"]
+
+
+def _person(rng: random.Random) -> str:
+    surname = "".join(rng.choice(_SYLL) for _ in range(rng.randint(2, 3))).title()
+    return f"{rng.choice(_FIRST)} {rng.choice([surname, rng.choice(_LAST) + ' ' + surname])}"
+
+
+def _case(rng: random.Random) -> tuple[str, str, int]:
+    a = _person(rng)
+    b = rng.choice([f"State of {rng.choice(_STATE)}", _person(rng), _person(rng), "Union of India"])
+    return a, b, rng.randint(1975, 2024)
+
+
+def _title(rng: random.Random, a: str, b: str, year: int, source: str) -> str:
+    if rng.random() < 0.3:
+        a, b = b, a
+    sep = rng.choice([" vs ", " v. ", " Versus ", " V/S "])
+    if rng.random() < 0.4:
+        b += rng.choice([" & Ors", " And Anr", " and others"])
+    title = a + sep + b
+    if rng.random() < 0.3:
+        title = title.upper() if rng.random() < 0.5 else title.title()
+    if source == "indian_kanoon":
+        title += f" on {rng.randint(1, 28)} {rng.choice(_MONTH)}, {year}"
+    return title
+
+
+def synthetic_results(n: int, dup_rate: float = 0.4, seed: int = 7) -> tuple[list[UnifiedSearchResult], list[int]]:
+    """n results and, for each, the id of the judgment it came from."""
+    rng = random.Random(seed)
+    results: list[UnifiedSearchResult] = []
+    truth:   list[int] = []
+    case_id = 0
+    while len(results) < n:
+        a, b, year = _case(rng)
+        copies     = rng.choice([2, 2, 3]) if rng.random() < dup_rate else 1
+        for source in rng.sample(_SOURCES, copies):
+            results.append(UnifiedSearchResult(
+                source    = source,
+                doc_id    = f"{source}-{len(results)}",
+                title     = _title(rng, a, b, year, source),
+                date      = f"{year}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}" if rng.random() < 0.7 else None,
+                relevance = rng.choice([0.9, 0.75, 0.7, 0.65]),
+            ))
+            truth.append(case_id)
+        case_id += 1
+    rng.shuffle(order := list(range(len(results))))
+    return [results[i] for i in order][:n], [truth[i] for i in order][:n]
+
+
+def prefix_groups(results: list[UnifiedSearchResult]) -> list[list[int]]:
+    """The aggregator's previous rule: exact match on the first 50 title chars."""
+    groups: dict[str, list[int]] = {}
+    for i, r in enumerate(results):
+        groups.setdefault(r.title[:50].lower().strip(), []).append(i)
+    return list(groups.values())
+
+
+def _pairs(groups) -> set[tuple[int, int]]:
+    return {p for g in groups for p in combinations(sorted(g), 2)}
+
+
+def score(groups: list[list[int]], truth: list[int]) -> tuple[float, float]:
+    by_case: dict[int, list[int]] = {}
+    for i, case in enumerate(truth):
+        by_case.setdefault(case, []).append(i)
+    found, actual = _pairs(groups), _pairs(by_case.values())
+    precision = len(found & actual) / len(found) if found else 1.0
+    recall    = len(found & actual) / len(actual) if actual else 1.0
+    return precision, recall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'results':>8}  {'method':<8} {'ms':>8} {'clusters':>9} {'precision':>9} {'recall':>7}")
+    for n in args.sizes:
+        results, truth = synthetic_results(n)
+        for name, fn in (("prefix", prefix_groups), ("minhash", duplicate_groups)):
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0     = time.perf_counter()
+                groups = fn(results)
+                best   = min(best, time.perf_counter() - t0)
+            precision, recall = score(groups, truth)
+            print(f"{n:>8}  {name:<8} {best * 1000:>8.1f} {len(groups):>9} {precision:>9.3f} {recall:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
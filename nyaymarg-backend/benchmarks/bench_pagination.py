@@ -0,0 +1,107 @@
+"""
+benchmarks/bench_pagination.py
+===============================
+Per-page cost of /predict/history as one user's history grows.
+
+Fills a temporary SQLite database with N predictions for a single user and
+times one 20-row page three ways:
+
+  load-all   the previous handler: SELECT every row, len(), slice in Python
+  offset     utils.pagination.paginate, ?page=1 (LIMIT/OFFSET + capped COUNT)
+  cursor     paginate with a keyset cursor from the middle of the history
+
+The table carries the (user_id, created_at, id) index the list queries rely on.
+
+    cd nyaymarg-backend && python -m benchmarks.bench_pagination [--sizes 1000 10000 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import Index, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.prediction import Prediction
+from app.models.user import User
+from app.utils.pagination import encode_cursor, paginate
+
+USER = uuid.uuid4()
+KEYS = (Prediction.created_at, Prediction.id)
+PAGE = 20
+
+
+def _rows(n: int, start: datetime) -> list[dict]:
+    return [{
+        "id": uuid.uuid4(), "user_id": USER, "case_type": "Civil", "court_level": "High Court",
+        "hearing_count": 5, "duration_days": 300, "judgment_text": "text " * 40,
+        "predicted_outcome": "Allowed", "rfc_confidence": 0.7, "logreg_confidence": 0.6,
+        "ensemble_confidence": 0.66, "top_features": {"f": 1.0}, "input_snapshot": {"x": 1},
+        "created_at": start + timedelta(seconds=i),
+    } for i in range(n)]
+
+
+async def _load_all(db) -> int:
+    stmt = select(Prediction).where(Prediction.user_id == USER).order_by(Prediction.created_at.desc())
+    rows = (await db.execute(stmt)).scalars().all()
+    return len(list(rows[:PAGE]))
+
+
+async def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+async def run(sizes: list[int], repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(User.__table__.create)
+            await conn.run_sync(Prediction.__table__.create)
+            await conn.run_sync(Index("ix_bench_user_created", Prediction.user_id,
+                                      Prediction.created_at, Prediction.id).create)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as db:
+            db.add(User(id=USER, email="bench@nyaymarg.in", username="bench",
+                        hashed_password="x", full_name="Bench"))
+            await db.commit()
+
+        print(f"{'history':>8} {'load-all ms':>12} {'offset ms':>10} {'cursor ms':>10}")
+        loaded, start = 0, datetime(2020, 1, 1)
+        for n in sizes:
+            async with sessions() as db:
+                rows = _rows(n - loaded, start + timedelta(seconds=loaded))
+                for i in range(0, len(rows), 5000):
+                    await db.execute(insert(Prediction), rows[i:i + 5000])
+                await db.commit()
+            loaded = n
+            mid    = encode_cursor([start + timedelta(seconds=n // 2), uuid.UUID(int=0)])
+            stmt   = select(Prediction).where(Prediction.user_id == USER)
+
+            async with sessions() as db:
+                t_all    = await _timed(lambda: _load_all(db), repeat)
+                t_offset = await _timed(lambda: paginate(db, stmt, keys=KEYS, page_size=PAGE), repeat)
+                t_cursor = await _timed(lambda: paginate(db, stmt, keys=KEYS, page_size=PAGE, cursor=mid), repeat)
+            print(f"{n:>8} {t_all:>12.1f} {t_offset:>10.1f} {t_cursor:>10.1f}")
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(sorted(args.sizes), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+benchmarks/bench_registry_sync.py
+==================================
+Throughput of loading df_cases into the `cases` table.
+
+Tiles the seeded df_cases up to N rows (fresh case_ids) and loads them:
+
+  orm-rows   one Case per session.add + flush, as POST /cases does (run on a
+             small sample only and reported as rows/s)
+  sync       data.registry_sync.sync_registry — COPY into a staging table +
+             one merge on Postgres, chunked executemany upserts elsewhere
+
+Defaults to a temporary SQLite file; pass --url postgresql+asyncpg://… (a
+throwaway database with the tables created) to measure the COPY path.
+
+    cd nyaymarg-backend && python -m benchmarks.bench_registry_sync [--sizes 10000 100000] [--url …]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.data.registry_sync import CASES, records, sync_registry
+from app.data.seed import get_registry, initialise_seed_data
+from app.models.base import Base
+from app.models.case import Case
+
+ORM_SAMPLE = 2000
+
+
+def _tiled(base: pd.DataFrame, n: int) -> pd.DataFrame:
+    reps = -(-n // len(base))
+    df   = pd.concat([base] * reps, ignore_index=True).head(n)
+    df["case_id"] = [f"BENCH_{i:09d}" for i in range(n)]
+    return df
+
+
+async def _orm_rows_per_s(engine, df: pd.DataFrame) -> float:
+    names    = [c.name for c in CASES.columns]
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    started  = time.perf_counter()
+    async with sessions() as db:
+        for row in records(df, CASES):
+            db.add(Case(**dict(zip(names, row))))
+            await db.flush()
+        await db.commit()
+    elapsed = time.perf_counter() - started
+    async with engine.begin() as conn:
+        await conn.execute(delete(Case))
+    return len(df) / elapsed
+
+
+async def run(sizes: list[int], url: str | None) -> None:
+    await initialise_seed_data()
+    registry = get_registry()
+    base     = registry.df_cases
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(url or f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[
+                Base.metadata.tables["courts"], Base.metadata.tables["judges"], Base.metadata.tables["cases"],
+            ])
+            await conn.execute(delete(Case))
+        await sync_registry(engine)                     # courts + judges (+ seed cases) first
+
+        orm = await _orm_rows_per_s(engine, _tiled(base, ORM_SAMPLE))
+        print(f"{engine.dialect.name}: orm-rows {orm:,.0f} rows/s (sample of {ORM_SAMPLE})")
+        print(f"{'rows':>9} {'sync s':>8} {'rows/s':>10} {'re-sync s':>10}")
+        for n in sizes:
+            registry.df_cases = _tiled(base, n)
+            started = time.perf_counter()
+            await sync_registry(engine)
+            first   = time.perf_counter() - started
+            started = time.perf_counter()
+            await sync_registry(engine)                 # unchanged rows: merge is a no-op
+            again   = time.perf_counter() - started
+            print(f"{n:>9} {first:>8.2f} {n / first:>10,.0f} {again:>10.2f}")
+            async with engine.begin() as conn:
+                await conn.execute(delete(Case))
+        registry.df_cases = base
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--url", default=None, help="database URL (default: temporary SQLite)")
+    args = parser.parse_args()
+    asyncio.run(run(sorted(args.sizes), args.url))
+
+
+if __name__ == "__main__":
+    main()
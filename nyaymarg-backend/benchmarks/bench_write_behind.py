@@ -0,0 +1,100 @@
+"""
+benchmarks/bench_write_behind.py
+=================================
+Request-path cost of POST /chat/message persistence in both durability modes.
+
+Runs N chat exchanges (each a get_db-style session: process + commit) with C
+running concurrently against a temporary SQLite file:
+
+  sync          ChatService.process flushes both messages inside the request
+  write_behind  the messages are buffered; core.write_behind batches them
+
+Reports per-request p50/p95 and wall time; write_behind also reports the
+queue's flush count and mean flush latency, and includes the final drain.
+
+    cd nyaymarg-backend && python -m benchmarks.bench_write_behind [--requests 2000] [--concurrency 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.core import write_behind as wb
+from app.core.write_behind import WriteBehindQueue
+from app.models.chat_message import ChatMessage
+from app.models.user import User
+from app.services.chat_service import ChatService
+
+USER = uuid.uuid4()
+
+
+async def _exchange(sessions, svc: ChatService, i: int) -> float:
+    started = time.perf_counter()
+    async with sessions() as db:
+        await svc.process(f"what is the chance my case {i} will win", "bench", USER, db)
+        await db.commit()
+    return (time.perf_counter() - started) * 1000
+
+
+async def _run_mode(engine, mode: str, n: int, concurrency: int) -> None:
+    settings.DB_DURABILITY_MODE = mode
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    svc      = ChatService()
+    gate     = asyncio.Semaphore(concurrency)
+    if mode == "write_behind":
+        wb.write_behind = WriteBehindQueue(settings.WRITE_BEHIND_BATCH_SIZE,
+                                           settings.WRITE_BEHIND_FLUSH_INTERVAL_MS,
+                                           settings.WRITE_BEHIND_MAX_QUEUE)
+        wb.write_behind.start(engine)
+
+    async def one(i: int) -> float:
+        async with gate:
+            return await _exchange(sessions, svc, i)
+
+    started   = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(one(i) for i in range(n))))
+    extra     = ""
+    if mode == "write_behind":
+        await wb.write_behind.stop()
+        snap  = wb.write_behind.snapshot()
+        extra = f"  flushes={snap['flushes']} avg_flush={snap['avg_flush_ms']}ms"
+    wall = time.perf_counter() - started
+    p95  = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{mode:>13} p50={statistics.median(latencies):7.2f}ms p95={p95:7.2f}ms "
+          f"wall={wall:6.2f}s{extra}")
+
+
+async def run(n: int, concurrency: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(User.__table__.create)
+            await conn.run_sync(ChatMessage.__table__.create)
+        async with async_sessionmaker(engine)() as db:
+            db.add(User(id=USER, email="bench@nyaymarg.in", username="bench",
+                        hashed_password="x", full_name="Bench"))
+            await db.commit()
+        print(f"{n} exchanges, concurrency {concurrency}")
+        for mode in ("sync", "write_behind"):
+            await _run_mode(engine, mode, n, concurrency)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
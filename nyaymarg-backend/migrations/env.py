@@ -30,6 +30,7 @@ import app.models.chat_message    # noqa: F401
 import app.models.ml_model        # noqa: F401
 import app.models.dataset         # noqa: F401
 import app.models.audit_log       # noqa: F401
+import app.models.gov_record      # noqa: F401
 
 config          = context.config
 target_metadata = Base.metadata
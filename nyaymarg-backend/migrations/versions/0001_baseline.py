@@ -0,0 +1,285 @@
+"""Baseline schema: every table as it stood before 0002_history_indexes.
+
+Frozen as explicit DDL so the revision means the same thing whatever the ORM
+models look like later; schema changes belong in their own revisions.
+Databases bootstrapped by the app's create_all already have these tables and
+are skipped table by table.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision      = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on    = None
+
+
+def _uuid_pk() -> sa.Column:
+    return sa.Column("id", UUID(as_uuid=True), primary_key=True)
+
+
+def _users() -> None:
+    op.create_table(
+        "users",
+        _uuid_pk(),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("full_name", sa.String(200), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("role", sa.Enum("citizen", "lawyer", "researcher", "admin", name="userrole"), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("avatar_url", sa.String(500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_login", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+
+def _courts() -> None:
+    op.create_table(
+        "courts",
+        _uuid_pk(),
+        sa.Column("court_id", sa.String(20), nullable=False),
+        sa.Column("court_name", sa.String(200), nullable=False),
+        sa.Column("city", sa.String(100), nullable=False),
+        sa.Column("state", sa.String(100), nullable=False),
+        sa.Column("court_type", sa.String(50), nullable=False),
+        sa.Column("judge_strength", sa.Integer(), nullable=False),
+        sa.Column("pending_cases", sa.Integer(), nullable=False),
+        sa.Column("monthly_filing_rate", sa.Integer(), nullable=False),
+        sa.Column("monthly_disposal_rate", sa.Integer(), nullable=False),
+        sa.Column("avg_disposal_time_days", sa.Integer(), nullable=False),
+        sa.Column("infrastructure_score", sa.Float(), nullable=False),
+        sa.Column("digitization_level", sa.Float(), nullable=False),
+        sa.Column("backlog_rate", sa.Float(), nullable=True),
+        sa.Column("utilization_rate", sa.Float(), nullable=True),
+        sa.Column("efficiency_score", sa.Float(), nullable=True),
+        sa.Column("backlog_risk_score", sa.Float(), nullable=True),
+        sa.Column("risk_category", sa.String(20), nullable=True),
+    )
+    op.create_index("ix_courts_court_id", "courts", ["court_id"], unique=True)
+    op.create_index("ix_courts_state", "courts", ["state"])
+    op.create_index("ix_courts_court_type", "courts", ["court_type"])
+
+
+def _judges() -> None:
+    op.create_table(
+        "judges",
+        _uuid_pk(),
+        sa.Column("judge_id", sa.String(20), nullable=False),
+        sa.Column("judge_name", sa.String(200), nullable=False),
+        sa.Column("court_id", sa.String(20), sa.ForeignKey("courts.court_id"), nullable=False),
+        sa.Column("court_name", sa.String(200), nullable=False),
+        sa.Column("state", sa.String(100), nullable=False),
+        sa.Column("specialization", sa.String(50), nullable=False),
+        sa.Column("experience_years", sa.Integer(), nullable=False),
+        sa.Column("cases_handled", sa.Integer(), nullable=False),
+        sa.Column("avg_judgment_time_days", sa.Integer(), nullable=False),
+        sa.Column("reversal_rate", sa.Float(), nullable=False),
+        sa.Column("bias_index", sa.Float(), nullable=False),
+        sa.Column("rating_score", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_judges_judge_id", "judges", ["judge_id"], unique=True)
+    op.create_index("ix_judges_court_id", "judges", ["court_id"])
+    op.create_index("ix_judges_state", "judges", ["state"])
+    op.create_index("ix_judges_specialization", "judges", ["specialization"])
+
+
+def _cases() -> None:
+    op.create_table(
+        "cases",
+        _uuid_pk(),
+        sa.Column("case_id", sa.String(20), nullable=False),
+        sa.Column("case_title", sa.String(500), nullable=False),
+        sa.Column("case_number", sa.String(50), nullable=False),
+        sa.Column("court_id", sa.String(20), sa.ForeignKey("courts.court_id"), nullable=False),
+        sa.Column("court_name", sa.String(200), nullable=False),
+        sa.Column("state", sa.String(100), nullable=False),
+        sa.Column("judge_id", sa.String(20), sa.ForeignKey("judges.judge_id"), nullable=False),
+        sa.Column("case_type", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(30), nullable=False),
+        sa.Column("filing_date", sa.Date(), nullable=True),
+        sa.Column("hearing_count", sa.Integer(), nullable=False),
+        sa.Column("complexity_score", sa.Float(), nullable=False),
+        sa.Column("case_value_lakhs", sa.Float(), nullable=False),
+        sa.Column("days_pending", sa.Integer(), nullable=False),
+        sa.Column("public_interest", sa.Boolean(), nullable=False),
+        sa.Column("law_id", sa.String(20), nullable=False),
+        sa.Column("outcome", sa.Integer(), nullable=False),
+        sa.Column("judgment_text", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_cases_case_id", "cases", ["case_id"], unique=True)
+    for column in ("court_id", "state", "judge_id", "case_type", "status", "law_id"):
+        op.create_index(f"ix_cases_{column}", "cases", [column])
+
+
+def _predictions() -> None:
+    op.create_table(
+        "predictions",
+        _uuid_pk(),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("case_type", sa.String(50), nullable=False),
+        sa.Column("court_level", sa.String(50), nullable=False),
+        sa.Column("hearing_count", sa.Integer(), nullable=False),
+        sa.Column("duration_days", sa.Integer(), nullable=False),
+        sa.Column("judgment_text", sa.Text(), nullable=False),
+        sa.Column("predicted_outcome", sa.String(20), nullable=False),
+        sa.Column("rfc_confidence", sa.Float(), nullable=False),
+        sa.Column("logreg_confidence", sa.Float(), nullable=False),
+        sa.Column("ensemble_confidence", sa.Float(), nullable=False),
+        sa.Column("top_features", sa.JSON(), nullable=True),
+        sa.Column("input_snapshot", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_predictions_user_id", "predictions", ["user_id"])
+
+
+def _bookmarks() -> None:
+    op.create_table(
+        "bookmarks",
+        _uuid_pk(),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("entity_type", sa.String(20), nullable=False),
+        sa.Column("entity_id", sa.String(100), nullable=False),
+        sa.Column("label", sa.String(200), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("meta", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_bookmarks_user_id", "bookmarks", ["user_id"])
+
+
+def _notifications() -> None:
+    op.create_table(
+        "notifications",
+        _uuid_pk(),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("type", sa.String(30), nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("entity_id", sa.String(100), nullable=True),
+        sa.Column("action_url", sa.String(300), nullable=True),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_notifications_user_id", "notifications", ["user_id"])
+
+
+def _chat_messages() -> None:
+    op.create_table(
+        "chat_messages",
+        _uuid_pk(),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("session_id", sa.String(50), nullable=False),
+        sa.Column("role", sa.String(10), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("intent", sa.String(30), nullable=True),
+        sa.Column("cta", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_chat_messages_user_id", "chat_messages", ["user_id"])
+    op.create_index("ix_chat_messages_session_id", "chat_messages", ["session_id"])
+
+
+def _ml_model_versions() -> None:
+    op.create_table(
+        "ml_model_versions",
+        _uuid_pk(),
+        sa.Column("version_tag", sa.String(50), nullable=False, unique=True),
+        sa.Column("rf_accuracy", sa.Float(), nullable=False),
+        sa.Column("rf_cv_f1", sa.Float(), nullable=False),
+        sa.Column("lr_accuracy", sa.Float(), nullable=False),
+        sa.Column("lr_f1", sa.Float(), nullable=False),
+        sa.Column("lr_auc_roc", sa.Float(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("metrics", sa.JSON(), nullable=True),
+        sa.Column("artefact_path", sa.String(500), nullable=True),
+        sa.Column("triggered_by", sa.String(100), nullable=True),
+        sa.Column("trained_at", sa.DateTime(), nullable=False),
+    )
+
+
+def _datasets() -> None:
+    op.create_table(
+        "datasets",
+        _uuid_pk(),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(200), nullable=False),
+        sa.Column("filename", sa.String(300), nullable=False),
+        sa.Column("file_path", sa.String(500), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("schema_info", sa.JSON(), nullable=True),
+        sa.Column("error_msg", sa.String(500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_datasets_user_id", "datasets", ["user_id"])
+
+
+def _audit_logs() -> None:
+    op.create_table(
+        "audit_logs",
+        _uuid_pk(),
+        sa.Column("user_id", sa.String(50), nullable=True),
+        sa.Column("action", sa.String(100), nullable=False),
+        sa.Column("resource", sa.String(100), nullable=True),
+        sa.Column("resource_id", sa.String(100), nullable=True),
+        sa.Column("ip_address", sa.String(45), nullable=True),
+        sa.Column("user_agent", sa.String(300), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+    op.create_index("ix_audit_logs_action", "audit_logs", ["action"])
+
+
+def _gov_records() -> None:
+    op.create_table(
+        "gov_records",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("resource", sa.String(30), nullable=False),
+        sa.Column("record_key", sa.String(32), nullable=False),
+        sa.Column("state", sa.String(100), nullable=True),
+        sa.Column("state_key", sa.String(100), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("synced_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("resource", "record_key", name="uq_gov_records_resource_key"),
+    )
+    op.create_index("ix_gov_records_resource_state_year", "gov_records", ["resource", "state_key", "year"])
+
+
+# Creation order: referenced tables first
+CREATE = {
+    "users": _users, "courts": _courts, "judges": _judges, "cases": _cases,
+    "predictions": _predictions, "bookmarks": _bookmarks, "notifications": _notifications,
+    "chat_messages": _chat_messages, "ml_model_versions": _ml_model_versions,
+    "datasets": _datasets, "audit_logs": _audit_logs, "gov_records": _gov_records,
+}
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, create in CREATE.items():
+        if table not in existing:
+            create()
+
+
+def downgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in reversed(CREATE):
+        if table in existing:
+            op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS userrole")
@@ -0,0 +1,50 @@
+"""Composite indexes for the per-user history listings.
+
+Every history endpoint filters on user_id (plus session_id / is_read) and
+orders by (created_at, id); with only single-column indexes Postgres fetched
+every matching row and sorted it. These indexes return the first page in
+index order. On Postgres they are built CONCURRENTLY so writes continue.
+
+Revision ID: 0002_history_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision      = "0002_history_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on    = None
+
+# name, table, columns, partial-index predicate (Postgres, SQLite)
+INDEXES = [
+    ("ix_predictions_user_created",           "predictions",   "(user_id, created_at DESC, id DESC)", None),
+    ("ix_chat_messages_user_session_created", "chat_messages", "(user_id, session_id, created_at, id)", None),
+    ("ix_notifications_user_created",         "notifications", "(user_id, created_at DESC, id DESC)", None),
+    ("ix_notifications_user_unread",          "notifications", "(user_id, created_at DESC, id DESC)",
+     ("NOT is_read", "is_read = 0")),
+    ("ix_bookmarks_user_created",             "bookmarks",     "(user_id, created_at DESC, id DESC)", None),
+    ("ix_audit_logs_user_created",            "audit_logs",    "(user_id, created_at DESC)", None),
+]
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            sql = f"CREATE INDEX {'CONCURRENTLY ' if postgres else ''}IF NOT EXISTS {name} ON {table} {columns}"
+            if where:
+                sql += f" WHERE {where[0] if postgres else where[1]}"
+            op.execute(sql)
+        if postgres:
+            for table in sorted({t for _, t, _, _ in INDEXES}):
+                op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX {'CONCURRENTLY ' if postgres else ''}IF EXISTS {name}")
@@ -0,0 +1,101 @@
+"""Monthly range partitioning of predictions and audit_logs (Postgres only).
+
+Each table is rebuilt as PARTITION BY RANGE (created_at) with one partition
+per month from its oldest row up to HISTORY_PARTITION_MONTHS_AHEAD months
+ahead, plus a DEFAULT partition; existing rows are copied across. The primary
+key becomes (id, created_at) because Postgres requires the partition key in
+every unique constraint. Afterwards `tasks.maintain_partitions` premakes new
+months and drops those past retention (app/data/partitions.py).
+
+Revision ID: 0003_partition_history
+Revises: 0002_history_indexes
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.config import settings
+from app.data.partitions import add_months, create_partition_sql, default_partition_sql, month_start
+
+revision      = "0003_partition_history"
+down_revision = "0002_history_indexes"
+branch_labels = None
+depends_on    = None
+
+TABLES: dict[str, dict[str, list[str]]] = {
+    "predictions": {
+        "foreign_keys": ["FOREIGN KEY (user_id) REFERENCES users (id)"],
+        "indexes": [
+            "CREATE INDEX ix_predictions_user_id ON {t} (user_id)",
+            "CREATE INDEX ix_predictions_user_created ON {t} (user_id, created_at DESC, id DESC)",
+        ],
+    },
+    "audit_logs": {
+        "foreign_keys": [],
+        "indexes": [
+            "CREATE INDEX ix_audit_logs_user_id ON {t} (user_id)",
+            "CREATE INDEX ix_audit_logs_action ON {t} (action)",
+            "CREATE INDEX ix_audit_logs_user_created ON {t} (user_id, created_at DESC)",
+        ],
+    },
+}
+
+
+def _relkind(table: str) -> str | None:
+    return op.get_bind().execute(
+        sa.text("SELECT relkind::text FROM pg_class WHERE relname = :t AND relkind IN ('p', 'r')"), {"t": table},
+    ).scalar()
+
+
+def _finish(table: str, spec: dict[str, list[str]], primary_key: str) -> None:
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})")
+    for fk in spec["foreign_keys"]:
+        op.execute(f"ALTER TABLE {table} ADD {fk}")
+    for index in spec["indexes"]:
+        op.execute(index.format(t=table))
+    op.execute(f"ANALYZE {table}")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, spec in TABLES.items():
+        if _relkind(table) != "r":
+            continue                                   # already partitioned
+        old = f"{table}_unpartitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        op.execute(f"UPDATE {old} SET created_at = now() WHERE created_at IS NULL")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL")
+
+        oldest = op.get_bind().execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar()
+        month  = month_start(oldest.date() if oldest else date.today())
+        last   = add_months(month_start(date.today()), settings.HISTORY_PARTITION_MONTHS_AHEAD)
+        while month <= last:
+            op.execute(create_partition_sql(table, month))
+            month = add_months(month, 1)
+        op.execute(default_partition_sql(table))
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+        op.execute(f"DROP TABLE {old}")                  # frees the old pkey / index names
+        _finish(table, spec, "id, created_at")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, spec in TABLES.items():
+        if _relkind(table) != "p":
+            continue
+        old = f"{table}_partitioned"
+        op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+        op.execute(f"DROP TABLE {old} CASCADE")           # drops every partition
+        _finish(table, spec, "id")
@@ -0,0 +1,33 @@
+"""SHA-256 checksum on datasets, for de-duplicating identical uploads.
+
+Uploads are now streamed to disk while hashed and stored content-addressed
+(UPLOAD_DIR/<sha256><ext>); re-uploading the same file returns the caller's
+existing dataset. Rows uploaded earlier keep a NULL checksum.
+
+Revision ID: 0004_dataset_checksum
+Revises: 0003_partition_history
+Create Date: 2026-10-19
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision      = "0004_dataset_checksum"
+down_revision = "0003_partition_history"
+branch_labels = None
+depends_on    = None
+
+
+def upgrade() -> None:
+    # Databases bootstrapped by the app's create_all already have the column.
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("datasets")}
+    if "checksum" not in columns:
+        op.add_column("datasets", sa.Column("checksum", sa.String(64), nullable=True))
+    op.execute("CREATE INDEX IF NOT EXISTS ix_datasets_user_checksum ON datasets (user_id, checksum)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_datasets_user_checksum")
+    with op.batch_alter_table("datasets") as batch:
+        batch.drop_column("checksum")
@@ -16,9 +16,26 @@ def event_loop():
     loop.close()
 
 
+# ── Keep the local SQLite stores out of the source tree ───────────────────────
+@pytest.fixture(scope="session", autouse=True)
+def local_stores(tmp_path_factory):
+    from app.config import settings
+    from app.external.causelists import causelist_store
+    from app.external.doc_store import doc_store
+
+    root = tmp_path_factory.mktemp("data")
+    for store, attr in ((doc_store, "DOC_STORE_PATH"), (causelist_store, "CAUSELIST_STORE_PATH")):
+        store.close()
+        store.path = str(root / store.path.rsplit("/", 1)[-1])
+        setattr(settings, attr, store.path)
+    yield root
+    doc_store.close()
+    causelist_store.close()
+
+
 # ── Initialise seed data + models once per test session ───────────────────────
 @pytest_asyncio.fixture(scope="session", autouse=True)
-async def setup_data():
+async def setup_data(local_stores):
     from app.data.seed import initialise_seed_data
     from app.ml.loader import load_or_train_models
     await initialise_seed_data()
@@ -0,0 +1,135 @@
+"""
+tests/integration/test_pg_indexes.py — Query plans of the history listings on Postgres.
+
+Runs only when TEST_POSTGRES_URL (postgresql+asyncpg://…) points at a throwaway
+database: the schema is dropped, migrated to 0002, seeded with ten months of
+generate_series rows, converted by 0003 (so the partition copy is exercised)
+and analysed. The router queries must then be answered from the composite
+indexes (no Seq Scan, no Sort node) and partitions must prune by created_at.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+PG_URL = os.environ.get("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not PG_URL, reason="TEST_POSTGRES_URL not set")
+
+USER = "00000000-0000-0000-0000-000000000001"
+
+SEED = [
+    "INSERT INTO users (id, email, username, full_name, hashed_password, role, is_active, created_at) "
+    "SELECT ('00000000-0000-0000-0000-' || lpad(to_hex(g), 12, '0'))::uuid, 'u' || g || '@t.in', 'u' || g, "
+    "'User', 'x', 'citizen', true, now() FROM generate_series(1, 200) g",
+    "INSERT INTO predictions (id, user_id, case_type, court_level, hearing_count, duration_days, judgment_text, "
+    "predicted_outcome, rfc_confidence, logreg_confidence, ensemble_confidence, created_at) "
+    "SELECT gen_random_uuid(), ('00000000-0000-0000-0000-' || lpad(to_hex(1 + g % 200), 12, '0'))::uuid, "
+    "'Civil', 'High Court', 3, 90, 'text', 'Allowed', 0.5, 0.5, 0.5, now() - (g % 300) * interval '1 day' "
+    "FROM generate_series(1, 60000) g",
+    "INSERT INTO notifications (id, user_id, type, title, body, is_read, created_at) "
+    "SELECT gen_random_uuid(), ('00000000-0000-0000-0000-' || lpad(to_hex(1 + g % 200), 12, '0'))::uuid, "
+    "'system', 't', 'b', g % 10 <> 0, now() - g * interval '1 minute' FROM generate_series(1, 60000) g",
+    "INSERT INTO chat_messages (id, user_id, session_id, role, content, created_at) "
+    "SELECT gen_random_uuid(), ('00000000-0000-0000-0000-' || lpad(to_hex(1 + g % 200), 12, '0'))::uuid, "
+    "'s' || (g % 7), 'user', 'hi', now() - g * interval '1 minute' FROM generate_series(1, 60000) g",
+    "INSERT INTO bookmarks (id, user_id, entity_type, entity_id, created_at) "
+    "SELECT gen_random_uuid(), ('00000000-0000-0000-0000-' || lpad(to_hex(1 + g % 200), 12, '0'))::uuid, "
+    "'case', 'CASE_' || g, now() - g * interval '1 minute' FROM generate_series(1, 60000) g",
+    "INSERT INTO audit_logs (id, user_id, action, created_at) "
+    "SELECT gen_random_uuid(), 'u' || (g % 200), 'user.login', now() - (g % 300) * interval '1 day' "
+    "FROM generate_series(1, 60000) g",
+]
+
+QUERIES = {
+    "predictions": "SELECT * FROM predictions WHERE user_id = '{u}' ORDER BY created_at DESC, id DESC LIMIT 21",
+    "notifications": "SELECT * FROM notifications WHERE user_id = '{u}' ORDER BY created_at DESC, id DESC LIMIT 21",
+    "notifications_unread": "SELECT * FROM notifications WHERE user_id = '{u}' AND NOT is_read "
+                            "ORDER BY created_at DESC, id DESC LIMIT 21",
+    # chat_history pages oldest-first (paginate(..., descending=False))
+    "chat": "SELECT * FROM chat_messages WHERE user_id = '{u}' AND session_id = 's1' "
+            "ORDER BY created_at, id LIMIT 21",
+    "bookmarks": "SELECT * FROM bookmarks WHERE user_id = '{u}' ORDER BY created_at DESC, id DESC LIMIT 21",
+    "audit": "SELECT * FROM audit_logs WHERE user_id = 'u1' ORDER BY created_at DESC LIMIT 50",
+}
+
+
+async def _execute(statements: list[str]) -> list:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(PG_URL)
+    results = []
+    async with engine.begin() as conn:
+        for sql in statements:
+            r = await conn.execute(text(sql))
+            results.append(r.fetchall() if r.returns_rows else [])
+    await engine.dispose()
+    return results
+
+
+def _plan(sql: str) -> str:
+    rows = asyncio.run(_execute([f"EXPLAIN {sql}"]))[0]
+    return "\n".join(r[0] for r in rows)
+
+
+@pytest.fixture(scope="module")
+def migrated():
+    from alembic import command
+    from alembic.config import Config
+    from app.config import settings
+
+    asyncio.run(_execute(["DROP SCHEMA public CASCADE", "CREATE SCHEMA public"]))
+    original, settings.DATABASE_URL = settings.DATABASE_URL, PG_URL
+    try:
+        config = Config(str(Path(__file__).resolve().parents[2] / "alembic.ini"))
+        command.upgrade(config, "0002_history_indexes")
+        asyncio.run(_execute(SEED))
+        command.upgrade(config, "head")
+    finally:
+        settings.DATABASE_URL = original
+    asyncio.run(_execute(["ANALYZE"]))
+
+
+@pytest.mark.parametrize("name", sorted(QUERIES))
+def test_history_query_uses_index(migrated, name):
+    plan = _plan(QUERIES[name].format(u=USER))
+    assert "Seq Scan" not in plan, plan
+    assert "Sort" not in plan, plan
+
+
+def test_partition_pruning(migrated):
+    from app.data.partitions import add_months, month_start
+
+    month = month_start(date.today())
+    plan  = _plan(
+        f"SELECT count(*) FROM predictions "
+        f"WHERE created_at >= '{month.isoformat()}' AND created_at < '{add_months(month, 1).isoformat()}'"
+    )
+    assert f"predictions_p{month:%Y_%m}" in plan
+    assert "predictions_default" not in plan
+    assert plan.count("predictions_p") == 1
+
+
+def test_maintenance_drops_expired_partitions(migrated, monkeypatch):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.config import settings
+    from app.data.partitions import add_months, maintain_partitions, month_start
+
+    monkeypatch.setattr(settings, "AUDIT_LOG_RETENTION_MONTHS", 3)
+
+    async def run():
+        engine = create_async_engine(PG_URL)
+        summary = await maintain_partitions(engine, today=date.today())
+        await engine.dispose()
+        return summary
+
+    summary = asyncio.run(run())
+    assert isinstance(summary["audit_logs"], dict), summary     # "not partitioned" otherwise
+    assert summary["audit_logs"]["dropped"]
+    cutoff = add_months(month_start(date.today()), -3)
+    oldest = asyncio.run(_execute(["SELECT min(created_at) FROM audit_logs"]))[0][0][0]
+    assert oldest.date() >= cutoff
@@ -0,0 +1,90 @@
+"""
+tests/unit/test_aggregator.py — deadline-aware fan-out and per-source streaming.
+Source adapters are replaced with local coroutines; no network is used.
+"""
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.external.aggregator import LegalSearchAggregator, SourceError
+from app.external.circuit_breaker import CircuitState, circuit_breakers
+from app.external.indian_kanoon.schemas import UnifiedSearchResult
+
+
+def _source(name: str, delay: float = 0.0, fail: bool = False):
+    async def search(query: str) -> list[UnifiedSearchResult]:
+        await asyncio.sleep(delay)
+        if fail:
+            raise SourceError(f"{name} down")
+        return [UnifiedSearchResult(source=name, doc_id="1", title=f"{name}: {query}", relevance=0.5)]
+    return search
+
+
+@pytest.fixture(autouse=True)
+def _fast_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "EXTERNAL_SEARCH_DEADLINE_SECONDS", 0.2)
+    monkeypatch.setattr(settings, "EXTERNAL_SEARCH_SOURCE_BUDGETS", {})
+    circuit_breakers.reset()
+    yield
+    circuit_breakers.reset()
+
+
+def _aggregator(monkeypatch, **sources) -> LegalSearchAggregator:
+    agg = LegalSearchAggregator()
+    monkeypatch.setattr(agg, "_enabled_sources", lambda intl: sources)
+    return agg
+
+
+@pytest.mark.asyncio
+async def test_slow_source_is_dropped_at_deadline(monkeypatch):
+    agg = _aggregator(monkeypatch, fast=_source("fast"), slow=_source("slow", delay=5))
+    loop  = asyncio.get_running_loop()
+    start = loop.time()
+    results = await agg.search_all("bail")
+    assert loop.time() - start < 1.0
+    assert [r["source"] for r in results] == ["fast"]
+
+
+@pytest.mark.asyncio
+async def test_events_stream_in_completion_order(monkeypatch):
+    agg = _aggregator(
+        monkeypatch,
+        a=_source("a", delay=0.08), b=_source("b"), c=_source("c", delay=0.03, fail=True),
+    )
+    events = [e async for e in agg.iter_search("bail")]
+    sources = [(e["source"], e["status"]) for e in events if e["event"] == "source"]
+    assert sources == [("b", "ok"), ("c", "error"), ("a", "ok")]
+    done = events[-1]
+    assert done["event"] == "done"
+    assert done["sources"] == {"a": "ok", "b": "ok", "c": "error"}
+    assert len(done["results"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_per_source_budget(monkeypatch):
+    monkeypatch.setattr(settings, "EXTERNAL_SEARCH_SOURCE_BUDGETS", {"slowish": 0.02})
+    agg = _aggregator(monkeypatch, slowish=_source("slowish", delay=0.1))
+    events = [e async for e in agg.iter_search("bail")]
+    assert events[0]["status"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_source_missing_deadlines_is_skipped_once_circuit_opens(monkeypatch):
+    monkeypatch.setattr(settings, "EXTERNAL_SEARCH_DEADLINE_SECONDS", 0.01)
+    calls = 0
+    slow  = _source("slow", delay=1)
+
+    async def counted(query):
+        nonlocal calls
+        calls += 1
+        return await slow(query)
+
+    agg = _aggregator(monkeypatch, slow=counted)
+    for _ in range(settings.EXTERNAL_CB_FAILURE_THRESHOLD):
+        await agg.search_all("bail")
+    assert circuit_breakers.get("slow").state is CircuitState.OPEN
+
+    events = [e async for e in agg.iter_search("bail")]
+    assert events[0]["status"] == "skipped"
+    assert calls == settings.EXTERNAL_CB_FAILURE_THRESHOLD
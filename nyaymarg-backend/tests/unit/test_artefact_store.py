@@ -0,0 +1,107 @@
+"""
+tests/unit/test_artefact_store.py — versioned model artefacts and hot reload:
+publish / CURRENT / prune, the pre-versioning fallback, and an API-side
+reloader (Redis pub/sub replaced by an in-memory queue) swapping versions
+while predictions keep being served.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import queue
+import time
+
+import joblib
+import pytest
+
+from app.data.seed import ModelBundle, get_registry
+from app.ml.artefact_store import ArtefactStore, ModelReloader, activate
+from app.schemas.prediction import PredictionRequest
+from app.services.prediction_service import PredictionService
+
+
+class _PubSub:
+    """Stand-in for redis PubSub: announcements arrive through a queue."""
+
+    def __init__(self, inbox: queue.Queue) -> None:
+        self.inbox = inbox
+
+    def get_message(self, timeout: float = 0.0):
+        try:
+            return {"type": "message", "data": self.inbox.get(timeout=timeout)}
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        pass
+
+
+def _bundle() -> ModelBundle:
+    models = get_registry().models
+    return ModelBundle(rf_model=models.rf_model, lr_model=models.lr_model, vectorizer=models.vectorizer)
+
+
+def test_publish_current_prune_and_legacy(tmp_path):
+    store = ArtefactStore(tmp_path)
+    assert store.current() is None and store.load() is None
+
+    for name in ("rf_model", "lr_model", "vectorizer"):                # pre-versioning layout
+        joblib.dump(name, tmp_path / f"{name}.joblib")
+    assert store.load()[0].version == "legacy"
+
+    versions = [store.publish(_bundle(), {"n": i}) for i in range(3)]
+    assert store.current() == versions[-1] and store.versions() == sorted(versions)
+    bundle, manifest = store.load()
+    assert bundle.version == versions[-1] and manifest["metrics"] == {"n": 2}
+    assert store.load(versions[0])[1]["metrics"] == {"n": 0}
+
+    assert store.prune(keep=1) == versions[:2] and store.versions() == versions[2:]
+    with pytest.raises(ValueError, match="incomplete"):
+        store.publish(dataclasses.replace(_bundle(), rf_model=None))
+
+
+@pytest.mark.asyncio
+async def test_predictions_switch_versions_without_downtime(tmp_path, monkeypatch):
+    registry = get_registry()
+    saved    = registry.models
+    store    = ArtefactStore(tmp_path)
+    inbox: queue.Queue = queue.Queue()
+
+    first = store.publish(_bundle())
+    activate(registry, *store.load(first))
+    assert registry.models.version == first and registry.corpus_vectors is not None
+
+    reloader = ModelReloader(store)
+    monkeypatch.setattr(reloader, "_connect", lambda: _PubSub(inbox))
+    reloader.start()
+
+    def trainer() -> str:                        # the Celery worker: publish, then announce
+        time.sleep(0.05)
+        version = store.publish(_bundle(), {"trained_by": "worker"})
+        inbox.put(json.dumps({"version": version}))
+        return version
+
+    svc  = PredictionService()
+    req  = PredictionRequest(case_type="Civil", court_level="High Court", hearing_count=8,
+                             duration_days=365, judgment_text="property dispute between legal heirs")
+    seen: list[str] = []
+    try:
+        worker = asyncio.get_running_loop().run_in_executor(None, trainer)
+        deadline = time.monotonic() + 20
+        while (not seen or seen[-1] == first) and time.monotonic() < deadline:
+            result = await svc.predict_case_outcome(req, user_id=None, db=None)   # never fails mid-swap
+            seen.append(result.model_version)
+            await asyncio.sleep(0.005)
+        second  = await worker
+        swapped = registry.models
+    finally:
+        reloader.stop()
+        activate(registry, saved)
+
+    assert seen[0] == first and seen[-1] == second
+    assert seen == sorted(seen)                                         # one switch, no flip-flopping
+    assert reloader.reloads == 1 and reloader.last_error is None and not reloader.running
+    # similarity matrix rebuilt with the new version's vectorizer before the swap
+    assert swapped.corpus_vectors is not saved.corpus_vectors
+    assert swapped.corpus_vectors.shape[0] == len(registry.df_cases)
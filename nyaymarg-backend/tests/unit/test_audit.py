@@ -0,0 +1,176 @@
+"""
+tests/unit/test_audit.py — audit pipeline: events from decorated endpoints
+(success and failure), redaction, sampling, ring-buffer overflow, client IP
+resolution behind trusted proxies, column-length fitting and the bulk flush
+into audit_logs (a rejected row does not block the rest). Uses a throwaway FastAPI app and a temporary SQLite file.
+"""
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.core import audit
+from app.core.audit import AuditMiddleware, AuditPipeline, audit_context, audited, redact
+from app.models.audit_log import AuditLog
+
+
+class Login(BaseModel):
+    email:    str
+    password: str
+
+
+class Token(BaseModel):
+    user_id: str
+
+
+def _current() -> dict:
+    return {"id": "u-42"}
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    @audited("user.login", "user", actor=lambda r: r.user_id, body="body")
+    async def login(body: Login) -> Token:
+        if body.password != "right":
+            raise HTTPException(401, "Invalid credentials")
+        return Token(user_id="u-1")
+
+    @app.put("/items/{item_id}")
+    @audited("item.update", "item", target="item_id")
+    async def update(item_id: int, current: dict = Depends(_current)) -> dict:
+        audit_context(note="x" * 500)
+        return {"ok": True}
+
+    @app.post("/plain")
+    async def plain() -> dict:
+        return {}
+
+    app.add_middleware(AuditMiddleware)
+    return app
+
+
+@pytest_asyncio.fixture
+async def pipeline(monkeypatch):
+    pipe = AuditPipeline(capacity=100, flush_interval_ms=60_000)
+    monkeypatch.setattr(audit, "audit_pipeline", pipe)
+    return pipe
+
+
+@pytest_asyncio.fixture
+async def client():
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_success_and_failure_are_recorded(pipeline, client):
+    assert (await client.post("/login", json={"email": "a@b.in", "password": "right"})).status_code == 200
+    assert (await client.post("/login", json={"email": "a@b.in", "password": "wrong"})).status_code == 401
+    assert (await client.post("/plain")).status_code == 200          # undecorated: no event
+
+    ok, failed = pipeline.events()
+    assert ok["action"] == "user.login" and ok["user_id"] == "u-1"
+    assert ok["payload"]["status"] == 200 and ok["payload"]["body"]["password"] == "[redacted]"
+    assert failed["user_id"] is None and failed["payload"]["status"] == 401
+    assert failed["payload"]["body"]["email"] == "a@b.in"
+
+
+@pytest.mark.asyncio
+async def test_actor_target_and_context(pipeline, client):
+    r = await client.put("/items/7", headers={"user-agent": "pytest", "x-forwarded-for": "10.0.0.9"})
+    assert r.status_code == 200
+    (event,) = pipeline.events()
+    assert (event["user_id"], event["resource"], event["resource_id"]) == ("u-42", "item", "7")
+    assert event["ip_address"] == "127.0.0.1" and event["user_agent"] == "pytest"   # no trusted proxy
+    assert len(event["payload"]["note"]) == settings.AUDIT_MAX_FIELD_CHARS + 1
+
+
+@pytest.mark.asyncio
+async def test_sampling_keeps_always_actions_and_failures(pipeline, client, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_SAMPLE_RATE", 0.0)
+    await client.put("/items/1")                                          # routine: sampled out
+    await client.post("/login", json={"email": "a@b.in", "password": "right"})   # always kept
+    monkeypatch.setattr(settings, "AUDIT_ALWAYS_ACTIONS", [])
+    await client.post("/login", json={"email": "a@b.in", "password": "wrong"})   # failure kept
+    assert [e["payload"]["status"] for e in pipeline.events()] == [200, 401]
+    assert pipeline.stats.sampled_out == 1
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_overwrites_oldest(monkeypatch, client):
+    pipe = AuditPipeline(capacity=3, flush_interval_ms=60_000)
+    monkeypatch.setattr(audit, "audit_pipeline", pipe)
+    for i in range(5):
+        await client.put(f"/items/{i}")
+    assert [e["resource_id"] for e in pipe.events()] == ["2", "3", "4"]
+    assert pipe.snapshot()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_bulk_inserts(pipeline, client, tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AuditLog.__table__.create)
+    pipeline.engine = engine
+    for i in range(4):
+        await client.put(f"/items/{i}")
+    assert await pipeline.flush() == 4 and pipeline.depth == 0
+    async with engine.connect() as conn:
+        rows = (await conn.execute(select(AuditLog.action, AuditLog.resource_id))).all()
+    assert sorted(r.resource_id for r in rows) == ["0", "1", "2", "3"]
+    await engine.dispose()
+
+
+def _scope(peer: str, forwarded: str | None = None, **headers: str) -> dict:
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    if forwarded is not None:
+        raw.append((b"x-forwarded-for", forwarded.encode()))
+    return {"method": "PUT", "path": "/items/1", "client": (peer, 5000), "headers": raw}
+
+
+def test_forwarded_for_is_only_trusted_from_configured_proxies(monkeypatch):
+    assert audit.client_ip(_scope("203.0.113.7", "1.2.3.4")) == "203.0.113.7"
+
+    monkeypatch.setattr(settings, "AUDIT_TRUSTED_PROXIES", ["10.0.0.0/8"])
+    assert audit.client_ip(_scope("203.0.113.7", "1.2.3.4")) == "203.0.113.7"      # peer not a proxy
+    # Spoofed left-most entry is ignored: the right-most untrusted hop wins
+    assert audit.client_ip(_scope("10.0.0.2", "6.6.6.6, 198.51.100.4, 10.0.0.3")) == "198.51.100.4"
+    assert audit.client_ip(_scope("10.0.0.2", "not-an-ip" + "x" * 80)) == "10.0.0.2"
+    assert audit.client_ip(_scope("10.0.0.2")) == "10.0.0.2"
+
+
+@pytest.mark.asyncio
+async def test_fields_fit_columns_and_a_rejected_row_does_not_block_the_rest(pipeline, tmp_path):
+    pipeline.record({"action": "a" * 300, "resource": "r" * 300, "resource_id": "9" * 300},
+                    _scope("127.0.0.1", user_agent="u" * 1000), 200, 1.0)
+    (row,) = pipeline.events()
+    assert (len(row["action"]), len(row["resource"]), len(row["resource_id"]), len(row["user_agent"])) \
+        == (100, 100, 100, 300)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(AuditLog.__table__.create)
+    pipeline.engine = engine
+    pipeline.record({"action": "item.update"}, _scope("127.0.0.1"), 200, 1.0)
+    pipeline.events()[1]["action"] = None                                  # NOT NULL: rejected
+    pipeline.record({"action": "item.delete"}, _scope("127.0.0.1"), 200, 1.0)
+
+    assert await pipeline.flush() == 2 and pipeline.depth == 1
+    async with engine.connect() as conn:
+        actions = (await conn.execute(select(AuditLog.action))).scalars().all()
+    assert sorted(actions) == ["a" * 100, "item.delete"]
+    assert pipeline.snapshot()["failures"] == 1
+    await engine.dispose()
+
+
+def test_redact_nested():
+    value = {"user": {"Password": "p", "tags": ["a" * 5]}, "n": 3}
+    assert redact(value, frozenset({"password"}), 3) == {"user": {"Password": "[redacted]", "tags": ["aaa…"]}, "n": 3}
@@ -0,0 +1,92 @@
+"""
+tests/unit/test_causelists.py — cause-list snapshots: one upstream fetch per
+court/date, expiry of current lists, CNR hearing index and the tracked-court
+snapshot job. The provider
+is replaced with a local fake; uses a temporary SQLite file.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.config import settings
+from app.external import causelists
+from app.external.causelists import CauseListStore
+from app.external.ecourts.eciapi_client import ECIAPIClient
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    store = CauseListStore(str(tmp_path / "causelists.sqlite3"))
+    monkeypatch.setattr(causelists, "causelist_store", store)
+    calls: list[tuple[str, str]] = []
+
+    async def get_causelist(self, court_code, day):
+        calls.append((court_code, day))
+        if court_code == "DOWN01":
+            return {"error": "External API eciapi returned 503"}
+        if court_code == "EMPTY01":
+            return []
+        n = int(day[-2:]) % 3 + 1
+        return [{"cnr": f"{court_code}0000{i}2024", "case_no": f"CRL.A {i}/2024",
+                 "parties": "State v. Accused", "bench": "Court 3", "item_no": i}
+                for i in range(n)]
+
+    monkeypatch.setattr(ECIAPIClient, "get_causelist", get_causelist)
+    yield calls
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_each_court_date_is_fetched_once(provider):
+    first  = await causelists.get_causelist("eciapi", "DLHC01", "2026-10-19")
+    second = await causelists.get_causelist("eciapi", "DLHC01", "2026-10-19")
+    assert first == second and provider == [("DLHC01", "2026-10-19")]
+
+    await causelists.get_causelist("eciapi", "DLHC01", "2026-10-19", refresh=True)
+    assert len(provider) == 2
+    assert causelists.causelist_store.snapshot()["snapshots"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_snapshotted(provider):
+    result = await causelists.get_causelist("eciapi", "DOWN01", "2026-10-19")
+    assert "error" in result
+    await causelists.get_causelist("eciapi", "DOWN01", "2026-10-19")
+    assert len(provider) == 2
+
+
+@pytest.mark.asyncio
+async def test_current_lists_expire_and_empty_ones_are_not_stored(provider, monkeypatch):
+    today     = date.today().isoformat()
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    tomorrow  = (date.today() + timedelta(days=1)).isoformat()
+
+    assert await causelists.get_causelist("eciapi", "EMPTY01", tomorrow) == []
+    await causelists.get_causelist("eciapi", "EMPTY01", tomorrow)
+    assert len(provider) == 2                          # unpublished list asked for again
+
+    await causelists.get_causelist("eciapi", "DLHC01", today)
+    await causelists.get_causelist("eciapi", "DLHC01", yesterday)
+    monkeypatch.setattr(settings, "CAUSELIST_TTL_SECONDS", -1)   # every snapshot is stale
+    await causelists.get_causelist("eciapi", "DLHC01", today)
+    await causelists.get_causelist("eciapi", "DLHC01", yesterday)
+    assert provider[2:] == [("DLHC01", today), ("DLHC01", yesterday), ("DLHC01", today)]
+
+
+@pytest.mark.asyncio
+async def test_hearings_for_cnrs_come_from_local_index(provider, monkeypatch):
+    monkeypatch.setattr(settings, "CAUSELIST_TRACKED_COURTS", ["DLHC01", "MHHC01", "DOWN01"])
+    summary = await causelists.snapshot_tracked(days_ahead=2)
+    assert summary["lists"] == 9 and summary["failed"] == 3
+    calls = len(provider)
+
+    today = date.today()
+    hearings = await causelists.causelist_store.hearings(
+        ["DLHC0100000" + "2024", "MHHC0100000" + "2024", "XXHC0100000" + "2024"],
+        today.isoformat(), (today + timedelta(days=6)).isoformat(),
+    )
+    assert len(provider) == calls                      # answered without upstream calls
+    assert {h["court"] for h in hearings} == {"DLHC01", "MHHC01"}
+    assert len(hearings) == 6                          # item 0 is listed every day
+    assert [h["date"] for h in hearings] == sorted(h["date"] for h in hearings)
+    assert hearings[0]["bench"] == "Court 3"
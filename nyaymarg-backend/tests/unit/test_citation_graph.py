@@ -0,0 +1,98 @@
+"""
+tests/unit/test_citation_graph.py — citation graph: CSR degrees, PageRank
+authority, k-hop traversal, incremental crawl and the precedent-search boost.
+IK metadata is served by a local fake; no network is used.
+"""
+import numpy as np
+import pytest
+
+from app.data.seed import get_registry
+from app.external import citation_graph as cg
+from app.external.citation_graph import CitationGraph
+from app.external.indian_kanoon.client import IndianKanoonClient
+from app.services.similarity_service import SimilarityService
+
+
+def _star(graph: CitationGraph) -> CitationGraph:
+    # 1..5 all cite 0; 0 cites 9; 6 cites 1
+    for i in range(1, 6):
+        graph.add_citations(f"ik:{i}", ["ik:0"])
+    graph.add_citations("ik:0", ["ik:9"])
+    graph.add_citations("ik:6", ["ik:1", "ik:1"])
+    return graph
+
+
+def test_degrees_and_authority():
+    g = _star(CitationGraph())
+    assert g.n_nodes == 8 and g.n_edges == 7          # duplicate edge collapsed
+    assert g.node("ik:0")["cited_by"] == 5
+    assert g.node("ik:0")["cites"] == 1
+    assert g.top(2)[0]["node"] in {"ik:0", "ik:9"}
+    auth = g.authority()
+    assert auth.max() == 1.0
+    assert g.authority_of("ik:0") > g.authority_of("ik:1") > g.authority_of("ik:2")
+    assert g.authority_of("ik:unknown") == 0.0
+
+
+def test_k_hop_neighbourhood():
+    g = _star(CitationGraph())
+    assert g.neighbourhood("ik:6", k=1, direction="out") == {"ik:1": 1}
+    two = g.neighbourhood("ik:6", k=2, direction="out")
+    assert two == {"ik:1": 1, "ik:0": 2}
+    both = g.neighbourhood("ik:0", k=1)
+    assert set(both) == {"ik:1", "ik:2", "ik:3", "ik:4", "ik:5", "ik:9"}
+
+
+def test_persistence_round_trip(tmp_path):
+    g = _star(CitationGraph(str(tmp_path / "graph.npz")))
+    g.mark_crawled("ik:0")
+    g.save()
+    loaded = CitationGraph(str(tmp_path / "graph.npz"))
+    assert loaded.load()
+    assert loaded.snapshot()["edges"] == 7 and loaded.is_crawled("ik:0")
+    np.testing.assert_allclose(loaded.authority(), g.authority())
+
+
+@pytest.mark.asyncio
+async def test_crawl_is_incremental(tmp_path, monkeypatch):
+    calls: list[int] = []
+
+    async def get_metadata(self, doc_id):
+        calls.append(doc_id)
+        return {"precedents": [{"doc_id": doc_id * 10 + i, "classification": "Positive"} for i in range(3)],
+                "citedbyList": [{"tid": doc_id + 1000}]}
+
+    monkeypatch.setattr(IndianKanoonClient, "get_metadata", get_metadata)
+    graph = CitationGraph(str(tmp_path / "graph.npz"))
+    summary = await cg.crawl(["ik:1"], depth=1, graph=graph)
+    assert summary["fetched"] == 5                     # seed + 3 precedents + 1 citing doc
+    assert graph.node("ik:1")["cites"] == 3 and graph.node("ik:1")["cited_by"] == 1
+
+    calls.clear()
+    await cg.crawl(["ik:1"], depth=1, graph=graph)
+    assert calls == []                                 # every node already crawled
+    await cg.crawl(["ik:1"], depth=2, graph=graph)
+    assert len(calls) == 16                            # only the new frontier
+    assert (tmp_path / "graph.npz").exists()
+
+
+def test_authority_boosts_precedent_search(monkeypatch):
+    registry = get_registry()
+    df_before = registry.df_cases
+    graph = _star(CitationGraph())
+    monkeypatch.setattr(cg, "citation_graph", graph)
+    try:
+        df = registry.df_cases.copy()
+        df["ik_doc_id"] = None
+        query = df.iloc[0]["clean_text"]
+        plain = SimilarityService().search(query, top_n=5, authority_weight=0)
+        target = df.index[df["case_id"] == plain[-1].case_id][0]
+        df.loc[target, "ik_doc_id"] = 0                # most-cited judgment
+        registry.df_cases = df
+
+        boosted = SimilarityService().search(query, top_n=5, authority_weight=1.0)
+        assert boosted[0].case_id == plain[-1].case_id
+        assert boosted[0].authority == round(graph.authority_of("ik:0"), 4)
+        assert boosted[0].similarity_score == plain[-1].similarity_score
+    finally:
+        registry.df_cases = df_before
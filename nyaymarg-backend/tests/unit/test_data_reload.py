@@ -0,0 +1,75 @@
+"""
+tests/unit/test_data_reload.py — cross-process data reload: a finished job's
+announcement re-runs the matching loader in the API process (Redis pub/sub
+replaced by an in-memory queue), coroutine loaders run on the API loop, and
+a lost subscription is caught up on resubscribe.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import queue
+import threading
+import time
+
+import pytest
+
+from app.data.reload import DataReloader
+
+
+class _PubSub:
+    def __init__(self, inbox: queue.Queue) -> None:
+        self.inbox = inbox
+
+    def get_message(self, timeout: float = 0.0):
+        try:
+            data = self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if isinstance(data, Exception):
+            raise data
+        return {"type": "message", "data": data}
+
+    def close(self) -> None:
+        pass
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    assert predicate()
+
+
+@pytest.mark.asyncio
+async def test_announcements_reload_only_the_announced_kind(monkeypatch):
+    calls: list[tuple[str, str]] = []
+    loop = asyncio.get_running_loop()
+
+    async def gov() -> int:
+        calls.append(("gov_records", "loop" if asyncio.get_running_loop() is loop else "other"))
+        return 3
+
+    reloader = DataReloader({
+        "ik_import":   lambda: calls.append(("ik_import", threading.current_thread().name)),
+        "gov_records": gov,
+    })
+    inbox: queue.Queue = queue.Queue()
+    monkeypatch.setattr(reloader, "_connect", lambda: _PubSub(inbox))
+    reloader.start()
+    try:
+        inbox.put(json.dumps({"kind": "ik_import"}))
+        inbox.put(json.dumps({"kind": "gov_records"}))
+        inbox.put(json.dumps({"kind": "no_such_kind"}))
+        await _wait_for(lambda: len(calls) == 2)
+
+        # A dropped subscription re-runs every loader once on resubscribe
+        inbox.put(ConnectionError("redis went away"))
+        await _wait_for(lambda: len(calls) == 4)
+    finally:
+        await asyncio.to_thread(reloader.stop)
+
+    assert calls[:2] == [("ik_import", "data-reloader"), ("gov_records", "loop")]
+    assert sorted(kind for kind, _ in calls[2:]) == ["gov_records", "ik_import"]
+    assert reloader.reloads == {"ik_import": 2, "gov_records": 2}
+    assert "redis went away" in reloader.last_error and not reloader.running
@@ -0,0 +1,91 @@
+"""
+tests/unit/test_dataset_features.py — training on uploaded datasets: column
+matching on the Parquet conversion, the per-dataset feature cache (a re-run
+with other hyperparameters skips vectorisation), and partial datasets that
+only train one model. Skipped without pyarrow.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.data.dataset_ingest import ingest
+from app.data.seed import DataRegistry
+from app.ml import dataset_features, trainer
+from app.ml.trainer import RF_FEATURES
+
+pytest.importorskip("pyarrow")
+
+_TEXT = {1: "judgment delivered appeal allowed decree passed", 0: "hearing adjourned notice issued respondent absent"}
+
+
+def _upload(tmp_path, n: int = 200, courts: bool = True, name: str = "ds.csv"):
+    rng = np.random.default_rng(7)
+    df  = pd.DataFrame({
+        "case_id":       [f"CASE_{i:05d}" for i in range(n)],
+        "case_type":     ["Civil"] * n,
+        "status":        ["Decided", "Pending"] * (n // 2),
+        "judgment_text": [f"{_TEXT[1 - i % 2]} item{i % 7}" for i in range(n)],
+    })
+    if courts:
+        for feature in RF_FEATURES:
+            df[feature.replace("_", " ").title()] = rng.uniform(0, 100, n)   # "Judge Strength"
+        df["backlog_risk_score"] = rng.uniform(0, 1, n)
+        df.loc[3, "Pending Cases"] = None                                       # dropped from the RF matrix
+    path = tmp_path / name
+    df.to_csv(path, index=False)
+    _, info = ingest(path)
+    return info["parquet"]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FEATURE_CACHE_DIR", str(tmp_path / "features"))
+    monkeypatch.setattr(settings, "MODEL_ARTEFACTS_DIR", str(tmp_path / "artefacts"))
+    monkeypatch.setattr(settings, "MODEL_HOT_RELOAD_ENABLED", False)
+    return DataRegistry()
+
+
+def test_features_built_once_then_cached(tmp_path, store, monkeypatch):
+    parquet  = _upload(tmp_path)
+    features = dataset_features.load_features(parquet, "a" * 64)
+    X, y     = features.rf
+    vec, (X_train, X_test, y_train, y_test) = features.text
+    assert not features.cached and features.rows == 200 and features.skipped == {}
+    assert X.shape == (199, len(RF_FEATURES)) and set(y) == {0, 1}
+    assert X_train.shape[0] + X_test.shape[0] == 200 and set(y_train) == {0, 1}
+
+    monkeypatch.setattr(dataset_features, "build_features", lambda *_: pytest.fail("re-vectorised"))
+    again = dataset_features.load_features(parquet, "a" * 64)
+    assert again.cached and np.array_equal(again.rf[0], X)
+    assert (again.text[1][0] != X_train).nnz == 0 and again.text[0].vocabulary_ == vec.vocabulary_
+
+    dataset_features.drop_cache("a" * 64)
+    assert list((tmp_path / "features").iterdir()) == []
+
+
+def test_train_on_dataset_with_new_hyperparameters(tmp_path, store):
+    parquet = _upload(tmp_path)
+    first   = trainer._train_dataset_sync(store, parquet, "b" * 64, {"n_estimators": 20})
+    second  = trainer._train_dataset_sync(store, parquet, "b" * 64, {"n_estimators": 40, "C": 0.5})
+
+    assert first["dataset"]["feature_cache"] == "miss" and second["dataset"]["feature_cache"] == "hit"
+    assert store.rf_model.n_estimators == 40 and store.lr_model.C == 0.5
+    assert second["lr_model"]["accuracy"] == 1.0                       # labels follow the text
+    assert (tmp_path / "artefacts" / "versions" / second["version"] / "vectorizer.joblib").exists()
+    row = pd.DataFrame([[50.0] * len(RF_FEATURES)], columns=RF_FEATURES)
+    assert store.rf_model.predict_proba(row).shape == (1, 2)
+    assert store.lr_model.predict_proba(store.vectorizer.transform(["appeal allowed"]))[0][1] > 0.5
+
+
+def test_text_only_dataset_keeps_backlog_model(tmp_path, store):
+    store.rf_model = existing = object()
+    parquet = _upload(tmp_path, courts=False)
+    metrics = trainer._train_dataset_sync(store, parquet, None, None)
+    assert "rf_model" not in metrics and "missing columns" in metrics["dataset"]["skipped"]["rf_model"]
+    assert store.rf_model is existing and store.lr_model is not None
+
+    with pytest.raises(ValueError, match="no trainable columns"):
+        trainer._train_dataset_sync(store, _upload(tmp_path, n=6, courts=False, name="tiny.csv"))
@@ -0,0 +1,153 @@
+"""
+tests/unit/test_dataset_ingest.py — streaming dataset ingestion: incremental
+JSON parsing across buffer boundaries, kind inference, case-schema validation
+over several chunks, the Parquet conversion (skipped without pyarrow) and the
+Celery task recording the result on the Dataset row, run after run.
+"""
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.data.dataset_ingest import infer_kind, ingest, json_records
+
+
+def _cases(n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "case_id":          [f"CASE_{i:06d}" for i in range(n)],
+        "case_type":        ["Civil", "Criminal"] * (n // 2),
+        "status":           ["Decided", "Pending"] * (n // 2),
+        "filing_date":      ["2021-03-04"] * n,
+        "hearing_count":    list(range(n)),
+        "complexity_score": [5.5] * n,
+        "public_interest":  ["true", "false"] * (n // 2),
+        "judgment_text":    ["land dispute over tenancy"] * n,
+        "outcome":          [1, 0] * (n // 2),
+    }).astype(object)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "DATASET_INGEST_CHUNK_ROWS", 7)
+    monkeypatch.setattr(settings, "DATASET_SAMPLE_ROWS", 5)
+
+
+def test_json_records_across_buffer_boundaries(tmp_path):
+    records = [{"n": i * 1001, "s": "x" * (i % 5), "nested": {"a": [i]}} for i in range(50)]
+    path    = tmp_path / "a.json"
+    path.write_text(" [ " + " , ".join(json.dumps(r) for r in records) + " ] ")
+    assert list(json_records(path, buffer_size=8)) == records
+
+    path.write_text("\n".join(json.dumps(r) for r in records[:3]) + "\n")     # NDJSON
+    assert list(json_records(path, buffer_size=5)) == records[:3]
+
+    path.write_text('[{"a": 1}, {"a": ')
+    with pytest.raises(json.JSONDecodeError):
+        list(json_records(path, buffer_size=4))
+
+
+def test_infer_kind():
+    assert infer_kind(pd.Series(["1", "2", None, ""])) == "integer"
+    assert infer_kind(pd.Series(["1.5", "2"])) == "number"
+    assert infer_kind(pd.Series(["yes", "No"])) == "boolean"
+    assert infer_kind(pd.Series(["2021-01-02", "15/01/2020"])) == "date"
+    assert infer_kind(pd.Series(["Civil", "3"])) == "string"
+
+
+def test_csv_case_schema_validation(tmp_path, small_chunks):
+    df = _cases(20)
+    df.loc[3, "hearing_count"]     = "-1"
+    df.loc[12, "complexity_score"] = "high"
+    df.loc[15, "judgment_text"]    = None
+    df.loc[18, "outcome"]          = 2
+    path = tmp_path / "cases.csv"
+    df.to_csv(path, index=False)
+
+    rows, info = ingest(path)
+    assert rows == 20 and info["format"] == "csv"
+    assert "case_text" in info["columns"] and "public_interest_tag" in info["columns"]   # aliases
+    assert info["kinds"]["hearing_count"] == "integer" and info["kinds"]["filing_date"] == "date"
+    schema = info["case_schema"]
+    assert schema["matches"] and schema["invalid_rows"] == 4
+    assert sorted((e["row"], e["column"]) for e in schema["errors"]) == [
+        (4, "hearing_count"), (13, "complexity_score"), (16, "case_text"), (19, "outcome"),
+    ]
+    assert info["type_errors"] == {"complexity_score": 1}
+
+
+def test_json_non_case_dataset(tmp_path, small_chunks):
+    path = tmp_path / "courts.json"
+    path.write_text(json.dumps([{"court": f"C{i}", "pending": i * 10, "extra": {"k": i}} for i in range(12)]))
+    rows, info = ingest(path)
+    assert rows == 12 and info["kinds"] == {"court": "string", "pending": "integer", "extra": "string"}
+    assert info["case_schema"] == {"matches": False, "missing": ["case_id", "case_type", "status", "case_text"]}
+
+
+def test_parquet_conversion(tmp_path, small_chunks):
+    pq = pytest.importorskip("pyarrow.parquet")
+    df = _cases(20)
+    df.loc[12, "complexity_score"] = "high"
+    path = tmp_path / "cases.csv"
+    df.to_csv(path, index=False)
+
+    _, info = ingest(path)
+    table = pq.read_table(info["parquet"])
+    assert info["parquet"] == str(tmp_path / "cases.parquet") and table.num_rows == 20
+    out = table.to_pandas()
+    assert out["hearing_count"].tolist() == list(range(20))
+    assert out["public_interest_tag"].tolist()[:2] == [True, False]
+    assert pd.isna(out.loc[12, "complexity_score"]) and out.loc[0, "complexity_score"] == 5.5
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_process_dataset_task_records_status_across_runs(tmp_path, small_chunks, monkeypatch):
+    # Each task run gets a fresh loop (as in a prefork worker); the second run
+    # must not reuse connections from the first one's closed loop
+    import asyncio
+    import uuid
+
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    import app.database as database
+    from app.models.dataset import Dataset
+    from app.models.user import User
+    from app.tasks import celery_app
+    from app.tasks.ingestion_tasks import process_dataset_task
+
+    url = tmp_path / "tasks.db"
+    sync = create_engine(f"sqlite:///{url}")
+    User.__table__.create(sync)
+    Dataset.__table__.create(sync)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{url}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", engine)
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(engine))
+
+    def fresh_loop(coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+    monkeypatch.setattr(celery_app.asyncio, "run", fresh_loop)
+
+    path = tmp_path / "cases.csv"
+    _cases(10).to_csv(path, index=False)
+    user, ids = uuid.uuid4(), [uuid.uuid4(), uuid.uuid4()]
+    with sync.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"id": user, "email": "d@t.in", "username": "d", "full_name": "D",
+                                                "hashed_password": "x", "role": "citizen", "is_active": True}])
+        conn.execute(Dataset.__table__.insert(), [
+            {"id": i, "user_id": user, "name": "c", "filename": "c.csv", "file_path": str(path),
+             "file_size": 1, "status": "pending"} for i in ids
+        ])
+
+    for i in ids:
+        assert process_dataset_task.run(str(i), str(path))["status"] == "ready"
+    with sync.connect() as conn:
+        rows = conn.execute(select(Dataset.status, Dataset.row_count)).all()
+    assert rows == [("ready", 10), ("ready", 10)]
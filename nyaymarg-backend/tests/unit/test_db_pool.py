@@ -0,0 +1,105 @@
+"""
+tests/unit/test_db_pool.py — pool instrumentation (checkouts, overflow,
+timeouts), the read-only session factory, the cached /health DB probe and
+the per-task engine disposal in Celery's run_async.
+Uses temporary SQLite files.
+"""
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy import exc, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.database as database
+from app.config import settings
+from app.core.db_pool import InstrumentedPool, pool_snapshot
+from app.database import ReadOnlySession
+from app.models.user import User
+
+
+def _engine(tmp_path, **kw):
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+                               poolclass=InstrumentedPool, **kw)
+
+
+@pytest.mark.asyncio
+async def test_checkout_overflow_and_timeout_counted(tmp_path):
+    engine = _engine(tmp_path, pool_size=1, max_overflow=1, pool_timeout=0.05)
+    first  = await engine.connect()
+    second = await engine.connect()                      # beyond pool_size: overflow
+    snap   = pool_snapshot(engine)
+    assert (snap["in_use"], snap["overflow"], snap["overflow_opened"]) == (2, 1, 1)
+
+    with pytest.raises(exc.TimeoutError):
+        await engine.connect()
+    await first.close()
+    await second.close()
+
+    snap = pool_snapshot(engine)
+    assert snap["checkouts"] == 2 and snap["timeouts"] == 1 and snap["peak_in_use"] == 2
+    assert snap["in_use"] == 0 and snap["wait_max_ms"] >= snap["wait_p50_ms"] >= 0
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_session_reads_but_refuses_to_flush(tmp_path):
+    engine = _engine(tmp_path)
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.create)
+    reads = async_sessionmaker(engine, class_=AsyncSession, sync_session_class=ReadOnlySession)
+
+    async with reads() as db:
+        assert (await db.execute(select(User))).scalars().all() == []
+        db.add(User(id=uuid.uuid4(), email="r@nyaymarg.in", username="r",
+                    hashed_password="x", full_name="R"))
+        with pytest.raises(RuntimeError, match="read-only"):
+            await db.flush()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_health_probe_is_cached(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "_health", (0.0, ""))
+    monkeypatch.setattr(settings, "DATABASE_HEALTH_CACHE_SECONDS", 60.0)
+
+    assert await database.check_db_connection() == "ok"
+    assert await database.check_db_connection() == "ok"
+    assert pool_snapshot(engine)["checkouts"] == 1
+
+    monkeypatch.setattr(settings, "DATABASE_HEALTH_CACHE_SECONDS", 0.0)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert await database.check_db_connection() == "ok"
+    assert pool_snapshot(engine)["checkouts"] == 3
+    await engine.dispose()
+
+
+def test_run_async_disposes_the_pool_after_each_task(tmp_path, monkeypatch):
+    # Each Celery task gets its own loop; pooled connections must not outlive it
+    import asyncio
+
+    from app.tasks import celery_app
+
+    engine = _engine(tmp_path)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", engine)
+
+    def fresh_loop(coro):                               # asyncio.run would unset pytest's loop
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+    monkeypatch.setattr(celery_app.asyncio, "run", fresh_loop)
+
+    async def task() -> int:
+        async with engine.connect() as conn:
+            return (await conn.execute(text("SELECT 1"))).scalar()
+
+    for _ in range(2):
+        assert celery_app.run_async(task()) == 1
+        assert engine.pool.checkedin() == 0              # nothing left bound to the closed loop
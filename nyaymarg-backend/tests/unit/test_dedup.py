@@ -0,0 +1,100 @@
+"""
+tests/unit/test_dedup.py — near-duplicate merge of fan-out search results:
+cross-source title variants, citation matches, year guard and the merged
+record's source ids, filled fields and relevance.
+"""
+from app.external.aggregator import LegalSearchAggregator
+from app.external.dedup import merge_duplicates, normalise_title
+from app.external.indian_kanoon.schemas import UnifiedSearchResult
+
+
+def _r(source: str, doc_id: str, title: str, **kw) -> UnifiedSearchResult:
+    return UnifiedSearchResult(source=source, doc_id=doc_id, title=title, **kw)
+
+
+def test_title_normalisation_ignores_source_styling():
+    a = normalise_title("Kesavananda Bharati vs State Of Kerala And Anr on 24 April, 1973")
+    b = normalise_title("STATE OF KERALA V. KESAVANANDA BHARATI & ORS")
+    assert a == b == "kesavananda bharati v state of kerala"
+
+
+def test_same_judgment_from_several_sources_is_merged():
+    results = [
+        _r("indian_kanoon", "257876", "Kesavananda Bharati vs State Of Kerala And Anr on 24 April, 1973",
+           date="1973-04-24", summary="Basic structure doctrine", relevance=0.9),
+        _r("eciapi", "KLHC010000011970", "State of Kerala v. Kesavananda Bharati & Ors",
+           court="Supreme Court", outcome="Disposed", relevance=0.75),
+        _r("kanoon_dev", "sc-1973-135", "Kesavananda Bharati Sripadagalvaru v. State of Kerala",
+           relevance=0.7),
+        _r("indian_kanoon", "1766147", "Maneka Gandhi vs Union Of India on 25 January, 1978",
+           relevance=0.9),
+    ]
+    merged = merge_duplicates(results)
+    assert len(merged) == 3
+
+    kb = merged[0]
+    assert kb.source == "indian_kanoon" and kb.doc_id == "257876"
+    assert kb.source_ids == {"indian_kanoon": ["257876"], "eciapi": ["KLHC010000011970"]}
+    assert kb.court == "Supreme Court" and kb.outcome == "Disposed"   # filled from eCourts
+    assert kb.relevance == 0.95                                       # one corroborating source
+    assert merged[2].source_ids == {"indian_kanoon": ["1766147"]}
+
+
+def test_shared_citation_merges_dissimilar_titles():
+    merged = merge_duplicates([
+        _r("indian_kanoon", "1", "Maneka Gandhi vs Union Of India", metadata={"citation": "AIR 1978 SC 597"}),
+        _r("courtlistener", "2", "Gandhi (Maneka) v. UOI, (1978) 1 SCC 248",
+           metadata={"citation": ["AIR 1978 SC 597"]}),
+    ])
+    assert len(merged) == 1
+    assert set(merged[0].source_ids) == {"indian_kanoon", "courtlistener"}
+
+
+def test_judgments_citing_the_same_precedent_stay_separate():
+    precedent = "following Kesavananda Bharati v. State of Kerala, (1973) 4 SCC 225"
+    merged = merge_duplicates([
+        _r("indian_kanoon", "1", "Kesavananda Bharati vs State Of Kerala on 24 April, 1973",
+           metadata={"citation": "(1973) 4 SCC 225"}),
+        _r("indian_kanoon", "2", "Minerva Mills Ltd. vs Union Of India on 31 July, 1980",
+           summary=f"Basic structure, {precedent}"),
+        _r("courtlistener", "3", "I.R. Coelho v. State of Tamil Nadu", date="2007-01-11",
+           summary=f"Ninth Schedule laws, {precedent}"),
+    ])
+    assert [m.source_ids for m in merged] == [
+        {"indian_kanoon": ["1"]}, {"indian_kanoon": ["2"]}, {"courtlistener": ["3"]},
+    ]
+
+
+def test_shared_citation_respects_the_year_guard():
+    merged = merge_duplicates([
+        _r("indian_kanoon", "1", "A vs B on 1 May, 1973", metadata={"citation": "AIR 1973 SC 1461"}),
+        _r("courtlistener", "2", "C v. D", date="2007-01-11", metadata={"citation": "AIR 1973 SC 1461"}),
+    ])
+    assert len(merged) == 2
+
+
+def test_same_parties_years_apart_stay_separate():
+    merged = merge_duplicates([
+        _r("indian_kanoon", "1", "Rajesh Kumar vs State Of Maharashtra on 3 May, 2009"),
+        _r("indian_kanoon", "2", "Rajesh Kumar vs State Of Maharashtra on 9 June, 2019"),
+        _r("eciapi", "3", "State of Maharashtra v. Rajesh Kumar", date="2019-02-11"),
+    ])
+    assert [sorted(sum(m.source_ids.values(), [])) for m in merged] == [["1"], ["2", "3"]]
+
+
+def test_distinct_short_titles_are_not_merged():
+    results = [_r(s, "1", f"{s}: bail") for s in ("a", "b", "c")]
+    assert len(merge_duplicates(results)) == 3
+
+
+def test_aggregator_ranks_merged_results():
+    agg = LegalSearchAggregator()
+    ranked = agg._deduplicate_and_rank([
+        _r("eciapi", "CNR1", "Arjun Singh v. State of Punjab", relevance=0.75),
+        _r("indian_kanoon", "9", "Meena Nair vs Union Of India", relevance=0.9),
+        _r("kanoon_dev", "x", "ARJUN SINGH VERSUS STATE OF PUNJAB & ORS", relevance=0.7),
+        _r("courtlistener", "y", "State of Punjab vs Arjun Singh", relevance=0.65),
+    ])
+    assert [r.doc_id for r in ranked] == ["9", "CNR1"]
+    assert ranked[1].relevance == 0.85
+    assert ranked[1].source_ids == {"eciapi": ["CNR1"], "kanoon_dev": ["x"], "courtlistener": ["y"]}
@@ -0,0 +1,60 @@
+"""
+tests/unit/test_doc_store.py — local document store: positional lookup,
+metadata merge and size-bounded eviction. Uses a temporary SQLite file.
+"""
+import pytest
+
+from app.external.doc_store import DocumentStore, clean_html
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = DocumentStore(str(tmp_path / "docs.sqlite3"), max_bytes=10_000_000)
+    yield s
+    s.close()
+
+
+TEXT = clean_html(
+    "<p>The appellant sought <b>anticipatory bail</b> under Section 438.</p>"
+    "<p>Bail was refused; the High Court later granted anticipatory   bail.</p>"
+)
+
+
+def test_find_returns_phrase_offsets_case_insensitively(store):
+    store.put_sync("indian_kanoon", "42", text=TEXT, fetch_ms=120.0, clean_ms=1.5)
+    hits = store.find_sync("indian_kanoon", "42", "Anticipatory Bail", limit=5)
+    assert len(hits) == 2
+    assert all(TEXT[h:h + 17].lower() == "anticipatory bail" for h in hits)
+    assert store.find_sync("indian_kanoon", "42", "regular bail") == []
+    assert store.find_sync("indian_kanoon", "42", "habeas corpus") == []
+
+
+def test_find_matches_partial_words_like_a_substring_search(store):
+    store.put_sync("indian_kanoon", "9", text="The accused was convicted; the contract was void.")
+    assert store.find_sync("indian_kanoon", "9", "convict") == [16]
+    assert store.find_sync("indian_kanoon", "9", "act") == [36]          # inside "contract"
+    assert store.find_sync("indian_kanoon", "9", "used was conv") == [7]
+    assert store.find_sync("indian_kanoon", "9", "accused is convicted") == []
+
+
+def test_metadata_merges_without_dropping_text(store):
+    store.put_sync("indian_kanoon", "7", text=TEXT, meta={"title": "A v. B"})
+    store.put_sync("indian_kanoon", "7", meta={"court": "Delhi High Court"})
+    doc = store.get_sync("indian_kanoon", "7")
+    assert doc.text == TEXT
+    assert doc.meta == {"title": "A v. B", "court": "Delhi High Court"}
+    assert store.snapshot()["hits"] == 1
+
+
+def test_least_recently_used_documents_are_evicted(tmp_path):
+    small = DocumentStore(str(tmp_path / "small.sqlite3"), max_bytes=6_000)   # room for two documents
+    words = " ".join(f"term{i}" for i in range(200))
+    small.put_sync("courtlistener", "1", text=words)
+    small.put_sync("courtlistener", "2", text=words)
+    small.get_sync("courtlistener", "1")                 # 1 is now more recent than 2
+    small.put_sync("courtlistener", "3", text=words)
+    assert small.get_sync("courtlistener", "2") is None
+    assert small.get_sync("courtlistener", "1") is not None
+    assert small.get_sync("courtlistener", "3") is not None
+    assert small.snapshot()["evicted"] >= 1
+    small.close()
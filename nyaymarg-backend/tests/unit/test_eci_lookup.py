@@ -0,0 +1,114 @@
+"""
+tests/unit/test_eci_lookup.py — async eCourts CNR lookup: the event loop keeps
+serving while the upstream hangs, batch lookups run concurrently and dedupe.
+The Kleopatra transport is replaced with a local fake; no network is used.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.external.cache import response_cache
+from app.external.circuit_breaker import circuit_breakers
+from app.external.ecourts.eciapi_client import ECIAPIClient
+from app.external.rate_limit import rate_limiters
+
+HANG = "DLHC010000002024"
+
+
+class _Calls(list):
+    """CNRs sent upstream, plus the peak number of concurrent upstream calls."""
+    in_flight = 0
+    peak      = 0
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = _Calls()
+
+    async def transport(self, method, url, **kwargs):
+        cnr = url.rsplit("/", 1)[-1]
+        calls.append(cnr)
+        calls.in_flight += 1
+        calls.peak = max(calls.peak, calls.in_flight)
+        try:
+            if cnr == HANG:
+                await asyncio.sleep(5)
+            await asyncio.sleep(0.05)
+        finally:
+            calls.in_flight -= 1
+        status = 404 if cnr.endswith("9999") else 200
+        return httpx.Response(status, json={"cnr": cnr}, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(ECIAPIClient, "_transport", transport)
+    monkeypatch.setattr(settings, "ECI_CNR_TIMEOUT_SECONDS", 0.5)
+    monkeypatch.setattr(settings, "EXTERNAL_API_RATE_LIMIT_OVERRIDES", {"eciapi": 0})
+    circuit_breakers.reset()
+    rate_limiters.reset()
+    yield calls
+    circuit_breakers.reset()
+    rate_limiters.reset()
+
+
+@pytest.mark.asyncio
+async def test_hanging_upstream_does_not_block_other_requests(client, upstream):
+    await response_cache.clear()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    hung = asyncio.create_task(client.get(f"/api/v1/eci/case/{HANG}"))
+    await asyncio.sleep(0.01)
+
+    ok = await client.get("/api/v1/eci/case/DLHC010000012024")
+    assert ok.json() == {"status": "success", "data": {"cnr": "DLHC010000012024"}}
+    assert loop.time() - start < 0.4
+    assert not hung.done()
+
+    body = (await hung).json()
+    assert body["status"] == "error" and "timed out" in body["message"]
+    assert loop.time() - start < 1.5
+
+
+@pytest.mark.asyncio
+async def test_batch_lookup_is_concurrent_and_deduped(client, upstream):
+    await response_cache.clear()
+    cnrs = [f"DLHC01{i:06d}2024" for i in range(1, 9)] + ["DLHC010000012024", "DLHC010099999999", "bad"]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    resp = await client.post("/api/v1/eci/cases", json=cnrs)
+    body = resp.json()
+    # 9 upstream calls of 50 ms each, at most EXTERNAL_API_MAX_IN_FLIGHT at a time
+    assert loop.time() - start < 9 * 0.05
+    assert sorted(upstream) == sorted(set(cnrs) - {"bad"})
+    assert body["counts"] == {"success": 8, "not_found": 1, "invalid": 1}
+    assert body["results"]["bad"]["status"] == "invalid"
+
+
+@pytest.mark.asyncio
+async def test_full_batch_within_rate_limit_all_succeed(client, upstream, monkeypatch):
+    # A full batch at 3000/min: every token is < 1 s away, but a naive fan-out
+    # would have spent the 0.5 s per-CNR deadline queueing in the limiter
+    await response_cache.clear()
+    monkeypatch.setattr(settings, "EXTERNAL_API_RATE_LIMIT_OVERRIDES", {"eciapi": 3000})
+    cnrs = [f"DLHC01{i:06d}2025" for i in range(settings.ECI_BATCH_MAX_CNRS)]
+    resp = await client.post("/api/v1/eci/cases", json=cnrs)
+    assert resp.json()["counts"] == {"success": len(cnrs)}
+    assert len(upstream) == len(cnrs)
+    assert upstream.peak <= settings.EXTERNAL_API_MAX_IN_FLIGHT
+
+
+@pytest.mark.asyncio
+async def test_batch_the_rate_limit_cannot_serve_is_rejected(client, upstream, monkeypatch):
+    monkeypatch.setattr(settings, "EXTERNAL_API_RATE_LIMIT_OVERRIDES", {"eciapi": 10})
+    cnrs = [f"DLHC01{i:06d}2026" for i in range(settings.ECI_BATCH_MAX_CNRS)]
+    resp = await client.post("/api/v1/eci/cases", json=cnrs)
+    assert resp.status_code == 422
+    assert "send at most 15" in resp.json()["detail"]
+    assert upstream == []
+
+
+def test_default_batch_size_fits_the_default_rate():
+    # The largest batch the route accepts must not be rejected at the defaults
+    per_second = settings.EXTERNAL_API_RATE_LIMIT_PER_MIN / 60
+    most = settings.EXTERNAL_API_RATE_LIMIT_BURST + per_second * settings.ECI_BATCH_MAX_SECONDS
+    assert settings.ECI_BATCH_MAX_CNRS <= most
@@ -0,0 +1,142 @@
+"""
+tests/unit/test_ecw_bulk_refresh.py — eCourtsIndia bulk refresh orchestration:
+chunking, bounded concurrent jobs, polling, recent-refresh dedupe and re-queueing of
+rate-limiter rejections. The provider is replaced with a local fake; no
+network is used.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.external.doc_store import DocumentStore
+from app.external.ecourts import bulk_refresh
+from app.external.ecourts.ecourtsindia_client import ECourtsIndiaClient
+from app.external.rate_limit import rate_limiters
+
+
+class FakeProvider:
+    def __init__(self) -> None:
+        self.jobs:      dict[str, list[str]] = {}
+        self.polls:     dict[str, int] = {}
+        self.in_flight = 0
+        self.peak      = 0
+        self.fetched:   list[str] = []
+
+    async def bulk_refresh(self, cnr_list):
+        assert len(cnr_list) <= 50
+        job_id = f"job{len(self.jobs)}"
+        self.jobs[job_id] = list(cnr_list)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        return {"job_id": job_id, "queued": len(cnr_list), "ready_in_seconds": 0.01}
+
+    async def bulk_refresh_status(self, job_id):
+        self.polls[job_id] = self.polls.get(job_id, 0) + 1
+        if self.polls[job_id] < 2:
+            return {"job_id": job_id, "status": "processing"}
+        self.in_flight -= 1
+        return {"job_id": job_id, "status": "completed"}
+
+    async def get_case(self, cnr, fresh=False):
+        assert fresh
+        self.fetched.append(cnr)
+        if cnr.endswith("99"):
+            return {"error": "External API ecourtsindia returned 404"}
+        return {"cnr": cnr, "status": "Pending", "next_date": "2026-11-02"}
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    store = DocumentStore(str(tmp_path / "store.sqlite3"), max_bytes=2**24)
+    monkeypatch.setattr(bulk_refresh, "doc_store", store)
+    monkeypatch.setattr(settings, "ECW_BULK_POLL_MAX_SECONDS", 0.02)
+    fake = FakeProvider()
+    for name in ("bulk_refresh", "bulk_refresh_status", "get_case"):
+        monkeypatch.setattr(ECourtsIndiaClient, name, lambda self, *a, _n=name, **kw: getattr(fake, _n)(*a, **kw))
+    yield fake
+    store.close()
+
+
+def _cnrs(n: int) -> list[str]:
+    return [f"DLHC01{i:06d}2024" for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_cnrs_are_chunked_polled_and_stored(provider):
+    cnrs = _cnrs(120) + [c.lower() for c in _cnrs(5)] + ["DLHC010000992099"]
+    updates: list[dict] = []
+    summary = await bulk_refresh.run_bulk_refresh(cnrs, progress=updates.append)
+
+    assert summary["unique"] == 121 and summary["chunks"] == 3
+    assert [len(c) for c in provider.jobs.values()] == [50, 50, 21]
+    assert provider.peak == 3                    # ECW_BULK_CONCURRENT_JOBS jobs overlap
+    assert all(n >= 2 for n in provider.polls.values())
+    assert summary["refreshed"] == 120
+    assert summary["failed_cnrs"] == ["DLHC010000992099"]
+    assert updates[-1]["step"] == "done" and updates[-1]["progress"] == 100
+
+    stored = await bulk_refresh.stored_case("dlhc010000052024")
+    assert stored["case"]["next_date"] == "2026-11-02"
+    assert stored["refreshed_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jobs_are_bounded(provider, monkeypatch):
+    monkeypatch.setattr(settings, "ECW_BULK_CONCURRENT_JOBS", 2)
+    summary = await bulk_refresh.run_bulk_refresh(_cnrs(250))
+    assert summary["chunks"] == 5 and summary["refreshed"] == 250
+    assert provider.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_recently_refreshed_cnrs_are_skipped(provider):
+    await bulk_refresh.run_bulk_refresh(_cnrs(60))
+    provider.fetched.clear()
+    summary = await bulk_refresh.run_bulk_refresh(_cnrs(70))
+    assert summary["skipped_recent"] == 60 and summary["chunks"] == 1
+    assert provider.fetched == _cnrs(70)[60:]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_marks_its_chunk_failed(provider, monkeypatch):
+    async def failed(job_id):
+        return {"job_id": job_id, "status": "failed"}
+    monkeypatch.setattr(provider, "bulk_refresh_status", failed)
+    summary = await asyncio.wait_for(bulk_refresh.run_bulk_refresh(_cnrs(10)), timeout=5)
+    assert summary["refreshed"] == 0 and summary["failed"] == 10
+    assert provider.fetched == []
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejections_are_requeued_not_failed(tmp_path, monkeypatch):
+    # Every upstream call succeeds; only the real rate limiter pushes back
+    store = DocumentStore(str(tmp_path / "store.sqlite3"), max_bytes=2**24)
+    monkeypatch.setattr(bulk_refresh, "doc_store", store)
+    monkeypatch.setattr(settings, "EXTERNAL_API_RATE_LIMIT_OVERRIDES", {"ecourtsindia": 3000})
+    monkeypatch.setattr(settings, "EXTERNAL_API_MAX_QUEUE_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "ECW_RATE_LIMIT_REQUEUES", 50)
+    rate_limiters.reset()
+    sent: list[str] = []
+
+    async def transport(self, method, url, **kwargs):
+        sent.append(url)
+        if url.endswith("/partner/bulk-refresh"):
+            body = {"job_id": f"job{len(sent)}", "ready_in_seconds": 0.01}
+        elif "/partner/bulk-refresh/" in url:
+            body = {"status": "completed"}
+        else:
+            body = {"cnr": url.rsplit("/", 1)[-1]}
+        return httpx.Response(200, json=body, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(ECourtsIndiaClient, "_transport", transport)
+    try:
+        summary = await bulk_refresh.run_bulk_refresh(_cnrs(100))
+    finally:
+        rate_limiters.reset()
+        store.close()
+
+    assert summary["refreshed"] == 100 and summary["failed"] == 0
+    assert summary["requeued"] > 0                       # rejections happened and were retried
+    assert sum("/partner/case/" in u for u in sent) == 100   # no call was paid for twice
@@ -0,0 +1,289 @@
+"""
+tests/unit/test_external_client.py — BaseAPIClient caching, coalescing, rate
+limiting and circuit breaking. Upstream calls are replaced by counting fakes of `_send` /
+`_transport`; no network is used.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.external.base_client import BaseAPIClient
+from app.config import settings
+from app.external.cache import response_cache
+from app.external.circuit_breaker import CircuitBreaker, CircuitState, circuit_breakers
+from app.external.rate_limit import parse_retry_after, rate_limiters
+from app.external.singleflight import single_flight
+
+
+class FakeClient(BaseAPIClient):
+    name      = "fake"
+    base_url  = "https://fake.test"
+    cache_ttl = 60
+
+    def __init__(self, payload=None, status: int = 200, delay: float = 0.0):
+        self.calls   = 0
+        self.payload = payload if payload is not None else {"ok": True}
+        self.status  = status
+        self.delay   = delay
+
+    async def _send(self, method, url, **kwargs):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status != 200:
+            request = httpx.Request(method, url)
+            raise httpx.HTTPStatusError(
+                "boom", request=request,
+                response=httpx.Response(self.status, request=request, text="missing"),
+            )
+        return {**self.payload, "n": self.calls}
+
+
+@pytest.fixture(autouse=True)
+async def _clean_cache():
+    await response_cache.clear()
+    single_flight.reset()
+    rate_limiters.reset()
+    circuit_breakers.reset()
+    yield
+    await response_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_served_from_cache():
+    client = FakeClient()
+    first  = await client.get("/doc/1")
+    second = await client.get("/doc/1")
+    assert first == second == {"ok": True, "n": 1}
+    assert client.calls == 1
+    stats = response_cache.snapshot()["sources"]["fake"]
+    assert stats["misses"] == 1
+    assert stats["hits_l1"] == 1
+    assert stats["bytes_served"] > 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_then_refreshed_in_background():
+    client = FakeClient()
+    await client.get("/doc/2")
+
+    # Age the entry past its TTL but inside the stale window
+    key   = client._cache_key("GET", "https://fake.test/doc/2", params=None)
+    entry = await response_cache.get("fake", key)
+    entry.stored_at -= client.cache_ttl + 1
+
+    stale = await client.get("/doc/2")
+    assert stale["n"] == 1                 # served immediately, not refetched inline
+    await asyncio.sleep(0)                 # let the refresh task run
+    await asyncio.sleep(0)
+    assert client.calls == 2
+    fresh = await client.get("/doc/2")
+    assert fresh["n"] == 2
+
+
+@pytest.mark.asyncio
+async def test_404_is_negatively_cached():
+    client = FakeClient(status=404)
+    first  = await client.get("/doc/missing")
+    second = await client.get("/doc/missing")
+    assert first["status"] == 404 and first == second
+    assert client.calls == 1
+    assert response_cache.snapshot()["sources"]["fake"]["negative_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_use_cache_false_always_goes_upstream():
+    client = FakeClient()
+    await client.get("/causelist", use_cache=False)
+    await client.get("/causelist", use_cache=False)
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_upstream_call():
+    client  = FakeClient(delay=0.05)
+    results = await asyncio.gather(*[client.post("/search/", data={"q": "bail"}) for _ in range(10)])
+    assert client.calls == 1
+    assert all(r == results[0] for r in results)
+    stats = single_flight.snapshot()["sources"]["fake"]
+    assert stats["leaders"] == 1
+    assert stats["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request():
+    client = FakeClient(delay=0.05)
+    first  = asyncio.create_task(client.get("/doc/9"))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(client.get("/doc/9"))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert (await second)["n"] == 1
+    assert client.calls == 1
+
+
+class ThrottledClient(BaseAPIClient):
+    """Exercises the real `_send` (limiter + retries) over a scripted transport."""
+    name      = "throttled"
+    base_url  = "https://throttled.test"
+    rate_limit_per_min = 600     # 10 tokens/s
+    max_in_flight      = 2
+
+    def __init__(self, statuses=(), delay: float = 0.0):
+        self.statuses = list(statuses)
+        self.delay    = delay
+        self.calls    = 0
+        self.active   = 0
+        self.peak     = 0
+
+    async def _transport(self, method, url, **kwargs):
+        self.calls  += 1
+        self.active += 1
+        self.peak    = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        status  = self.statuses.pop(0) if self.statuses else 200
+        headers = {"Retry-After": "0.05"} if status == 429 else {}
+        return httpx.Response(
+            status, json={"n": self.calls}, headers=headers,
+            request=httpx.Request(method, url),
+        )
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_caps_concurrency():
+    client = ThrottledClient(delay=0.02)
+    await asyncio.gather(*[client.get(f"/doc/{i}") for i in range(6)])
+    assert client.calls == 6
+    assert client.peak == 2
+    stats = rate_limiters.snapshot()["sources"]["throttled"]
+    assert stats["acquired"] == 6
+    assert stats["peak_in_flight"] == 2
+    assert stats["queued"] >= 4
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests_after_burst():
+    client = ThrottledClient()
+    client.max_in_flight = 100
+    burst  = settings.EXTERNAL_API_RATE_LIMIT_BURST
+    loop   = asyncio.get_running_loop()
+    start  = loop.time()
+    await asyncio.gather(*[client.get(f"/doc/{i}") for i in range(burst + 2)])
+    # Two requests beyond the burst at 10 tokens/s need ~0.2 s
+    assert loop.time() - start >= 0.15
+    assert rate_limiters.snapshot()["sources"]["throttled"]["queue_wait_max_s"] >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_429_cools_down_then_retries():
+    client = ThrottledClient(statuses=[429])
+    result = await client.get("/doc/1")
+    assert result == {"n": 2}
+    stats = rate_limiters.snapshot()["sources"]["throttled"]
+    assert stats["upstream_429"] == 1
+    assert stats["queue_wait_max_s"] >= 0.04   # second attempt waited out Retry-After
+
+
+@pytest.mark.asyncio
+async def test_slot_beyond_queue_budget_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "EXTERNAL_API_MAX_QUEUE_SECONDS", 0.01)
+    client = ThrottledClient()
+    await client._limiter().penalize(5.0)
+    result = await client.get("/doc/1")
+    assert "rate limited" in result["error"]
+    assert client.calls == 0
+    assert rate_limiters.snapshot()["sources"]["throttled"]["rejected"] == 1
+
+
+def test_async_redis_client_is_per_event_loop(monkeypatch):
+    # Celery runs each task in its own asyncio.run loop; a client created on
+    # an earlier loop must not be handed to a later one
+    from app.core.redis import close_async_redis, get_async_redis
+
+    monkeypatch.setattr(settings, "EXTERNAL_CACHE_REDIS_ENABLED", True)
+
+    async def _client_for_loop():
+        first = get_async_redis()
+        assert get_async_redis() is first
+        await close_async_redis()
+        return first
+
+    def run_in_fresh_loop():
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(_client_for_loop())
+        finally:
+            loop.close()
+
+    first  = run_in_fresh_loop()
+    second = run_in_fresh_loop()
+    assert first is not second
+    assert get_async_redis() is None   # no running loop → no client
+
+
+def test_parse_retry_after_formats():
+    request = httpx.Request("GET", "https://x.test")
+    assert parse_retry_after(httpx.Response(429, headers={"Retry-After": "7"}, request=request)) == 7.0
+    assert parse_retry_after(httpx.Response(429, request=request), default=3.0) == 3.0
+    dated = httpx.Response(
+        429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, request=request,
+    )
+    assert parse_retry_after(dated) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_5xx_then_fails_fast():
+    threshold = settings.EXTERNAL_CB_FAILURE_THRESHOLD
+    client = ThrottledClient(statuses=[503] * threshold)
+    for i in range(threshold):
+        result = await client.get(f"/doc/{i}", use_cache=False)
+        assert "returned 503" in result["error"]
+    assert circuit_breakers.get("throttled").state is CircuitState.OPEN
+
+    result = await client.get("/doc/next", use_cache=False)
+    assert "temporarily unavailable" in result["error"]
+    assert client.calls == threshold          # no upstream attempt while open
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_stale_without_refresh():
+    client = ThrottledClient()
+    await client.get("/doc/1")
+    key   = client._cache_key("GET", "https://throttled.test/doc/1", params=None)
+    entry = await response_cache.get("throttled", key)
+    entry.stored_at -= client.cache_ttl + 1
+
+    circuit_breakers.get("throttled")._open("test")
+    stale = await client.get("/doc/1")
+    await asyncio.sleep(0)
+    assert stale == {"n": 1}
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_circuit():
+    client  = ThrottledClient()
+    breaker = circuit_breakers.get("throttled")
+    breaker._open("test")
+    breaker.opened_at -= breaker.reset_timeout
+    assert await client.get("/doc/1", use_cache=False) == {"n": 1}
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_error_rate_and_p95_trip_the_breaker():
+    by_rate = CircuitBreaker("rate", failure_threshold=100, min_calls=4, error_rate_limit=0.5)
+    for ok in (True, False, True, False):
+        by_rate.record_success(0.1) if ok else by_rate.record_failure("HTTP 502", 0.1)
+    assert by_rate.state is CircuitState.OPEN
+
+    by_latency = CircuitBreaker("slow", min_calls=4, slow_p95=1.0)
+    for latency in (0.2, 0.3, 0.2):
+        by_latency.record_success(latency)
+    assert by_latency.state is CircuitState.CLOSED
+    by_latency.record_success(2.5)
+    assert by_latency.state is CircuitState.OPEN
+    assert by_latency.snapshot()["p95_ms"] == 2500
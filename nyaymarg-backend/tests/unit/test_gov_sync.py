@@ -0,0 +1,128 @@
+"""
+tests/unit/test_gov_sync.py — data.gov.in mirror: concurrent paging, upsert
+into gov_records, per-state local reads and the df_courts join. The OGD client
+is a local fake; uses a temporary SQLite database.
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.data import gov_sync
+from app.data.seed import get_registry
+from app.external.data_gov.client import DataGovClient
+from app.models.gov_record import GovRecord
+
+STATES = ["Delhi", "Maharashtra", "Kerala", "Bihar", "Punjab"]
+
+
+def _records(resource_id: str, n: int) -> list[dict]:
+    return [{"state_ut": STATES[i % 5], "year": str(2019 + i // 5), "pending_cases": 1000 + i,
+             "courts": 10 + i % 5, "resource": resource_id[:8]} for i in range(n)]
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'gov.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(GovRecord.__table__.create)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def ogd(monkeypatch):
+    monkeypatch.setattr(settings, "DATA_GOV_PAGE_SIZE", 10)
+    monkeypatch.setattr(settings, "DATA_GOV_SYNC_CONCURRENCY", 3)
+    state = {"rows": 45, "calls": 0, "active": 0, "peak": 0}
+
+    async def get_page(self, resource_id, offset=0, limit=500):
+        state["calls"]  += 1
+        state["active"] += 1
+        state["peak"]    = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        rows = _records(resource_id, state["rows"])
+        return {"total": len(rows), "count": limit, "records": rows[offset:offset + limit]}
+
+    monkeypatch.setattr(DataGovClient, "get_page", get_page)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_sync_pages_concurrently_and_upserts(sessions, ogd):
+    summary = await gov_sync.run_sync(["infrastructure", "pendency"], session_factory=sessions)
+    assert summary["infrastructure"] == {"pages": 5, "records": 45, "removed": 0}
+    assert summary["failed"] == []
+    assert ogd["calls"] == 10
+    assert ogd["peak"] > 1
+
+    # Re-sync after upstream dropped rows: unchanged rows are kept, vanished ones removed
+    ogd["rows"] = 40
+    summary = await gov_sync.run_sync(["infrastructure"], session_factory=sessions)
+    assert summary["infrastructure"] == {"pages": 4, "records": 40, "removed": 5}
+
+
+@pytest.mark.asyncio
+async def test_a_failing_resource_does_not_sink_the_others(sessions, ogd, monkeypatch):
+    from app.external.data_gov.client import RESOURCES
+
+    await gov_sync.run_sync(["pendency"], session_factory=sessions)
+    get_page = DataGovClient.get_page
+
+    async def flaky(self, resource_id, offset=0, limit=500):
+        if resource_id == RESOURCES["pendency"]:
+            return {"error": "data.gov.in returned 404"}
+        return await get_page(self, resource_id, offset=offset, limit=limit)
+
+    monkeypatch.setattr(DataGovClient, "get_page", flaky)
+    summary = await gov_sync.run_sync(["infrastructure", "pendency"], session_factory=sessions)
+    assert summary["infrastructure"] == {"pages": 5, "records": 45, "removed": 0}
+    assert "404" in summary["pendency"]["error"] and summary["failed"] == ["pendency"]
+    kept = await gov_sync.query_records("pendency", session_factory=sessions)
+    assert kept["total"] == 45
+
+    with pytest.raises(RuntimeError):
+        await gov_sync.run_sync(["pendency"], session_factory=sessions)
+
+
+@pytest.mark.asyncio
+async def test_unknown_resources_are_rejected_before_fetching(sessions, ogd):
+    with pytest.raises(ValueError, match="nope"):
+        await gov_sync.run_sync(["infrastructure", "nope"], session_factory=sessions)
+    assert ogd["calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_state_queries_are_answered_locally(sessions, ogd):
+    assert await gov_sync.query_records("infrastructure", session_factory=sessions) is None
+    await gov_sync.run_sync(["infrastructure"], session_factory=sessions)
+    calls = ogd["calls"]
+
+    delhi = await gov_sync.query_records("infrastructure", state="delhi ", session_factory=sessions)
+    assert delhi["source"] == "local" and delhi["total"] == 9
+    assert {r["state_ut"] for r in delhi["records"]} == {"Delhi"}
+    in_2020 = await gov_sync.query_records("infrastructure", year=2020, session_factory=sessions)
+    assert in_2020["total"] == 5
+    assert ogd["calls"] == calls
+
+
+@pytest.mark.asyncio
+async def test_frames_join_with_courts(sessions, ogd):
+    registry = get_registry()
+    before   = registry.df_gov
+    try:
+        await gov_sync.run_sync(["infrastructure"], session_factory=sessions)
+        rows = await gov_sync.load_gov_frames(session_factory=sessions)
+        assert rows == {"infrastructure": 45}
+
+        joined = gov_sync.courts_with_gov("infrastructure", year=2019)
+        assert len(joined) == len(registry.df_courts)
+        delhi = joined[joined["state"] == "Delhi"]
+        assert (delhi["pending_cases_infrastructure"] == 1000).all()
+        other = ~joined["state_key"].isin([s.lower() for s in STATES])
+        assert other.any() and joined.loc[other, "courts"].isna().all()
+    finally:
+        registry.df_gov = before
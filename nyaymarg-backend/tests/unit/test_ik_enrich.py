@@ -0,0 +1,69 @@
+"""
+tests/unit/test_ik_enrich.py — batch enrichment: query dedupe, persisted
+results and free re-runs. The IK lookup is replaced with a local fake.
+"""
+import pandas as pd
+import pytest
+
+from app.data import ik_enrich
+from app.data.seed import get_registry
+
+_BAIL  = "bail application under section 439 " * 5
+_LEASE = "eviction of tenant under rent control act " * 5
+
+
+@pytest.fixture
+def enrich_env(tmp_path, monkeypatch):
+    monkeypatch.setattr(ik_enrich, "ENRICH_FILE", tmp_path / "enrichments.jsonl")
+    monkeypatch.setattr(ik_enrich, "_results", None)
+    calls: list[str] = []
+
+    async def enrich_query(query):
+        calls.append(query)
+        if query.startswith("eviction"):
+            return {"enriched": False, "reason": "no IK match"}
+        return {"enriched": True, "ik_doc_id": 42, "title": "State v. Accused",
+                "court": "Supreme Court", "date": "2021-03-04", "citation": "(2021) 3 SCC 1"}
+
+    monkeypatch.setattr(ik_enrich, "enrich_query", enrich_query)
+    registry = get_registry()
+    df_before = registry.df_cases
+    registry.df_cases = pd.DataFrame({
+        "case_id":    [f"C{i}" for i in range(6)] + ["IK_7"],
+        "court_id":   ["SC", "SC", "SC", "SC", "HC", "SC", "SC"],
+        "state":      ["Delhi"] * 7,
+        "case_type":  ["Criminal", "Criminal", "Criminal", "Civil", "Criminal", "Civil", "Criminal"],
+        "clean_text": [_BAIL, _BAIL, _BAIL, _LEASE, _BAIL, _LEASE, _BAIL],
+    })
+    yield calls
+    registry.df_cases = df_before
+
+
+@pytest.mark.asyncio
+async def test_duplicate_queries_hit_api_once(enrich_env):
+    summary = await ik_enrich.run_enrichment(court_id="SC")
+    assert summary["cases_selected"] == 5          # HC row and imported IK row excluded
+    assert summary["unique_queries"] == 2 and summary["api_queries"] == 2
+    assert summary["cases_enriched"] == 3
+    assert len(enrich_env) == 2
+
+    df = get_registry().df_cases
+    assert df.loc[df["case_id"] == "C0", "ik_doc_id"].item() == 42
+    assert df.loc[df["case_id"] == "C3", "ik_doc_id"].isna().item()
+    assert df.loc[df["case_id"] == "C3", "ik_enriched_at"].notna().item()
+    assert df.loc[df["case_id"] == "C4", "ik_enriched_at"].isna().item()
+
+
+@pytest.mark.asyncio
+async def test_stored_results_make_repeat_enrichment_free(enrich_env):
+    await ik_enrich.run_enrichment(court_id="SC")
+    summary = await ik_enrich.run_enrichment()     # only the HC row is still pending
+    assert summary["cases_selected"] == 1
+    assert summary["api_queries"] == 0 and summary["cached_queries"] == 1
+    assert len(enrich_env) == 2
+
+    # A fresh process (new registry frame) re-applies the file without any lookup
+    registry = get_registry()
+    registry.df_cases = registry.df_cases.drop(columns=ik_enrich.ENRICH_COLUMNS)
+    assert ik_enrich.load_enrichments() == 6
+    assert registry.df_cases["ik_enriched_at"].notna().sum() == 6
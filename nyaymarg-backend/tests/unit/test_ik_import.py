@@ -0,0 +1,101 @@
+"""
+tests/unit/test_ik_import.py — IK bulk import: paging, checkpoint resume and
+incremental similarity-index extension. The IK client and document fetches are
+replaced with local fakes; no network is used.
+"""
+import pytest
+
+from app.data import ik_import
+from app.data.seed import get_registry
+from app.external.doc_store import StoredDocument
+from app.external.indian_kanoon.client import IndianKanoonClient
+from app.services.external_service import ExternalService
+from app.services.similarity_service import SimilarityService
+
+
+def _docs(page: int) -> list[dict]:
+    return [{"tid": page * 10 + i} for i in range(10)] if page < 3 else []
+
+
+@pytest.fixture
+def import_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ik_import, "IMPORT_DIR", tmp_path)
+    monkeypatch.setattr(ik_import, "CASES_FILE", tmp_path / "imported_cases.jsonl")
+
+    async def search(self, query, page=0, **kw):
+        return {"docs": _docs(page)}
+
+    async def stored(self, tid):
+        return StoredDocument(
+            source="indian_kanoon", doc_id=str(tid),
+            text=f"anticipatory bail granted criminal appeal number {tid}",
+            meta={"title": f"State v. Accused {tid}", "publishdate": "2021-03-04"},
+            fetch_ms=1.0, clean_ms=0.1,
+        )
+
+    monkeypatch.setattr(IndianKanoonClient, "search", search)
+    monkeypatch.setattr(ExternalService, "ik_stored_document", stored)
+    registry = get_registry()
+    before = registry.df_cases, registry.df_imported, registry.corpus_vectors
+    yield tmp_path
+    registry.df_cases, registry.df_imported, registry.corpus_vectors = before
+
+
+@pytest.mark.asyncio
+async def test_import_appends_rows_and_extends_index(import_dir):
+    registry = get_registry()
+    n_before = registry.corpus_vectors.shape[0]
+
+    n_cases  = len(registry.df_cases)
+    updates: list[dict] = []
+
+    result = await ik_import.run_import("bail", 15, progress=updates.append)
+    assert result["imported"] == 15 and result["merged"] == 15
+    assert registry.corpus_vectors.shape[0] == n_before + 15
+    assert registry.df_imported.iloc[-1]["case_id"] == "IK_14"
+    assert registry.df_imported.iloc[-1]["case_type"] == "Criminal"
+    assert updates[-1]["step"] == "done" and updates[-1]["progress"] == 100
+
+    # Imported judgments are searchable but never join the labelled registry
+    assert len(registry.df_cases) == n_cases
+    assert registry.df_imported["outcome"].isna().all()
+    hits = SimilarityService().search("anticipatory bail granted criminal appeal number 14", top_n=1)
+    assert hits[0].case_id.startswith("IK_") and hits[0].outcome_label == "Decided"
+
+    # Merging again is a no-op
+    assert ik_import.load_imported_cases() == 0
+
+
+@pytest.mark.asyncio
+async def test_interrupted_import_resumes_from_checkpoint(import_dir, monkeypatch):
+    calls: list[int] = []
+    original = IndianKanoonClient.search
+
+    async def flaky(self, query, page=0, **kw):
+        calls.append(page)
+        if page == 1 and calls.count(1) == 1:
+            return {"error": "External API indian_kanoon request failed"}
+        return await original(self, query, page=page)
+
+    monkeypatch.setattr(IndianKanoonClient, "search", flaky)
+    with pytest.raises(RuntimeError):
+        await ik_import.run_import("murder", 25)
+
+    result = await ik_import.run_import("murder", 25)
+    assert result["resumed"] is True
+    assert result["imported"] == 25
+    assert calls == [0, 1, 1, 2]          # page 0 was not fetched again
+
+
+@pytest.mark.asyncio
+async def test_malformed_lines_are_skipped_on_merge(import_dir):
+    await ik_import.run_import("bail", 5)
+    row = ik_import.ik_case_row(99, "anticipatory bail granted", {"title": "State v. X"})
+    with ik_import.CASES_FILE.open("a") as fh:
+        fh.write('{"case_id": "IK_98", "case_ti\n')      # torn write
+        fh.write('["not", "a", "row"]\n')
+    ik_import.append_jsonl(ik_import.CASES_FILE, [row])
+
+    assert ik_import.load_imported_cases() == 1
+    assert get_registry().df_imported.iloc[-1]["case_id"] == "IK_99"
+    assert "IK_98" not in ik_import._imported_doc_ids()
@@ -0,0 +1,105 @@
+"""
+tests/unit/test_pagination.py — database-side pagination: offset pages, keyset
+cursors (ties on created_at broken by id), bounded counts and the paginated
+notification listing. Uses a temporary SQLite database.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.exceptions import ValidationError
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.notification_service import NotificationService
+from app.utils.pagination import count_rows, decode_cursor, encode_cursor, paginate
+
+USER = uuid.uuid4()
+BASE = datetime(2026, 1, 1)
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pages.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.create)
+        await conn.run_sync(Notification.__table__.create)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessions() as session:
+        session.add(User(id=USER, email="p@nyaymarg.in", username="p", hashed_password="x", full_name="P"))
+        other = uuid.uuid4()
+        session.add(User(id=other, email="q@nyaymarg.in", username="q", hashed_password="x", full_name="Q"))
+        for i in range(57):
+            session.add(Notification(
+                user_id=USER, type="system", title=f"n{i}", body="m", is_read=i % 3 == 0,
+                created_at=BASE + timedelta(minutes=i // 2),    # pairs share a timestamp
+            ))
+        session.add(Notification(user_id=other, type="system", title="other", body="m", created_at=BASE))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+def _stmt():
+    return select(Notification).where(Notification.user_id == USER)
+
+
+KEYS = (Notification.created_at, Notification.id)
+
+
+async def test_offset_pages_are_ordered_and_counted(db):
+    first = await paginate(db, _stmt(), keys=KEYS, page=1, page_size=20)
+    last  = await paginate(db, _stmt(), keys=KEYS, page=3, page_size=20)
+    assert first.total == last.total == 57 and not first.total_estimated
+    assert len(first.items) == 20 and len(last.items) == 17
+    assert first.items[0].title in ("n56", "n55") and first.next_cursor
+    assert last.next_cursor is None
+    stamps = [n.created_at for n in first.items]
+    assert stamps == sorted(stamps, reverse=True)
+
+
+async def test_cursor_walk_visits_every_row_once(db):
+    seen, cursor = [], None
+    while True:
+        page = await paginate(db, _stmt(), keys=KEYS, page_size=8, cursor=cursor)
+        seen.extend(n.id for n in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 57
+
+    offset = []
+    for p in range(1, 9):
+        offset.extend(n.id for n in (await paginate(db, _stmt(), keys=KEYS, page=p, page_size=8)).items)
+    assert seen == offset
+
+
+async def test_ascending_cursor(db):
+    page  = await paginate(db, _stmt(), keys=KEYS, page_size=5, descending=False)
+    after = await paginate(db, _stmt(), keys=KEYS, page_size=5, cursor=page.next_cursor, descending=False)
+    assert [n.title for n in page.items][:2] in (["n0", "n1"], ["n1", "n0"])
+    assert after.items[0].created_at >= page.items[-1].created_at
+
+
+async def test_count_is_capped(db):
+    assert await count_rows(db, _stmt(), limit=100) == (57, False)
+    assert await count_rows(db, _stmt(), limit=10) == (10, True)      # SQLite: report the cap
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    nid = uuid.uuid4()
+    assert decode_cursor(encode_cursor([BASE, nid]), KEYS) == [BASE, nid]
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor", KEYS)
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor([BASE]), KEYS)
+
+
+async def test_notification_listing_filters_unread(db):
+    svc  = NotificationService()
+    page = await svc.list_for_user(db, USER, unread_only=True, page_size=50)
+    assert page.total == 38 and len(page.items) == 38
+    assert all(not n.is_read for n in page.items)
@@ -0,0 +1,144 @@
+"""
+tests/unit/test_registry_sync.py — registry → courts/judges/cases sync: record
+coercion, parent-first upserts, orphan skipping and idempotent re-runs.
+Uses a temporary SQLite database (the COPY path needs Postgres).
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.data.registry_sync import CASES, COURTS, records, sync_registry
+from app.data.seed import get_registry
+from app.models.case import Case
+from app.models.court import Court
+from app.models.judge import Judge
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'registry.db'}")
+    async with engine.begin() as conn:
+        for model in (Court, Judge, Case):
+            await conn.run_sync(model.__table__.create)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def small_registry(monkeypatch):
+    """First 400 cases of the seeded registry; restored after the test."""
+    registry = get_registry()
+    monkeypatch.setattr(registry, "df_cases", registry.df_cases.head(400).copy())
+    return registry
+
+
+async def _count(engine, model) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(model))).scalar()
+
+
+def test_records_are_plain_python_in_column_order():
+    df = pd.DataFrame({
+        "case_id": ["C1"], "court_id": [7], "judge_id": ["J1"], "hearing_count": [np.int64(3)],
+        "complexity_score": [np.float64(2.5)], "public_interest_tag": [np.bool_(True)],
+        "filing_date": ["2020-02-03"], "case_text": ["text"],
+    })
+    row  = records(df, CASES)[0]
+    cols = [c.name for c in CASES.columns]
+    values = dict(zip(cols, row))
+    assert values["court_id"] == "7"
+    assert type(values["hearing_count"]) is int and type(values["complexity_score"]) is float
+    assert values["public_interest"] is True and values["judgment_text"] == "text"
+    assert values["filing_date"] == date(2020, 2, 3)
+    assert values["case_title"] == "" and values["outcome"] == 0     # NOT NULL gaps filled
+
+
+def test_nullable_floats_become_none():
+    df  = get_registry().df_courts.head(2).copy()
+    df.loc[df.index[0], "backlog_rate"] = np.nan
+    row = dict(zip([c.name for c in COURTS.columns], records(df, COURTS)[0]))
+    assert row["backlog_rate"] is None
+
+
+@pytest.mark.asyncio
+async def test_sync_mirrors_registry(engine, small_registry):
+    summary = await sync_registry(engine)
+    assert summary["courts"]["rows"] == len(small_registry.df_courts)
+    assert summary["judges"]["rows"] == len(small_registry.df_judges)
+    assert (summary["cases"]["rows"], summary["cases"]["skipped"]) == (400, 0)
+    assert await _count(engine, Case) == 400
+
+    expected = small_registry.df_cases.set_index("case_id").loc["CASE_000123"]
+    async with engine.connect() as conn:
+        row = (await conn.execute(select(Case).where(Case.case_id == "CASE_000123"))).one()
+    assert row.judge_id == expected["judge_id"] and row.status == expected["status"]
+    assert row.days_pending == expected["days_pending"]
+
+
+@pytest.mark.asyncio
+async def test_resync_updates_in_place_and_skips_orphans(engine, small_registry, monkeypatch):
+    await sync_registry(engine)
+    cases = small_registry.df_cases.copy()
+    cases.loc[cases["case_id"] == "CASE_000001", "status"] = "Transferred"
+    orphan = cases.iloc[[0]].assign(case_id="CASE_ORPHAN", judge_id="JUDGE_NOPE")
+    monkeypatch.setattr(small_registry, "df_cases", pd.concat([cases, orphan], ignore_index=True))
+
+    summary = await sync_registry(engine)
+    assert summary["cases"]["skipped"] == 1
+    assert await _count(engine, Case) == 400
+    assert await _count(engine, Court) == len(small_registry.df_courts)
+    async with engine.connect() as conn:
+        status = (await conn.execute(select(Case.status).where(Case.case_id == "CASE_000001"))).scalar()
+    assert status == "Transferred"
+
+
+@pytest.mark.asyncio
+async def test_admin_sync_queues_only_when_a_worker_answers(monkeypatch):
+    from types import SimpleNamespace
+
+    import app.data.registry_sync as registry_sync
+    from app.routers import admin
+    from app.tasks import celery_app, ingestion_tasks
+
+    queued: list = []
+    monkeypatch.setattr(ingestion_tasks.sync_registry_task, "delay",
+                        lambda cases_dir: queued.append(cases_dir) or SimpleNamespace(id="job-1"))
+
+    async def in_process(engine=None, cases_dir=None):
+        return {"cases": {"rows": 7}}
+    monkeypatch.setattr(registry_sync, "sync_registry", in_process)
+
+    monkeypatch.setattr(celery_app, "workers_available", lambda: True)
+    assert await admin.sync_registry(cases_dir="parts") == {"job_id": "job-1", "status": "queued"}
+
+    # .delay() succeeds with no worker up, so the worker ping decides
+    monkeypatch.setattr(celery_app, "workers_available", lambda: False)
+    reply = await admin.sync_registry(cases_dir=None)
+    assert reply == {"job_id": "sync", "status": "done", "result": {"cases": {"rows": 7}}}
+    assert queued == ["parts"]
+
+
+@pytest.mark.asyncio
+async def test_job_status_shapes(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.routers import admin
+    from app.tasks import celery_app
+
+    tasks = {
+        "running": SimpleNamespace(state="PROGRESS", info={"step": "cases", "progress": 40}),
+        "done":    SimpleNamespace(state="SUCCESS", info={"cases": {"rows": 7}}),
+        "broken":  SimpleNamespace(state="FAILURE", info=RuntimeError("boom")),
+    }
+    monkeypatch.setattr(celery_app.celery_app, "AsyncResult", tasks.__getitem__)
+
+    assert celery_app.job_status("running") == {"job_id": "running", "state": "PROGRESS",
+                                                "step": "cases", "progress": 40}
+    assert celery_app.job_status("broken") == {"job_id": "broken", "state": "FAILURE", "error": "boom"}
+    assert await admin.sync_registry_status("done") == {"job_id": "done", "state": "SUCCESS",
+                                                        "result": {"cases": {"rows": 7}}}
@@ -0,0 +1,194 @@
+"""
+tests/unit/test_upload_service.py — streaming dataset uploads: chunked copy
+with SHA-256, early abort past the size limit, multipart bodies parsed from
+the request stream (oversize / bad extension refused before the file is
+read), content-addressed names,
+duplicate lookup, shared-file release, and resumable multi-part uploads.
+Uses temp dirs and SQLite.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import time
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.models.dataset import Dataset
+from app.models.user import User
+from app.services.upload_service import UploadError, UploadService, UploadTooLarge
+
+
+class _Source:
+    """Minimal async reader that records the chunk sizes requested."""
+
+    def __init__(self, data: bytes) -> None:
+        self._buf  = io.BytesIO(data)
+        self.reads = 0
+
+    async def read(self, n: int) -> bytes:
+        self.reads += 1
+        return self._buf.read(n)
+
+
+@pytest.mark.asyncio
+async def test_store_streams_hashes_and_renames(tmp_path):
+    data   = b"case_id,outcome\n" + b"x,1\n" * 10_000
+    svc    = UploadService(tmp_path, max_bytes=1 << 20, chunk_size=4096)
+    source = _Source(data)
+    stored = await svc.store(source, ".csv")
+
+    assert stored.sha256 == hashlib.sha256(data).hexdigest() and stored.size == len(data)
+    assert stored.path == tmp_path / f"{stored.sha256}.csv" and stored.path.read_bytes() == data
+    assert source.reads == len(data) // 4096 + 2
+    assert [p.name for p in tmp_path.iterdir()] == [stored.path.name]   # no temp file left
+
+    again = await svc.store(_Source(data), ".csv")                     # same content, same file
+    assert again.path == stored.path and len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_aborts_early(tmp_path):
+    svc    = UploadService(tmp_path, max_bytes=10_000, chunk_size=1024)
+    source = _Source(b"a" * 1_000_000)
+    with pytest.raises(UploadTooLarge):
+        await svc.store(source, ".csv")
+    assert source.reads == 10                                   # stopped just past the limit
+    assert list(tmp_path.iterdir()) == []
+
+
+BOUNDARY = "----nyaymarg"
+FORM     = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _form(filename: str, data: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhi\r\n"
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: text/csv\r\n\r\n"
+    ).encode() + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+class _Body:
+    """Request body stream in fixed-size pieces; counts the pieces pulled."""
+
+    def __init__(self, body: bytes, piece: int) -> None:
+        self.pieces = [body[i:i + piece] for i in range(0, len(body), piece)]
+        self.pulled = 0
+
+    async def __aiter__(self):
+        for piece in self.pieces:
+            self.pulled += 1
+            yield piece
+
+
+@pytest.mark.asyncio
+async def test_store_form_parses_the_request_stream(tmp_path):
+    data = b"case_id,outcome\n" + b"x,1\n" * 5_000
+    svc  = UploadService(tmp_path, max_bytes=1 << 20, chunk_size=4096)
+    body = _Body(_form("../cases.CSV", data), 7)                       # boundaries split across pieces
+    stored, filename = await svc.store_form(body.__aiter__(), FORM, len(b"".join(body.pieces)))
+    assert filename == "cases.CSV" and stored.path.suffix == ".csv"
+    assert stored.path.read_bytes() == data and stored.sha256 == hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_oversize_or_disallowed_form_is_refused_before_the_body_is_read(tmp_path):
+    svc  = UploadService(tmp_path, max_bytes=10_000, chunk_size=1024)
+    body = _Body(_form("big.csv", b"a" * 1_000_000), 1024)
+    with pytest.raises(UploadTooLarge):                                 # declared length: nothing read
+        await svc.store_form(body.__aiter__(), FORM, len(b"".join(body.pieces)))
+    assert body.pulled == 0
+
+    with pytest.raises(UploadTooLarge):                                 # chunked: stops at the limit
+        await svc.store_form(body.__aiter__(), FORM)
+    assert body.pulled <= 12 < len(body.pieces)
+
+    body = _Body(_form("evil.exe", b"a" * 1_000_000), 1024)
+    with pytest.raises(UploadError, match="allowed"):                   # refused at the part headers
+        await svc.store_form(body.__aiter__(), FORM)
+    assert body.pulled == 1
+    with pytest.raises(UploadError, match="multipart"):
+        await svc.store_form(body.__aiter__(), "application/json")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_duplicate_lookup_and_shared_release(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ds.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.create)
+        await conn.run_sync(Dataset.__table__.create)
+    svc    = UploadService(tmp_path / "uploads")
+    stored = await svc.store(_Source(b"a,b\n1,2\n"), ".csv")
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+
+    def _row(user_id, status="pending"):
+        return Dataset(id=uuid.uuid4(), user_id=user_id, name="d.csv", filename=stored.path.name,
+                       file_path=str(stored.path), file_size=stored.size,
+                       checksum=stored.sha256, status=status)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        failed, mine, theirs = _row(alice, "failed"), _row(alice), _row(bob)
+        db.add_all([failed, mine, theirs])
+        await db.flush()
+
+        assert (await svc.find_duplicate(db, alice, stored.sha256)).id == mine.id
+        assert await svc.find_duplicate(db, alice, "0" * 64) is None
+
+        await svc.release(db, mine)                             # bob's row still uses the file
+        assert stored.path.exists()
+        for ds in (failed, mine):
+            await db.delete(ds)
+        await db.flush()
+        await svc.release(db, theirs)
+        assert not stored.path.exists()
+    await engine.dispose()
+
+
+async def _body(data: bytes, piece: int = 65_536):
+    for i in range(0, len(data), piece):
+        yield data[i:i + piece]
+
+
+@pytest.mark.asyncio
+async def test_resumable_upload_resume_and_complete(tmp_path):
+    svc  = UploadService(tmp_path, chunk_size=1 << 20)
+    part = 5 * 1024 * 1024
+    data = bytes(range(256)) * ((2 * part + 1234) // 256) + b"tail"
+    up   = svc.initiate("u-1", "state.csv", len(data), part)
+    assert up.total_parts == 3 and up.part_length(3) == len(data) - 2 * part
+
+    await svc.put_part(up, 2, _body(data[part:2 * part]))
+    with pytest.raises(UploadError, match="must be"):                     # truncated part
+        await svc.put_part(up, 1, _body(data[:part - 1]))
+
+    # "Interrupted" client: reload the session, see what's missing and resume.
+    up = svc.get(up.upload_id, "u-1")
+    assert svc.received(up) == [2] and svc.get(up.upload_id, "someone-else") is None
+    with pytest.raises(UploadError, match="missing parts: \\[1, 3\\]"):
+        await svc.complete(up)
+    await svc.put_part(up, 1, _body(data[:part]))
+    await svc.put_part(up, 3, _body(data[2 * part:]))
+
+    stored = await svc.complete(up)
+    assert stored.sha256 == hashlib.sha256(data).hexdigest() and stored.path.read_bytes() == data
+    assert svc.get(up.upload_id, "u-1") is None and list(svc.sessions_dir.iterdir()) == []
+
+
+def test_resumable_validation_and_purge(tmp_path):
+    svc = UploadService(tmp_path)
+    with pytest.raises(UploadError, match="allowed"):
+        svc.initiate("u-1", "state.exe", 10)
+    with pytest.raises(UploadError, match="part_size"):
+        svc.initiate("u-1", "state.csv", 10, part_size=1024)
+
+    fresh, stale = svc.initiate("u-1", "a.csv", 10), svc.initiate("u-1", "b.csv", 10)
+    old = time.time() - 3600 * (settings.RESUMABLE_UPLOAD_TTL_HOURS + 1)
+    os.utime(svc.sessions_dir / stale.upload_id / "manifest.json", (old, old))
+    assert svc.purge_stale() == 1
+    assert [p.name for p in svc.sessions_dir.iterdir()] == [fresh.upload_id]
@@ -0,0 +1,153 @@
+"""
+tests/unit/test_write_behind.py — buffered persistence: size/time-triggered
+batch flushes, the shutdown flush, retry after a failed flush, isolation of
+bad rows, metrics and
+the sync/write_behind switch in persist(). Uses a temporary SQLite database.
+"""
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.core import write_behind as wb
+from app.core.write_behind import WriteBehindQueue, persist
+from app.models.chat_message import ChatMessage
+from app.models.user import User
+from app.services.chat_service import ChatService
+
+USER = uuid.uuid4()
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'wb.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.create)
+        await conn.run_sync(ChatMessage.__table__.create)
+    async with async_sessionmaker(engine)() as db:
+        db.add(User(id=USER, email="w@nyaymarg.in", username="w", hashed_password="x", full_name="W"))
+        await db.commit()
+    yield engine
+    await engine.dispose()
+
+
+def _message(i: int) -> ChatMessage:
+    return ChatMessage(user_id=USER, session_id="s", role="user", content=f"m{i}")
+
+
+async def _count(engine) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(ChatMessage))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_batches_by_size_and_flushes_on_stop(engine):
+    queue = WriteBehindQueue(batch_size=10, flush_interval_ms=60_000, max_queue=1000)
+    queue.start(engine)
+    await queue.submit(*[_message(i) for i in range(25)])
+    await asyncio.sleep(0.05)                       # size trigger wakes the flusher
+    assert await _count(engine) == 25 and queue.depth == 0
+
+    msg = _message(99)
+    await queue.submit(msg)
+    assert msg.id is not None and msg.created_at is not None    # assigned at submit
+    assert await _count(engine) == 25
+    await queue.stop()
+    assert await _count(engine) == 26 and not queue.running
+
+    snap = queue.snapshot()
+    assert snap["enqueued"] == snap["flushed"] == 26
+    assert snap["flushes"] == 2 and snap["avg_flush_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_time_trigger_and_inline_flush_when_full(engine):
+    queue = WriteBehindQueue(batch_size=1000, flush_interval_ms=20, max_queue=1000)
+    queue.start(engine)
+    await queue.submit(_message(0))
+    await asyncio.sleep(0.1)
+    assert await _count(engine) == 1
+    await queue.stop()
+
+    full = WriteBehindQueue(batch_size=1000, flush_interval_ms=60_000, max_queue=5)
+    full.engine = engine                            # not started: only the inline path runs
+    await full.submit(*[_message(i) for i in range(5)])
+    assert await _count(engine) == 6 and full.stats.inline_flushes == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows(engine, tmp_path):
+    queue = WriteBehindQueue(batch_size=1000, flush_interval_ms=60_000, max_queue=1000)
+    queue.engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'empty.db'}")   # no tables
+    await queue.submit(_message(0), _message(1))
+    assert await queue.flush() == 0
+    assert queue.depth == 2 and queue.stats.failures == 1
+
+    await queue.engine.dispose()
+    queue.engine = engine
+    assert await queue.flush() == 2 and await _count(engine) == 2
+
+
+@pytest.mark.asyncio
+async def test_bad_row_is_isolated_and_dropped_after_max_attempts(engine):
+    queue = WriteBehindQueue(batch_size=1000, flush_interval_ms=60_000, max_queue=1000, max_attempts=2)
+    queue.engine = engine
+    bad = ChatMessage(user_id=USER, session_id="s", role="user", content=None)    # NOT NULL
+    await queue.submit(*[_message(i) for i in range(3)], bad, *[_message(i) for i in range(3, 6)])
+
+    assert await queue.flush() == 6                 # the good rows land around it
+    assert await _count(engine) == 6 and queue.depth == 1
+
+    await queue.submit(_message(6))
+    assert await queue.flush() == 1                 # second failure on its own: dropped
+    assert await _count(engine) == 7 and queue.depth == 0
+    assert queue.stats.dropped == 1 and queue.stats.failures == 2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_database_keeps_every_row(engine, tmp_path):
+    queue = WriteBehindQueue(batch_size=1000, flush_interval_ms=60_000, max_queue=1000, max_attempts=1)
+    queue.engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'wb.db'}")
+    await queue.submit(_message(0), _message(1))
+    for _ in range(3):
+        assert await queue.flush() == 0
+    assert queue.depth == 2 and queue.stats.dropped == 0    # an outage is not a bad row
+
+    await queue.engine.dispose()
+    queue.engine = engine
+    assert await queue.flush() == 2
+
+
+@pytest.mark.asyncio
+async def test_chat_persist_modes(engine, monkeypatch):
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as db:                    # sync: visible in the same session
+        await ChatService().process("predict my case", "s1", USER, db)
+        rows = (await db.execute(select(ChatMessage).order_by(ChatMessage.created_at))).scalars().all()
+        assert [r.role for r in rows] == ["user", "assistant"]
+        await db.commit()
+
+    queue = WriteBehindQueue(batch_size=1000, flush_interval_ms=60_000, max_queue=1000)
+    queue.start(engine)
+    monkeypatch.setattr(wb, "write_behind", queue)
+    monkeypatch.setattr(settings, "DB_DURABILITY_MODE", "write_behind")
+    async with sessions() as db:
+        await ChatService().process("hello", "s2", USER, db)
+        assert not db.new and queue.depth == 2      # nothing added to the request session
+    await queue.stop()
+    assert await _count(engine) == 4
+
+
+@pytest.mark.asyncio
+async def test_persist_falls_back_to_sync_when_queue_not_running(engine, monkeypatch):
+    monkeypatch.setattr(settings, "DB_DURABILITY_MODE", "write_behind")
+    monkeypatch.setattr(wb, "write_behind", WriteBehindQueue(10, 1000, 100))
+    async with async_sessionmaker(engine)() as db:
+        await persist(db, _message(0))
+        await db.commit()
+    assert await _count(engine) == 1